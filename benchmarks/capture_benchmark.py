@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""Benchmark de ponta a ponta da captura (stream -> chunk -> callback) sem placa de som.
+
+Usa o ``SimulatedBackend`` para alimentar o ``AudioRecorder`` com um sinal
+gerado (ou um WAV) pelos mesmos callbacks do PortAudio, em tempo real ou
+acelerado, com jitter, xruns e deriva de relógio opcionais. Mede:
+
+* vazão: segundos de áudio capturados e entregues por segundo de relógio;
+* latência de cada chunk: da entrega do último quadro do chunk pelo
+  "dispositivo" até o callback de tempo real receber o ``PcmBuffer``;
+* blocos perdidos (xruns), atraso máximo do stream e o tempo de
+  ``stop_recording`` (renderização do arquivo final);
+* do lado do gravador (``AudioRecorder.get_capture_metrics``): overflows
+  vistos pelos callbacks, p99/máximo do tempo de callback contra o prazo do
+  bloco e profundidade máxima da fila.
+
+Uso:
+    python benchmarks/capture_benchmark.py --seconds 30
+    python benchmarks/capture_benchmark.py --seconds 120 --speed 8 --no-gate
+    python benchmarks/capture_benchmark.py --jitter-ms 15 --xrun-rate 0.01 --system-drift-ppm 80
+    python benchmarks/capture_benchmark.py --wav data/recording_20240101_120000.wav --json captura.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.audio.backends import GeneratedSource, SimulatedBackend, WavSource  # noqa: E402
+from src.audio.recorder import AudioRecorder  # noqa: E402
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    rate = 44100
+    if args.wav:
+        mic_source = WavSource(args.wav)
+        rate = mic_source.sample_rate or rate
+        seconds = mic_source.frames.shape[0] / rate
+    else:
+        seconds = args.seconds
+        mic_source = GeneratedSource("tone", sample_rate=rate, seconds=seconds, level_db=-18.0, frequency=220.0)
+    system_source = None
+    if not args.no_system:
+        system_source = GeneratedSource("noise", sample_rate=rate, seconds=seconds, level_db=-36.0, seed=1)
+
+    backend = SimulatedBackend(
+        mic_source,
+        system_source,
+        speed=args.speed,
+        jitter_ms=args.jitter_ms,
+        xrun_rate=args.xrun_rate,
+        drift_ppm=args.drift_ppm,
+        system_drift_ppm=args.system_drift_ppm,
+        seed=args.seed,
+    )
+
+    chunks: List[Dict[str, float]] = []
+    lock = threading.Lock()
+
+    def on_chunk(chunk, index):
+        received = time.perf_counter()
+        if args.callback_ms:
+            # Simula um consumidor lento (ex.: transcrição síncrona no callback)
+            time.sleep(args.callback_ms / 1000.0)
+        with lock:
+            chunks.append({"index": index, "received": received, "frames": chunk.frames})
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # Pastas data/, temp/ e config/ do gravador ficam no diretório temporário
+        os.chdir(tmp)
+        try:
+            recorder = AudioRecorder(backend=backend)
+            recorder.sample_rate = rate
+            recorder.chunk_duration = args.chunk_seconds
+            recorder.chunk_overlap = args.overlap
+            if args.no_gate:
+                recorder.config["enable_noise_gate"] = False
+            recorder.set_realtime_transcription_callback(on_chunk)
+
+            started = time.perf_counter()
+            if not recorder.start_recording():
+                raise RuntimeError("Falha ao iniciar a gravação simulada")
+            backend.wait_finished()
+            captured = time.perf_counter()
+            output = recorder.stop_recording()
+            finished = time.perf_counter()
+            capture_metrics = recorder.get_capture_metrics()
+            if output is None:
+                raise RuntimeError("Gravação simulada não gerou arquivo")
+        finally:
+            os.chdir(cwd)
+
+    mic_stream = backend.streams[0]
+    chunk_frames = int(args.chunk_seconds * rate)
+    step_frames = int(max(args.chunk_seconds - args.overlap, 1) * rate)
+    latencies = []
+    for chunk in chunks:
+        if chunk["frames"] < chunk_frames:
+            continue  # chunk final, emitido no stop
+        last_frame = chunk_frames + (int(chunk["index"]) - 1) * step_frames
+        delivered = mic_stream.delivery_time(last_frame)
+        if delivered is not None:
+            latencies.append((chunk["received"] - delivered) * 1000)
+
+    capture_wall = captured - started
+    streams = {
+        name: {
+            "blocks": stream.blocks,
+            "frames_delivered": stream.frames_delivered,
+            "frames_lost": stream.frames_lost,
+            "xruns": stream.xruns,
+            "max_lateness_ms": stream.max_lateness * 1000,
+        }
+        for name, stream in (("mic", mic_stream), ("system", backend.streams.get(1)))
+        if stream is not None
+    }
+    return {
+        "settings": {
+            key: getattr(args, key)
+            for key in (
+                "seconds", "speed", "chunk_seconds", "overlap", "jitter_ms", "xrun_rate", "drift_ppm",
+                "system_drift_ppm", "callback_ms", "no_gate", "no_system", "wav", "seed",
+            )
+        },
+        "audio_seconds": seconds,
+        "capture_wall_s": capture_wall,
+        "throughput_x": seconds / capture_wall if capture_wall > 0 else None,
+        "stop_render_s": finished - captured,
+        "chunks": len(chunks),
+        "chunk_latency_ms": {
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "max": max(latencies) if latencies else None,
+            "mean": statistics.mean(latencies) if latencies else None,
+        },
+        "streams": streams,
+        "callbacks": {
+            name: {key: value for key, value in metrics.items() if key != "histogram"}
+            for name, metrics in capture_metrics.items()
+            if metrics["callbacks"]
+        },
+    }
+
+
+def fmt_ms(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.1f} ms"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=30.0, help="duração do sinal gerado (padrão: 30)")
+    parser.add_argument("--wav", help="usar este WAV de 16 bits como microfone")
+    parser.add_argument("--speed", type=float, default=1.0, help="aceleração do relógio (0 = o mais rápido possível)")
+    parser.add_argument("--chunk-seconds", type=float, default=8.0, help="duração dos chunks de tempo real")
+    parser.add_argument("--overlap", type=float, default=2.0, help="sobreposição entre chunks (s)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="atraso aleatório máximo por bloco")
+    parser.add_argument("--xrun-rate", type=float, default=0.0, help="probabilidade de perder um bloco")
+    parser.add_argument("--drift-ppm", type=float, default=0.0, help="deriva do relógio dos dispositivos")
+    parser.add_argument("--system-drift-ppm", type=float, default=None, help="deriva só do loopback")
+    parser.add_argument("--callback-ms", type=float, default=0.0, help="tempo gasto pelo consumidor em cada chunk")
+    parser.add_argument("--no-gate", action="store_true", help="desativar o noise gate (etapa mais lenta)")
+    parser.add_argument("--no-system", action="store_true", help="capturar apenas o microfone")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="salvar o resultado neste arquivo")
+    args = parser.parse_args()
+
+    result = run(args)
+    latency = result["chunk_latency_ms"]
+    print("\n=== CAPTURA SIMULADA ===")
+    print(f"Áudio: {result['audio_seconds']:.1f} s em {result['capture_wall_s']:.2f} s ({result['throughput_x']:.1f}x)")
+    print(f"Chunks entregues: {result['chunks']}")
+    print(f"Latência do chunk: p50 {fmt_ms(latency['p50'])} | p95 {fmt_ms(latency['p95'])} | máx {fmt_ms(latency['max'])}")
+    print(f"stop_recording (arquivo final): {result['stop_render_s']:.2f} s")
+    for name, stats in result["streams"].items():
+        print(
+            f"  {name:<7} blocos {stats['blocks']:6d} | xruns {stats['xruns']:4d} "
+            f"({stats['frames_lost']} quadros) | atraso máx {stats['max_lateness_ms']:.1f} ms"
+        )
+    for name, metrics in result["callbacks"].items():
+        print(
+            f"  {name:<7} callback p99 {metrics['callback_p99_us']:.0f} µs | máx {metrics['callback_max_us']:.0f} µs "
+            f"de {metrics['deadline_us']:.0f} µs | overflows {metrics['input_overflows']} | "
+            f"fila máx {metrics['max_queue_depth']}"
+        )
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n[OK] Resultado salvo em {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+"""Benchmark da cadeia de DSP do ``AudioProcessor``.
+
+Gera sinais sintéticos e determinísticos (semente fixa) no formato do
+gravador (44,1 kHz, estéreo intercalado, int16) e mede cada etapa:
+``high_pass_filter``, ``apply_noise_gate``, ``apply_compressor``,
+``normalize``, ``reduce_echo``, ``mix_tracks``, a cadeia completa etapa por
+etapa (``process_pair``) e a mesma cadeia no kernel em blocos
+(``fused_kernel``, ``src/audio/dsp_kernel.py``). Não usa dispositivos de áudio
+nem chaves de API.
+
+Sinais:
+* ``speech``: vogais sintéticas (f0 variável + harmônicos) com sílabas e pausas;
+* ``noise``: ruído branco a cerca de -30 dBFS;
+* ``silence``: zeros.
+
+Tamanhos: ``chunk`` (8 s, o chunk de tempo real), ``10min`` e ``1h`` (opcional:
+precisa de alguns GB de RAM). O microfone vaza para o áudio do sistema (eco),
+como numa reunião real.
+
+Para cada medida são registrados o tempo (mediana), o fator de tempo real
+(tempo de processamento / duração do áudio; < 1 é mais rápido que o tempo
+real) e o pico de memória alocada (tracemalloc). Etapas cujo tempo previsto
+excede ``--budget`` são extrapoladas linearmente a partir dos primeiros 8 s
+e marcadas como estimadas.
+
+Uso:
+    python benchmarks/dsp_benchmark.py
+    python benchmarks/dsp_benchmark.py --sizes chunk,10min,1h --json dsp.json
+    python benchmarks/dsp_benchmark.py --json novo.json --compare base.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.audio.recorder import AudioProcessor, AudioRecorder  # noqa: E402
+
+SAMPLE_RATE = 44100
+CHANNELS = 2
+SIZES = {"chunk": 8.0, "10min": 600.0, "1h": 3600.0}
+SIGNALS = ("speech", "noise", "silence")
+DEFAULT_SIZES = "chunk,10min"
+BLOCK_SECONDS = 30.0
+ECHO_LEAK = 0.25
+SEED = 1234
+
+Pair = Tuple[np.ndarray, np.ndarray]
+
+
+# ----------------------------------------------------------------------
+# Sinais sintéticos
+# ----------------------------------------------------------------------
+def _phrase_bounds(seconds: float, rng: np.random.Generator) -> np.ndarray:
+    """Instantes alternados de início/fim de fala (frases de 1–4 s, pausas de 0,2–1,2 s)."""
+    bounds = []
+    position = float(rng.uniform(0.0, 0.3))
+    while position < seconds:
+        bounds.append(position)
+        position += float(rng.uniform(1.0, 4.0))
+        bounds.append(position)
+        position += float(rng.uniform(0.2, 1.2))
+    return np.array(bounds)
+
+
+def _speech_block(t: np.ndarray, bounds: np.ndarray, voice: float, rng: np.random.Generator) -> np.ndarray:
+    f0 = 150.0 * voice
+    # Entonação: f0 oscila ±25% a 0,3 Hz; a fase é a integral analítica de f0(t)
+    phase = 2 * np.pi * (f0 * t - (0.25 * f0) / (2 * np.pi * 0.3) * np.cos(2 * np.pi * 0.3 * t))
+    signal = np.zeros_like(t)
+    for harmonic in range(1, 9):
+        signal += np.sin(harmonic * phase) / harmonic
+    syllables = 0.5 * (1.0 - np.cos(2 * np.pi * 4.0 * voice * t))
+    speaking = (np.searchsorted(bounds, t, side="right") % 2) == 1
+    signal *= syllables * speaking
+    signal *= 0.35 * 32767.0 / 2.2  # pico em torno de -9 dBFS
+    signal += rng.standard_normal(t.size) * 10.0  # piso de ruído (~ -70 dBFS)
+    return signal
+
+
+def _mono_block(kind: str, t: np.ndarray, state: Dict[str, object]) -> np.ndarray:
+    rng = state["rng"]
+    if kind == "speech":
+        return _speech_block(t, state["bounds"], state["voice"], rng)  # type: ignore[arg-type]
+    if kind == "noise":
+        return rng.standard_normal(t.size) * (0.0316 * 32767.0)  # type: ignore[union-attr]
+    if kind == "silence":
+        return np.zeros_like(t)
+    raise ValueError(f"Sinal desconhecido: {kind}")
+
+
+def make_pair(kind: str, seconds: float, seed: int = SEED) -> Pair:
+    """Faixas (microfone, sistema) int16 intercaladas, geradas em blocos."""
+    frames = int(round(seconds * SAMPLE_RATE))
+    mic = np.empty(frames * CHANNELS, dtype=np.int16)
+    system = np.empty(frames * CHANNELS, dtype=np.int16)
+    states = []
+    for offset, voice in ((0, 1.0), (1, 1.35)):
+        rng = np.random.default_rng(seed + offset)
+        states.append({"rng": rng, "voice": voice, "bounds": _phrase_bounds(seconds, rng)})
+
+    block = int(BLOCK_SECONDS * SAMPLE_RATE)
+    for start in range(0, frames, block):
+        stop = min(frames, start + block)
+        t = np.arange(start, stop) / SAMPLE_RATE
+        mic_mono = _mono_block(kind, t, states[0])
+        sys_mono = _mono_block(kind, t, states[1]) + ECHO_LEAK * mic_mono
+        for target, mono in ((mic, mic_mono), (system, sys_mono)):
+            # Canal direito um pouco mais baixo que o esquerdo
+            stereo = np.column_stack((mono, mono * 0.9))
+            target[start * CHANNELS:stop * CHANNELS] = np.clip(stereo, -32768, 32767).astype(np.int16).reshape(-1)
+    return mic, system
+
+
+# ----------------------------------------------------------------------
+# Etapas medidas
+# ----------------------------------------------------------------------
+def build_operations(recorder: AudioRecorder) -> Dict[str, Callable[[np.ndarray, np.ndarray], np.ndarray]]:
+    config = recorder.config
+    processor = AudioProcessor
+    return {
+        "high_pass_filter": lambda mic, system: processor.high_pass_filter(mic, SAMPLE_RATE),
+        "apply_noise_gate": lambda mic, system: processor.apply_noise_gate(
+            mic,
+            sample_rate=SAMPLE_RATE,
+            threshold_db=config.get("noise_gate_threshold_db", -55.0),
+            hold_ms=config.get("noise_gate_hold_ms", 120.0),
+            floor=config.get("noise_gate_floor", 0.12),
+        ),
+        "apply_compressor": lambda mic, system: processor.apply_compressor(
+            mic,
+            threshold_db=config.get("compressor_threshold_db", -16.0),
+            ratio=config.get("compressor_ratio", 3.5),
+        ),
+        "normalize": lambda mic, system: processor.normalize(mic, target_db=config.get("normalize_target_db", -14.0)),
+        "reduce_echo": lambda mic, system: processor.reduce_echo(
+            system, mic, sample_rate=SAMPLE_RATE, strength=config.get("echo_strength", 0.55)
+        ),
+        "mix_tracks": lambda mic, system: processor.mix_tracks(mic, system),
+        "process_pair": lambda mic, system: recorder._process_pair_stages(mic, system),
+        "fused_kernel": lambda mic, system: recorder.dsp_kernel.process(mic, system, SAMPLE_RATE, config),
+    }
+
+
+def make_recorder() -> AudioRecorder:
+    """Gravador com a configuração padrão (sem ler config/audio_config.json do usuário)."""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            recorder = AudioRecorder()
+        finally:
+            os.chdir(cwd)
+    recorder.sample_rate = SAMPLE_RATE
+    recorder.channels = CHANNELS
+    return recorder
+
+
+def time_call(func: Callable[[], object], repeat: int, min_total: float = 2.0) -> Tuple[float, int]:
+    """Mediana de até ``repeat`` execuções (para cedo em etapas lentas)."""
+    timings: List[float] = []
+    while len(timings) < repeat:
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+        if sum(timings) >= min_total:
+            break
+    return statistics.median(timings), len(timings)
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        func()
+        return max(0, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+
+
+def measure(
+    op: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    pair: Pair,
+    seconds: float,
+    repeat: int,
+    with_memory: bool,
+) -> Dict[str, object]:
+    mic, system = pair
+    elapsed, runs = time_call(lambda: op(mic, system), repeat)
+    return {
+        "time_s": elapsed,
+        "runs": runs,
+        "rtf": elapsed / seconds,
+        "peak_bytes": peak_memory(lambda: op(mic, system)) if with_memory else None,
+        "estimated": False,
+    }
+
+
+def scale(calibration: Dict[str, object], factor: float, seconds: float) -> Dict[str, object]:
+    elapsed = float(calibration["time_s"]) * factor
+    peak = calibration["peak_bytes"]
+    return {
+        "time_s": elapsed,
+        "runs": 0,
+        "rtf": elapsed / seconds,
+        "peak_bytes": int(peak * factor) if peak is not None else None,
+        "estimated": True,
+    }
+
+
+def run_suite(
+    recorder: AudioRecorder, sizes: List[str], signals: List[str], repeat: int, budget: float, with_memory: bool
+) -> List[Dict[str, object]]:
+    operations = build_operations(recorder)
+    chunk_seconds = SIZES["chunk"]
+    results: List[Dict[str, object]] = []
+
+    for kind in signals:
+        calibration: Dict[str, Dict[str, object]] = {}
+        for size in sizes:
+            seconds = SIZES[size]
+            print(f"\n[{kind} / {size}] gerando {seconds:.0f} s de áudio...")
+            pair = make_pair(kind, seconds)
+            for name, op in operations.items():
+                if size != "chunk" and name not in calibration:
+                    head = tuple(track[: int(chunk_seconds * SAMPLE_RATE) * CHANNELS] for track in pair)
+                    calibration[name] = measure(op, head, chunk_seconds, repeat, with_memory)
+                if size == "chunk":
+                    entry = measure(op, pair, seconds, repeat, with_memory)
+                    calibration[name] = entry
+                else:
+                    factor = seconds / chunk_seconds
+                    predicted = float(calibration[name]["time_s"]) * factor
+                    if predicted > budget:
+                        entry = scale(calibration[name], factor, seconds)
+                    else:
+                        entry = measure(op, pair, seconds, 1, with_memory)
+                entry.update({"signal": kind, "size": size, "seconds": seconds, "op": name})
+                results.append(entry)
+                print("  " + format_entry(entry))
+            del pair
+    return results
+
+
+# ----------------------------------------------------------------------
+# Relatório e comparação
+# ----------------------------------------------------------------------
+def format_bytes(value: Optional[int]) -> str:
+    if value is None:
+        return "-"
+    return f"{value / (1024 * 1024):.1f} MB"
+
+
+def format_entry(entry: Dict[str, object]) -> str:
+    mark = "~" if entry["estimated"] else " "
+    rtf = float(entry["rtf"])
+    speed = f"{1 / rtf:8.1f}x" if rtf > 0 else "       -"
+    return (
+        f"{entry['op']:<18}{mark}{float(entry['time_s']):10.3f} s  "
+        f"RTF {rtf:8.4f}  {speed} tempo real  pico {format_bytes(entry['peak_bytes'])}"
+    )
+
+
+def git_revision() -> Optional[str]:
+    try:
+        proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return proc.stdout.strip() or None
+
+
+def metadata(recorder_config: Dict[str, object], args: argparse.Namespace) -> Dict[str, object]:
+    return {
+        "commit": git_revision(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "sample_rate": SAMPLE_RATE,
+        "channels": CHANNELS,
+        "seed": SEED,
+        "repeat": args.repeat,
+        "budget_s": args.budget,
+        "config": recorder_config,
+    }
+
+
+def compare(results: List[Dict[str, object]], baseline: Dict[str, object], threshold: float) -> int:
+    """Imprimir a variação por etapa; retorna quantas regressões medidas passaram do limite."""
+    previous = {(r["signal"], r["size"], r["op"]): r for r in baseline.get("results", [])}
+    regressions = 0
+    print(f"\n=== COMPARAÇÃO com {baseline.get('meta', {}).get('commit') or 'base'} ===")
+    for entry in results:
+        old = previous.get((entry["signal"], entry["size"], entry["op"]))
+        if not old or not float(old["time_s"]):
+            continue
+        ratio = float(entry["time_s"]) / float(old["time_s"])
+        estimated = entry["estimated"] or old["estimated"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  (estimado)" if estimated else "  REGRESSÃO"
+            regressions += 0 if estimated else 1
+        elif ratio < 1 - threshold:
+            flag = "  melhora"
+        print(
+            f"{entry['signal']:<8}{entry['size']:<7}{entry['op']:<18}"
+            f"{float(old['time_s']):10.3f} s -> {float(entry['time_s']):10.3f} s  ({ratio - 1:+.1%}){flag}"
+        )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"tamanhos separados por vírgula ({', '.join(SIZES)})")
+    parser.add_argument("--signals", default=",".join(SIGNALS), help="sinais separados por vírgula")
+    parser.add_argument("--repeat", type=int, default=5, help="execuções por medida no chunk (padrão: 5)")
+    parser.add_argument(
+        "--budget", type=float, default=30.0, help="tempo máximo (s) por medida antes de extrapolar (padrão: 30)"
+    )
+    parser.add_argument("--no-memory", action="store_true", help="não medir o pico de memória (mais rápido)")
+    parser.add_argument("--json", dest="json_path", help="salvar o resultado neste arquivo")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=0.15, help="variação considerada regressão (padrão: 0.15)")
+    args = parser.parse_args()
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    signals = [s.strip() for s in args.signals.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES] + [s for s in signals if s not in SIGNALS]
+    if unknown:
+        print(f"[ERRO] Valores desconhecidos: {', '.join(unknown)}")
+        return 2
+    # O chunk vem primeiro: serve de calibração para os tamanhos maiores
+    sizes.sort(key=lambda s: SIZES[s])
+
+    recorder = make_recorder()
+    results = run_suite(recorder, sizes, signals, max(1, args.repeat), args.budget, not args.no_memory)
+    payload = {"meta": metadata(recorder.config, args), "results": results}
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n[OK] Resultado salvo em {args.json_path}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""Vazão do pipeline pós-gravação (fila -> transcrição -> resumo) contra o servidor falso.
+
+Sobe o ``FakeAIServer`` (``src/devtools/fake_ai_server.py``) em uma porta
+livre, aponta ``Transcriber`` e ``Summarizer`` para ele via
+``ai.openai_base_url``/``ai.gemini_base_url`` com chaves fictícias e processa
+N gravações sintéticas pela ``MeetingPipeline``. Nada sai da máquina e o
+resultado não depende da rede, então dá para comparar mudanças de
+concorrência, retentativas e chunking entre commits. Mede:
+
+* jobs por minuto e tempo total até a fila esvaziar;
+* p50/p95 de cada etapa (``encoded``, ``transcribed``, ``summarized``),
+  a partir dos eventos ``started``/``completed`` da fila;
+* retentativas e falhas (com ``--error-rate``) e as chamadas recebidas pelo servidor.
+
+Requer o SDK ``openai`` (e ``google-generativeai`` para ``--provider gemini``).
+
+Uso:
+    python benchmarks/pipeline_benchmark.py --jobs 20 --seconds 60
+    python benchmarks/pipeline_benchmark.py --jobs 20 --latency-ms 400 --transcribe-ms-per-s 50 --tokens-per-s 80
+    python benchmarks/pipeline_benchmark.py --error-rate 0.1 --transcribe-workers 4 --json pipeline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import wave
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.devtools.fake_ai_server import FakeAIConfig, FakeAIServer  # noqa: E402
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def write_recording(path: Path, seconds: float, seed: int, sample_rate: int = 16000) -> Path:
+    """WAV mono de 16 bits com ruído modulado (conteúdo distinto por gravação)."""
+    rng = np.random.default_rng(seed)
+    frames = int(seconds * sample_rate)
+    envelope = 0.5 + 0.5 * np.sin(np.linspace(0, seconds * 2 * np.pi / 3, frames))
+    samples = (rng.standard_normal(frames) * envelope * 3000).astype(np.int16)
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(samples.tobytes())
+    return path
+
+
+def run(args: argparse.Namespace) -> Dict[str, object]:
+    server_config = FakeAIConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        transcribe_ms_per_audio_s=args.transcribe_ms_per_s,
+        tokens_per_second=args.tokens_per_s,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+
+    durations: Dict[str, List[float]] = {}
+    started_at: Dict[tuple, float] = {}
+    counts = {"retrying": 0, "failed": 0, "done": 0}
+    lock = threading.Lock()
+
+    def on_event(job, event):
+        now = time.perf_counter()
+        with lock:
+            if event == "started":
+                started_at[(job.id, job.next_stage)] = now
+            elif event == "completed":
+                begin = started_at.pop((job.id, job.stage), None)
+                if begin is not None:
+                    durations.setdefault(job.stage, []).append(now - begin)
+                if job.finished:
+                    counts["done"] += 1
+            elif event in counts:
+                counts[event] += 1
+
+    # Templates de resumo são lidos de src/templates relativo ao diretório atual
+    cwd = os.getcwd()
+    os.chdir(ROOT)
+    try:
+        from src.ai.summarizer import Summarizer
+        from src.ai.transcriber import Transcriber
+        from src.pipeline.meeting import MeetingPipeline
+        from src.utils.config_manager import ConfigManager
+
+        with FakeAIServer(server_config) as server, tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(tmp)
+            config = ConfigManager(config_dir=workdir / "config")
+            config.update_section("ai", openai_base_url=server.openai_base_url, gemini_base_url=server.gemini_base_url)
+            config.update_api_keys(openai_api_key="sk-fake", gemini_api_key="fake", ai_provider=args.provider)
+
+            recordings = [
+                write_recording(workdir / f"reuniao_{index:03d}.wav", args.seconds, seed=args.seed + index)
+                for index in range(args.jobs)
+            ]
+            pipeline = MeetingPipeline(
+                Transcriber(config),
+                Summarizer(config),
+                db_path=workdir / "jobs.db",
+                concurrency={"transcribed": args.transcribe_workers, "summarized": args.summarize_workers},
+                retry_delay=args.retry_delay,
+            )
+            pipeline.add_listener(on_event)
+
+            started = time.perf_counter()
+            for path in recordings:
+                pipeline.submit(str(path))
+            idle = pipeline.wait_idle(timeout=args.timeout)
+            elapsed = time.perf_counter() - started
+            pipeline.shutdown(wait=True)
+            config.flush()
+            server_stats = server.stats()
+    finally:
+        os.chdir(cwd)
+
+    return {
+        "settings": {
+            key: getattr(args, key)
+            for key in (
+                "jobs", "seconds", "provider", "latency_ms", "jitter_ms", "transcribe_ms_per_s", "tokens_per_s",
+                "error_rate", "transcribe_workers", "summarize_workers", "retry_delay", "seed",
+            )
+        },
+        "completed": idle,
+        "elapsed_s": elapsed,
+        "jobs_done": counts["done"],
+        "jobs_per_minute": counts["done"] / elapsed * 60 if elapsed > 0 else None,
+        "retries": counts["retrying"],
+        "failed": counts["failed"],
+        "stages": {
+            stage: {
+                "count": len(values),
+                "p50_ms": percentile(values, 0.50) * 1000,
+                "p95_ms": percentile(values, 0.95) * 1000,
+            }
+            for stage, values in durations.items()
+        },
+        "server": server_stats,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=10, help="número de gravações (padrão: 10)")
+    parser.add_argument("--seconds", type=float, default=30.0, help="duração de cada gravação (padrão: 30)")
+    parser.add_argument("--provider", choices=["openai", "gemini"], default="openai", help="provedor do resumo")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="latência fixa por chamada")
+    parser.add_argument("--jitter-ms", type=float, default=50.0, help="variação aleatória da latência")
+    parser.add_argument("--transcribe-ms-per-s", type=float, default=30.0, help="custo da transcrição por segundo de áudio")
+    parser.add_argument("--tokens-per-s", type=float, default=0.0, help="velocidade de geração do resumo (0 = instantâneo)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fração de chamadas que falham (429/500/503)")
+    parser.add_argument("--transcribe-workers", type=int, default=2)
+    parser.add_argument("--summarize-workers", type=int, default=2)
+    parser.add_argument("--retry-delay", type=float, default=0.2, help="espera base entre tentativas da fila")
+    parser.add_argument("--timeout", type=float, default=600.0, help="tempo máximo para a fila esvaziar")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="salvar o resultado neste arquivo")
+    args = parser.parse_args()
+
+    result = run(args)
+    print("\n=== PIPELINE (SERVIDOR FALSO) ===")
+    status = "" if result["completed"] else " (tempo esgotado)"
+    print(f"Jobs concluídos: {result['jobs_done']}/{args.jobs} em {result['elapsed_s']:.2f} s{status}")
+    print(f"Vazão: {result['jobs_per_minute']:.1f} jobs/min | retentativas {result['retries']} | falhas {result['failed']}")
+    for stage, stats in result["stages"].items():
+        print(f"  {stage:<12} n={stats['count']:3d} | p50 {stats['p50_ms']:8.1f} ms | p95 {stats['p95_ms']:8.1f} ms")
+    print(f"Chamadas ao servidor: {result['server']['calls']} | erros: {result['server']['errors']}")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n[OK] Resultado salvo em {args.json_path}")
+    return 0 if result["completed"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
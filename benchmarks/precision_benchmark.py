@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""Benchmark da precisão do DSP: float64 contra float32 em gravações longas.
+
+Mede, para cada etapa vetorizada do ``AudioProcessor`` (``apply_gain``,
+``apply_compressor``, ``normalize``, ``reduce_echo``, ``analyze_levels``) e
+para o kernel em blocos (``fused_kernel``), o tempo, a vazão (fator sobre o
+tempo real) e o pico de RSS com ``dtype=float64`` e ``dtype=float32``. Cada
+medida roda num processo próprio para o pico de RSS (``ru_maxrss``) ser só
+daquela etapa; o acréscimo sobre o processo com a entrada já carregada é
+reportado à parte.
+
+``high_pass_filter`` e ``apply_noise_gate`` ficam de fora: são laços Python
+por amostra, e numa gravação de 1 h o tempo é dominado pelo interpretador,
+não pela precisão (o kernel em blocos cobre essas etapas).
+
+O áudio é o sinal ``speech`` de ``dsp_benchmark.py`` (44,1 kHz, estéreo
+intercalado, int16), gerado uma vez e salvo num diretório temporário. Com o
+padrão de 60 min, a entrada ocupa ~1,3 GB e as etapas em float64 chegam a
+~6 GB de RSS; use ``--minutes`` menor em máquinas com pouca memória.
+
+Uso:
+    python benchmarks/precision_benchmark.py
+    python benchmarks/precision_benchmark.py --minutes 10 --ops apply_gain,fused_kernel --json precisao.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from dsp_benchmark import CHANNELS, SAMPLE_RATE, format_bytes, git_revision, make_pair, make_recorder  # noqa: E402
+from src.audio.recorder import PRECISIONS, AudioProcessor  # noqa: E402
+
+OPS = ("apply_gain", "apply_compressor", "normalize", "reduce_echo", "analyze_levels", "fused_kernel")
+DEFAULT_MINUTES = 60.0
+
+
+def build_operations(recorder) -> Dict[str, Callable[[np.ndarray, np.ndarray, type], object]]:
+    config = recorder.config
+    processor = AudioProcessor
+    return {
+        "apply_gain": lambda mic, system, dtype: processor.apply_gain(mic, config.get("mic_gain_db", 7.5), dtype),
+        "apply_compressor": lambda mic, system, dtype: processor.apply_compressor(
+            mic,
+            threshold_db=config.get("compressor_threshold_db", -16.0),
+            ratio=config.get("compressor_ratio", 3.5),
+            dtype=dtype,
+        ),
+        "normalize": lambda mic, system, dtype: processor.normalize(
+            mic, target_db=config.get("normalize_target_db", -14.0), dtype=dtype
+        ),
+        "reduce_echo": lambda mic, system, dtype: processor.reduce_echo(
+            system, mic, sample_rate=SAMPLE_RATE, strength=config.get("echo_strength", 0.55), dtype=dtype
+        ),
+        "analyze_levels": lambda mic, system, dtype: processor.analyze_levels(mic, dtype=dtype),
+        "fused_kernel": lambda mic, system, dtype: recorder.dsp_kernel.process(mic, system, SAMPLE_RATE, config, dtype),
+    }
+
+
+def peak_rss() -> int:
+    """Pico de RSS do processo em bytes (ru_maxrss é KiB no Linux e bytes no macOS)."""
+    value = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return value if sys.platform == "darwin" else value * 1024
+
+
+def run_worker(args: argparse.Namespace) -> int:
+    """Uma medida isolada; imprime o resultado em JSON na última linha."""
+    data = Path(args.data)
+    mic = np.load(data / "mic.npy")
+    system = np.load(data / "system.npy")
+    operation = build_operations(make_recorder())[args.op]
+    dtype = AudioProcessor.precision_dtype(args.precision)
+    loaded = peak_rss()
+    started = time.perf_counter()
+    operation(mic, system, dtype)
+    elapsed = time.perf_counter() - started
+    print(json.dumps({"time_s": elapsed, "peak_rss": peak_rss(), "input_rss": loaded}))
+    return 0
+
+
+def measure(data: Path, op: str, precision: str) -> Dict[str, object]:
+    proc = subprocess.run(
+        [sys.executable, __file__, "--worker", "--data", str(data), "--op", op, "--precision", precision],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        # Falta de memória costuma aparecer como SIGKILL (-9)
+        return {"error": (proc.stderr.strip().splitlines() or [f"código {proc.returncode}"])[-1]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def format_row(op: str, precision: str, entry: Dict[str, object], seconds: float) -> str:
+    if "error" in entry:
+        return f"{op:<18}{precision:<9}  [ERRO] {entry['error']}"
+    elapsed = float(entry["time_s"])
+    extra = int(entry["peak_rss"]) - int(entry["input_rss"])
+    return (
+        f"{op:<18}{precision:<9}{elapsed:9.2f} s {seconds / elapsed:9.1f}x tempo real  "
+        f"pico RSS {format_bytes(int(entry['peak_rss']))} (+{format_bytes(extra)} sobre a entrada)"
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=DEFAULT_MINUTES, help="duração do áudio (padrão: 60)")
+    parser.add_argument("--ops", default=",".join(OPS), help="etapas separadas por vírgula")
+    parser.add_argument("--json", dest="json_path", help="salvar o resultado neste arquivo")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--data", help=argparse.SUPPRESS)
+    parser.add_argument("--op", help=argparse.SUPPRESS)
+    parser.add_argument("--precision", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return run_worker(args)
+
+    ops = [op.strip() for op in args.ops.split(",") if op.strip()]
+    unknown = [op for op in ops if op not in OPS]
+    if unknown:
+        print(f"[ERRO] Etapas desconhecidas: {', '.join(unknown)}")
+        return 2
+
+    seconds = args.minutes * 60.0
+    results: List[Dict[str, object]] = []
+    with tempfile.TemporaryDirectory(prefix="meetai_precision_") as tmp:
+        data = Path(tmp)
+        print(f"Gerando {args.minutes:g} min de áudio ({SAMPLE_RATE} Hz, {CHANNELS} canais)...")
+        mic, system = make_pair("speech", seconds)
+        np.save(data / "mic.npy", mic)
+        np.save(data / "system.npy", system)
+        del mic, system
+
+        for op in ops:
+            timings = {}
+            for precision in PRECISIONS:
+                entry = measure(data, op, precision)
+                print(format_row(op, precision, entry, seconds))
+                entry.update({"op": op, "precision": precision, "seconds": seconds})
+                results.append(entry)
+                timings[precision] = entry
+            old, new = timings["float64"], timings["float32"]
+            if "error" not in old and "error" not in new:
+                speedup = float(old["time_s"]) / float(new["time_s"])
+                saved = int(old["peak_rss"]) - int(new["peak_rss"])
+                print(f"{'':<18}{'ganho':<9}{speedup:9.2f}x vazão, pico RSS {format_bytes(saved)} menor")
+
+    if args.json_path:
+        payload = {
+            "meta": {"commit": git_revision(), "numpy": np.__version__, "minutes": args.minutes},
+            "results": results,
+        }
+        Path(args.json_path).write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n[OK] Resultado salvo em {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""Benchmark de inicialização do MeetAI (tempo até o primeiro quadro).
+
+Executa ``python -X importtime main.py --startup-probe`` algumas vezes. Com
+``--startup-probe`` a aplicação imprime ``STARTUP first_frame_ms=<ms>`` assim
+que a janela principal é desenhada e fecha em seguida. O script reúne:
+
+* tempo até o primeiro quadro medido dentro do processo;
+* tempo total do processo (inclui o encerramento do interpretador);
+* custo de import acumulado dos módulos pesados que ainda foram carregados
+  antes da janela aparecer (numpy, sounddevice, openai, google.generativeai).
+
+Requer um display (no Linux sem interface gráfica use ``xvfb-run``).
+
+Uso:
+    python benchmarks/startup_benchmark.py --runs 5
+    python benchmarks/startup_benchmark.py --runs 5 --json startup.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["tkinter", "numpy", "sounddevice", "openai", "google.generativeai"]
+
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+_FIRST_FRAME = re.compile(r"STARTUP first_frame_ms=([\d.]+)")
+
+
+def parse_importtime(stderr: str) -> Dict[str, float]:
+    """Retornar o tempo cumulativo (ms) de cada módulo de nível superior."""
+    cumulative: Dict[str, float] = {}
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.search(line)
+        if not match:
+            continue
+        module = match.group(4)
+        cumulative[module] = max(cumulative.get(module, 0.0), int(match.group(2)) / 1000.0)
+    return cumulative
+
+
+def run_once(python: str) -> Optional[Dict[str, object]]:
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [python, "-X", "importtime", "main.py", "--startup-probe"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    match = _FIRST_FRAME.search(proc.stdout)
+    if not match:
+        print(f"[ERRO] Execução sem marcador de primeiro quadro (código {proc.returncode})")
+        print(proc.stderr[-2000:])
+        return None
+
+    imports = parse_importtime(proc.stderr)
+    return {
+        "first_frame_ms": float(match.group(1)),
+        "process_ms": wall_ms,
+        "imports_ms": {name: imports.get(name, 0.0) for name in HEAVY_MODULES},
+    }
+
+
+def summarize(runs: List[Dict[str, object]]) -> Dict[str, object]:
+    first_frame = [float(run["first_frame_ms"]) for run in runs]
+    process = [float(run["process_ms"]) for run in runs]
+    imports = {
+        name: statistics.median(float(run["imports_ms"][name]) for run in runs)  # type: ignore[index]
+        for name in HEAVY_MODULES
+    }
+    return {
+        "runs": len(runs),
+        "first_frame_ms_median": statistics.median(first_frame),
+        "first_frame_ms_min": min(first_frame),
+        "process_ms_median": statistics.median(process),
+        "imports_before_first_frame_ms": imports,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="número de execuções (padrão: 5)")
+    parser.add_argument("--python", default=sys.executable, help="interpretador a utilizar")
+    parser.add_argument("--json", dest="json_path", help="salvar o resultado neste arquivo")
+    args = parser.parse_args()
+
+    runs = []
+    for index in range(args.runs):
+        result = run_once(args.python)
+        if result is None:
+            return 1
+        runs.append(result)
+        print(f"[{index + 1}/{args.runs}] primeiro quadro: {result['first_frame_ms']:.1f} ms")
+
+    summary = summarize(runs)
+    print("\n=== INICIALIZAÇÃO ===")
+    print(f"Primeiro quadro (mediana): {summary['first_frame_ms_median']:.1f} ms")
+    print(f"Primeiro quadro (mínimo):  {summary['first_frame_ms_min']:.1f} ms")
+    print(f"Processo completo (mediana): {summary['process_ms_median']:.1f} ms")
+    print("Imports carregados antes do primeiro quadro (cumulativo, mediana):")
+    for name, value in summary["imports_before_first_frame_ms"].items():  # type: ignore[union-attr]
+        state = f"{value:8.1f} ms" if value else "  adiado"
+        print(f"  {name:<22}{state}")
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps({"summary": summary, "runs": runs}, indent=2), encoding="utf-8")
+        print(f"\n[OK] Resultado salvo em {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
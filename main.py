@@ -3,45 +3,136 @@ MeetAI - Gravador de Áudio com Resumos IA
 Aplicação principal para gravação de áudio e geração de resumos
 """
 
+import time
+
+# Marca o início do processo para medir o tempo até o primeiro quadro
+_PROCESS_START = time.perf_counter()
+
 import sys
 import os
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
 import threading
-import json
-from datetime import datetime
 from pathlib import Path
 
 # Adicionar src ao path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.audio.recorder import AudioRecorder
 from src.ai.transcriber import Transcriber
 from src.ai.summarizer import Summarizer
-from src.gui.main_window import MainWindow
-from src.utils.config_manager import ConfigManager
+from src.utils.config_manager import get_config_manager
+from src.utils.tempspace import cleanup_stale_workspaces
+from src.gui.dispatcher import JOB as JOB_EVENT
+
+# tkinter e a interface são importados apenas no modo gráfico (o modo
+# "batch" precisa iniciar rápido em servidores sem display)
 
 class MeetAI:
-    def __init__(self):
-        self.config_manager = ConfigManager()
-        self.audio_recorder = AudioRecorder()
-        self.transcriber = Transcriber()
-        self.summarizer = Summarizer()
+    def __init__(self, startup_probe=False):
+        self.startup_probe = startup_probe
+        self.first_frame_ms = None
+        # Fonte única de configurações: os módulos assinam alterações em vez de reler arquivos
+        self.config_manager = get_config_manager()
+        # Clientes de IA são leves: os SDKs só são importados no primeiro uso
+        self.transcriber = Transcriber(self.config_manager)
+        self.summarizer = Summarizer(self.config_manager)
+        
+        # Gravador (numpy + PortAudio) é criado sob demanda ou em segundo plano
+        self._audio_recorder = None
+        self._recorder_lock = threading.Lock()
+        
+        # Fila persistente de pós-processamento (data/jobs.db), aberta sob demanda
+        self._pipeline = None
+        self._pipeline_lock = threading.Lock()
+        # Gravação cujos resultados estão na tela (para ligar exportações no catálogo)
+        self.current_recording = None
         
         # Transcrição em tempo real REMOVIDA (sistema simplificado)
         
         # Criar diretórios necessários
         self.ensure_directories()
         
-        # Carregar configurações de áudio
-        self.load_audio_settings()
-        
         # Inicializar interface
+        import tkinter as tk
+        from src.gui.main_window import MainWindow
+        
         self.root = tk.Tk()
         self.main_window = MainWindow(self.root, self)
+        self.main_window.dispatcher.register(JOB_EVENT, self._show_job_event)
+        self.root.bind("<Map>", self._on_map, add="+")
         
         # Transcrição em tempo real DESABILITADA (usuário preferiu gravação completa)
         # self.audio_recorder.set_realtime_transcription_callback(self.realtime_transcription_callback)
+    
+    @property
+    def audio_recorder(self):
+        """Gravador de áudio, construído na primeira utilização"""
+        if self._audio_recorder is None:
+            with self._recorder_lock:
+                if self._audio_recorder is None:
+                    from src.audio.recorder import AudioRecorder
+                    recorder = AudioRecorder()
+                    self.load_audio_settings(recorder)
+                    self._audio_recorder = recorder
+        return self._audio_recorder
+    
+    @property
+    def pipeline(self):
+        """Fila de processamento das gravações (transcrição e resumo)"""
+        if self._pipeline is None:
+            with self._pipeline_lock:
+                if self._pipeline is None:
+                    from src.pipeline.meeting import MeetingPipeline
+                    from src.storage.archive import ArchiveStore
+                    from src.storage.catalog import RecordingCatalog
+                    # Cada etapa concluída é indexada em data/catalog.db; com o
+                    # arquivamento ativado, o áudio transcrito vai para data/archive
+                    catalog = RecordingCatalog()
+                    archive = ArchiveStore(catalog, self.config_manager.storage)
+                    self.config_manager.subscribe("storage", archive.update_settings)
+                    pipeline = MeetingPipeline(self.transcriber, self.summarizer, catalog=catalog, archive=archive)
+                    pipeline.add_listener(self._on_job_event)
+                    self._pipeline = pipeline
+        return self._pipeline
+    
+    def _on_map(self, event):
+        """Primeira exibição da janela: medir e iniciar o pré-carregamento"""
+        if event.widget is not self.root or self.first_frame_ms is not None:
+            return
+        self.first_frame_ms = (time.perf_counter() - _PROCESS_START) * 1000
+        self.root.after_idle(self._after_first_frame)
+    
+    def _after_first_frame(self):
+        """Executado depois que o primeiro quadro foi desenhado"""
+        if self.startup_probe:
+            print(f"STARTUP first_frame_ms={self.first_frame_ms:.1f}", flush=True)
+            self.root.after(0, self.root.destroy)
+            return
+        threading.Thread(target=self._background_init, name="meetai-warmup", daemon=True).start()
+    
+    def _background_init(self):
+        """Importar numpy/sounddevice/SDKs e detectar dispositivos fora da thread do Tk"""
+        # Pastas temporárias deixadas por execuções que terminaram com erro
+        cleanup_stale_workspaces()
+        try:
+            self.audio_recorder.ensure_devices()
+        except Exception as e:
+            print(f"Erro ao preparar gravador de áudio: {e}")
+        self.transcriber.warm_up()
+        self.summarizer.warm_up()
+        # Retomar gravações cujo processamento foi interrompido
+        try:
+            self.pipeline.resume()
+        except Exception as e:
+            print(f"Erro ao retomar fila de processamento: {e}")
+        # Indexar gravações antigas que ainda não estão no catálogo
+        try:
+            self.pipeline.catalog.backfill("data")
+        except Exception as e:
+            print(f"Erro ao indexar gravações existentes: {e}")
+        # Arquivar gravações transcritas que ficaram para trás e aplicar a retenção
+        try:
+            self.pipeline.archive.sweep()
+        except Exception as e:
+            print(f"Erro na manutenção do arquivo de gravações: {e}")
         
     def ensure_directories(self):
         """Criar diretórios necessários se não existirem"""
@@ -49,59 +140,41 @@ class MeetAI:
         for directory in directories:
             Path(directory).mkdir(exist_ok=True)
     
-    def load_audio_settings(self):
-        """Carregar configurações de áudio salvas"""
+    def load_audio_settings(self, recorder=None):
+        """Aplicar configurações de áudio salvas ao gravador"""
+        recorder = recorder or self.audio_recorder
         try:
-            settings_file = Path("config/settings.json")
-            if settings_file.exists():
-                with open(settings_file, 'r') as f:
-                    settings = json.load(f)
-                    
-                    audio_config = settings.get('audio', {})
-                    
-                    # Configurar dispositivo de entrada
-                    input_device = audio_config.get('input_device')
-                    if input_device is not None:
-                        self.audio_recorder.set_input_device(input_device)
-                    else:
-                        print("Dispositivo de microfone nao definido nas configuracoes; usando auto-detectado.")
-                    
-                    # Configurar sample rate
-                    sample_rate = audio_config.get('sample_rate', 44100)
-                    self.audio_recorder.rate = sample_rate
-                    
-                    # Configurar gravação de áudio do sistema
-                    record_system = audio_config.get('record_system_audio', True)
-                    self.audio_recorder.set_record_system_audio(record_system)
-                    
-                    device_label = input_device if input_device is not None else "Auto"
-                    print(f"Configurações de áudio carregadas: Dispositivo={device_label}, Sample Rate={sample_rate}, Sistema={record_system}")
+            audio_config = self.config_manager.audio
+            
+            # Configurar dispositivo de entrada
+            input_device = audio_config.input_device
+            if input_device is not None:
+                recorder.set_input_device(input_device)
+            else:
+                print("Dispositivo de microfone nao definido nas configuracoes; usando auto-detectado.")
+            
+            # Configurar sample rate
+            recorder.rate = audio_config.sample_rate
+            
+            # Configurar gravação de áudio do sistema
+            recorder.set_record_system_audio(audio_config.record_system_audio)
+            
+            device_label = input_device if input_device is not None else "Auto"
+            print(f"Configurações de áudio carregadas: Dispositivo={device_label}, Sample Rate={audio_config.sample_rate}, Sistema={audio_config.record_system_audio}")
         except Exception as e:
             print(f"Erro ao carregar configurações de áudio: {e}")
     
-    def realtime_transcription_callback(self, chunk_file, chunk_number):
-        """Callback para transcrição em tempo real"""
+    def realtime_transcription_callback(self, chunk, chunk_number):
+        """Callback para transcrição em tempo real (chunk é um PcmBuffer em memória)"""
         try:
             print(f"🎯 Transcrevendo chunk {chunk_number} em tempo real...")
             
             # Transcrever chunk
-            chunk_transcript = self.transcriber.transcribe(chunk_file)
+            chunk_transcript = self.transcriber.transcribe(chunk)
             
             if chunk_transcript:
-                # Armazenar transcrição do chunk
-                self.chunk_transcripts[chunk_number] = chunk_transcript
-                
-                # Reconstruir transcrição completa
-                full_transcript = ""
-                for i in sorted(self.chunk_transcripts.keys()):
-                    if full_transcript and not full_transcript.endswith(" "):
-                        full_transcript += " "
-                    full_transcript += self.chunk_transcripts[i]
-                
-                self.realtime_transcript = full_transcript
-                
-                # Atualizar interface na thread principal
-                self.root.after(0, lambda: self.main_window.update_realtime_transcript(full_transcript))
+                # Só o trecho novo vai para a interface (inserção incremental, agrupada no Tk)
+                self.main_window.add_realtime_segment(chunk_number, chunk_transcript)
                 
                 print(f"✅ Chunk {chunk_number} transcrito: {len(chunk_transcript)} caracteres")
             else:
@@ -119,60 +192,100 @@ class MeetAI:
             self.audio_recorder.start_recording()
             return True
         except Exception as e:
+            from tkinter import messagebox
             messagebox.showerror("Erro", f"Erro ao iniciar gravação: {str(e)}")
             return False
     
-    def stop_recording(self):
-        """Parar gravação e processar áudio"""
+    def stop_recording(self, template=None):
+        """Parar gravação e enfileirar o processamento do áudio (roda fora da thread do Tk)"""
         try:
             audio_file = self.audio_recorder.stop_recording()
             if audio_file:
-                # Processar em thread separada
-                threading.Thread(target=self.process_audio, args=(audio_file,), daemon=True).start()
+                # O job é persistido antes de começar: sobrevive a fechar/travar a aplicação
+                self.main_window.post_status("Gravação na fila de processamento...")
+                self.pipeline.submit(audio_file, template)
             return audio_file
         except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao parar gravação: {str(e)}")
+            self.main_window.post_error(f"Erro ao parar gravação: {str(e)}")
             return None
     
-    def process_audio(self, audio_file):
-        """Processar áudio gravado - SISTEMA SIMPLIFICADO"""
-        try:
-            # Fazer transcrição completa do arquivo (sem tempo real)
-            self.main_window.update_status("Transcrevendo áudio...")
-            transcript = self.transcriber.transcribe(audio_file)
-            
-            if transcript:
-                # Exibir transcrição primeiro
-                self.main_window.display_transcript_only(transcript)
-                
-                # Gerar resumo
+    def _on_job_event(self, job, event):
+        """Eventos da fila (threads dos workers): repassar à interface pelo despachante"""
+        self.main_window.dispatcher.post(JOB_EVENT, job, event)
+    
+    def _show_job_event(self, job, event):
+        """Atualizar a interface conforme o andamento do job"""
+        if event == "started":
+            if job.next_stage == "transcribed":
+                self.main_window.update_status("Transcrevendo áudio...")
+            elif job.next_stage == "summarized":
                 self.main_window.update_status("Gerando resumo...")
-                template = self.main_window.get_selected_template()
-                summary = self.summarizer.generate_summary(transcript, template)
-                
-                # Atualizar interface com transcrição + resumo final
-                self.main_window.display_final_results(transcript, summary)
+        elif event == "completed":
+            if job.stage == "transcribed":
+                # Exibir transcrição primeiro
+                self.main_window.display_transcript_only(job.transcript, job.metadata.get("segments"))
+            elif job.stage == "summarized":
+                self.current_recording = job.audio_path
+                self.main_window.display_final_results(job.transcript, job.summary, job.metadata.get("segments"))
                 self.main_window.update_status("Processamento concluído!")
-            else:
-                self.main_window.update_status("Erro na transcrição")
-                self.main_window.show_error("Falha na transcrição do áudio")
-                
-        except Exception as e:
-            error_msg = f"Erro no processamento: {str(e)}"
+        elif event == "retrying":
+            self.main_window.update_status(f"Falha temporária, nova tentativa ({job.error})")
+        elif event == "failed":
+            error_msg = f"Erro no processamento: {job.error}"
             self.main_window.update_status(error_msg)
-            messagebox.showerror("Erro", error_msg)
+            self.main_window.show_error(error_msg)
+    
+    def open_recording(self, recording_id, start_ms=None):
+        """Exibir uma reunião do catálogo, opcionalmente no segmento em start_ms"""
+        catalog = self.pipeline.catalog
+        recording = catalog.get_by_id(recording_id)
+        if recording is None:
+            raise KeyError(f"Gravação {recording_id} não encontrada no catálogo")
+        summaries = catalog.summaries(recording_id)
+        summary = summaries[-1]["content"] if summaries else ""
+        self.current_recording = recording["path"]
+        segments = catalog.segments(recording_id)
+        self.main_window.display_final_results(recording["transcript"] or "", summary, segments)
+        if start_ms is not None and segments:
+            self.main_window.show_transcript_at(start_ms)
+    
+    def record_export(self, export_path):
+        """Registrar no catálogo o arquivo salvo a partir da gravação exibida"""
+        if self.current_recording is None:
+            return
+        try:
+            self.pipeline.catalog.add_export(self.current_recording, export_path)
+        except Exception as e:
+            print(f"Erro ao registrar exportação no catálogo: {e}")
     
     def run(self):
         """Executar aplicação"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            # Gravar alterações de configuração ainda pendentes
+            self.config_manager.flush()
+            if self._audio_recorder is not None:
+                self._audio_recorder.flush_settings()
+            # Jobs em andamento ficam pendentes no banco e são retomados no próximo início
+            if self._pipeline is not None:
+                self._pipeline.shutdown(wait=False)
 
 def main():
     """Função principal"""
+    args = sys.argv[1:]
+    if args and args[0] == "batch":
+        # Modo em lote, sem interface gráfica
+        from src.cli.batch import main as batch_main
+        sys.exit(batch_main(args[1:]))
+    
     try:
-        app = MeetAI()
+        # --startup-probe: fecha a janela logo após o primeiro quadro (benchmarks/startup_benchmark.py)
+        app = MeetAI(startup_probe="--startup-probe" in sys.argv[1:])
         app.run()
     except Exception as e:
         print(f"Erro ao inicializar aplicação: {e}")
+        from tkinter import messagebox
         messagebox.showerror("Erro Fatal", f"Erro ao inicializar aplicação: {e}")
 
 if __name__ == "__main__":
@@ -5,30 +5,36 @@ Módulo de geração de resumos usando Google Gemini
 import json
 from pathlib import Path
 
+from src.utils.config_manager import get_config_manager
+
 class GeminiSummarizer:
-    def __init__(self):
+    def __init__(self, config_manager=None):
         self.client = None
+        self._api_key = None
         self.templates = {}
+        self.config_manager = config_manager or get_config_manager()
         self.load_config()
         self.load_templates()
+        self.config_manager.subscribe("api_keys", self._on_api_keys_changed)
     
     def load_config(self):
         """Carregar configurações da API do Gemini"""
-        config_file = Path("config/api_keys.json")
-        if config_file.exists():
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-                api_key = config.get('gemini_api_key')
-                if api_key:
-                    try:
-                        import google.generativeai as genai
-                        genai.configure(api_key=api_key)
-                        self.client = genai.GenerativeModel('gemini-2.5-flash')
-                        print("Gemini configurado com sucesso")
-                    except ImportError:
-                        print("Biblioteca google-generativeai não encontrada. Execute: pip install google-generativeai")
-                    except Exception as e:
-                        print(f"Erro ao configurar Gemini: {e}")
+        self._on_api_keys_changed(self.config_manager.get_api_keys())
+    
+    def _on_api_keys_changed(self, api_keys):
+        """Reconfigurar o cliente quando a chave do Gemini mudar"""
+        api_key = api_keys.gemini_api_key
+        if api_key and api_key != self._api_key:
+            self._api_key = api_key
+            try:
+                import google.generativeai as genai
+                genai.configure(api_key=api_key)
+                self.client = genai.GenerativeModel('gemini-2.5-flash')
+                print("Gemini configurado com sucesso")
+            except ImportError:
+                print("Biblioteca google-generativeai não encontrada. Execute: pip install google-generativeai")
+            except Exception as e:
+                print(f"Erro ao configurar Gemini: {e}")
     
     def load_templates(self):
         """Carregar templates de resumo (mesmos do OpenAI)"""
@@ -2,48 +2,112 @@
 Módulo de geração de resumos usando IA (OpenAI e Gemini)
 """
 
-import openai
 import json
+import threading
 from pathlib import Path
 
+from src.utils.config_manager import get_config_manager
+from src.utils.tracing import get_tracer
+
 class Summarizer:
-    def __init__(self):
-        self.openai_client = None
-        self.gemini_client = None
+    def __init__(self, config_manager=None):
+        self._openai_client = None
+        self._gemini_client = None
+        self._openai_key = None
+        self._gemini_key = None
+        self._openai_base_url = None
+        self._gemini_base_url = None
+        self._client_lock = threading.Lock()
         self.ai_provider = "openai"  # padrão
         self.templates = {}
+        self.config_manager = config_manager or get_config_manager()
         self.load_config()
         self.load_templates()
+        # Acompanhar alterações de chaves/provedor feitas pela interface
+        self.config_manager.subscribe("api_keys", self._on_api_keys_changed)
+        self.config_manager.subscribe("ai", self._on_ai_settings_changed)
+    
+    @property
+    def tracer(self):
+        """Tracer compartilhado (spans em data/traces.jsonl)"""
+        return get_tracer()
     
     def load_config(self):
-        """Carregar configurações das APIs"""
-        config_file = Path("config/api_keys.json")
-        if config_file.exists():
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-                
-                # Configurar OpenAI
-                openai_key = config.get('openai_api_key')
-                if openai_key:
-                    self.openai_client = openai.OpenAI(api_key=openai_key)
-                
-                # Configurar Gemini
-                gemini_key = config.get('gemini_api_key')
-                if gemini_key:
+        """Carregar configurações das APIs (clientes criados sob demanda)"""
+        self._on_ai_settings_changed(self.config_manager.ai)
+        self._on_api_keys_changed(self.config_manager.get_api_keys())
+    
+    def _on_api_keys_changed(self, api_keys):
+        """Aplicar chaves e provedor atualizados no ConfigManager"""
+        with self._client_lock:
+            # Configurar OpenAI
+            if api_keys.openai_api_key and api_keys.openai_api_key != self._openai_key:
+                self._openai_key = api_keys.openai_api_key
+                self._openai_client = None
+            
+            # Configurar Gemini
+            if api_keys.gemini_api_key and api_keys.gemini_api_key != self._gemini_key:
+                self._gemini_key = api_keys.gemini_api_key
+                self._gemini_client = None
+        
+        # Definir e aplicar o provedor preferido
+        self.set_ai_provider(api_keys.ai_provider)
+    
+    def _on_ai_settings_changed(self, ai_settings):
+        """Trocar os endpoints das APIs (ex.: servidor falso local)"""
+        with self._client_lock:
+            if (ai_settings.openai_base_url or None) != self._openai_base_url:
+                self._openai_base_url = ai_settings.openai_base_url or None
+                self._openai_client = None
+            if (ai_settings.gemini_base_url or None) != self._gemini_base_url:
+                self._gemini_base_url = ai_settings.gemini_base_url or None
+                self._gemini_client = None
+    
+    @property
+    def openai_client(self):
+        """Cliente OpenAI, construído no primeiro uso"""
+        if self._openai_client is None and self._openai_key:
+            with self._client_lock:
+                if self._openai_client is None:
+                    import openai
+                    self._openai_client = openai.OpenAI(api_key=self._openai_key, base_url=self._openai_base_url)
+        return self._openai_client
+    
+    @property
+    def gemini_client(self):
+        """Cliente Gemini, construído no primeiro uso (google.generativeai é lento para importar)"""
+        if self._gemini_client is None and self._gemini_key:
+            with self._client_lock:
+                if self._gemini_client is None:
                     try:
                         import google.generativeai as genai
-                        genai.configure(api_key=gemini_key)
-                        self.gemini_client = genai.GenerativeModel('gemini-2.5-flash')
+                        if self._gemini_base_url:
+                            # O transporte REST aceita um endpoint http:// arbitrário
+                            genai.configure(
+                                api_key=self._gemini_key,
+                                transport="rest",
+                                client_options={"api_endpoint": self._gemini_base_url},
+                            )
+                        else:
+                            genai.configure(api_key=self._gemini_key)
+                        self._gemini_client = genai.GenerativeModel('gemini-2.5-flash')
                     except ImportError:
                         print("Biblioteca google-generativeai não encontrada. Execute: pip install google-generativeai")
+                        self._gemini_key = None
                     except Exception as e:
                         print(f"Erro ao configurar Gemini: {e}")
-                
-                # Definir provedor preferido
-                self.ai_provider = config.get('ai_provider', 'openai')
-                
-                # Aplicar o provedor selecionado
-                self.set_ai_provider(self.ai_provider)
+                        self._gemini_key = None
+        return self._gemini_client
+    
+    def warm_up(self):
+        """Pré-carregar o cliente do provedor atual em segundo plano"""
+        try:
+            if self.ai_provider == "gemini":
+                self.gemini_client
+            else:
+                self.openai_client
+        except Exception as e:
+            print(f"Erro ao preparar cliente de IA: {e}")
     
     def load_templates(self):
         """Carregar templates de resumo"""
@@ -106,12 +170,13 @@ class Summarizer:
             raise Exception(f"Template '{template_id}' não encontrado e nenhum template disponível")
         
         # Usar o provedor configurado
-        if self.ai_provider == "openai":
-            return self._generate_summary_openai(transcript, template)
-        elif self.ai_provider == "gemini":
-            return self._generate_summary_gemini(transcript, template)
-        else:
-            raise Exception("Provedor de IA não configurado")
+        with self.tracer.span("summarize", provider=self.ai_provider, template=template_id, chars=len(transcript)):
+            if self.ai_provider == "openai":
+                return self._generate_summary_openai(transcript, template)
+            elif self.ai_provider == "gemini":
+                return self._generate_summary_gemini(transcript, template)
+            else:
+                raise Exception("Provedor de IA não configurado")
     
     def _generate_summary_openai(self, transcript, template):
         """Gerar resumo usando OpenAI"""
@@ -2,37 +2,91 @@
 Módulo de transcrição usando OpenAI Whisper
 """
 
-import openai
+import math
 import os
 from pathlib import Path
-import json
 import wave
-import numpy as np
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from functools import partial
+
+from src.utils.config_manager import get_config_manager
+from src.utils.tempspace import TEMP_ROOT, TempWorkspace
+from src.utils.tracing import get_tracer, propagate
 
 class Transcriber:
-    def __init__(self):
-        self.client = None
+    # VAD desligado até load_config ler a seção "ai"
+    _vad_enabled = False
+    _vad_margin_db = 10.0
+    
+    def __init__(self, config_manager=None):
+        self._client = None
+        self._api_key = None
+        self._base_url = None
+        self._client_lock = threading.Lock()
+        self.config_manager = config_manager or get_config_manager()
         self.load_config()
+        # Recriar o cliente quando a chave ou o endpoint mudarem (sem reler o arquivo)
+        self.config_manager.subscribe("api_keys", self._on_api_keys_changed)
+        self.config_manager.subscribe("ai", self._on_ai_settings_changed)
+    
+    @property
+    def tracer(self):
+        """Tracer compartilhado (spans em data/traces.jsonl)"""
+        return get_tracer()
     
     def load_config(self):
-        """Carregar configurações da API"""
-        config_file = Path("config/api_keys.json")
-        if config_file.exists():
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-                api_key = config.get('openai_api_key')
-                if api_key:
-                    self.client = openai.OpenAI(api_key=api_key)
+        """Carregar configurações da API (o cliente é criado sob demanda)"""
+        self._on_ai_settings_changed(self.config_manager.ai)
+        self._on_api_keys_changed(self.config_manager.get_api_keys())
+    
+    def _on_api_keys_changed(self, api_keys):
+        """Aplicar chaves atualizadas no ConfigManager"""
+        api_key = api_keys.openai_api_key
+        if api_key and api_key != self._api_key:
+            with self._client_lock:
+                self._api_key = api_key
+                self._client = None
+    
+    def _on_ai_settings_changed(self, ai_settings):
+        """Apontar para outro endpoint compatível (ex.: servidor falso local)"""
+        self._vad_enabled = ai_settings.vad_enabled
+        self._vad_margin_db = ai_settings.vad_margin_db
+        base_url = ai_settings.openai_base_url or None
+        if base_url != self._base_url:
+            with self._client_lock:
+                self._base_url = base_url
+                self._client = None
+    
+    @property
+    def client(self):
+        """Cliente OpenAI, construído no primeiro uso (importa o SDK só então)"""
+        if self._client is None and self._api_key:
+            with self._client_lock:
+                if self._client is None:
+                    import openai
+                    self._client = openai.OpenAI(api_key=self._api_key, base_url=self._base_url)
+        return self._client
+    
+    def warm_up(self):
+        """Pré-carregar o SDK e o cliente (chamado em segundo plano na inicialização)"""
+        try:
+            self.client
+        except Exception as e:
+            print(f"⚠️ Erro ao preparar cliente OpenAI: {e}")
     
     def get_file_size_mb(self, file_path):
         """Obter tamanho do arquivo em MB"""
         return os.path.getsize(file_path) / (1024 * 1024)
     
-    def split_audio_file(self, input_file, max_size_mb=20):
-        """Dividir arquivo de áudio em pedaços menores se necessário"""
+    def split_audio_file(self, input_file, max_size_mb=20, workspace=None):
+        """Dividir arquivo de áudio em pedaços menores se necessário
+        
+        Os pedaços são gravados na pasta ``workspace`` (TempWorkspace); sem
+        ela, uma pasta exclusiva é criada e fica a cargo de quem chamou.
+        """
         file_size_mb = self.get_file_size_mb(input_file)
         
         if file_size_mb <= max_size_mb:
@@ -46,23 +100,25 @@ class Transcriber:
             params = wav_file.getparams()
             
             # Calcular quantos pedaços precisamos
-            num_chunks = int(np.ceil(file_size_mb / max_size_mb))
-            frames_per_chunk = len(frames) // num_chunks
+            num_chunks = int(math.ceil(file_size_mb / max_size_mb))
+            # Cortar em múltiplos do tamanho do quadro (canais * bytes por amostra)
+            frame_size = params.nchannels * params.sampwidth
+            bytes_per_chunk = (len(frames) // frame_size // num_chunks) * frame_size
             
             chunk_files = []
-            temp_dir = Path("temp")
-            temp_dir.mkdir(exist_ok=True)
+            if workspace is None:
+                workspace = TempWorkspace("split")
             
             for i in range(num_chunks):
-                chunk_filename = temp_dir / f"chunk_{i+1}.wav"
+                chunk_filename = workspace.file(f"chunk_{i+1}.wav")
                 
-                start_frame = i * frames_per_chunk
+                start_byte = i * bytes_per_chunk
                 if i == num_chunks - 1:  # Último pedaço
-                    end_frame = len(frames)
+                    end_byte = len(frames)
                 else:
-                    end_frame = (i + 1) * frames_per_chunk
+                    end_byte = (i + 1) * bytes_per_chunk
                 
-                chunk_frames = frames[start_frame:end_frame]
+                chunk_frames = frames[start_byte:end_byte]
                 
                 # Salvar pedaço
                 with wave.open(str(chunk_filename), 'wb') as chunk_file:
@@ -75,68 +131,196 @@ class Transcriber:
         return chunk_files
     
     def cleanup_temp_files(self, temp_files):
-        """Limpar arquivos temporários"""
+        """Limpar arquivos temporários (apenas os que estão sob temp/)"""
+        temp_root = TEMP_ROOT.resolve()
         for temp_file in temp_files:
             try:
-                if os.path.exists(temp_file) and "chunk_" in temp_file:
-                    os.remove(temp_file)
+                path = Path(temp_file).resolve()
+                if path.is_file() and temp_root in path.parents:
+                    os.remove(path)
             except Exception as e:
                 print(f"⚠️ Erro ao remover arquivo temporário {temp_file}: {e}")
     
     def transcribe(self, audio_file):
-        """Transcrever arquivo de áudio"""
+        """Transcrever áudio
+        
+        Aceita um caminho de arquivo, um ``PcmBuffer`` (src/audio/buffers.py)
+        ou um stream binário já codificado (``io.BytesIO``). Buffers e streams
+        são enviados direto da memória, sem gravar WAVs temporários.
+        """
         if not self.client:
             raise Exception("API Key da OpenAI não configurada")
         
-        if not os.path.exists(audio_file):
+        if self._is_path(audio_file) and not os.path.exists(audio_file):
             raise Exception(f"Arquivo de áudio não encontrado: {audio_file}")
         
         try:
-            # Verificar tamanho do arquivo e dividir se necessário
-            file_size_mb = self.get_file_size_mb(audio_file)
-            print(f"📁 Tamanho do arquivo: {file_size_mb:.1f}MB")
-            
-            if file_size_mb > 15:  # Limite otimizado para melhor paralelismo
-                return self._transcribe_large_file(audio_file)
-            else:
-                return self._transcribe_single_file(audio_file)
+            with self._vad_workspace(audio_file) as workspace:
+                audio_file, _ = self._speech_only(audio_file, workspace)
+                if audio_file is None:
+                    return None
+                
+                # Verificar tamanho do áudio e dividir se necessário
+                file_size_mb = self._audio_size_mb(audio_file)
+                print(f"📁 Tamanho do áudio: {file_size_mb:.1f}MB")
+                
+                with self.tracer.span("transcribe", size_mb=round(file_size_mb, 2)):
+                    if file_size_mb > 15:  # Limite otimizado para melhor paralelismo
+                        return self._transcribe_large_file(audio_file)
+                    else:
+                        return self._transcribe_single_file(audio_file)
                 
         except Exception as e:
             print(f"Erro na transcrição: {e}")
             return None
     
-    def _transcribe_single_file(self, audio_file):
-        """Transcrever um único arquivo"""
-        with open(audio_file, "rb") as audio:
-            response = self.client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio,
-                language="pt"  # Português
-            )
+    def _vad_workspace(self, audio):
+        """Pasta temporária para a fala extraída de arquivos (buffers ficam em memória)"""
+        if self._vad_enabled and self._is_path(audio):
+            return TempWorkspace("vad")
+        return nullcontext()
+    
+    def _speech_only(self, audio, workspace=None):
+        """Aplicar o VAD -> (áudio só com fala, TimeMap)
+        
+        Retorna (audio, None) se o VAD estiver desligado, falhar ou não
+        compensar, e (None, None) se não houver fala nenhuma. Com
+        ``workspace`` (TempWorkspace), a fala é gravada em blocos num WAV
+        dessa pasta em vez de ficar inteira na memória.
+        """
+        if not self._vad_enabled:
+            return audio, None
+        from src.audio.buffers import PcmBuffer
+        from src.audio.vad import VoiceActivityDetector, extract_speech
+        
+        detector = VoiceActivityDetector(margin_db=self._vad_margin_db)
+        with self.tracer.span("transcribe.vad") as span:
+            try:
+                if self._is_path(audio):
+                    regions, _, total = detector.detect_file(audio)
+                    source = audio
+                else:
+                    source = audio if hasattr(audio, "slice") else self._stream_pcm(audio, PcmBuffer)
+                    regions, total = detector.detect(source), source.frames
+            except Exception as e:
+                print(f"⚠️ VAD indisponível para este áudio, enviando completo: {e}")
+                return audio, None
+            
+            speech_frames = sum(end - start for start, end in regions)
+            span.set(regions=len(regions), speech_ratio=round(speech_frames / total, 3) if total else 0.0)
+            if not regions:
+                print("🔇 Nenhuma fala detectada; nada a transcrever")
+                return None, None
+            if speech_frames > 0.9 * total:
+                return audio, None
+            destination = workspace.file("speech.wav") if workspace is not None else None
+            speech, time_map = extract_speech(source, regions, destination=destination)
+        print(f"🗣️ VAD: {time_map.speech_ms / 1000:.0f}s de fala em {time_map.original_ms / 1000:.0f}s de áudio ({len(regions)} trechos)")
+        return speech, time_map
+    
+    @staticmethod
+    def _stream_pcm(stream, buffer_type):
+        """Ler um stream WAV para o VAD, devolvendo-o na posição original
+        
+        Mesmo quando o stream não é WAV (MP3, ID3...) e a leitura falha, o
+        envio do áudio completo parte do ponto em que o chamador o deixou.
+        """
+        position = stream.tell()
+        try:
+            return buffer_type.from_wav(stream)
+        finally:
+            stream.seek(position)
+    
+    @staticmethod
+    def _is_path(audio):
+        return isinstance(audio, (str, os.PathLike))
+    
+    def _audio_size_mb(self, audio):
+        """Tamanho em MB de um arquivo, PcmBuffer ou stream"""
+        if self._is_path(audio):
+            return self.get_file_size_mb(audio)
+        if hasattr(audio, "wav_nbytes"):
+            return audio.wav_nbytes / (1024 * 1024)
+        position = audio.tell()
+        size = audio.seek(0, os.SEEK_END)
+        audio.seek(position)
+        return (size - position) / (1024 * 1024)
+    
+    @contextmanager
+    def _upload(self, audio):
+        """Valor do parâmetro ``file`` da API para qualquer tipo de entrada"""
+        if self._is_path(audio):
+            with open(audio, "rb") as handle:
+                yield handle
+        elif hasattr(audio, "to_wav"):
+            yield audio.to_wav("chunk.wav")
+        else:
+            # O nome informa o formato à API; a posição é restaurada para novas tentativas
+            position = audio.tell()
+            name = Path(getattr(audio, "name", "") or "audio.wav").name
+            try:
+                yield (name, audio)
+            finally:
+                audio.seek(position)
+    
+    def _transcribe_single_file(self, audio_file, index=None):
+        """Transcrever um único arquivo ou buffer"""
+        with self.tracer.span("transcribe.upload", chunk=index, size_mb=round(self._audio_size_mb(audio_file), 2)):
+            with self._upload(audio_file) as audio:
+                response = self.client.audio.transcriptions.create(
+                    model="whisper-1",
+                    file=audio,
+                    language="pt"  # Português
+                )
         return response.text
     
+    def _plan_chunks(self, audio, max_size_mb):
+        """Dividir em trechos de até max_size_mb -> [(início em ms, carregador)]
+        
+        Cada carregador devolve um PcmBuffer. Para arquivos, o trecho é lido só
+        quando o worker precisa dele (sem WAVs intermediários no disco);
+        buffers em memória são fatiados sem cópia.
+        """
+        from src.audio.buffers import PcmBuffer, chunk_ranges
+        
+        max_bytes = int(max_size_mb * 1024 * 1024)
+        if self._is_path(audio):
+            with wave.open(str(audio), 'rb') as wav_file:
+                rate = wav_file.getframerate()
+                frame_bytes = wav_file.getnchannels() * wav_file.getsampwidth()
+                total_frames = wav_file.getnframes()
+            ranges = chunk_ranges(total_frames, frame_bytes, max_bytes)
+            loaders = [partial(PcmBuffer.from_wav, str(audio), start, count) for start, count in ranges]
+        else:
+            buffer = audio if hasattr(audio, "slice") else PcmBuffer.from_wav(audio)
+            rate = buffer.sample_rate
+            ranges = chunk_ranges(buffer.frames, buffer.frame_bytes, max_bytes)
+            loaders = [partial(buffer.slice, start, start + count) for start, count in ranges]
+        return [(int(round(start * 1000 / rate)), loader) for (start, _), loader in zip(ranges, loaders)]
+    
     def _transcribe_large_file(self, audio_file):
         """Transcrever arquivo grande dividindo em pedaços com processamento paralelo"""
         print("🔄 Processando arquivo grande com transcrição simultânea...")
         
-        # Dividir arquivo em pedaços menores para melhor paralelismo
-        chunk_files = self.split_audio_file(audio_file, max_size_mb=12)
+        # Dividir em pedaços menores para melhor paralelismo
+        with self.tracer.span("transcribe.split"):
+            chunks = self._plan_chunks(audio_file, max_size_mb=12)
         
-        if len(chunk_files) == 1:
+        if len(chunks) == 1:
             # Arquivo não foi dividido
             return self._transcribe_single_file(audio_file)
         
         # Transcrever pedaços em paralelo
-        print(f"🚀 Iniciando transcrição simultânea de {len(chunk_files)} pedaços...")
+        print(f"🚀 Iniciando transcrição simultânea de {len(chunks)} pedaços...")
         start_time = time.time()
         
         # Usar ThreadPoolExecutor para processamento paralelo
         transcripts = {}
-        with ThreadPoolExecutor(max_workers=min(len(chunk_files), 4)) as executor:
+        with ThreadPoolExecutor(max_workers=min(len(chunks), 4)) as executor:
             # Submeter todas as tarefas
             future_to_index = {
-                executor.submit(self._transcribe_chunk_with_index, i, chunk_file): i 
-                for i, chunk_file in enumerate(chunk_files)
+                executor.submit(propagate(self._transcribe_chunk_with_index), i, load_chunk): i 
+                for i, (_, load_chunk) in enumerate(chunks)
             }
             
             # Coletar resultados conforme completam
@@ -146,15 +330,15 @@ class Transcriber:
                     result = future.result()
                     if result:
                         transcripts[chunk_index] = result
-                        print(f"✅ Pedaço {chunk_index + 1}/{len(chunk_files)} concluído")
+                        print(f"✅ Pedaço {chunk_index + 1}/{len(chunks)} concluído")
                     else:
-                        print(f"❌ Erro no pedaço {chunk_index + 1}/{len(chunk_files)}")
+                        print(f"❌ Erro no pedaço {chunk_index + 1}/{len(chunks)}")
                 except Exception as e:
                     print(f"❌ Erro ao processar pedaço {chunk_index + 1}: {e}")
         
         # Montar transcrição final na ordem correta
         full_transcript = ""
-        for i in range(len(chunk_files)):
+        for i in range(len(chunks)):
             if i in transcripts:
                 if full_transcript and not full_transcript.endswith(" "):
                     full_transcript += " "
@@ -165,16 +349,15 @@ class Transcriber:
         elapsed_time = time.time() - start_time
         print(f"⏱️ Transcrição simultânea concluída em {elapsed_time:.1f} segundos")
         
-        # Limpar arquivos temporários
-        self.cleanup_temp_files(chunk_files)
-        
         return full_transcript if full_transcript else None
     
-    def _transcribe_chunk_with_index(self, index, chunk_file):
+    def _transcribe_chunk_with_index(self, index, load_chunk):
         """Transcrever um pedaço específico com índice (para processamento paralelo)"""
         try:
             print(f"🎯 Iniciando pedaço {index + 1}...")
-            result = self._transcribe_single_file(chunk_file)
+            with self.tracer.span("transcribe.load_chunk", chunk=index):
+                chunk = load_chunk()
+            result = self._transcribe_single_file(chunk, index=index)
             return result
         except Exception as e:
             print(f"❌ Erro ao transcrever pedaço {index + 1}: {e}")
@@ -186,7 +369,7 @@ class Transcriber:
             raise Exception("API Key da OpenAI não configurada")
         
         try:
-            with open(audio_file, "rb") as audio:
+            with self._upload(audio_file) as audio:
                 response = self.client.audio.transcriptions.create(
                     model="whisper-1",
                     file=audio,
@@ -199,4 +382,104 @@ class Transcriber:
             
         except Exception as e:
             print(f"Erro na transcrição com timestamps: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def transcribe_detailed(self, audio_file):
+        """Transcrever retornando texto e segmentos com tempo absoluto em ms
+        
+        Retorna {"text": str, "segments": [{"start_ms", "end_ms", "text"}]} ou
+        None em caso de falha; sem fala nenhuma (VAD), o texto vem vazio com
+        "no_speech": True. Aceita as mesmas entradas de transcribe();
+        áudios grandes são divididos em memória e os tempos de cada pedaço são
+        deslocados pelo início dele.
+        """
+        if not self.client:
+            raise Exception("API Key da OpenAI não configurada")
+        
+        if self._is_path(audio_file) and not os.path.exists(audio_file):
+            raise Exception(f"Arquivo de áudio não encontrado: {audio_file}")
+        
+        try:
+            with self.tracer.span("transcribe", detailed=True), self._vad_workspace(audio_file) as workspace:
+                speech, time_map = self._speech_only(audio_file, workspace)
+                if speech is None:
+                    return {"text": "", "segments": [], "no_speech": True}
+                result = self._transcribe_detailed(speech)
+                # Segmentos voltam para o tempo da gravação original
+                if result and time_map is not None:
+                    result["segments"] = time_map.map_segments(result["segments"])
+                return result
+        except Exception as e:
+            print(f"Erro na transcrição: {e}")
+            return None
+    
+    def _transcribe_detailed(self, audio_file):
+        """Corpo de transcribe_detailed (dentro do span "transcribe")"""
+        results = {}
+        if self._audio_size_mb(audio_file) > 15:
+            with self.tracer.span("transcribe.split"):
+                chunks = self._plan_chunks(audio_file, max_size_mb=12)
+            with ThreadPoolExecutor(max_workers=min(len(chunks), 4)) as executor:
+                future_to_index = {
+                    executor.submit(propagate(self._transcribe_verbose_chunk), i, load_chunk): i
+                    for i, (_, load_chunk) in enumerate(chunks)
+                }
+                for future in as_completed(future_to_index):
+                    chunk_index = future_to_index[future]
+                    try:
+                        results[chunk_index] = future.result()
+                    except Exception as e:
+                        print(f"❌ Erro ao processar pedaço {chunk_index + 1}: {e}")
+            offsets_ms = [offset_ms for offset_ms, _ in chunks]
+        else:
+            results[0] = self._transcribe_verbose(audio_file)
+            offsets_ms = [0]
+        
+        texts = []
+        segments = []
+        for i, offset_ms in enumerate(offsets_ms):
+            if i not in results:
+                print(f"⚠️ Pedaço {i + 1} não foi transcrito com sucesso")
+                continue
+            text, chunk_segments = results[i]
+            if text:
+                texts.append(text.strip())
+            for segment in chunk_segments:
+                segments.append({
+                    "start_ms": segment["start_ms"] + offset_ms,
+                    "end_ms": segment["end_ms"] + offset_ms,
+                    "text": segment["text"],
+                })
+        
+        full_transcript = " ".join(t for t in texts if t)
+        if not full_transcript:
+            return None
+        return {"text": full_transcript, "segments": segments}
+    
+    def _transcribe_verbose_chunk(self, index, load_chunk):
+        """Carregar e transcrever um pedaço (para processamento paralelo)"""
+        with self.tracer.span("transcribe.load_chunk", chunk=index):
+            chunk = load_chunk()
+        return self._transcribe_verbose(chunk, index=index)
+    
+    def _transcribe_verbose(self, audio_file, index=None):
+        """Transcrever com verbose_json -> (texto, segmentos relativos em ms)"""
+        with self.tracer.span("transcribe.upload", chunk=index, size_mb=round(self._audio_size_mb(audio_file), 2)):
+            with self._upload(audio_file) as audio:
+                response = self.client.audio.transcriptions.create(
+                    model="whisper-1",
+                    file=audio,
+                    language="pt",
+                    response_format="verbose_json",
+                    timestamp_granularities=["segment"]
+                )
+        
+        segments = []
+        for segment in getattr(response, "segments", None) or []:
+            get = segment.get if isinstance(segment, dict) else lambda name: getattr(segment, name, None)
+            segments.append({
+                "start_ms": int(round(float(get("start") or 0.0) * 1000)),
+                "end_ms": int(round(float(get("end") or 0.0) * 1000)),
+                "text": (get("text") or "").strip(),
+            })
+        return response.text, segments
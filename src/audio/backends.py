@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+"""Backends de captura usados pelo ``AudioRecorder``.
+
+O gravador não cria ``sounddevice.InputStream`` diretamente: pede o stream ao
+backend. ``SoundDeviceBackend`` é o padrão (PortAudio). ``SimulatedBackend``
+entrega quadros de um WAV ou de um sinal gerado pelos mesmos callbacks
+(``_mic_callback`` / ``_system_callback``), em tempo real ou acelerado, e pode
+injetar atraso (jitter), sinalização de xrun e deriva de relógio. Serve para
+testes e benchmarks de ponta a ponta sem placa de som.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from src.audio.buffers import PcmBuffer
+from src.audio.devices import DeviceRegistry, get_device_registry, import_sounddevice
+
+StreamCallback = Callable[[np.ndarray, int, Any, Any], None]
+
+# Índices dos dispositivos simulados (o nome do segundo contém "loopback")
+SIMULATED_MIC = 0
+SIMULATED_SYSTEM = 1
+
+
+class StreamBackend:
+    """Fábrica de streams de entrada com a interface de ``sd.InputStream``."""
+
+    name = "base"
+
+    def device_registry(self) -> DeviceRegistry:
+        return get_device_registry()
+
+    def open_input(
+        self,
+        *,
+        samplerate: int,
+        channels: int,
+        dtype: str,
+        blocksize: int,
+        callback: StreamCallback,
+        device: Optional[int],
+        latency: Any = None,
+    ):
+        raise NotImplementedError
+
+
+class SoundDeviceBackend(StreamBackend):
+    """Captura real via PortAudio (``sounddevice``)."""
+
+    name = "sounddevice"
+
+    def open_input(self, **kwargs):
+        sd = import_sounddevice()
+        return sd.InputStream(**kwargs)
+
+
+# ----------------------------------------------------------------------
+# Fontes de sinal
+# ----------------------------------------------------------------------
+class SignalSource:
+    """Fonte de quadros int16 ``(quadros, canais)``; ``None`` quando acaba."""
+
+    sample_rate: Optional[int] = None
+    channels = 1
+
+    def read(self, frames: int) -> Optional[np.ndarray]:
+        raise NotImplementedError
+
+
+class ArraySource(SignalSource):
+    """Quadros de um array em memória (ou de um ``PcmBuffer``)."""
+
+    def __init__(self, audio, sample_rate: Optional[int] = None, channels: Optional[int] = None, loop: bool = False):
+        if isinstance(audio, PcmBuffer):
+            buffer = audio
+        else:
+            buffer = PcmBuffer(audio, sample_rate or 0, channels)
+        self.frames = buffer.samples.reshape(-1, buffer.channels)
+        self.sample_rate = buffer.sample_rate or None
+        self.channels = buffer.channels
+        self.loop = loop
+        self._position = 0
+
+    def read(self, frames: int) -> Optional[np.ndarray]:
+        total = self.frames.shape[0]
+        if total == 0 or (self._position >= total and not self.loop):
+            return None
+        parts = []
+        needed = frames
+        while needed > 0:
+            if self._position >= total:
+                if not self.loop:
+                    break
+                self._position = 0
+            part = self.frames[self._position:self._position + needed]
+            self._position += part.shape[0]
+            needed -= part.shape[0]
+            parts.append(part)
+        block = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        if block.shape[0] < frames:
+            # Último bloco incompleto: completa com silêncio, como um driver faria
+            block = np.concatenate((block, np.zeros((frames - block.shape[0], self.channels), dtype=np.int16)))
+        return block
+
+
+class WavSource(ArraySource):
+    """Quadros de um arquivo WAV de 16 bits."""
+
+    def __init__(self, path: str | Path, loop: bool = False):
+        super().__init__(PcmBuffer.from_wav(path), loop=loop)
+        self.path = Path(path)
+
+
+class GeneratedSource(SignalSource):
+    """Sinal gerado sob demanda: ``tone`` (senoide), ``noise`` ou ``silence``."""
+
+    KINDS = ("tone", "noise", "silence")
+
+    def __init__(
+        self,
+        kind: str = "tone",
+        sample_rate: int = 44100,
+        channels: int = 2,
+        seconds: Optional[float] = None,
+        level_db: float = -12.0,
+        frequency: float = 440.0,
+        seed: int = 0,
+    ):
+        if kind not in self.KINDS:
+            raise ValueError(f"Sinal desconhecido: {kind}")
+        self.kind = kind
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.total = None if seconds is None else int(round(seconds * sample_rate))
+        self.amplitude = 32767.0 * (10.0 ** (level_db / 20.0))
+        self.frequency = frequency
+        self._rng = np.random.default_rng(seed)
+        self._position = 0
+
+    def read(self, frames: int) -> Optional[np.ndarray]:
+        if self.total is not None and self._position >= self.total:
+            return None
+        start = self._position
+        self._position += frames
+        if self.kind == "tone":
+            t = np.arange(start, start + frames) / self.sample_rate
+            mono = np.sin(2 * np.pi * self.frequency * t) * self.amplitude
+        elif self.kind == "noise":
+            mono = self._rng.standard_normal(frames) * self.amplitude
+        else:
+            mono = np.zeros(frames)
+        if self.total is not None and self._position > self.total:
+            mono[self.total - start:] = 0.0
+        block = np.clip(mono, -32768, 32767).astype(np.int16)
+        return np.repeat(block[:, None], self.channels, axis=1)
+
+
+# ----------------------------------------------------------------------
+# Stream simulado
+# ----------------------------------------------------------------------
+class SimulatedStatus:
+    """Equivalente mínimo de ``sd.CallbackFlags`` (verdadeiro se houve xrun)."""
+
+    __slots__ = ("input_overflow",)
+
+    def __init__(self, input_overflow: bool = False):
+        self.input_overflow = input_overflow
+
+    def __bool__(self) -> bool:
+        return self.input_overflow
+
+    def __str__(self) -> str:
+        return "input overflow" if self.input_overflow else ""
+
+
+class SimulatedInputStream:
+    """Thread que entrega blocos de uma fonte ao callback no ritmo de um dispositivo.
+
+    ``speed`` acelera o relógio (0 = o mais rápido possível). Cada bloco é
+    entregue no prazo absoluto ``início + n * período`` mais um atraso
+    aleatório de até ``jitter_ms`` (os atrasos não se acumulam). Com
+    probabilidade ``xrun_rate`` um bloco é perdido antes da entrega e o
+    próximo chega com ``status.input_overflow``. ``drift_ppm`` faz o relógio
+    do dispositivo andar mais rápido (positivo) ou mais devagar.
+    """
+
+    def __init__(
+        self,
+        source: SignalSource,
+        samplerate: int,
+        channels: int,
+        blocksize: int,
+        callback: StreamCallback,
+        speed: float = 1.0,
+        jitter_ms: float = 0.0,
+        xrun_rate: float = 0.0,
+        drift_ppm: float = 0.0,
+        seed: int = 0,
+        name: str = "simulado",
+    ):
+        self.source = source
+        self.samplerate = samplerate
+        self.channels = channels
+        self.blocksize = blocksize or 1024
+        self.callback = callback
+        self.speed = speed
+        self.jitter = jitter_ms / 1000.0
+        self.xrun_rate = xrun_rate
+        self.drift_ppm = drift_ppm
+        self.name = name
+        self._rng = np.random.default_rng(seed)
+        self._stop = threading.Event()
+        self.finished = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.closed = False
+
+        # Estatísticas
+        self.blocks = 0
+        self.frames_delivered = 0
+        self.frames_lost = 0
+        self.xruns = 0
+        self.max_lateness = 0.0
+        self.started_at: Optional[float] = None
+        # (quadros entregues até cada bloco, instante da entrega) para medir latência
+        self._delivered_frames: List[int] = []
+        self._delivered_times: List[float] = []
+
+    @property
+    def block_period(self) -> float:
+        """Intervalo entre blocos (s) no relógio de parede."""
+        if self.speed <= 0:
+            return 0.0
+        device_rate = self.samplerate * (1.0 + self.drift_ppm * 1e-6)
+        return self.blocksize / device_rate / self.speed
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.active:
+            return
+        self._stop.clear()
+        self.finished.clear()
+        self._thread = threading.Thread(target=self._run, name=f"meetai-sim-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5.0)
+        self._thread = None
+
+    def close(self) -> None:
+        self.stop()
+        self.closed = True
+
+    def delivery_time(self, frame: int) -> Optional[float]:
+        """Instante em que o ``frame``-ésimo quadro recebido pelo callback foi entregue.
+
+        Quadros perdidos em xruns não contam, como no buffer do gravador.
+        """
+        index = bisect.bisect_left(self._delivered_frames, frame)
+        if index >= len(self._delivered_times):
+            return None
+        return self._delivered_times[index]
+
+    def _next_block(self) -> Optional[np.ndarray]:
+        block = self.source.read(self.blocksize)
+        if block is None:
+            return None
+        if block.shape[1] != self.channels:
+            # Mono -> estéreo (ou o contrário) como o driver faria
+            block = np.repeat(block[:, :1], self.channels, axis=1)
+        return block
+
+    def _run(self) -> None:
+        period = self.block_period
+        self.started_at = start = time.perf_counter()
+        index = 0
+        overflow = False
+        try:
+            while not self._stop.is_set():
+                index += 1
+                deadline = start + index * period
+                if self.jitter:
+                    deadline += float(self._rng.uniform(0.0, self.jitter))
+                delay = deadline - time.perf_counter()
+                if delay > 0 and self._stop.wait(delay):
+                    break
+
+                if self.xrun_rate and self._rng.random() < self.xrun_rate:
+                    # Bloco perdido no driver: a fonte avança, o callback não o vê
+                    lost = self._next_block()
+                    if lost is None:
+                        break
+                    self.frames_lost += lost.shape[0]
+                    self.xruns += 1
+                    overflow = True
+                    continue
+
+                block = self._next_block()
+                if block is None:
+                    break
+                now = time.perf_counter()
+                self.max_lateness = max(self.max_lateness, now - (start + index * period))
+                time_info = SimpleNamespace(inputBufferAdcTime=now - start, currentTime=now - start)
+                self.callback(block, block.shape[0], time_info, SimulatedStatus(overflow))
+                overflow = False
+                self.blocks += 1
+                self.frames_delivered += block.shape[0]
+                self._delivered_frames.append(self.frames_delivered)
+                self._delivered_times.append(now)
+        except Exception as exc:
+            print(f"[ERRO] Stream simulado '{self.name}' falhou: {exc}")
+        finally:
+            self.finished.set()
+
+
+class SimulatedBackend(StreamBackend):
+    """Dispositivos simulados: microfone (índice 0) e loopback do sistema (índice 1).
+
+    As opções de tempo (``speed``, ``jitter_ms``, ``xrun_rate``, ``drift_ppm``)
+    valem para os dois streams; ``system_drift_ppm`` permite que o relógio do
+    loopback divirja do microfone, como em placas diferentes.
+    """
+
+    name = "simulated"
+
+    def __init__(
+        self,
+        mic_source: SignalSource,
+        system_source: Optional[SignalSource] = None,
+        speed: float = 1.0,
+        jitter_ms: float = 0.0,
+        xrun_rate: float = 0.0,
+        drift_ppm: float = 0.0,
+        system_drift_ppm: Optional[float] = None,
+        seed: int = 0,
+    ):
+        self.sources = {SIMULATED_MIC: mic_source, SIMULATED_SYSTEM: system_source}
+        self.options = {"speed": speed, "jitter_ms": jitter_ms, "xrun_rate": xrun_rate}
+        self.drift = {
+            SIMULATED_MIC: drift_ppm,
+            SIMULATED_SYSTEM: drift_ppm if system_drift_ppm is None else system_drift_ppm,
+        }
+        self.seed = seed
+        self.streams: Dict[int, SimulatedInputStream] = {}
+        self._registry: Optional[DeviceRegistry] = None
+
+    def device_registry(self) -> DeviceRegistry:
+        if self._registry is None:
+            devices = [{"name": "Microfone simulado", "max_input_channels": 2, "default_samplerate": 44100}]
+            if self.sources[SIMULATED_SYSTEM] is not None:
+                devices.append({"name": "Loopback simulado", "max_input_channels": 2, "default_samplerate": 44100})
+            self._registry = DeviceRegistry(query=lambda: (devices, SIMULATED_MIC), rescan=lambda: None)
+        return self._registry
+
+    def open_input(self, *, samplerate, channels, dtype="int16", blocksize=1024, callback, device=None, latency=None):
+        if dtype != "int16":
+            raise ValueError(f"Backend simulado entrega apenas int16 (pedido: {dtype})")
+        device = SIMULATED_MIC if device is None else device
+        source = self.sources.get(device)
+        if source is None:
+            raise ValueError(f"Dispositivo simulado inexistente: {device}")
+        if source.sample_rate and source.sample_rate != samplerate:
+            print(f"[AVISO] Fonte simulada em {source.sample_rate} Hz entregue como {samplerate} Hz")
+        stream = SimulatedInputStream(
+            source,
+            samplerate=samplerate,
+            channels=channels,
+            blocksize=blocksize,
+            callback=callback,
+            drift_ppm=self.drift[device],
+            seed=self.seed + device,
+            name="mic" if device == SIMULATED_MIC else "system",
+            **self.options,
+        )
+        self.streams[device] = stream
+        return stream
+
+    def wait_finished(self, timeout: Optional[float] = None) -> bool:
+        """Esperar todas as fontes finitas acabarem."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for stream in list(self.streams.values()):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not stream.finished.wait(remaining):
+                return False
+        return True
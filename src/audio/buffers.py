@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""Áudio PCM em memória para entregar chunks sem passar pelo disco.
+
+``PcmBuffer`` guarda amostras int16 intercaladas junto com a taxa e o número
+de canais. Fatias são *views* do mesmo array (sem cópia) e ``to_wav`` gera
+o WAV diretamente num ``io.BytesIO``, pronto para upload.
+"""
+
+from __future__ import annotations
+
+import io
+import wave
+from pathlib import Path
+from typing import BinaryIO, List, Optional, Union
+
+import numpy as np
+
+WAV_HEADER_BYTES = 44
+
+WavSource = Union[str, Path, BinaryIO]
+
+
+def _to_int16(samples: np.ndarray) -> np.ndarray:
+    if np.issubdtype(samples.dtype, np.floating):
+        # Ponto flutuante em [-1, 1], como o sounddevice entrega em float32
+        return np.round(np.clip(samples, -1.0, 1.0) * 32767.0).astype(np.int16)
+    return np.clip(samples, -32768, 32767).astype(np.int16)
+
+
+class PcmBuffer:
+    """Bloco de áudio int16 em memória (amostras intercaladas)."""
+
+    __slots__ = ("samples", "sample_rate", "channels")
+
+    def __init__(self, samples: np.ndarray, sample_rate: int, channels: Optional[int] = None):
+        samples = np.asarray(samples)
+        if samples.ndim == 2:
+            channels = samples.shape[1] if channels is None else channels
+            samples = samples.reshape(-1)
+        channels = int(channels or 1)
+        if samples.dtype != np.int16:
+            samples = _to_int16(samples)
+        remainder = samples.size % channels
+        if remainder:
+            samples = samples[:-remainder]
+        self.samples = samples
+        self.sample_rate = int(sample_rate)
+        self.channels = channels
+
+    # ------------------------------------------------------------------
+    # Propriedades
+    # ------------------------------------------------------------------
+    @property
+    def frames(self) -> int:
+        return self.samples.size // self.channels
+
+    @property
+    def duration_ms(self) -> int:
+        return int(round(self.frames * 1000 / self.sample_rate)) if self.sample_rate else 0
+
+    @property
+    def frame_bytes(self) -> int:
+        return 2 * self.channels
+
+    @property
+    def wav_nbytes(self) -> int:
+        """Tamanho do WAV que ``to_wav`` produziria."""
+        return WAV_HEADER_BYTES + self.samples.size * 2
+
+    def __len__(self) -> int:
+        return self.frames
+
+    def __repr__(self) -> str:
+        return f"PcmBuffer(frames={self.frames}, rate={self.sample_rate}, channels={self.channels})"
+
+    # ------------------------------------------------------------------
+    # Fatias
+    # ------------------------------------------------------------------
+    def slice(self, start_frame: int, stop_frame: Optional[int] = None) -> "PcmBuffer":
+        """Trecho em quadros, como view do mesmo array."""
+        stop_frame = self.frames if stop_frame is None else min(stop_frame, self.frames)
+        start_frame = max(0, min(start_frame, stop_frame))
+        view = self.samples[start_frame * self.channels:stop_frame * self.channels]
+        return PcmBuffer(view, self.sample_rate, self.channels)
+
+    def split(self, max_bytes: int) -> List["PcmBuffer"]:
+        """Dividir em pedaços de WAV com no máximo ``max_bytes`` (em quadros inteiros)."""
+        ranges = chunk_ranges(self.frames, self.frame_bytes, max_bytes)
+        return [self.slice(start, start + count) for start, count in ranges]
+
+    # ------------------------------------------------------------------
+    # Conversões
+    # ------------------------------------------------------------------
+    def to_wav(self, name: str = "audio.wav") -> io.BytesIO:
+        """WAV completo num ``BytesIO`` (com ``name``, usado no upload)."""
+        stream = io.BytesIO()
+        self._write_wav(stream)
+        stream.seek(0)
+        stream.name = name
+        return stream
+
+    def save_wav(self, path: str | Path) -> Path:
+        path = Path(path)
+        with open(path, "wb") as handle:
+            self._write_wav(handle)
+        return path
+
+    def _write_wav(self, handle: BinaryIO) -> None:
+        with wave.open(handle, "wb") as wf:
+            wf.setnchannels(self.channels)
+            wf.setsampwidth(2)
+            wf.setframerate(self.sample_rate)
+            # Bytes do próprio array, sem a cópia de tobytes()
+            wf.writeframes(memoryview(np.ascontiguousarray(self.samples)).cast("B"))
+
+    @classmethod
+    def from_wav(cls, source: WavSource, start_frame: int = 0, frame_count: Optional[int] = None) -> "PcmBuffer":
+        """Ler um WAV int16 (caminho ou stream), opcionalmente só um trecho."""
+        opened = str(source) if isinstance(source, (str, Path)) else source
+        with wave.open(opened, "rb") as wf:
+            if wf.getsampwidth() != 2:
+                raise ValueError(f"Somente WAV de 16 bits é suportado ({wf.getsampwidth() * 8} bits)")
+            total = wf.getnframes()
+            start_frame = max(0, min(start_frame, total))
+            if frame_count is None:
+                frame_count = total - start_frame
+            wf.setpos(start_frame)
+            data = wf.readframes(frame_count)
+            return cls(np.frombuffer(data, dtype=np.int16), wf.getframerate(), wf.getnchannels())
+
+
+def chunk_ranges(total_frames: int, frame_bytes: int, max_bytes: int) -> List[tuple]:
+    """Trechos ``(início, quadros)`` de tamanho parecido que cabem em ``max_bytes``."""
+    if total_frames <= 0:
+        return [(0, 0)]
+    payload = max(frame_bytes, int(max_bytes) - WAV_HEADER_BYTES)
+    num_chunks = max(1, -(-total_frames * frame_bytes // payload))
+    per_chunk = -(-total_frames // num_chunks)
+    return [(start, min(per_chunk, total_frames - start)) for start in range(0, total_frames, per_chunk)]
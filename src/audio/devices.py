@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""Registro compartilhado de dispositivos de áudio.
+
+Cada consulta ao PortAudio (``sd.query_devices``) pode levar centenas de
+milissegundos em máquinas com muitos dispositivos virtuais. O registro faz
+uma única enumeração, classifica as entradas em microfones e loopbacks e
+guarda o resultado até que alguém peça uma nova varredura (``refresh``, o
+botão "Atualizar Lista"). A atualização é manual: o PortAudio só enxerga
+dispositivos conectados depois de reinicializado, e reinicializá-lo
+periodicamente interromperia streams e renumeraria dispositivos.
+
+Reinicializar o PortAudio pode renumerar os dispositivos; por isso cada
+enumeração nova traz ``renumbered``, que leva os índices antigos aos novos
+pelo nome e pela host API.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+SYSTEM_KEYWORDS = [
+    "stereo mix",
+    "mixagem",
+    "loopback",
+    "what u hear",
+    "wave out mix",
+    "sum",
+    "alto-falantes (loopback)",
+]
+
+# (lista bruta de dispositivos, índice da entrada padrão ou None)
+QueryResult = Tuple[Sequence[Any], Optional[int]]
+DevicesListener = Callable[["DeviceSnapshot"], None]
+
+_sounddevice_module = None
+
+
+def import_sounddevice():
+    """Importar ``sounddevice`` sob demanda.
+
+    O import inicializa o PortAudio, o que é lento em algumas máquinas; adiar
+    até a primeira consulta permite que a janela seja desenhada antes.
+    """
+    global _sounddevice_module
+    if _sounddevice_module is None:
+        import sounddevice
+
+        _sounddevice_module = sounddevice
+    return _sounddevice_module
+
+
+def _query_portaudio() -> QueryResult:
+    sd = import_sounddevice()
+    devices = sd.query_devices()
+    default_index: Optional[int] = None
+    try:
+        default_index = int(sd.default.device[0])
+    except Exception:
+        default_index = None
+    if default_index is None or default_index < 0:
+        try:
+            default_index = int(sd.query_hostapis(0).get("default_input_device", -1))
+        except Exception:
+            default_index = None
+    if default_index is not None and default_index < 0:
+        default_index = None
+    return list(devices), default_index
+
+
+def _rescan_portaudio() -> None:
+    """Reinicializar o PortAudio para enxergar dispositivos conectados depois do início."""
+    sd = import_sounddevice()
+    sd._terminate()
+    sd._initialize()
+
+
+def is_loopback_name(name: str) -> bool:
+    lowered = name.lower()
+    return any(keyword in lowered for keyword in SYSTEM_KEYWORDS)
+
+
+class DeviceSnapshot:
+    """Resultado imutável de uma enumeração de dispositivos."""
+
+    def __init__(self, raw_devices: Sequence[Any], default_index: Optional[int]):
+        self.inputs: List[dict] = []
+        self.microphones: List[dict] = []
+        self.loopbacks: List[dict] = []
+        self.default_input: Optional[dict] = None
+
+        for index, device in enumerate(raw_devices):
+            channels = int(device.get("max_input_channels", 0))
+            if channels <= 0:
+                continue
+            name = str(device.get("name", f"Dispositivo {index}"))
+            info = {
+                "index": index,
+                "name": name,
+                "hostapi": device.get("hostapi"),
+                "channels": channels,
+                "default_sample_rate": device.get("default_samplerate"),
+            }
+            self.inputs.append(info)
+            if is_loopback_name(name):
+                self.loopbacks.append(info)
+            else:
+                self.microphones.append(info)
+            if index == default_index:
+                self.default_input = info
+
+        self.signature = tuple(
+            (info["index"], info["name"], info["hostapi"], info["channels"]) for info in self.inputs
+        )
+        # Índice na enumeração anterior -> índice nesta (None se o dispositivo sumiu)
+        self.renumbered: Dict[int, Optional[int]] = {}
+
+    def find(self, index: Optional[int]) -> Optional[dict]:
+        return next((info for info in self.inputs if info["index"] == index), None)
+
+    def map_from(self, previous: "DeviceSnapshot") -> Dict[int, Optional[int]]:
+        """Índices de ``previous`` -> índices atuais, casando nome e host API."""
+        current = {(info["name"], info["hostapi"]): info["index"] for info in self.inputs}
+        return {info["index"]: current.get((info["name"], info["hostapi"])) for info in previous.inputs}
+
+
+class DeviceRegistry:
+    """Cache da enumeração de dispositivos com atualização sob demanda."""
+
+    def __init__(
+        self,
+        query: Optional[Callable[[], QueryResult]] = None,
+        rescan: Optional[Callable[[], None]] = None,
+    ):
+        self._query = query or _query_portaudio
+        self._rescan = rescan or _rescan_portaudio
+        self._lock = threading.Lock()
+        # Serializa enumerações/reinicializações sem bloquear quem lê o cache
+        self._scan_lock = threading.Lock()
+        self._snapshot: Optional[DeviceSnapshot] = None
+        self._listeners: List[DevicesListener] = []
+        self._holders = 0
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    def snapshot(self) -> DeviceSnapshot:
+        """Retornar a enumeração em cache, consultando o PortAudio se necessário."""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._scan_lock:
+            if self._snapshot is None:
+                self._snapshot = self._enumerate()
+            return self._snapshot
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._snapshot is not None
+
+    def inputs(self) -> List[dict]:
+        return list(self.snapshot().inputs)
+
+    def microphones(self) -> List[dict]:
+        return list(self.snapshot().microphones)
+
+    def loopbacks(self) -> List[dict]:
+        return list(self.snapshot().loopbacks)
+
+    def default_input(self) -> Optional[dict]:
+        return self.snapshot().default_input
+
+    def find(self, index: Optional[int]) -> Optional[dict]:
+        return self.snapshot().find(index)
+
+    def _enumerate(self) -> DeviceSnapshot:
+        try:
+            raw_devices, default_index = self._query()
+        except Exception as exc:
+            print(f"[ERRO] Ao listar dispositivos: {exc}")
+            raw_devices, default_index = [], None
+        return DeviceSnapshot(raw_devices, default_index)
+
+    # ------------------------------------------------------------------
+    # Invalidação
+    # ------------------------------------------------------------------
+    def invalidate(self) -> None:
+        """Descartar o cache; a próxima consulta faz uma nova enumeração."""
+        with self._scan_lock:
+            self._snapshot = None
+
+    def refresh(self, rescan: bool = True) -> DeviceSnapshot:
+        """Refazer a enumeração agora e avisar os inscritos se a lista mudou.
+
+        Com ``rescan`` o PortAudio é reinicializado para enxergar dispositivos
+        conectados ou removidos; isso é pulado enquanto houver streams abertos.
+        """
+        with self._scan_lock:
+            previous = self._snapshot
+            if rescan and self._holders == 0:
+                try:
+                    self._rescan()
+                except Exception as exc:
+                    print(f"[AVISO] Falha ao reinicializar o PortAudio: {exc}")
+            current = self._enumerate()
+            if previous is not None:
+                current.renumbered = current.map_from(previous)
+            self._snapshot = current
+        with self._lock:
+            listeners = list(self._listeners)
+
+        if previous is None or previous.signature != current.signature:
+            for listener in listeners:
+                try:
+                    listener(current)
+                except Exception as exc:
+                    print(f"[AVISO] Listener de dispositivos gerou exceção: {exc}")
+        return current
+
+    def subscribe(self, listener: DevicesListener) -> Callable[[], None]:
+        """Registrar callback para mudanças na lista; retorna função para cancelar."""
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        """Impedir reinicializações do PortAudio enquanto houver streams abertos."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def acquire(self) -> None:
+        # Espera uma eventual reinicialização em andamento terminar
+        with self._scan_lock:
+            self._holders += 1
+
+    def release(self) -> None:
+        with self._scan_lock:
+            self._holders = max(0, self._holders - 1)
+
+
+_shared_registry: Optional[DeviceRegistry] = None
+_shared_lock = threading.Lock()
+
+
+def get_device_registry() -> DeviceRegistry:
+    """Registro compartilhado por gravador, janela de configurações e utilitários."""
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = DeviceRegistry()
+        return _shared_registry
@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+"""Cadeia de ``AudioRecorder._process_pair`` numa passada por blocos.
+
+A cadeia do ``AudioProcessor`` converte cada trilha para float64 e de volta
+para int16 a cada etapa (passa-altas, ganho, gate, eco, mixagem, compressor,
+normalização), sempre com temporários do tamanho do áudio inteiro. Aqui as
+faixas são convertidas uma vez para buffers float32 e as etapas rodam em
+blocos de ``BLOCK_SAMPLES`` amostras; o int16 só é gerado no fim. Os buffers
+das faixas são reaproveitados entre chamadas do tamanho de um chunk de tempo
+real; depois de um áudio maior que ``RETAIN_SAMPLES`` (o arquivo final) eles
+são liberados, para a gravação inteira não ficar residente.
+
+O resultado fica a no máximo 1 LSB da cadeia antiga:
+
+* os pontos de truncamento para int16 (``safe_clip``) são reproduzidos com
+  ``clip`` + ``trunc`` no próprio bloco, então os buffers float32 só guardam
+  inteiros (exatos em float32);
+* as contas de cada bloco usam float64 como a cadeia antiga (``dtype`` de
+  ``process`` troca por float32 nas contas por amostra: gate, eco, mixagem,
+  compressor e normalização; veja "Precisão do DSP" no DOCS.md);
+* as recorrências viram fórmulas fechadas: o passa-altas é uma soma
+  acumulada ponderada por potências de ``alpha`` e o envelope do gate é uma
+  progressão geométrica por trecho (ataque, hold, release), limitada aos
+  mesmos pontos em que a iteração antiga para de andar por arredondamento.
+
+Como na cadeia antiga, as amostras intercaladas são tratadas como uma única
+sequência.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+# Amostras por bloco (os temporários do bloco cabem no cache)
+BLOCK_SAMPLES = 8192
+INT16_MIN = -32768.0
+INT16_MAX = 32767.0
+# Faixas até este tamanho (~12 s estéreo a 44,1 kHz, 4 MB em float32) ficam
+# guardadas para a próxima chamada; maiores são liberadas ao fim de ``process``
+RETAIN_SAMPLES = 1 << 20
+# Maior expoente usado nas potências de alpha do passa-altas (evita underflow)
+MAX_SCAN_EXPONENT = 600.0
+
+
+def _quantize(block: np.ndarray) -> np.ndarray:
+    """Mesmo efeito de ``AudioProcessor.safe_clip`` sem sair do float."""
+    np.clip(block, INT16_MIN, INT16_MAX, out=block)
+    np.trunc(block, out=block)
+    return block
+
+
+def _settle(value: float, target: float, steps: int) -> float:
+    """Ponto em que ``value += (target - value) / steps`` para de mudar em float64."""
+    while True:
+        following = value + (target - value) / steps
+        if following == value:
+            return value
+        value = following
+
+
+class FusedDspKernel:
+    """Processa (microfone, sistema) com buffers reaproveitados; seguro entre threads."""
+
+    def __init__(self, block_samples: int = BLOCK_SAMPLES, retain_samples: int = RETAIN_SAMPLES):
+        self.block_samples = max(64, int(block_samples))
+        self.retain_samples = int(retain_samples)
+        self._lock = threading.Lock()
+        self._mic = np.empty(0, dtype=np.float32)
+        self._system = np.empty(0, dtype=np.float32)
+        self._scratches: Dict[type, Tuple[np.ndarray, np.ndarray]] = {}
+        self._steps = np.arange(1, self.block_samples + 1, dtype=np.float64)
+        self._scan_cache: Dict[float, Tuple[np.ndarray, np.ndarray]] = {}
+        self._settle_cache: Dict[Tuple[float, int, int], Tuple[float, float]] = {}
+
+    # ------------------------------------------------------------------
+    # Buffers
+    # ------------------------------------------------------------------
+    def _track(self, name: str, size: int) -> np.ndarray:
+        buffer = getattr(self, name)
+        if buffer.size < size:
+            buffer = np.empty(size, dtype=np.float32)
+            setattr(self, name, buffer)
+        return buffer[:size]
+
+    def _scratch(self, size: int, dtype: type = np.float64) -> Tuple[np.ndarray, np.ndarray]:
+        """Dois buffers de bloco de ``dtype`` (reaproveitados; só crescem)."""
+        buffers = self._scratches.get(dtype)
+        if buffers is None or buffers[0].size < size:
+            buffers = (np.empty(size, dtype=dtype), np.empty(size, dtype=dtype))
+            self._scratches[dtype] = buffers
+        return buffers
+
+    # ------------------------------------------------------------------
+    # Etapas por trilha
+    # ------------------------------------------------------------------
+    def _scan_weights(self, alpha: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(alpha^k, alpha / alpha^k) para k = 1..n, com n limitado contra underflow."""
+        weights = self._scan_cache.get(alpha)
+        if weights is None:
+            length = int(min(self.block_samples, max(1.0, MAX_SCAN_EXPONENT / -np.log(alpha))))
+            powers = alpha ** self._steps[:length]
+            weights = (powers, alpha / powers)
+            self._scan_cache[alpha] = weights
+        return weights
+
+    def _filter_track(self, source: np.ndarray, target: np.ndarray, sample_rate: int, cutoff: float, gain_db: float) -> None:
+        """Passa-altas de 1ª ordem + ganho (``high_pass_filter`` e ``apply_gain``)."""
+        rc = 1.0 / (2 * np.pi * cutoff)
+        dt = 1.0 / sample_rate
+        alpha = rc / (rc + dt)
+        powers, inverse = self._scan_weights(alpha)
+        step = powers.size
+        gain = 10.0 ** (gain_db / 20.0) if gain_db != 0.0 else None
+        work, diff = self._scratch(self.block_samples + 1)
+
+        count = source.size
+        # y[0] = x[0]; depois y[n] = alpha * (y[n-1] + x[n] - x[n-1])
+        x_prev = y_prev = float(source[0])
+        start = 0
+        while start < count:
+            first = 1 if start == 0 else 0
+            stop = min(count, start + first + step)
+            length = stop - start
+            x = work[:length]
+            x[:] = source[start:stop]
+            y = diff[:length]
+            if first:
+                y[0] = x[0]
+            if length > first:
+                body = y[first:]
+                np.subtract(x[1:], x[:-1], out=y[1:])
+                if not first:
+                    y[0] = x[0] - x_prev
+                body *= inverse[:body.size]
+                np.cumsum(body, out=body)
+                body += y_prev
+                body *= powers[:body.size]
+                y_prev = float(body[-1])
+            x_prev = float(x[-1])
+            _quantize(y)
+            if gain is not None:
+                y *= gain
+                _quantize(y)
+            target[start:stop] = y
+            start = stop
+
+    def _settled(self, floor: float, attack: int, release: int) -> Tuple[float, float]:
+        key = (floor, attack, release)
+        bounds = self._settle_cache.get(key)
+        if bounds is None:
+            bounds = (_settle(1.0, floor, release), _settle(floor, 1.0, attack))
+            self._settle_cache[key] = bounds
+        return bounds
+
+    def _gate_track(
+        self, track: np.ndarray, sample_rate: int, threshold_db: float, hold_ms: float, floor: float, dtype: type
+    ) -> None:
+        """``apply_noise_gate`` com os parâmetros padrão de ataque/release, no lugar.
+
+        Somas da média móvel e envelope ficam em float64; ``dtype`` vale para
+        a aplicação do envelope às amostras.
+        """
+        threshold = 32767.0 * (10.0 ** (threshold_db / 20.0))
+        window = max(1, int(sample_rate * 0.01))
+        before, after = window // 2, (window - 1) // 2
+        attack = max(1, int(6.0 * sample_rate / 1000))
+        release = max(1, int(200.0 * sample_rate / 1000))
+        hold_samples = max(1, int(hold_ms * sample_rate / 1000))
+        low, high = self._settled(floor, attack, release)
+        attack_ratio, release_ratio = 1.0 - 1.0 / attack, 1.0 - 1.0 / release
+
+        count = track.size
+        work, gains = self._scratch(self.block_samples + window + 1)
+        steps = self._steps
+        short = None
+        if count < window:
+            # np.convolve "same" com o kernel maior que o sinal centraliza de outro jeito
+            short = np.convolve(track.astype(np.float64) ** 2, np.ones(window), "same")[:count]
+        # Amostras anteriores ao bloco, ainda sem gate (a janela da média é centrada)
+        tail = np.zeros(before, dtype=np.float64)
+        state, hold = floor, 0
+
+        for start in range(0, count, self.block_samples):
+            stop = min(count, start + self.block_samples)
+            length = stop - start
+            if short is not None:
+                sums = short[start:stop]
+            else:
+                ahead = min(count, stop + after)
+                span = before + (ahead - start)
+                padded = work[:span + 1]
+                padded[0] = 0.0
+                padded[1:before + 1] = tail
+                padded[before + 1:] = track[start:ahead]
+                padded[before + 1:] **= 2
+                padded[1:before + 1] **= 2
+                np.cumsum(padded, out=padded)
+                sums = gains[:length]
+                # Zeros além do fim, como o "same" do np.convolve
+                upper = np.minimum(np.arange(window, window + length), span)
+                np.subtract(padded[upper], padded[:length], out=sums)
+            active = np.sqrt(sums / window) >= threshold
+
+            envelope = gains[:length]
+            edges = np.flatnonzero(active[1:] != active[:-1]) + 1
+            run_start = 0
+            for run_stop in list(edges) + [length]:
+                run = envelope[run_start:run_stop]
+                size = run_stop - run_start
+                if active[run_start]:
+                    if state >= high:
+                        run[:] = state
+                    else:
+                        np.power(attack_ratio, steps[:size], out=run)
+                        run *= state - 1.0
+                        run += 1.0
+                        np.minimum(run, high, out=run)
+                    hold = hold_samples
+                else:
+                    held = min(hold, size)
+                    run[:held] = state
+                    hold -= held
+                    rest = run[held:]
+                    if rest.size:
+                        if state <= low:
+                            rest[:] = state
+                        else:
+                            np.power(release_ratio, steps[:rest.size], out=rest)
+                            rest *= state - floor
+                            rest += floor
+                            np.maximum(rest, low, out=rest)
+                state = float(run[-1])
+                run_start = run_stop
+
+            if before:
+                tail = np.concatenate((tail, track[start:stop]))[-before:]
+            # Em float64 reaproveita o buffer das somas (já consumidas), nunca o do envelope
+            block = self._scratch(self.block_samples, dtype)[0][:length]
+            block[:] = track[start:stop]
+            block *= envelope
+            track[start:stop] = _quantize(block)
+
+    # ------------------------------------------------------------------
+    # Cadeia completa
+    # ------------------------------------------------------------------
+    def _echo_strength(self, system: np.ndarray, mic: np.ndarray, sample_rate: int, strength: float) -> Optional[float]:
+        """Força efetiva de ``reduce_echo`` (None quando a redução não se aplica)."""
+        length = min(system.size, mic.size)
+        window = min(int(sample_rate * 0.05), length)
+        if window < 32:
+            return None
+        sys_window = system[:window].astype(np.float64)
+        mic_window = mic[:window].astype(np.float64)
+        denominator = (np.linalg.norm(sys_window) * np.linalg.norm(mic_window)) + 1e-9
+        correlation = np.clip(np.dot(sys_window, mic_window) / denominator, -1.0, 1.0)
+        if abs(correlation) < 0.1:
+            return None
+        return float(np.clip(abs(correlation) * strength, 0.0, 0.8))
+
+    def process(
+        self,
+        mic_audio: np.ndarray,
+        system_audio: np.ndarray,
+        sample_rate: int,
+        config: Mapping,
+        dtype: type = np.float64,
+    ) -> np.ndarray:
+        """Equivalente a ``AudioRecorder._process_pair`` (mesmas chaves de ``config``).
+
+        ``dtype`` é o tipo das contas por amostra; passa-altas, somas e
+        envelopes usam float64 nos dois modos.
+        """
+        with self._lock:
+            try:
+                return self._process(mic_audio, system_audio, sample_rate, config, dtype)
+            finally:
+                self._release_tracks()
+
+    def _release_tracks(self) -> None:
+        """Soltar buffers de faixa maiores que ``retain_samples``."""
+        for name in ("_mic", "_system"):
+            if getattr(self, name).size > self.retain_samples:
+                setattr(self, name, np.empty(0, dtype=np.float32))
+
+    def _process(
+        self, mic_audio: np.ndarray, system_audio: np.ndarray, sample_rate: int, config: Mapping, dtype: type
+    ) -> np.ndarray:
+        mic = system = None
+        if mic_audio.size:
+            mic = self._track("_mic", mic_audio.size)
+            self._filter_track(mic_audio, mic, sample_rate, 80.0, config.get("mic_gain_db", 0.0))
+            if config.get("enable_noise_gate", True):
+                self._gate_track(
+                    mic,
+                    sample_rate,
+                    threshold_db=config.get("noise_gate_threshold_db", -55.0),
+                    hold_ms=config.get("noise_gate_hold_ms", 120.0),
+                    floor=config.get("noise_gate_floor", 0.12),
+                    dtype=dtype,
+                )
+        if system_audio.size:
+            system = self._track("_system", system_audio.size)
+            self._filter_track(system_audio, system, sample_rate, 60.0, config.get("system_gain_db", 0.0))
+        if mic is None and system is None:
+            return np.array([], dtype=np.int16)
+
+        echo = None
+        if mic is not None and system is not None:
+            if config.get("enable_echo_reduction", True):
+                echo = self._echo_strength(system, mic, sample_rate, config.get("echo_strength", 0.55))
+            count = min(mic.size, system.size)
+        else:
+            count = (mic if mic is not None else system).size
+        # A mixagem fica no buffer do sistema (ou na única trilha presente)
+        mixed = (system if system is not None else mic)[:count]
+
+        compress = config.get("enable_compressor", True)
+        threshold = 32767.0 * (10.0 ** (config.get("compressor_threshold_db", -16.0) / 20.0))
+        ratio = config.get("compressor_ratio", 3.5)
+        makeup = 10.0 ** (1.5 / 20.0)
+
+        work, aux = self._scratch(self.block_samples, dtype)
+        sum_squares = 0.0
+        for start in range(0, count, self.block_samples):
+            stop = min(count, start + self.block_samples)
+            block = work[:stop - start]
+            block[:] = mixed[start:stop]
+            if mic is not None and system is not None:
+                if echo is not None:
+                    other = aux[:block.size]
+                    other[:] = mic[start:stop]
+                    other *= echo
+                    block -= other
+                    _quantize(block)
+                block += mic[start:stop]
+                np.clip(block, INT16_MIN, INT16_MAX, out=block)
+            if compress:
+                magnitude = np.abs(block)
+                over = magnitude > threshold
+                if over.any():
+                    block[over] = np.sign(block[over]) * (threshold + (magnitude[over] - threshold) / ratio)
+                block *= makeup
+                _quantize(block)
+            sum_squares += float(np.dot(block, block))
+            mixed[start:stop] = block
+
+        output = np.empty(count, dtype=np.int16)
+        rms = np.sqrt(sum_squares / count)
+        gain = None
+        if rms >= 1e-6:
+            target = 32767.0 * (10.0 ** (config.get("normalize_target_db", -14.0) / 20.0))
+            gain = min(target / rms, 5.0)
+        for start in range(0, count, self.block_samples):
+            stop = min(count, start + self.block_samples)
+            block = work[:stop - start]
+            block[:] = mixed[start:stop]
+            if gain is not None:
+                block *= gain
+                _quantize(block)
+            output[start:stop] = block
+        return output
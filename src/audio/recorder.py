@@ -10,22 +10,56 @@ import wave
 from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, Deque, List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Deque, List, Optional, Tuple
 
 import numpy as np
-import sounddevice as sd
 
-RealtimeCallback = Callable[[str, int], None]
+from src.audio.backends import SoundDeviceBackend, StreamBackend
+from src.audio.buffers import PcmBuffer
+from src.audio.devices import SYSTEM_KEYWORDS, DeviceRegistry, get_device_registry
+from src.audio.dsp_kernel import FusedDspKernel
+from src.audio.telemetry import CaptureTelemetry, StreamMetrics, level_to_db
+from src.audio.vad import VoiceActivityDetector
+from src.utils.persistence import DebouncedJsonWriter
+from src.utils.tracing import get_tracer
+
+if TYPE_CHECKING:  # pragma: no cover - apenas para anotações
+    import sounddevice as sd
+
+RealtimeCallback = Callable[[PcmBuffer, int], None]
+
+# Período de silêncio (s) antes de gravar audio_config.json
+SETTINGS_SAVE_DELAY = 1.0
+
+# Precisão das contas do DSP (config "realtime_precision" / "final_precision")
+PRECISIONS = {"float32": np.float32, "float64": np.float64}
+
+
+def _measure_block(indata: np.ndarray, scratch: np.ndarray, metrics: StreamMetrics) -> np.ndarray:
+    """Pico e soma inteira dos quadrados do bloco -> ``metrics.levels``.
+
+    Os quadrados vão para ``scratch`` (int64, reaproveitado entre callbacks);
+    só um bloco maior que o previsto provoca uma nova alocação.
+    """
+    samples = indata.reshape(-1)
+    count = samples.size
+    if count == 0:
+        return scratch
+    if scratch.size < count:
+        scratch = np.empty(count, dtype=np.int64)
+    squares = scratch[:count]
+    np.multiply(samples, samples, out=squares, dtype=np.int64)
+    peak = max(int(samples.max()), -int(samples.min()))
+    metrics.record_level(peak, int(squares.sum()), count)
+    return scratch
+
+
+def _pad_to(track: np.ndarray, size: int) -> np.ndarray:
+    """Completar a trilha com silêncio até ``size`` amostras."""
+    if track.size >= size:
+        return track
+    return np.concatenate((track, np.zeros(size - track.size, dtype=np.int16)))
 
-SYSTEM_KEYWORDS = [
-    "stereo mix",
-    "mixagem",
-    "loopback",
-    "what u hear",
-    "wave out mix",
-    "sum",
-    "alto-falantes (loopback)",
-]
 
 
 class AudioProcessor:
@@ -41,20 +75,29 @@ class AudioProcessor:
             return -80.0
         return 20.0 * np.log10(linear_gain)
 
+    @staticmethod
+    def precision_dtype(precision: str) -> type:
+        """``"float32"``/``"float64"`` -> tipo do numpy usado nas contas."""
+        try:
+            return PRECISIONS[precision]
+        except KeyError:
+            raise ValueError(f"Precisão desconhecida: {precision!r} (use {' ou '.join(PRECISIONS)})") from None
+
     @staticmethod
     def safe_clip(audio: np.ndarray) -> np.ndarray:
         return np.clip(audio, -32768, 32767).astype(np.int16, copy=False)
 
     @staticmethod
-    def apply_gain(audio: np.ndarray, gain_db: float) -> np.ndarray:
+    def apply_gain(audio: np.ndarray, gain_db: float, dtype: type = np.float64) -> np.ndarray:
         if audio.size == 0 or gain_db == 0.0:
             return audio
         gain = AudioProcessor.db_to_linear(gain_db)
-        amplified = audio.astype(np.float64) * gain
+        amplified = audio.astype(dtype) * gain
         return AudioProcessor.safe_clip(amplified)
 
     @staticmethod
     def high_pass_filter(audio: np.ndarray, sample_rate: int, cutoff: float = 80.0) -> np.ndarray:
+        """Passa-altas de 1ª ordem; a recorrência fica sempre em float64 (não recebe ``dtype``)."""
         if audio.size < 2:
             return audio
 
@@ -77,7 +120,9 @@ class AudioProcessor:
         release_ms: float = 200.0,
         hold_ms: float = 250.0,
         floor: float = 0.3,
+        dtype: type = np.float64,
     ) -> np.ndarray:
+        """Gate com média móvel e envelope em float64; ``dtype`` vale para a aplicação do envelope."""
         if audio.size == 0:
             return audio
 
@@ -85,7 +130,7 @@ class AudioProcessor:
         window = max(1, int(sample_rate * 0.01))
 
         squares = audio.astype(np.float64) ** 2
-        kernel = np.ones(window)
+        kernel = np.ones(window, dtype=np.float64)
         moving_rms = np.sqrt(np.convolve(squares, kernel, "same") / window)
 
         attack_samples = max(1, int(attack_ms * sample_rate / 1000))
@@ -93,9 +138,9 @@ class AudioProcessor:
         hold_samples = max(1, int(hold_ms * sample_rate / 1000))
         gate_state = floor
         hold_counter = 0
-        output = np.zeros_like(audio, dtype=np.float64)
+        output = np.zeros_like(audio, dtype=dtype)
 
-        for idx, sample in enumerate(audio.astype(np.float64)):
+        for idx, sample in enumerate(audio.astype(dtype)):
             if moving_rms[idx] >= threshold:
                 gate_state += (1.0 - gate_state) / attack_samples
                 hold_counter = hold_samples
@@ -106,7 +151,7 @@ class AudioProcessor:
                     gate_state -= (gate_state - floor) / release_samples
 
             gate_state = np.clip(gate_state, floor, 1.0)
-            output[idx] = sample * gate_state
+            output[idx] = sample * dtype(gate_state)
 
         return AudioProcessor.safe_clip(output)
 
@@ -116,11 +161,12 @@ class AudioProcessor:
         threshold_db: float = -16.0,
         ratio: float = 3.5,
         makeup_gain_db: float = 1.5,
+        dtype: type = np.float64,
     ) -> np.ndarray:
         if audio.size == 0:
             return audio
 
-        audio_float = audio.astype(np.float64)
+        audio_float = audio.astype(dtype)
         threshold = 32767.0 * (10.0 ** (threshold_db / 20.0))
 
         magnitude = np.abs(audio_float)
@@ -134,18 +180,19 @@ class AudioProcessor:
         return AudioProcessor.safe_clip(audio_float)
 
     @staticmethod
-    def normalize(audio: np.ndarray, target_db: float = -14.0) -> np.ndarray:
+    def normalize(audio: np.ndarray, target_db: float = -14.0, dtype: type = np.float64) -> np.ndarray:
         if audio.size == 0:
             return audio
 
-        rms = np.sqrt(np.mean(audio.astype(np.float64) ** 2))
+        audio_float = audio.astype(dtype)
+        rms = np.sqrt(np.mean(audio_float ** 2))
         if rms < 1e-6:
             return audio
 
         target = 32767.0 * (10.0 ** (target_db / 20.0))
         gain = target / rms
         gain = min(gain, 5.0)
-        normalized = audio.astype(np.float64) * gain
+        normalized = audio_float * gain
         return AudioProcessor.safe_clip(normalized)
 
     @staticmethod
@@ -154,13 +201,14 @@ class AudioProcessor:
         mic_audio: np.ndarray,
         sample_rate: int,
         strength: float = 0.55,
+        dtype: type = np.float64,
     ) -> np.ndarray:
         if system_audio.size == 0 or mic_audio.size == 0:
             return system_audio
 
         length = min(system_audio.size, mic_audio.size)
-        system = system_audio[:length].astype(np.float64)
-        mic = mic_audio[:length].astype(np.float64)
+        system = system_audio[:length].astype(dtype)
+        mic = mic_audio[:length].astype(dtype)
 
         window = min(int(sample_rate * 0.05), length)
         if window < 32:
@@ -196,11 +244,11 @@ class AudioProcessor:
         return AudioProcessor.safe_clip(mixed)
 
     @staticmethod
-    def analyze_levels(audio: np.ndarray) -> Tuple[float, float]:
+    def analyze_levels(audio: np.ndarray, dtype: type = np.float64) -> Tuple[float, float]:
         if audio.size == 0:
             return -np.inf, -np.inf
 
-        audio_float = audio.astype(np.float64)
+        audio_float = audio.astype(dtype)
         peak = np.max(np.abs(audio_float))
         rms = np.sqrt(np.mean(audio_float ** 2))
 
@@ -208,11 +256,36 @@ class AudioProcessor:
         rms_db = -np.inf if rms == 0 else 20.0 * np.log10(rms / 32767.0)
         return peak_db, rms_db
 
+    @staticmethod
+    def analyze_file_levels(path: str | Path, block_frames: int = 65536) -> Tuple[float, float]:
+        """Mesmo cálculo de ``analyze_levels`` lendo um WAV int16 em blocos."""
+        peak = 0.0
+        sum_squares = 0.0
+        count = 0
+        with wave.open(str(path), "rb") as wf:
+            if wf.getsampwidth() != 2:
+                raise ValueError("Apenas WAV PCM de 16 bits é suportado")
+            while True:
+                data = wf.readframes(block_frames)
+                if not data:
+                    break
+                block = np.frombuffer(data, dtype=np.int16).astype(np.float64)
+                peak = max(peak, float(np.max(np.abs(block))))
+                sum_squares += float(np.dot(block, block))
+                count += block.size
+
+        if count == 0:
+            return -np.inf, -np.inf
+        rms = np.sqrt(sum_squares / count)
+        peak_db = -np.inf if peak == 0 else 20.0 * np.log10(peak / 32767.0)
+        rms_db = -np.inf if rms == 0 else 20.0 * np.log10(rms / 32767.0)
+        return peak_db, rms_db
+
 
 class AudioRecorder:
     """Gravador de áudio completo com processamento e streaming em tempo real."""
 
-    def __init__(self):
+    def __init__(self, device_registry: Optional[DeviceRegistry] = None, backend: Optional[StreamBackend] = None):
         # Parâmetros básicos
         self.sample_rate = 44100
         self.channels = 2
@@ -229,6 +302,17 @@ class AudioRecorder:
 
         # Processamento
         self.processor = AudioProcessor()
+        # Mesma cadeia em uma passada por blocos (config "fused_dsp")
+        self.dsp_kernel = FusedDspKernel()
+        # Spans de cada etapa (data/traces.jsonl); um trace por gravação
+        self.tracer = get_tracer()
+        self._trace_id = "recording"
+        # Métricas dos callbacks (xruns, duração, fila), sem trava
+        self.telemetry = CaptureTelemetry()
+        self._mic_metrics: StreamMetrics = self.telemetry.stream("mic", self.chunk, self.sample_rate)
+        self._system_metrics: StreamMetrics = self.telemetry.stream("system", self.chunk, self.sample_rate)
+        self._mic_scratch = np.empty(self.chunk * self.channels, dtype=np.int64)
+        self._system_scratch = np.empty(self.chunk * self.channels, dtype=np.int64)
         self.config = {
             "mic_gain_db": 7.5,
             "system_gain_db": 5.0,
@@ -242,9 +326,30 @@ class AudioRecorder:
             "compressor_threshold_db": -16.0,
             "compressor_ratio": 3.5,
             "normalize_target_db": -14.0,
+            # Cadeia de DSP em blocos float32 (src/audio/dsp_kernel.py); False usa as etapas do AudioProcessor
+            "fused_dsp": True,
+            # Precisão das contas do DSP: chunks de tempo real em float32, arquivo final em float64
+            "realtime_precision": "float32",
+            "final_precision": "float64",
+            # Chunks sem fala não passam pelo DSP nem vão ao callback
+            "skip_silent_chunks": True,
+            "silent_chunk_level_db": -55.0,
+            "silent_chunk_min_speech": 0.05,
+            # "merge": o silêncio pulado é anexado ao início do próximo chunk com fala; "drop": descartado
+            "silent_chunk_policy": "merge",
         }
-
-        # Dispositivos
+        # Triagem dos chunks (mesmo detector usado antes da transcrição)
+        self._chunk_vad = VoiceActivityDetector()
+        self._held_mic = np.array([], dtype=np.int16)
+        self._held_system = np.array([], dtype=np.int16)
+        self.skipped_chunks = 0
+
+        # Streams vêm do backend (PortAudio por padrão; simulado em testes/benchmarks)
+        self.backend = backend or SoundDeviceBackend()
+
+        # Dispositivos (enumeração compartilhada e em cache)
+        self.devices = device_registry or self.backend.device_registry()
+        self.devices.subscribe(self._follow_renumbering)
         self.mic_device: Optional[int] = None
         self.system_device: Optional[int] = None
 
@@ -270,6 +375,9 @@ class AudioRecorder:
         self._chunk_thread: Optional[threading.Thread] = None
         self._chunk_counter = 0
         self.system_recording_thread: Optional[threading.Thread] = None
+        self._detect_lock = threading.Lock()
+        self._devices_detected = False
+        self._holding_devices = False
 
         # Pastas e arquivos
         self._data_dir = Path("data")
@@ -280,9 +388,16 @@ class AudioRecorder:
         self._temp_dir.mkdir(exist_ok=True)
         self._config_path.parent.mkdir(exist_ok=True)
 
-        # Carregar configurações e detectar dispositivos
+        # Gravação adiada: vários setters seguidos resultam em uma única escrita
+        self._settings_writer = DebouncedJsonWriter(
+            self._config_path,
+            delay=SETTINGS_SAVE_DELAY,
+            on_saved=lambda _path: print("[OK] Configurações de áudio salvas."),
+        )
+
+        # Carregar configurações; a detecção de dispositivos é adiada
+        # (ensure_devices / prefetch_devices) para não travar a inicialização
         self._load_settings()
-        self._auto_detect_devices()
 
     # ------------------------------------------------------------------
     # Persistência e configuração
@@ -310,18 +425,32 @@ class AudioRecorder:
             print(f"[AVISO] Não foi possível carregar configurações de áudio: {exc}")
 
     def save_settings(self) -> None:
-        data = {
+        """Agendar a gravação de ``audio_config.json``.
+
+        As alterações são agrupadas e gravadas uma vez, de forma atômica,
+        ``SETTINGS_SAVE_DELAY`` segundos após a última chamada. Use
+        ``flush_settings`` para forçar a gravação (ex.: ao encerrar).
+        A cópia é feita aqui, na thread de quem alterou a configuração, e não
+        na thread do timer enquanto a interface ainda mexe em ``config``.
+        """
+        snapshot = self._settings_snapshot()
+        self._settings_writer.schedule(lambda: snapshot)
+
+    def flush_settings(self) -> bool:
+        """Gravar imediatamente as configurações pendentes."""
+        try:
+            return self._settings_writer.flush()
+        except Exception as exc:
+            print(f"[ERRO] Falha ao salvar configurações de áudio: {exc}")
+            return False
+
+    def _settings_snapshot(self) -> dict:
+        return {
             **self.config,
             "record_system_audio": self.record_system_audio,
             "chunk_duration": self.chunk_duration,
             "chunk_overlap": self.chunk_overlap,
         }
-        try:
-            with open(self._config_path, "w", encoding="utf-8") as handle:
-                json.dump(data, handle, indent=2)
-            print("[OK] Configurações de áudio salvas.")
-        except Exception as exc:
-            print(f"[ERRO] Falha ao salvar configurações de áudio: {exc}")
 
     # ------------------------------------------------------------------
     # API de compatibilidade com código legado
@@ -331,7 +460,7 @@ class AudioRecorder:
 
     def set_record_system_audio(self, enable: bool) -> None:
         self.record_system_audio = bool(enable)
-        if enable and self.system_device is None:
+        if enable and self.system_device is None and self._devices_detected:
             self._auto_detect_devices()
 
     def set_realtime_transcription_callback(self, callback: Optional[RealtimeCallback]) -> None:
@@ -361,55 +490,28 @@ class AudioRecorder:
         self.save_settings()
 
     def get_audio_devices(self) -> List[dict]:
-        devices: List[dict] = []
-        try:
-            for index, device in enumerate(sd.query_devices()):
-                if int(device.get("max_input_channels", 0)) <= 0:
-                    continue
-                devices.append(
-                    {
-                        "index": index,
-                        "name": device.get("name", f"Dispositivo {index}"),
-                        "channels": device.get("max_input_channels", 0),
-                        "default_sample_rate": device.get("default_samplerate"),
-                    }
-                )
-        except Exception as exc:
-            print(f"[ERRO] Ao listar dispositivos: {exc}")
-        return devices
+        return self.devices.inputs()
 
     def get_system_audio_devices(self) -> List[dict]:
-        candidates: List[dict] = []
-        try:
-            for index, device in enumerate(sd.query_devices()):
-                if int(device.get("max_input_channels", 0)) <= 0:
-                    continue
-                name = str(device.get("name", "")).lower()
-                if any(keyword in name for keyword in SYSTEM_KEYWORDS):
-                    candidates.append(
-                        {
-                            "index": index,
-                            "name": device.get("name", f"Loopback {index}"),
-                            "channels": device.get("max_input_channels", 0),
-                            "default_sample_rate": device.get("default_samplerate"),
-                        }
-                    )
-        except Exception as exc:
-            print(f"[ERRO] Ao listar dispositivos de sistema: {exc}")
-        return candidates
+        return self.devices.loopbacks()
 
     def get_default_device(self) -> Optional[dict]:
-        try:
-            default = sd.query_devices(kind="input")
-            if default and isinstance(default, dict):
-                return {
-                    "index": default.get("index"),
-                    "name": default.get("name"),
-                    "channels": default.get("max_input_channels"),
-                }
-        except Exception:
-            pass
-        return None
+        default = self.devices.default_input()
+        if default is None:
+            return None
+        return {"index": default["index"], "name": default["name"], "channels": default["channels"]}
+
+    def refresh_devices(self) -> List[dict]:
+        """Refazer a enumeração (ex.: após conectar um headset)."""
+        return list(self.devices.refresh().inputs)
+
+    def _follow_renumbering(self, snapshot) -> None:
+        """Listener do registro: manter os dispositivos escolhidos se o PortAudio mudou os índices."""
+        mapping = snapshot.renumbered
+        if self.mic_device in mapping:
+            self.mic_device = mapping[self.mic_device]
+        if self.system_device in mapping:
+            self.system_device = mapping[self.system_device]
 
     @property
     def rate(self) -> int:
@@ -424,28 +526,34 @@ class AudioRecorder:
     # ------------------------------------------------------------------
     # Detecção de dispositivos
     # ------------------------------------------------------------------
-    def _auto_detect_devices(self) -> None:
-        try:
-            default_input = sd.query_devices(kind="input")
-            if default_input and isinstance(default_input, dict):
-                self.mic_device = default_input.get("index")
-                print(f"[MIC] Dispositivo padrão: {default_input.get('name')}")
-        except Exception as exc:
-            print(f"[AVISO] Falha ao detectar microfone padrão: {exc}")
+    def ensure_devices(self) -> None:
+        """Detectar os dispositivos uma única vez, na primeira necessidade."""
+        with self._detect_lock:
+            if self._devices_detected:
+                return
+            self._auto_detect_devices()
+            self._devices_detected = True
 
-        try:
-            for idx, device in enumerate(sd.query_devices()):
-                if int(device.get("max_input_channels", 0)) == 0:
-                    continue
-                name = str(device.get("name", "")).lower()
-                if any(keyword in name for keyword in SYSTEM_KEYWORDS):
-                    self.system_device = idx
-                    print(f"[SYS] Dispositivo de sistema detectado: {device.get('name')}")
-                    break
-            else:
-                print("[AVISO] Nenhum dispositivo de áudio do sistema encontrado.")
-        except Exception as exc:
-            print(f"[ERRO] Falha ao detectar dispositivos: {exc}")
+    def prefetch_devices(self) -> threading.Thread:
+        """Disparar a detecção de dispositivos em segundo plano."""
+        thread = threading.Thread(target=self.ensure_devices, name="meetai-device-probe", daemon=True)
+        thread.start()
+        return thread
+
+    def _auto_detect_devices(self) -> None:
+        snapshot = self.devices.snapshot()
+        default_input = snapshot.default_input
+        if default_input is None:
+            print("[AVISO] Falha ao detectar microfone padrão.")
+        elif self.mic_device is None:
+            self.mic_device = default_input["index"]
+            print(f"[MIC] Dispositivo padrão: {default_input['name']}")
+
+        if snapshot.loopbacks:
+            self.system_device = snapshot.loopbacks[0]["index"]
+            print(f"[SYS] Dispositivo de sistema detectado: {snapshot.loopbacks[0]['name']}")
+        else:
+            print("[AVISO] Nenhum dispositivo de áudio do sistema encontrado.")
 
     def set_devices(self, mic_device: Optional[int] = None, system_device: Optional[int] = None) -> None:
         if mic_device is not None:
@@ -461,6 +569,7 @@ class AudioRecorder:
             print("[AVISO] Gravação já está em andamento.")
             return False
 
+        self.ensure_devices()
         if self.mic_device is None:
             print("[ERRO] Nenhum microfone configurado.")
             return False
@@ -470,10 +579,17 @@ class AudioRecorder:
         self._chunk_event.clear()
         self.recording = True
         self._chunk_counter = 0
+        self.skipped_chunks = 0
+        self._held_mic = np.array([], dtype=np.int16)
+        self._held_system = np.array([], dtype=np.int16)
         self._start_time = time.time()
+        self._trace_id = f"recording-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self._hold_devices()
 
         try:
-            self.mic_stream = sd.InputStream(
+            self._mic_metrics = self.telemetry.stream("mic", self.chunk, self.sample_rate)
+            self._system_metrics = self.telemetry.stream("system", self.chunk, self.sample_rate)
+            self.mic_stream = self.backend.open_input(
                 samplerate=self.sample_rate,
                 channels=self.channels,
                 dtype="int16",
@@ -487,11 +603,15 @@ class AudioRecorder:
         except Exception as exc:
             print(f"[ERRO] Falha ao iniciar microfone: {exc}")
             self.recording = False
+            self._release_devices()
+            # O dispositivo pode ter sido desconectado: forçar nova enumeração
+            self.devices.invalidate()
             return False
 
         if self.record_system_audio and self.system_device is not None:
             try:
-                self.system_stream = sd.InputStream(
+                self._system_metrics = self.telemetry.stream("system", self.chunk, self.sample_rate)
+                self.system_stream = self.backend.open_input(
                     samplerate=self.sample_rate,
                     channels=self.channels,
                     dtype="int16",
@@ -505,6 +625,7 @@ class AudioRecorder:
             except Exception as exc:
                 print(f"[AVISO] Falha ao iniciar captura do sistema: {exc}")
                 self.system_stream = None
+                self.devices.invalidate()
 
         if self.realtime_callback:
             self._chunk_thread = threading.Thread(target=self._chunk_worker, daemon=True)
@@ -522,9 +643,8 @@ class AudioRecorder:
             self._system_queue.clear()
 
     def _mic_callback(self, indata, frames, time_info, status) -> None:
-        if status:
-            print(f"[AVISO] Callback do microfone reportou status: {status}")
-
+        # Nada de print aqui: flags de status viram contadores em self.telemetry
+        started = time.perf_counter()
         if not self.recording:
             return
 
@@ -535,12 +655,13 @@ class AudioRecorder:
             self.mic_frames.append(data_bytes)
             self._mic_queue.append(data_bytes)
             self.mic_timestamps.append(timestamp)
+            depth = len(self._mic_queue)
         self._chunk_event.set()
+        self._mic_scratch = _measure_block(indata, self._mic_scratch, self._mic_metrics)
+        self._mic_metrics.record(started, time.perf_counter(), frames, status, depth)
 
     def _system_callback(self, indata, frames, time_info, status) -> None:
-        if status:
-            print(f"[AVISO] Callback do sistema reportou status: {status}")
-
+        started = time.perf_counter()
         if not self.recording:
             return
 
@@ -551,7 +672,10 @@ class AudioRecorder:
             self.system_audio_frames.append(data_bytes)
             self._system_queue.append(data_bytes)
             self.system_timestamps.append(timestamp)
+            depth = len(self._system_queue)
         self._chunk_event.set()
+        self._system_scratch = _measure_block(indata, self._system_scratch, self._system_metrics)
+        self._system_metrics.record(started, time.perf_counter(), frames, status, depth)
 
     def stop_recording(self) -> Optional[str]:
         if not self.recording:
@@ -567,12 +691,17 @@ class AudioRecorder:
         if self._chunk_thread and self._chunk_thread.is_alive():
             self._chunk_thread.join(timeout=5.0)
         self._chunk_thread = None
+        self._report_xruns()
+        print(f"[CAPTURA]\n{self.telemetry.format_overlay()}")
 
         try:
-            return self._render_final_file()
+            with self.tracer.trace(self._trace_id):
+                return self._render_final_file()
         except Exception as exc:
             print(f"[ERRO] Falha ao finalizar gravação: {exc}")
             return None
+        finally:
+            self.tracer.end_trace(self._trace_id, title="Etapas da gravação")
 
     def _cleanup_streams(self) -> None:
         if self.mic_stream:
@@ -591,10 +720,26 @@ class AudioRecorder:
                 pass
             self.system_stream = None
 
+        self._release_devices()
+
+    def _hold_devices(self) -> None:
+        if not self._holding_devices:
+            self.devices.acquire()
+            self._holding_devices = True
+
+    def _release_devices(self) -> None:
+        if self._holding_devices:
+            self._holding_devices = False
+            self.devices.release()
+
     # ------------------------------------------------------------------
     # Chunking e tempo real
     # ------------------------------------------------------------------
     def _chunk_worker(self) -> None:
+        with self.tracer.trace(self._trace_id):
+            self._chunk_loop()
+
+    def _chunk_loop(self) -> None:
         chunk_samples = int(self.chunk_duration * self.sample_rate * self.channels)
         step_seconds = max(self.chunk_duration - self.chunk_overlap, 1)
         step_samples = int(step_seconds * self.sample_rate * self.channels)
@@ -605,6 +750,7 @@ class AudioRecorder:
         while True:
             self._chunk_event.wait(timeout=0.5)
             self._chunk_event.clear()
+            self._report_xruns()
 
             with self._lock:
                 mic_queue = self._drain_queue(self._mic_queue)
@@ -624,7 +770,7 @@ class AudioRecorder:
             while mic_buffer.size >= chunk_samples:
                 mic_chunk = mic_buffer[:chunk_samples]
                 sys_chunk = system_buffer[:chunk_samples] if system_buffer.size >= chunk_samples else np.array([], dtype=np.int16)
-                self._emit_chunk(mic_chunk, sys_chunk)
+                self._emit_chunk(mic_chunk, sys_chunk, step_samples=step_samples)
 
                 mic_buffer = mic_buffer[step_samples:]
                 if system_buffer.size >= step_samples:
@@ -632,6 +778,16 @@ class AudioRecorder:
                 else:
                     system_buffer = np.array([], dtype=np.int16)
 
+    def _report_xruns(self) -> None:
+        """Avisar (fora da thread de áudio) sobre perdas reportadas pelos streams."""
+        for name, count in self.telemetry.new_xruns().items():
+            label = "microfone" if name == "mic" else "sistema"
+            print(f"[AVISO] Stream do {label} reportou {count} overflow(s)/underflow(s) de entrada.")
+
+    def get_capture_metrics(self) -> dict:
+        """Métricas atuais dos callbacks por stream (ver src/audio/telemetry.py)."""
+        return self.telemetry.snapshot()
+
     def _drain_queue(self, queue: Deque[bytes]) -> np.ndarray:
         if not queue:
             return np.array([], dtype=np.int16)
@@ -640,23 +796,82 @@ class AudioRecorder:
             frames.append(np.frombuffer(queue.popleft(), dtype=np.int16))
         return np.concatenate(frames) if frames else np.array([], dtype=np.int16)
 
-    def _emit_chunk(self, mic_chunk: np.ndarray, system_chunk: np.ndarray, final_chunk: bool = False) -> None:
+    def _chunk_is_silent(self, mic_chunk: np.ndarray, system_chunk: np.ndarray) -> bool:
+        """Triagem antes do DSP: nível bruto baixo ou quase nenhum quadro com fala nas duas trilhas."""
+        level_limit = self.config.get("silent_chunk_level_db", -55.0)
+        min_speech = self.config.get("silent_chunk_min_speech", 0.05)
+        with self.tracer.span("chunk.screen") as span:
+            for name, track in (("mic", mic_chunk), ("system", system_chunk)):
+                if not track.size:
+                    continue
+                level_db, speech = self._chunk_vad.screen(PcmBuffer(track, self.sample_rate, self.channels))
+                span.set(**{f"{name}_level_db": round(level_db, 1), f"{name}_speech": round(speech, 3)})
+                if level_db >= level_limit and speech >= min_speech:
+                    return False
+        return True
+
+    def _emit_chunk(
+        self,
+        mic_chunk: np.ndarray,
+        system_chunk: np.ndarray,
+        final_chunk: bool = False,
+        step_samples: Optional[int] = None,
+    ) -> None:
+        """Entregar o chunk processado ao callback como ``PcmBuffer`` (sem disco).
+
+        ``Transcriber.transcribe`` aceita o buffer diretamente; quem precisar
+        de um arquivo pode usar ``PcmBuffer.save_wav``. Chunks sem fala são
+        pulados antes do DSP; com a política "merge", a parte deles que não se
+        repete no próximo chunk (``step_samples``) é guardada e anexada ao
+        início do próximo chunk com fala, até ``chunk_duration`` segundos.
+        """
         if self.realtime_callback is None:
             return
 
-        processed = self._process_pair(mic_chunk, system_chunk)
-        if processed.size == 0:
+        if self.config.get("skip_silent_chunks", True) and self._chunk_is_silent(mic_chunk, system_chunk):
+            self.skipped_chunks += 1
+            if self.config.get("silent_chunk_policy", "merge") == "merge" and not final_chunk:
+                keep = max(mic_chunk.size, system_chunk.size) if step_samples is None else step_samples
+                limit = int(self.chunk_duration * self.sample_rate * self.channels)
+                # As duas trilhas guardadas crescem juntas (a que faltar vira
+                # silêncio) e são cortadas no mesmo ponto, para seguirem alinhadas
+                mic_part, system_part = mic_chunk[:keep], system_chunk[:keep]
+                size = max(mic_part.size, system_part.size)
+                self._held_mic = np.concatenate((self._held_mic, _pad_to(mic_part, size)))[-limit:]
+                self._held_system = np.concatenate((self._held_system, _pad_to(system_part, size)))[-limit:]
+            if final_chunk:
+                self._chunk_event.set()
             return
 
-        self._chunk_counter += 1
-        chunk_name = f"chunk_{self._chunk_counter:03d}.wav"
-        chunk_path = self._temp_dir / chunk_name
-        self._write_wav(chunk_path, processed)
+        if self._held_mic.size:
+            # O chunk atual também é completado com silêncio (o mix corta na
+            # trilha menor); uma trilha só entra se tiver áudio guardado ou
+            # atual, então o sistema guardado vai mesmo sem sistema no chunk
+            held = self._held_mic.size
+            incoming = max(mic_chunk.size, system_chunk.size)
+            tracks = []
+            for held_track, track in ((self._held_mic, mic_chunk), (self._held_system, system_chunk)):
+                if track.size or held_track.any():
+                    track = np.concatenate((held_track, _pad_to(track, incoming)))
+                tracks.append(track)
+            mic_chunk, system_chunk = tracks
+            self._held_mic = np.array([], dtype=np.int16)
+            self._held_system = np.array([], dtype=np.int16)
+
+        with self.tracer.span("chunk.emit", final=final_chunk) as span:
+            processed = self._process_pair(mic_chunk, system_chunk, self.config.get("realtime_precision", "float32"))
+            if processed.size == 0:
+                return
+
+            self._chunk_counter += 1
+            span.set(chunk=self._chunk_counter)
+            chunk = PcmBuffer(processed, self.sample_rate, self.channels)
 
-        try:
-            self.realtime_callback(str(chunk_path), self._chunk_counter)
-        except Exception as exc:
-            print(f"[AVISO] Callback de chunk gerou exceção: {exc}")
+            try:
+                with self.tracer.span("chunk.callback", chunk=self._chunk_counter):
+                    self.realtime_callback(chunk, self._chunk_counter)
+            except Exception as exc:
+                print(f"[AVISO] Callback de chunk gerou exceção: {exc}")
 
         if final_chunk:
             self._chunk_event.set()
@@ -664,62 +879,90 @@ class AudioRecorder:
     # ------------------------------------------------------------------
     # Processamento e salvamento
     # ------------------------------------------------------------------
-    def _process_pair(self, mic_audio: np.ndarray, system_audio: np.ndarray) -> np.ndarray:
-        mic_audio = mic_audio.astype(np.int16, copy=False)
-        system_audio = system_audio.astype(np.int16, copy=False)
-
+    def _process_pair(self, mic_audio: np.ndarray, system_audio: np.ndarray, precision: str = "float64") -> np.ndarray:
+        span = self.tracer.span
+        dtype = self.processor.precision_dtype(precision)
+        with span("dsp.process_pair", samples=int(mic_audio.size), precision=precision):
+            mic_audio = mic_audio.astype(np.int16, copy=False)
+            system_audio = system_audio.astype(np.int16, copy=False)
+            if self.config.get("fused_dsp", True):
+                with span("dsp.fused"):
+                    return self.dsp_kernel.process(mic_audio, system_audio, self.sample_rate, self.config, dtype)
+            return self._process_pair_stages(mic_audio, system_audio, dtype)
+
+    def _process_pair_stages(
+        self, mic_audio: np.ndarray, system_audio: np.ndarray, dtype: type = np.float64
+    ) -> np.ndarray:
+        """Cadeia original, uma etapa do ``AudioProcessor`` por vez (referência do kernel em blocos)."""
+        span = self.tracer.span
         if mic_audio.size:
-            mic_audio = self.processor.high_pass_filter(mic_audio, self.sample_rate)
-            mic_audio = self.processor.apply_gain(mic_audio, self.config.get("mic_gain_db", 0.0))
+            with span("dsp.high_pass", track="mic"):
+                mic_audio = self.processor.high_pass_filter(mic_audio, self.sample_rate)
+            with span("dsp.gain", track="mic"):
+                mic_audio = self.processor.apply_gain(mic_audio, self.config.get("mic_gain_db", 0.0), dtype)
             if self.config.get("enable_noise_gate", True):
-                mic_audio = self.processor.apply_noise_gate(
-                    mic_audio,
-                    sample_rate=self.sample_rate,
-                    threshold_db=self.config.get("noise_gate_threshold_db", -55.0),
-                    hold_ms=self.config.get("noise_gate_hold_ms", 120.0),
-                    floor=self.config.get("noise_gate_floor", 0.12),
-                )
+                with span("dsp.noise_gate"):
+                    mic_audio = self.processor.apply_noise_gate(
+                        mic_audio,
+                        sample_rate=self.sample_rate,
+                        threshold_db=self.config.get("noise_gate_threshold_db", -55.0),
+                        hold_ms=self.config.get("noise_gate_hold_ms", 120.0),
+                        floor=self.config.get("noise_gate_floor", 0.12),
+                        dtype=dtype,
+                    )
 
         if system_audio.size:
-            system_audio = self.processor.high_pass_filter(system_audio, self.sample_rate, cutoff=60.0)
-            system_audio = self.processor.apply_gain(system_audio, self.config.get("system_gain_db", 0.0))
+            with span("dsp.high_pass", track="system"):
+                system_audio = self.processor.high_pass_filter(system_audio, self.sample_rate, cutoff=60.0)
+            with span("dsp.gain", track="system"):
+                system_audio = self.processor.apply_gain(system_audio, self.config.get("system_gain_db", 0.0), dtype)
 
         if self.config.get("enable_echo_reduction", True) and mic_audio.size and system_audio.size:
-            system_audio = self.processor.reduce_echo(
-                system_audio,
-                mic_audio,
-                sample_rate=self.sample_rate,
-                strength=self.config.get("echo_strength", 0.55),
-            )
+            with span("dsp.echo_reduction"):
+                system_audio = self.processor.reduce_echo(
+                    system_audio,
+                    mic_audio,
+                    sample_rate=self.sample_rate,
+                    strength=self.config.get("echo_strength", 0.55),
+                    dtype=dtype,
+                )
 
-        mixed = self.processor.mix_tracks(mic_audio, system_audio)
+        with span("dsp.mix"):
+            mixed = self.processor.mix_tracks(mic_audio, system_audio)
 
         if self.config.get("enable_compressor", True):
-            mixed = self.processor.apply_compressor(
-                mixed,
-                threshold_db=self.config.get("compressor_threshold_db", -16.0),
-                ratio=self.config.get("compressor_ratio", 3.5),
-            )
+            with span("dsp.compressor"):
+                mixed = self.processor.apply_compressor(
+                    mixed,
+                    threshold_db=self.config.get("compressor_threshold_db", -16.0),
+                    ratio=self.config.get("compressor_ratio", 3.5),
+                    dtype=dtype,
+                )
 
-        mixed = self.processor.normalize(mixed, target_db=self.config.get("normalize_target_db", -14.0))
+        with span("dsp.normalize"):
+            mixed = self.processor.normalize(mixed, target_db=self.config.get("normalize_target_db", -14.0), dtype=dtype)
         return mixed
 
     def _render_final_file(self) -> str:
-        mic_audio = self._merge_bytes(self.mic_frames)
-        system_audio = self._merge_bytes(self.system_audio_frames)
-        final_audio = self._process_pair(mic_audio, system_audio)
-
-        if final_audio.size == 0:
-            raise RuntimeError("Nenhum áudio foi capturado.")
-
-        peak_db, rms_db = self.processor.analyze_levels(final_audio)
-        print(f"[ANÁLISE] Pico {peak_db:.1f} dBFS | RMS {rms_db:.1f} dBFS")
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = self._data_dir / f"recording_{timestamp}.wav"
-        self._write_wav(output_path, final_audio)
-        print(f"[OK] Arquivo salvo em {output_path}")
-        return str(output_path)
+        with self.tracer.span("render.final_file") as span:
+            with self.tracer.span("render.merge"):
+                mic_audio = self._merge_bytes(self.mic_frames)
+                system_audio = self._merge_bytes(self.system_audio_frames)
+            final_audio = self._process_pair(mic_audio, system_audio, self.config.get("final_precision", "float64"))
+
+            if final_audio.size == 0:
+                raise RuntimeError("Nenhum áudio foi capturado.")
+
+            peak_db, rms_db = self.processor.analyze_levels(final_audio)
+            print(f"[ANÁLISE] Pico {peak_db:.1f} dBFS | RMS {rms_db:.1f} dBFS")
+
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_path = self._data_dir / f"recording_{timestamp}.wav"
+            with self.tracer.span("render.write_wav"):
+                self._write_wav(output_path, final_audio)
+            span.set(seconds=round(final_audio.size / (self.sample_rate * self.channels), 3))
+            print(f"[OK] Arquivo salvo em {output_path}")
+            return str(output_path)
 
     def _merge_bytes(self, frames: List[bytes]) -> np.ndarray:
         if not frames:
@@ -787,17 +1030,68 @@ class AudioRecorder:
             "5. Volte ao MeetAI e selecione o dispositivo na lista.\n"
         )
 
+    def test_input_device(self, device: Optional[int] = None, seconds: float = 1.0) -> dict:
+        """Capturar ``seconds`` do dispositivo (None = padrão) e medir o nível do sinal."""
+        if self.recording:
+            raise RuntimeError("Gravação em andamento")
+        info = self.devices.default_input() if device is None else self.devices.find(device)
+        if info is None:
+            raise RuntimeError("Dispositivo não encontrado")
+
+        metrics = StreamMetrics("teste", self.chunk, self.sample_rate)
+        scratch = np.empty(self.chunk * self.channels, dtype=np.int64)
+        loudest = [0.0, 0.0]  # maior RMS e maior pico entre os blocos
+
+        def callback(indata, frames, time_info, status) -> None:
+            nonlocal scratch
+            started = time.perf_counter()
+            scratch = _measure_block(indata, scratch, metrics)
+            rms, peak, _ = metrics.levels
+            loudest[0] = max(loudest[0], rms)
+            loudest[1] = max(loudest[1], peak)
+            metrics.record(started, time.perf_counter(), frames, status)
+
+        with self.devices.hold():
+            stream = self.backend.open_input(
+                samplerate=self.sample_rate,
+                channels=self.channels,
+                dtype="int16",
+                blocksize=self.chunk,
+                callback=callback,
+                device=info["index"],
+                latency="low",
+            )
+            try:
+                stream.start()
+                time.sleep(seconds)
+            finally:
+                stream.stop()
+                stream.close()
+
+        return {
+            "index": info["index"],
+            "name": info["name"],
+            "channels": info["channels"],
+            "default_sample_rate": info.get("default_sample_rate"),
+            "callbacks": metrics.callbacks,
+            "xruns": metrics.xruns,
+            "rms_db": level_to_db(loudest[0]),
+            "peak_db": level_to_db(loudest[1]),
+        }
+
     def get_audio_level(self) -> int:
-        with self._lock:
-            recent = self.mic_frames[-5:] if self.mic_frames else []
-        if not recent:
-            return 0
-        audio = np.frombuffer(b"".join(recent), dtype=np.int16)
-        if audio.size == 0:
+        """Nível do microfone (0-100) a partir do RMS já calculado no callback."""
+        if not self.recording:
             return 0
-        rms = np.sqrt(np.mean(audio.astype(np.float64) ** 2))
-        level = int((rms / 32767.0) * 100 * 2.5)
-        return max(0, min(100, level))
+        rms = self._mic_metrics.levels[0]
+        return max(0, min(100, int(rms * 100 * 2.5)))
+
+    def get_stream_levels(self) -> Tuple[Tuple[float, float, float], Tuple[float, float, float]]:
+        """(rms, pico, pico retido) do microfone e do sistema, lineares em 0..1 (sem trava)."""
+        if not self.recording:
+            return (0.0, 0.0, 0.0), (0.0, 0.0, 0.0)
+        system = self._system_metrics.levels if self.system_stream is not None else (0.0, 0.0, 0.0)
+        return self._mic_metrics.levels, system
 
     # ------------------------------------------------------------------
     # Operações adicionais / compatibilidade
@@ -810,9 +1104,11 @@ class AudioRecorder:
         self._stop_event.clear()
         self.record_system_audio = True
         self.recording = True
+        self._hold_devices()
 
         try:
-            self.system_stream = sd.InputStream(
+            self._system_metrics = self.telemetry.stream("system", self.chunk, self.sample_rate)
+            self.system_stream = self.backend.open_input(
                 samplerate=self.sample_rate,
                 channels=self.channels,
                 dtype="int16",
@@ -828,6 +1124,8 @@ class AudioRecorder:
             print(f"[ERRO] Falha ao iniciar captura do sistema: {exc}")
             self.system_stream = None
             self.recording = False
+            self._release_devices()
+            self.devices.invalidate()
             return False
 
     def quick_setup_for_meetings(self) -> None:
@@ -850,10 +1148,10 @@ class AudioRecorder:
 
 
 def get_audio_devices() -> List[dict]:
-    """Compatibilidade com importações antigas."""
-    return AudioRecorder().get_audio_devices()
+    """Compatibilidade com importações antigas (usa o registro compartilhado)."""
+    return get_device_registry().inputs()
 
 
 def get_system_audio_devices() -> List[dict]:
-    """Compatibilidade com importações antigas."""
-    return AudioRecorder().get_system_audio_devices()
+    """Compatibilidade com importações antigas (usa o registro compartilhado)."""
+    return get_device_registry().loopbacks()
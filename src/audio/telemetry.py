@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""Telemetria do caminho de captura (callbacks do PortAudio).
+
+Cada stream tem um ``StreamMetrics`` atualizado apenas pela thread do seu
+callback: contadores de overflow/underflow, histograma do tempo de execução do
+callback, quão perto ele chegou do prazo do bloco (1024 quadros a 44,1 kHz ≈
+23 ms), maior intervalo entre callbacks e profundidade da fila para o chunker.
+
+Não há trava: com um único escritor por stream, o callback só faz somas e
+atribuições de inteiros/floats. Quem lê (``snapshot``, overlay da interface)
+pode ver um callback a mais num campo que no outro, o que é irrelevante para
+diagnóstico e evita disputar trava com a thread de áudio.
+
+O callback também publica o nível do bloco (RMS a partir da soma inteira dos
+quadrados, pico e pico retido com decaimento) numa única tupla ``levels``; o
+medidor da interface lê essa tupla a 25 Hz sem tocar nos buffers de áudio.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+# Limites superiores (µs) das faixas do histograma; a última faixa é "acima"
+DURATION_BUCKETS_US = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000)
+# Callback acima desta fração do prazo do bloco conta como "quase perdeu"
+NEAR_MISS_FRACTION = 0.5
+# Intervalo entre callbacks acima de N blocos indica travamento do stream
+LATE_INTERVAL_BLOCKS = 2.0
+# Fundo de escala de int16 e piso (dBFS) usado para nível zero
+FULL_SCALE = 32768.0
+LEVEL_FLOOR_DB = -90.0
+# Decaimento do pico retido por bloco (1024 quadros ≈ 23 ms -> ~20 dB/s)
+PEAK_HOLD_DECAY = 0.95
+
+
+def level_to_db(level: float) -> float:
+    """Nível linear (0..1 do fundo de escala) em dBFS, limitado ao piso."""
+    if level <= 0.0:
+        return LEVEL_FLOOR_DB
+    return max(LEVEL_FLOOR_DB, 20.0 * math.log10(level))
+
+
+class StreamMetrics:
+    """Métricas de um stream de entrada (escritas só pelo callback)."""
+
+    def __init__(self, name: str, block_frames: int, sample_rate: int):
+        self.name = name
+        self.block_frames = int(block_frames)
+        self.sample_rate = int(sample_rate)
+        self.deadline_s = self.block_frames / float(self.sample_rate) if self.sample_rate else 0.0
+        self.reset()
+
+    def reset(self) -> None:
+        self.callbacks = 0
+        self.frames = 0
+        self.input_overflows = 0
+        self.input_underflows = 0
+        self.other_flags = 0
+        self.histogram = [0] * (len(DURATION_BUCKETS_US) + 1)
+        self.total_callback_s = 0.0
+        self.max_callback_s = 0.0
+        self.overruns = 0
+        self.near_misses = 0
+        self.max_interval_s = 0.0
+        self.late_callbacks = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        # (rms, pico, pico retido) do último bloco, lineares em 0..1; trocada de uma vez
+        self.levels: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+        self._last_start: Optional[float] = None
+
+    def record(self, started: float, finished: float, frames: int, status=None, queue_depth: int = 0) -> None:
+        """Registrar um callback (tempos de ``time.perf_counter``)."""
+        self.callbacks += 1
+        self.frames += frames
+
+        if status:
+            overflow = bool(getattr(status, "input_overflow", False))
+            underflow = bool(getattr(status, "input_underflow", False))
+            self.input_overflows += overflow
+            self.input_underflows += underflow
+            if not (overflow or underflow):
+                self.other_flags += 1
+
+        duration = finished - started
+        self.total_callback_s += duration
+        if duration > self.max_callback_s:
+            self.max_callback_s = duration
+        micros = duration * 1e6
+        index = 0
+        for limit in DURATION_BUCKETS_US:
+            if micros <= limit:
+                break
+            index += 1
+        self.histogram[index] += 1
+        if self.deadline_s:
+            if duration > self.deadline_s:
+                self.overruns += 1
+            elif duration > self.deadline_s * NEAR_MISS_FRACTION:
+                self.near_misses += 1
+
+        if self._last_start is not None:
+            interval = started - self._last_start
+            if interval > self.max_interval_s:
+                self.max_interval_s = interval
+            if self.deadline_s and interval > self.deadline_s * LATE_INTERVAL_BLOCKS:
+                self.late_callbacks += 1
+        self._last_start = started
+
+        self.queue_depth = queue_depth
+        if queue_depth > self.max_queue_depth:
+            self.max_queue_depth = queue_depth
+
+    def record_level(self, peak: int, sum_squares: int, samples: int) -> None:
+        """Registrar o nível de um bloco a partir do pico e da soma inteira dos quadrados."""
+        if samples <= 0:
+            return
+        rms = math.sqrt(sum_squares / samples) / FULL_SCALE
+        peak_level = min(1.0, peak / FULL_SCALE)
+        hold = max(peak_level, self.levels[2] * PEAK_HOLD_DECAY)
+        self.levels = (rms, peak_level, hold)
+
+    @property
+    def xruns(self) -> int:
+        return self.input_overflows + self.input_underflows
+
+    def callback_percentile_us(self, fraction: float) -> Optional[float]:
+        """Limite superior da faixa do histograma que contém o percentil."""
+        histogram = list(self.histogram)
+        total = sum(histogram)
+        if not total:
+            return None
+        target = fraction * total
+        running = 0
+        for index, count in enumerate(histogram):
+            running += count
+            if running >= target:
+                if index < len(DURATION_BUCKETS_US):
+                    return float(DURATION_BUCKETS_US[index])
+                return self.max_callback_s * 1e6
+        return self.max_callback_s * 1e6
+
+    def snapshot(self) -> Dict[str, object]:
+        callbacks = self.callbacks
+        max_us = self.max_callback_s * 1e6
+        deadline_us = self.deadline_s * 1e6
+        labels = [f"<={limit}us" for limit in DURATION_BUCKETS_US] + [f">{DURATION_BUCKETS_US[-1]}us"]
+        rms, peak, _ = self.levels
+        return {
+            "name": self.name,
+            "callbacks": callbacks,
+            "frames": self.frames,
+            "input_overflows": self.input_overflows,
+            "input_underflows": self.input_underflows,
+            "other_flags": self.other_flags,
+            "callback_mean_us": self.total_callback_s / callbacks * 1e6 if callbacks else None,
+            "callback_p50_us": self.callback_percentile_us(0.50),
+            "callback_p99_us": self.callback_percentile_us(0.99),
+            "callback_max_us": max_us,
+            "deadline_us": deadline_us,
+            # Fração do prazo que sobrou no pior callback (1 = folga total, <0 = estourou)
+            "worst_headroom": 1.0 - max_us / deadline_us if deadline_us else None,
+            "overruns": self.overruns,
+            "near_misses": self.near_misses,
+            "max_interval_ms": self.max_interval_s * 1000.0,
+            "late_callbacks": self.late_callbacks,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "level_rms_db": level_to_db(rms),
+            "level_peak_db": level_to_db(peak),
+            "histogram": dict(zip(labels, self.histogram)),
+        }
+
+
+class CaptureTelemetry:
+    """Métricas de todos os streams de uma gravação."""
+
+    def __init__(self):
+        self.streams: Dict[str, StreamMetrics] = {}
+        self._reported: Dict[str, int] = {}
+
+    def stream(self, name: str, block_frames: int, sample_rate: int) -> StreamMetrics:
+        """Métricas zeradas para o stream ``name`` (chamar antes de abri-lo)."""
+        metrics = StreamMetrics(name, block_frames, sample_rate)
+        self.streams[name] = metrics
+        self._reported[name] = 0
+        return metrics
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        return {name: metrics.snapshot() for name, metrics in list(self.streams.items())}
+
+    @property
+    def xruns(self) -> int:
+        return sum(metrics.xruns for metrics in list(self.streams.values()))
+
+    def new_xruns(self) -> Dict[str, int]:
+        """Xruns surgidos desde a última chamada, por stream (para avisos fora do callback)."""
+        fresh = {}
+        for name, metrics in list(self.streams.items()):
+            total = metrics.xruns
+            if total > self._reported.get(name, 0):
+                fresh[name] = total - self._reported.get(name, 0)
+                self._reported[name] = total
+        return fresh
+
+    def format_overlay(self) -> str:
+        """Texto compacto para o overlay da janela principal."""
+        lines: List[str] = []
+        for snap in self.snapshot().values():
+            if not snap["callbacks"]:
+                continue
+            p99 = snap["callback_p99_us"]
+            headroom = snap["worst_headroom"]
+            lines.append(
+                f"{snap['name']:<7} cb {snap['callbacks']:>6} | xrun {snap['input_overflows']}/{snap['input_underflows']}"
+                f" | p99 {'-' if p99 is None else f'{p99:.0f}'}µs máx {snap['callback_max_us']:.0f}µs"
+                f" | folga {'-' if headroom is None else f'{headroom:.0%}'}"
+                f" | fila {snap['queue_depth']} (máx {snap['max_queue_depth']})"
+                f" | gap {snap['max_interval_ms']:.0f}ms"
+            )
+        return "\n".join(lines) if lines else "Captura: nenhum callback recebido"
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+"""Detecção de voz (VAD) para enviar só os trechos com fala à transcrição.
+
+O áudio é dividido em quadros de 30 ms. Cada quadro tem duas medidas:
+
+* energia (dBFS do RMS, a mesma conta de ``AudioProcessor.analyze_levels``);
+* fluxo espectral normalizado: quanto o espectro de magnitude cresceu em
+  relação ao quadro anterior, dividido pela magnitude total (0..1).
+
+Um quadro é fala quando a energia passa do piso de ruído da gravação (10º
+percentil) mais ``margin_db`` e o fluxo médio em ~150 ms passa de
+``flux_threshold``: silêncio e ruído estacionário ficam abaixo do piso,
+tons e música de espera sustentada têm fluxo baixo. Depois vem a suavização:
+pré-roll antes de cada trecho, *hangover* depois, união de pausas curtas e
+descarte de estalos isolados.
+
+``extract_speech`` concatena os trechos (com uma pausa curta entre eles) e
+devolve um ``TimeMap`` que converte tempos do áudio compactado de volta para
+a gravação original, para os segmentos do Whisper continuarem válidos. Com
+``destination`` a fala é gravada num WAV em blocos, sem ficar inteira na
+memória; sem ele, vira um ``PcmBuffer`` (chunks de tempo real).
+"""
+
+from __future__ import annotations
+
+import io
+import wave
+from bisect import bisect_right
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.audio.buffers import PcmBuffer
+
+FULL_SCALE = 32768.0
+# Quadros lidos por vez ao analisar arquivos (não carrega a gravação inteira)
+FILE_BLOCK_FRAMES = 44100 * 30
+
+Region = Tuple[int, int]
+AudioSource = Union[str, Path, PcmBuffer, io.IOBase]
+
+
+class VoiceActivityDetector:
+    """Energia + fluxo espectral por quadro, com hangover e pré-roll."""
+
+    def __init__(
+        self,
+        frame_ms: float = 30.0,
+        margin_db: float = 10.0,
+        min_level_db: float = -55.0,
+        flux_threshold: float = 0.08,
+        flux_window_ms: float = 150.0,
+        hangover_ms: float = 300.0,
+        preroll_ms: float = 150.0,
+        merge_gap_ms: float = 500.0,
+        min_speech_ms: float = 120.0,
+    ):
+        self.frame_ms = frame_ms
+        self.margin_db = margin_db
+        self.min_level_db = min_level_db
+        self.flux_threshold = flux_threshold
+        self.flux_window_ms = flux_window_ms
+        self.hangover_ms = hangover_ms
+        self.preroll_ms = preroll_ms
+        self.merge_gap_ms = merge_gap_ms
+        self.min_speech_ms = min_speech_ms
+
+    # ------------------------------------------------------------------
+    # Medidas por quadro
+    # ------------------------------------------------------------------
+    def frame_length(self, sample_rate: int) -> int:
+        return max(1, int(round(sample_rate * self.frame_ms / 1000.0)))
+
+    def _features(self, mono: np.ndarray, frame_len: int, previous: Optional[np.ndarray]):
+        """(energia dB, fluxo, último espectro) dos quadros completos de ``mono``."""
+        count = mono.size // frame_len
+        if count == 0:
+            return np.empty(0), np.empty(0), previous
+        frames = mono[:count * frame_len].reshape(count, frame_len)
+        mean_square = np.einsum("ij,ij->i", frames, frames) / frame_len
+        energy_db = 10.0 * np.log10(np.maximum(mean_square, 1e-12) / FULL_SCALE ** 2)
+
+        magnitude = np.abs(np.fft.rfft(frames * np.hanning(frame_len).astype(np.float32), axis=1))
+        before = np.empty_like(magnitude)
+        before[1:] = magnitude[:-1]
+        before[0] = magnitude[0] if previous is None else previous
+        rise = np.maximum(magnitude - before, 0.0).sum(axis=1)
+        flux = rise / np.maximum(magnitude.sum(axis=1), 1e-9)
+        return energy_db, flux, magnitude[-1]
+
+    @staticmethod
+    def _mono(samples: np.ndarray, channels: int) -> np.ndarray:
+        if channels == 1:
+            return samples.astype(np.float32)
+        return samples.reshape(-1, channels).astype(np.float32).mean(axis=1)
+
+    def analyze(self, buffer: PcmBuffer) -> Tuple[np.ndarray, np.ndarray]:
+        """Energia (dBFS) e fluxo espectral de cada quadro do buffer."""
+        energy, flux, _ = self._features(self._mono(buffer.samples, buffer.channels), self.frame_length(buffer.sample_rate), None)
+        return energy, flux
+
+    def analyze_file(self, path: Union[str, Path]) -> Tuple[np.ndarray, np.ndarray, int, int]:
+        """Como ``analyze``, lendo o WAV em blocos -> (energia, fluxo, taxa, quadros)."""
+        with wave.open(str(path), "rb") as wf:
+            if wf.getsampwidth() != 2:
+                raise ValueError(f"Somente WAV de 16 bits é suportado ({wf.getsampwidth() * 8} bits)")
+            rate, channels, total = wf.getframerate(), wf.getnchannels(), wf.getnframes()
+            frame_len = self.frame_length(rate)
+            block = max(frame_len, FILE_BLOCK_FRAMES // frame_len * frame_len)
+            energies, fluxes, previous = [], [], None
+            while True:
+                data = wf.readframes(block)
+                if not data:
+                    break
+                mono = self._mono(np.frombuffer(data, dtype=np.int16), channels)
+                energy, flux, previous = self._features(mono, frame_len, previous)
+                energies.append(energy)
+                fluxes.append(flux)
+        if not energies:
+            return np.empty(0), np.empty(0), rate, total
+        return np.concatenate(energies), np.concatenate(fluxes), rate, total
+
+    # ------------------------------------------------------------------
+    # Decisão
+    # ------------------------------------------------------------------
+    def _frames(self, ms: float) -> int:
+        return int(round(ms / self.frame_ms))
+
+    def active_frames(self, energy_db: np.ndarray, flux: np.ndarray) -> np.ndarray:
+        """Quadros com fala antes da suavização (energia acima do piso e fluxo alto)."""
+        floor_db = float(np.percentile(energy_db, 10))
+        threshold_db = max(self.min_level_db, floor_db + self.margin_db)
+        # Janela nunca maior que o trecho ("same" devolveria mais quadros que a entrada)
+        window = max(1, min(self._frames(self.flux_window_ms), flux.size))
+        smooth_flux = np.convolve(flux, np.ones(window) / window, mode="same")
+        return (energy_db > threshold_db) & (smooth_flux > self.flux_threshold)
+
+    def decide(self, energy_db: np.ndarray, flux: np.ndarray) -> List[Tuple[int, int]]:
+        """Trechos de fala em índices de quadro ``[início, fim)``."""
+        count = energy_db.size
+        if count == 0:
+            return []
+        active = self.active_frames(energy_db, flux)
+
+        # Hangover (depois) e pré-roll (antes) de cada quadro ativo
+        hangover, preroll = self._frames(self.hangover_ms), self._frames(self.preroll_ms)
+        extended = active.copy()
+        if hangover:
+            extended |= np.convolve(active, np.ones(hangover + 1), mode="full")[:count] > 0
+        if preroll:
+            extended |= np.convolve(active[::-1], np.ones(preroll + 1), mode="full")[:count][::-1] > 0
+
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], extended.astype(np.int8), [0]))))
+        runs = list(zip(edges[0::2].tolist(), edges[1::2].tolist()))
+
+        merged: List[List[int]] = []
+        merge_gap = self._frames(self.merge_gap_ms)
+        for start, end in runs:
+            if merged and start - merged[-1][1] <= merge_gap:
+                merged[-1][1] = end
+            else:
+                merged.append([start, end])
+
+        min_speech = max(1, self._frames(self.min_speech_ms))
+        cumulative = np.concatenate(([0], np.cumsum(active)))
+        return [(start, end) for start, end in merged if cumulative[end] - cumulative[start] >= min_speech]
+
+    def screen(self, buffer: PcmBuffer) -> Tuple[float, float]:
+        """Triagem rápida de um chunk -> (nível médio em dBFS, fração de quadros com fala)."""
+        energy, flux = self.analyze(buffer)
+        if energy.size == 0:
+            return -np.inf, 0.0
+        level_db = 10.0 * np.log10(np.mean(10.0 ** (energy / 10.0)))
+        return float(level_db), float(self.active_frames(energy, flux).mean())
+
+    def detect(self, buffer: PcmBuffer) -> List[Region]:
+        """Trechos de fala do buffer em quadros de amostra ``[início, fim)``."""
+        energy, flux = self.analyze(buffer)
+        return self._to_sample_frames(self.decide(energy, flux), self.frame_length(buffer.sample_rate), buffer.frames)
+
+    def detect_file(self, path: Union[str, Path]) -> Tuple[List[Region], int, int]:
+        """Trechos de fala de um WAV -> (trechos, taxa, total de quadros)."""
+        energy, flux, rate, total = self.analyze_file(path)
+        return self._to_sample_frames(self.decide(energy, flux), self.frame_length(rate), total), rate, total
+
+    @staticmethod
+    def _to_sample_frames(runs, frame_len: int, total: int) -> List[Region]:
+        return [(start * frame_len, min(end * frame_len, total)) for start, end in runs]
+
+
+class TimeMap:
+    """Converte tempos do áudio só com fala para tempos da gravação original."""
+
+    def __init__(self, pieces: Sequence[Tuple[int, int, int]], sample_rate: int, original_frames: int):
+        # (início no compactado, início no original, duração), em quadros de amostra
+        self.pieces = list(pieces)
+        self.sample_rate = int(sample_rate)
+        self.original_frames = int(original_frames)
+        self._starts = [piece[0] for piece in self.pieces]
+
+    @property
+    def speech_ms(self) -> int:
+        return int(round(sum(piece[2] for piece in self.pieces) * 1000 / self.sample_rate))
+
+    @property
+    def original_ms(self) -> int:
+        return int(round(self.original_frames * 1000 / self.sample_rate))
+
+    def to_original(self, ms: float) -> int:
+        """Tempo (ms) no compactado -> tempo (ms) no original; pausas inseridas colam no trecho anterior."""
+        if not self.pieces:
+            return int(round(ms))
+        frame = ms * self.sample_rate / 1000.0
+        index = max(0, bisect_right(self._starts, frame) - 1)
+        compact_start, original_start, length = self.pieces[index]
+        offset = min(max(frame - compact_start, 0.0), length)
+        return int(round((original_start + offset) * 1000 / self.sample_rate))
+
+    def map_segments(self, segments: Sequence[dict]) -> List[dict]:
+        return [
+            dict(segment, start_ms=self.to_original(segment["start_ms"]), end_ms=self.to_original(segment["end_ms"]))
+            for segment in segments
+        ]
+
+
+def extract_speech(
+    source: AudioSource,
+    regions: Sequence[Region],
+    gap_ms: float = 200.0,
+    destination: Optional[Union[str, Path]] = None,
+) -> Tuple[Union[PcmBuffer, Path], TimeMap]:
+    """Concatenar os trechos de fala (pausa de ``gap_ms`` entre eles).
+
+    Arquivos são lidos em blocos de ``FILE_BLOCK_FRAMES`` quadros; buffers são
+    fatiados em memória. Com ``destination`` os blocos vão direto para esse WAV
+    e o caminho é devolvido no lugar do ``PcmBuffer``.
+    """
+    handle = writer = None
+    if isinstance(source, PcmBuffer):
+        rate, channels, total = source.sample_rate, source.channels, source.frames
+    else:
+        handle = wave.open(str(source) if isinstance(source, (str, Path)) else source, "rb")
+        rate, channels, total = handle.getframerate(), handle.getnchannels(), handle.getnframes()
+
+    def read(start, end):
+        if handle is None:
+            return source.slice(start, end).samples
+        handle.setpos(start)
+        return np.frombuffer(handle.readframes(end - start), dtype=np.int16)
+
+    try:
+        gap = int(round(rate * gap_ms / 1000.0)) if len(regions) > 1 else 0
+        if destination is None:
+            speech_frames = sum(end - start for start, end in regions)
+            out = np.zeros((speech_frames + gap * max(0, len(regions) - 1)) * channels, dtype=np.int16)
+        else:
+            writer = wave.open(str(destination), "wb")
+            writer.setnchannels(channels)
+            writer.setsampwidth(2)
+            writer.setframerate(rate)
+            silence = bytes(gap * channels * 2)
+        pieces = []
+        position = 0
+        for index, (start, end) in enumerate(regions):
+            if index:
+                if writer is not None:
+                    writer.writeframes(silence)
+                position += gap
+            length = 0
+            for block_start in range(start, end, FILE_BLOCK_FRAMES):
+                block_end = min(end, block_start + FILE_BLOCK_FRAMES)
+                samples = read(block_start, block_end)
+                frames = samples.size // channels
+                samples = samples[:frames * channels]
+                if writer is None:
+                    out[(position + length) * channels:(position + length + frames) * channels] = samples
+                else:
+                    writer.writeframes(samples.tobytes())
+                length += frames
+                if frames < block_end - block_start:
+                    break
+            pieces.append((position, start, length))
+            position += length
+    finally:
+        if handle is not None:
+            handle.close()
+        if writer is not None:
+            writer.close()
+    time_map = TimeMap(pieces, rate, total)
+    if destination is not None:
+        return Path(destination), time_map
+    return PcmBuffer(out[:position * channels], rate, channels), time_map
@@ -0,0 +1 @@
+# Módulo de linha de comando - inicialização
\ No newline at end of file
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""Modo em lote (sem interface gráfica) para transcrever e resumir gravações.
+
+Uso:
+    python main.py batch <pasta> [--workers 4] [--template auto] [--recursive]
+
+Para cada ``reuniao.wav`` são gravados ``reuniao.transcript.txt`` e
+``reuniao.summary.md`` ao lado do arquivo. O manifesto
+``.meetai_manifest.json`` na pasta registra o que já foi processado (tamanho e
+data de modificação do WAV), de modo que uma nova execução pula os arquivos
+concluídos. Gravações sem fala (VAD) ficam concluídas com transcrição vazia e
+sem resumo. Este módulo não importa tkinter.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.utils.persistence import atomic_write_json, atomic_write_text
+from src.utils.tracing import format_stage_stats, get_tracer
+
+MANIFEST_NAME = ".meetai_manifest.json"
+TRANSCRIPT_SUFFIX = ".transcript.txt"
+SUMMARY_SUFFIX = ".summary.md"
+
+
+def find_recordings(directory: Path, recursive: bool = False) -> List[Path]:
+    """Listar os WAV da pasta em ordem estável."""
+    pattern = "**/*.wav" if recursive else "*.wav"
+    found = {path for path in directory.glob(pattern) if path.is_file()}
+    found |= {path for path in directory.glob(pattern.replace(".wav", ".WAV")) if path.is_file()}
+    return sorted(found)
+
+
+def transcript_path_for(audio_path: Path) -> Path:
+    return audio_path.with_name(audio_path.stem + TRANSCRIPT_SUFFIX)
+
+
+def summary_path_for(audio_path: Path) -> Path:
+    return audio_path.with_name(audio_path.stem + SUMMARY_SUFFIX)
+
+
+class BatchManifest:
+    """Registro persistente dos arquivos já processados em uma pasta."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.path = directory / MANIFEST_NAME
+        self._lock = threading.Lock()
+        self.entries: Dict[str, dict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+            self.entries = dict(payload.get("files", {}))
+        except Exception as exc:
+            print(f"[AVISO] Manifesto ilegível ({exc}); todos os arquivos serão processados.")
+            self.entries = {}
+
+    def _key(self, audio_path: Path) -> str:
+        return audio_path.relative_to(self.directory).as_posix()
+
+    @staticmethod
+    def _fingerprint(audio_path: Path) -> dict:
+        stat = audio_path.stat()
+        return {"size": stat.st_size, "mtime": int(stat.st_mtime)}
+
+    def is_done(self, audio_path: Path, summarize: bool, template: str) -> bool:
+        with self._lock:
+            entry = self.entries.get(self._key(audio_path))
+        if not entry or entry.get("status") != "done":
+            return False
+        fingerprint = self._fingerprint(audio_path)
+        if entry.get("size") != fingerprint["size"] or entry.get("mtime") != fingerprint["mtime"]:
+            return False
+        if not transcript_path_for(audio_path).exists():
+            return False
+        if summarize and not entry.get("no_speech") and (entry.get("template") != template or not summary_path_for(audio_path).exists()):
+            return False
+        return True
+
+    def record(self, audio_path: Path, **fields) -> None:
+        with self._lock:
+            entry = {
+                **self._fingerprint(audio_path),
+                **fields,
+                "updated_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            self.entries[self._key(audio_path)] = entry
+            atomic_write_json(self.path, {"version": 1, "files": self.entries})
+
+
+class BatchReport:
+    def __init__(self) -> None:
+        self.processed: List[Path] = []
+        self.skipped: List[Path] = []
+        self.failed: Dict[Path, str] = {}
+        self.elapsed = 0.0
+
+    @property
+    def exit_code(self) -> int:
+        return 1 if self.failed else 0
+
+
+class BatchProcessor:
+    """Executa Transcriber + Summarizer sobre vários arquivos em paralelo."""
+
+    def __init__(
+        self,
+        transcriber,
+        summarizer=None,
+        template: str = "auto",
+        workers: int = 2,
+        force: bool = False,
+    ):
+        self.transcriber = transcriber
+        self.summarizer = summarizer
+        self.template = template
+        self.workers = max(1, int(workers))
+        self.force = force
+
+    @property
+    def summarize(self) -> bool:
+        return self.summarizer is not None
+
+    def run(self, directory: Path, files: Optional[Iterable[Path]] = None) -> BatchReport:
+        directory = Path(directory).resolve()
+        manifest = BatchManifest(directory)
+        report = BatchReport()
+        started = time.perf_counter()
+
+        pending = []
+        for audio_path in files if files is not None else find_recordings(directory):
+            audio_path = Path(audio_path).resolve()
+            if not self.force and manifest.is_done(audio_path, self.summarize, self.template):
+                report.skipped.append(audio_path)
+            else:
+                pending.append(audio_path)
+
+        print(f"[LOTE] {len(pending)} arquivo(s) a processar, {len(report.skipped)} já concluído(s).")
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.process_file, audio_path, manifest): audio_path for audio_path in pending}
+            for future in as_completed(futures):
+                audio_path = futures[future]
+                error = future.result()
+                if error:
+                    report.failed[audio_path] = error
+                    print(f"[ERRO] {audio_path.name}: {error}")
+                else:
+                    report.processed.append(audio_path)
+                    print(f"[OK] {audio_path.name}")
+
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def process_file(self, audio_path: Path, manifest: BatchManifest) -> Optional[str]:
+        """Processar um arquivo; retorna a mensagem de erro ou None."""
+        tracer = get_tracer()
+        trace_id = f"batch-{audio_path.name}"
+        try:
+            with tracer.trace(trace_id), tracer.span("batch.file", file=audio_path.name):
+                return self._process_file(audio_path, manifest)
+        finally:
+            tracer.end_trace(trace_id, title=f"Etapas de {audio_path.name}")
+
+    def _process_file(self, audio_path: Path, manifest: BatchManifest) -> Optional[str]:
+        try:
+            transcript, no_speech = self._transcribe(audio_path)
+            transcript_path = transcript_path_for(audio_path)
+            atomic_write_text(transcript_path, transcript)
+
+            fields = {"status": "done", "transcript": transcript_path.name}
+            if no_speech:
+                fields["no_speech"] = True
+            elif self.summarizer is not None:
+                summary = self.summarizer.generate_summary(transcript, self.template)
+                if not summary:
+                    raise RuntimeError("geração do resumo falhou")
+                summary_path = summary_path_for(audio_path)
+                atomic_write_text(summary_path, summary)
+                fields.update(summary=summary_path.name, template=self.template)
+
+            manifest.record(audio_path, **fields)
+            return None
+        except Exception as exc:
+            manifest.record(audio_path, status="failed", error=str(exc))
+            return str(exc)
+
+    def _transcribe(self, audio_path: Path) -> Tuple[str, bool]:
+        """(texto, sem fala); sem fala o texto é vazio e o arquivo conta como concluído."""
+        if hasattr(self.transcriber, "transcribe_detailed"):
+            result = self.transcriber.transcribe_detailed(str(audio_path))
+            if result and result.get("no_speech"):
+                return "", True
+            transcript = result["text"] if result else None
+        else:
+            transcript = self.transcriber.transcribe(str(audio_path))
+        if not transcript:
+            raise RuntimeError("transcrição vazia ou falhou")
+        return transcript, False
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python main.py batch",
+        description="Transcrever e resumir todas as gravações WAV de uma pasta, sem interface gráfica.",
+    )
+    parser.add_argument("directory", help="pasta com os arquivos .wav")
+    parser.add_argument("--workers", type=int, default=2, help="arquivos processados em paralelo (padrão: 2)")
+    parser.add_argument("--template", default="auto", help="template de resumo (padrão: auto)")
+    parser.add_argument("--provider", choices=["openai", "gemini"], help="provedor para os resumos")
+    parser.add_argument("--no-summary", action="store_true", help="apenas transcrever")
+    parser.add_argument("--recursive", action="store_true", help="incluir subpastas")
+    parser.add_argument("--force", action="store_true", help="reprocessar arquivos já concluídos")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    directory = Path(args.directory)
+    if not directory.is_dir():
+        print(f"[ERRO] Pasta não encontrada: {directory}")
+        return 2
+
+    from src.ai.transcriber import Transcriber
+    from src.utils.tempspace import cleanup_stale_workspaces
+
+    cleanup_stale_workspaces()
+    transcriber = Transcriber()
+    summarizer = None
+    if not args.no_summary:
+        from src.ai.summarizer import Summarizer
+
+        summarizer = Summarizer()
+        if args.provider:
+            summarizer.set_ai_provider(args.provider)
+
+    processor = BatchProcessor(
+        transcriber,
+        summarizer,
+        template=args.template,
+        workers=args.workers,
+        force=args.force,
+    )
+    report = processor.run(directory, find_recordings(directory.resolve(), recursive=args.recursive))
+
+    print(
+        f"\n[LOTE] Concluído em {report.elapsed:.1f}s: {len(report.processed)} processado(s), "
+        f"{len(report.skipped)} pulado(s), {len(report.failed)} com erro."
+    )
+    if report.processed or report.failed:
+        print(format_stage_stats(get_tracer().stage_stats()))
+    return report.exit_code
@@ -0,0 +1 @@
+# Ferramentas de desenvolvimento (servidores falsos, simuladores) - inicialização
\ No newline at end of file
@@ -0,0 +1,443 @@
+# -*- coding: utf-8 -*-
+"""Servidor HTTP local que imita as APIs da OpenAI e do Gemini.
+
+Permite medir a vazão do pipeline (transcrição -> resumo) sem chaves nem
+rede. Endpoints:
+
+* ``POST /v1/audio/transcriptions`` (multipart, como o Whisper): formatos
+  ``json``, ``text`` e ``verbose_json`` com segmentos;
+* ``POST /v1/chat/completions``;
+* ``POST /v1beta/models/<modelo>:generateContent`` (Gemini, transporte REST);
+* ``GET /health`` e ``GET /stats`` (contadores de chamadas e erros).
+
+As respostas são determinísticas: dependem apenas do conteúdo enviado. A
+latência tem uma parte fixa, uma parte proporcional ao trabalho (segundos de
+áudio ou tokens gerados) e um jitter; uma fração configurável das chamadas
+falha com 429/500/503 no formato de erro de cada provedor.
+
+Para apontar o MeetAI para o servidor, em ``config/settings.json``::
+
+    "ai": {"openai_base_url": "http://127.0.0.1:8765/v1",
+           "gemini_base_url": "http://127.0.0.1:8765"}
+
+Uso:
+    python -m src.devtools.fake_ai_server --port 8765 --latency-ms 300 --error-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import random
+import threading
+import time
+import wave
+from dataclasses import dataclass
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+# Frases usadas nas transcrições e resumos gerados
+CANNED_SENTENCES = [
+    "Vamos começar revisando os pontos da última reunião.",
+    "O prazo da entrega foi confirmado para a próxima sexta-feira.",
+    "Precisamos validar o orçamento com o time financeiro.",
+    "A equipe de produto vai apresentar o protótipo na quarta.",
+    "Ficou decidido que os testes de carga rodam toda noite.",
+    "Alguém pode acompanhar a migração do banco de dados?",
+    "O cliente pediu mais detalhes sobre a integração.",
+    "Vamos registrar as pendências no quadro do projeto.",
+]
+
+SEGMENT_SECONDS = 5.0
+ERROR_STATUSES = (429, 500, 503)
+
+
+@dataclass
+class FakeAIConfig:
+    """Comportamento do servidor (latências em milissegundos)."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    # Tempo de transcrição por segundo de áudio (50 = 20x mais rápido que o tempo real)
+    transcribe_ms_per_audio_s: float = 0.0
+    # Velocidade de geração dos resumos (0 = instantâneo)
+    tokens_per_second: float = 0.0
+    error_rate: float = 0.0
+    seed: int = 0
+    # Exigir esta chave no cabeçalho Authorization / x-goog-api-key (None = aceitar qualquer uma)
+    api_key: Optional[str] = None
+
+
+def _digest(*parts: bytes) -> int:
+    sha = hashlib.sha1()
+    for part in parts:
+        sha.update(part)
+    return int.from_bytes(sha.digest()[:8], "big")
+
+
+def canned_sentences(seed: int, count: int) -> List[str]:
+    rng = random.Random(seed)
+    return [rng.choice(CANNED_SENTENCES) for _ in range(count)]
+
+
+def audio_duration(data: bytes) -> float:
+    """Duração de um WAV; para outros formatos estima ~16 kB/s (mp3/ogg de voz)."""
+    try:
+        with wave.open(io.BytesIO(data), "rb") as wf:
+            rate = wf.getframerate()
+            return wf.getnframes() / rate if rate else 0.0
+    except (wave.Error, EOFError):
+        return len(data) / 16000.0
+
+
+def fake_transcription(data: bytes) -> Tuple[str, List[dict], float]:
+    """Texto, segmentos (um a cada 5 s) e duração para o áudio enviado."""
+    duration = audio_duration(data)
+    count = max(1, int(-(-duration // SEGMENT_SECONDS)))
+    sentences = canned_sentences(_digest(data), count)
+    segments = []
+    for index, sentence in enumerate(sentences):
+        start = index * SEGMENT_SECONDS
+        end = min(duration, start + SEGMENT_SECONDS) if duration else start + SEGMENT_SECONDS
+        segments.append({"id": index, "start": round(start, 3), "end": round(end, 3), "text": " " + sentence})
+    return " ".join(sentences), segments, duration
+
+
+def fake_summary(prompt: str) -> str:
+    seed = _digest(prompt.encode("utf-8"))
+    points = canned_sentences(seed, 3)
+    decisions = canned_sentences(seed + 1, 2)
+    lines = ["## Resumo", "", *[f"- {point}" for point in points], "", "## Decisões", ""]
+    lines += [f"- {decision}" for decision in decisions]
+    return "\n".join(lines)
+
+
+def parse_multipart(content_type: str, body: bytes) -> Dict[str, object]:
+    """Campos de um multipart/form-data (arquivos como bytes, o resto como str)."""
+    message = BytesParser(policy=HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\nMIME-Version: 1.0\r\n\r\n".encode("latin-1") + body
+    )
+    fields: Dict[str, object] = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        if not name:
+            continue
+        payload = part.get_payload(decode=True) or b""
+        if part.get_filename():
+            fields[name] = payload
+            fields[f"{name}.filename"] = part.get_filename()
+        else:
+            fields[name] = payload.decode("utf-8", errors="replace")
+    return fields
+
+
+def _json_body(payload: dict) -> Tuple[bytes, str]:
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "_Server"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002 - assinatura da classe base
+        if self.server.owner.verbose:
+            super().log_message(format, *args)
+
+    # ------------------------------------------------------------------
+    # Roteamento
+    # ------------------------------------------------------------------
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif path == "/stats":
+            self._send_json(200, self.server.owner.stats())
+        else:
+            self._send_json(404, {"error": {"message": f"Rota desconhecida: {path}"}})
+
+    def do_POST(self):
+        path = self.path.split("?", 1)[0]
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        owner = self.server.owner
+
+        if path.endswith("/audio/transcriptions"):
+            kind, gemini = "transcriptions", False
+        elif path.endswith("/chat/completions"):
+            kind, gemini = "chat", False
+        elif ":generateContent" in path:
+            kind, gemini = "gemini", True
+        else:
+            self._send_json(404, {"error": {"message": f"Rota desconhecida: {path}"}})
+            return
+
+        if not self._authorized():
+            owner.record(kind, error=True)
+            self._send_error(401, "Chave de API inválida", gemini)
+            return
+
+        status = owner.draw_error()
+        if status:
+            owner.record(kind, error=True)
+            owner.sleep(0.0)
+            self._send_error(status, "Erro simulado pelo servidor falso", gemini)
+            return
+
+        try:
+            if kind == "transcriptions":
+                data, content_type = self._transcriptions(body)
+            elif kind == "chat":
+                data, content_type = self._chat(body)
+            else:
+                data, content_type = self._gemini(body, path)
+        except (ValueError, KeyError) as exc:
+            owner.record(kind, error=True)
+            self._send_error(400, f"Requisição inválida: {exc}", gemini)
+            return
+        # Contabilizar antes de responder: o cliente pode consultar /stats logo em seguida
+        owner.record(kind)
+        self._send(200, data, content_type)
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+    def _transcriptions(self, body: bytes) -> Tuple[bytes, str]:
+        fields = parse_multipart(self.headers.get("Content-Type", ""), body)
+        data = fields.get("file")
+        if not isinstance(data, bytes):
+            raise ValueError("campo 'file' ausente")
+        text, segments, duration = fake_transcription(data)
+        config = self.server.owner.config
+        self.server.owner.sleep(duration * config.transcribe_ms_per_audio_s / 1000.0)
+
+        response_format = fields.get("response_format") or "json"
+        if response_format == "text":
+            return text.encode("utf-8"), "text/plain; charset=utf-8"
+        if response_format == "verbose_json":
+            return _json_body({
+                "task": "transcribe",
+                "language": fields.get("language") or "pt",
+                "duration": round(duration, 3),
+                "text": text,
+                "segments": segments,
+            })
+        return _json_body({"text": text})
+
+    def _chat(self, body: bytes) -> Tuple[bytes, str]:
+        request = json.loads(body or b"{}")
+        messages = request["messages"]
+        prompt = "\n".join(str(message.get("content", "")) for message in messages)
+        content = fake_summary(prompt)
+        completion_tokens = max(1, len(content) // 4)
+        self._generation_delay(completion_tokens)
+        return _json_body({
+            "id": f"chatcmpl-fake-{_digest(prompt.encode('utf-8')):x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-3.5-turbo"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": len(prompt) // 4,
+                "completion_tokens": completion_tokens,
+                "total_tokens": len(prompt) // 4 + completion_tokens,
+            },
+        })
+
+    def _gemini(self, body: bytes, path: str) -> Tuple[bytes, str]:
+        request = json.loads(body or b"{}")
+        prompt = "\n".join(
+            str(part.get("text", ""))
+            for content in request["contents"]
+            for part in content.get("parts", [])
+        )
+        content = fake_summary(prompt)
+        completion_tokens = max(1, len(content) // 4)
+        self._generation_delay(completion_tokens)
+        return _json_body({
+            "candidates": [{
+                "content": {"parts": [{"text": content}], "role": "model"},
+                "finishReason": "STOP",
+                "index": 0,
+            }],
+            "usageMetadata": {
+                "promptTokenCount": len(prompt) // 4,
+                "candidatesTokenCount": completion_tokens,
+                "totalTokenCount": len(prompt) // 4 + completion_tokens,
+            },
+            "modelVersion": path.rsplit("/", 1)[-1].split(":", 1)[0],
+        })
+
+    # ------------------------------------------------------------------
+    # Utilidades
+    # ------------------------------------------------------------------
+    def _generation_delay(self, tokens: int) -> None:
+        speed = self.server.owner.config.tokens_per_second
+        self.server.owner.sleep(tokens / speed if speed > 0 else 0.0)
+
+    def _authorized(self) -> bool:
+        expected = self.server.owner.config.api_key
+        if not expected:
+            return True
+        bearer = self.headers.get("Authorization", "")
+        google = self.headers.get("x-goog-api-key") or ""
+        query_key = ""
+        if "key=" in self.path:
+            query_key = self.path.split("key=", 1)[1].split("&", 1)[0]
+        return expected in (bearer.removeprefix("Bearer ").strip(), google, query_key)
+
+    def _send_error(self, status: int, message: str, gemini: bool) -> None:
+        if gemini:
+            names = {400: "INVALID_ARGUMENT", 401: "UNAUTHENTICATED", 429: "RESOURCE_EXHAUSTED", 503: "UNAVAILABLE"}
+            payload = {"error": {"code": status, "message": message, "status": names.get(status, "INTERNAL")}}
+        else:
+            types = {400: "invalid_request_error", 401: "invalid_request_error", 429: "rate_limit_exceeded"}
+            payload = {"error": {"message": message, "type": types.get(status, "server_error"), "code": None}}
+        self._send_json(status, payload)
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        self._send(status, *_json_body(payload))
+
+    def _send(self, status: int, data: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    owner: "FakeAIServer"
+
+
+class FakeAIServer:
+    """Servidor falso em uma thread própria; use ``with`` ou ``start``/``stop``."""
+
+    def __init__(self, config: Optional[FakeAIConfig] = None, host: str = "127.0.0.1", port: int = 0, verbose: bool = False):
+        self.config = config or FakeAIConfig()
+        self.verbose = verbose
+        self._httpd = _Server((host, port), _Handler)
+        self._httpd.owner = self
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.config.seed)
+        self._calls: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def openai_base_url(self) -> str:
+        return f"{self.url}/v1"
+
+    @property
+    def gemini_base_url(self) -> str:
+        return self.url
+
+    def start(self) -> "FakeAIServer":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, name="meetai-fake-ai", daemon=True)
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Atender na thread atual até ``KeyboardInterrupt`` (uso pela linha de comando)."""
+        try:
+            self._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._httpd.server_close()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join(timeout=5.0)
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeAIServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # Comportamento simulado
+    # ------------------------------------------------------------------
+    def draw_error(self) -> int:
+        """Status HTTP de erro para esta chamada, ou 0 (sorteio com semente fixa)."""
+        if self.config.error_rate <= 0:
+            return 0
+        with self._lock:
+            if self._rng.random() >= self.config.error_rate:
+                return 0
+            return self._rng.choice(ERROR_STATUSES)
+
+    def sleep(self, work_seconds: float) -> None:
+        """Latência fixa + trabalho + jitter."""
+        with self._lock:
+            jitter = self._rng.uniform(0.0, self.config.jitter_ms) if self.config.jitter_ms else 0.0
+        delay = (self.config.latency_ms + jitter) / 1000.0 + work_seconds
+        if delay > 0:
+            time.sleep(delay)
+
+    def record(self, kind: str, error: bool = False) -> None:
+        with self._lock:
+            self._calls[kind] = self._calls.get(kind, 0) + 1
+            if error:
+                self._errors[kind] = self._errors.get(kind, 0) + 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {"calls": dict(self._calls), "errors": dict(self._errors)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Servidor falso compatível com OpenAI/Gemini para testes offline")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latência fixa por chamada")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="variação aleatória da latência")
+    parser.add_argument(
+        "--transcribe-ms-per-audio-s", type=float, default=0.0, help="tempo de transcrição por segundo de áudio"
+    )
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="velocidade de geração dos resumos")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fração das chamadas que falham")
+    parser.add_argument("--api-key", help="exigir esta chave (padrão: aceitar qualquer uma)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="registrar cada requisição")
+    args = parser.parse_args(argv)
+
+    config = FakeAIConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        transcribe_ms_per_audio_s=args.transcribe_ms_per_audio_s,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        api_key=args.api_key,
+    )
+    server = FakeAIServer(config, host=args.host, port=args.port, verbose=args.verbose)
+    print(f"[FAKE-AI] Servindo em {server.url}")
+    print(f"  ai.openai_base_url = {server.openai_base_url}")
+    print(f"  ai.gemini_base_url = {server.gemini_base_url}")
+    server.serve_forever()
+    print(f"[FAKE-AI] Encerrado. {server.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
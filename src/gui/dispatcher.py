@@ -0,0 +1,120 @@
+"""
+Despachante de eventos para a interface (threads de trabalho -> loop do Tk)
+
+Tk não é thread-safe: threads de trabalho (fila de jobs, parada da gravação,
+enumeração de dispositivos) não devem tocar em widgets. Elas publicam eventos
+com ``post(tipo, *args)`` numa fila; o loop do Tk esvazia a fila a cada
+``interval_ms`` e entrega os eventos aos handlers registrados, em ordem.
+
+Tipos registrados com ``coalesce=True`` (ex.: status) entregam só o último
+evento de cada lote: uma rajada de mensagens de status vira uma única
+atualização do rótulo. Este módulo não importa tkinter.
+"""
+
+import queue
+import threading
+
+# Período de drenagem da fila (ms) e máximo de eventos por ciclo
+DRAIN_INTERVAL_MS = 50
+MAX_BATCH = 200
+
+# Tipos de evento usados pela aplicação
+STATUS = "status"
+ERROR = "error"
+JOB = "job"
+CALL = "call"
+
+
+class UIDispatcher:
+    """Fila de eventos drenada periodicamente na thread do Tk"""
+
+    def __init__(self, root, interval_ms=DRAIN_INTERVAL_MS, max_batch=MAX_BATCH):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.max_batch = max_batch
+        self._queue = queue.SimpleQueue()
+        self._handlers = {CALL: lambda func, *args: func(*args)}
+        self._coalesce = set()
+        self._after_id = None
+        self._running = False
+        self._lock = threading.Lock()
+        self.posted = 0
+        self.delivered = 0
+        self.coalesced = 0
+
+    def register(self, kind, handler, coalesce=False):
+        """Associar ``handler(*args)`` ao tipo ``kind``"""
+        self._handlers[kind] = handler
+        if coalesce:
+            self._coalesce.add(kind)
+        else:
+            self._coalesce.discard(kind)
+
+    def post(self, kind, *args):
+        """Publicar um evento (qualquer thread; não bloqueia)"""
+        with self._lock:
+            self.posted += 1
+        self._queue.put((kind, args))
+
+    def call(self, func, *args):
+        """Executar ``func(*args)`` na thread do Tk"""
+        self.post(CALL, func, *args)
+
+    def start(self):
+        """Iniciar a drenagem periódica (chamar na thread do Tk)"""
+        if not self._running:
+            self._running = True
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        self._running = False
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _tick(self):
+        self._after_id = None
+        try:
+            self.drain()
+        finally:
+            if self._running:
+                self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def drain(self):
+        """Entregar até ``max_batch`` eventos pendentes; retorna quantos handlers rodaram"""
+        batch = []
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if not batch:
+            return 0
+
+        # Para tipos coalescidos, só a última ocorrência do lote é entregue
+        last_index = {}
+        for index, (kind, _) in enumerate(batch):
+            if kind in self._coalesce:
+                last_index[kind] = index
+
+        delivered = 0
+        for index, (kind, args) in enumerate(batch):
+            if kind in last_index and last_index[kind] != index:
+                continue
+            handler = self._handlers.get(kind)
+            if handler is None:
+                print(f"[AVISO] Evento de interface sem handler: {kind}")
+                continue
+            try:
+                handler(*args)
+            except Exception as e:
+                print(f"[AVISO] Handler de interface '{kind}' gerou exceção: {e}")
+            delivered += 1
+
+        with self._lock:
+            self.delivered += delivered
+            self.coalesced += len(batch) - delivered
+        return delivered
@@ -0,0 +1,73 @@
+"""
+Medidor de nível (microfone e sistema) desenhado num Canvas
+
+Os itens do Canvas são criados uma vez; cada atualização só move as
+coordenadas das barras (RMS) e dos marcadores de pico retido. Os níveis vêm
+prontos dos callbacks de captura (``AudioRecorder.get_stream_levels``).
+"""
+
+import tkinter as tk
+
+from src.audio.telemetry import level_to_db
+
+# Faixa exibida (dBFS): abaixo de METER_MIN_DB a barra fica vazia
+METER_MIN_DB = -60.0
+# Cores por faixa do RMS
+COLOR_OK = '#4caf50'
+COLOR_HOT = '#ffb300'
+COLOR_CLIP = '#e53935'
+HOT_DB = -12.0
+CLIP_DB = -1.0
+
+
+class LevelMeter:
+    """Duas barras horizontais (Mic / Sistema) com marcador de pico"""
+
+    ROWS = ("Mic", "Sistema")
+
+    def __init__(self, parent, width=220, row_height=9):
+        self.width = width
+        self.row_height = row_height
+        self.label_width = 52
+        height = row_height * len(self.ROWS) + 4 * (len(self.ROWS) + 1)
+        self.canvas = tk.Canvas(parent, width=width, height=height, highlightthickness=0, bg='#f0f0f0')
+        self._bars = []
+        self._peaks = []
+        self._colors = []
+        for index, name in enumerate(self.ROWS):
+            top = 4 + index * (row_height + 4)
+            bottom = top + row_height
+            self.canvas.create_text(0, (top + bottom) / 2, text=name, anchor=tk.W, font=('Arial', 7))
+            self.canvas.create_rectangle(self.label_width, top, width - 1, bottom, outline='#bbbbbb', fill='#e0e0e0')
+            self._bars.append(self.canvas.create_rectangle(self.label_width, top, self.label_width, bottom, width=0, fill=COLOR_OK))
+            self._peaks.append(self.canvas.create_line(self.label_width, top, self.label_width, bottom, fill='#333333'))
+            self._colors.append(COLOR_OK)
+
+    def grid(self, **kwargs):
+        self.canvas.grid(**kwargs)
+
+    def _x(self, level):
+        """Posição x de um nível linear (escala em dB)"""
+        db = level_to_db(level)
+        fraction = 0.0 if db <= METER_MIN_DB else min(1.0, (db - METER_MIN_DB) / -METER_MIN_DB)
+        return self.label_width + fraction * (self.width - 1 - self.label_width)
+
+    def update(self, *levels):
+        """Aplicar ``(rms, pico, pico_retido)`` de cada linha, na ordem de ROWS"""
+        canvas = self.canvas
+        for index, (rms, _, hold) in enumerate(levels):
+            top = 4 + index * (self.row_height + 4)
+            bottom = top + self.row_height
+            canvas.coords(self._bars[index], self.label_width, top, self._x(rms), bottom)
+            peak_x = self._x(hold)
+            canvas.coords(self._peaks[index], peak_x, top, peak_x, bottom)
+            db = level_to_db(rms)
+            color = COLOR_CLIP if db >= CLIP_DB else COLOR_HOT if db >= HOT_DB else COLOR_OK
+            # itemconfigure só quando a faixa muda (evita redesenho desnecessário)
+            if color != self._colors[index]:
+                canvas.itemconfigure(self._bars[index], fill=color)
+                self._colors[index] = color
+
+    def clear(self):
+        self.update(*[(0.0, 0.0, 0.0)] * len(self.ROWS))
+
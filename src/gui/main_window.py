@@ -5,16 +5,38 @@ Interface gráfica principal do MeetAI
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import os
 
+from src.gui.dispatcher import ERROR, STATUS, UIDispatcher
+from src.gui.level_meter import LevelMeter
+from src.gui.transcript_model import IncrementalTranscriptView
+from src.gui.transcript_pages import CURRENT_TAG, HIT_TAG, SegmentStore, TranscriptPager, format_timestamp, parse_timestamp
+
+# Intervalo de atualização do overlay de telemetria da captura (ms)
+TELEMETRY_REFRESH_MS = 500
+# Duração da gravação de teste nas Configurações (s)
+DEVICE_TEST_SECONDS = 1.0
+# Atualização do medidor de nível durante a gravação (40 ms = 25 Hz)
+LEVEL_METER_REFRESH_MS = 40
+
 class MainWindow:
     def __init__(self, root, app):
         self.root = root
         self.app = app
         self.recording = False
+        self.telemetry_visible = False
+        self._telemetry_after = None
+        self._meter_after = None
         self.setup_ui()
         
+        # Threads de trabalho publicam aqui; só o loop do Tk mexe nos widgets
+        self.dispatcher = UIDispatcher(root)
+        self.dispatcher.register(STATUS, self.update_status, coalesce=True)
+        self.dispatcher.register(ERROR, self.show_error)
+        self.dispatcher.start()
+        
     def setup_ui(self):
         """Configurar interface do usuário"""
         self.root.title("MeetAI - Gravador com Resumos IA")
@@ -58,6 +80,14 @@ class MainWindow:
         self.status_label = ttk.Label(recording_frame, text="Pronto para gravar")
         self.status_label.grid(row=0, column=1, sticky=tk.W)
         
+        # Medidor de nível: lê os valores prontos dos callbacks de captura
+        self.level_meter = LevelMeter(recording_frame)
+        self.level_meter.grid(row=0, column=2, sticky=tk.E, padx=(10, 0))
+        
+        # Overlay com as métricas dos callbacks de captura (F12 mostra/oculta)
+        self.telemetry_label = ttk.Label(recording_frame, font=('Consolas', 8), justify=tk.LEFT, foreground='#555555')
+        self.root.bind("<F12>", self.toggle_telemetry_overlay)
+        
         # Seção de templates - compacta
         template_frame = ttk.LabelFrame(main_frame, text="Template de Resumo", padding="8")
         template_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=(0, 8))
@@ -102,6 +132,36 @@ class MainWindow:
             borderwidth=1
         )
         self.transcript_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=3, pady=3)
+        self.transcript_text.tag_configure(HIT_TAG, background='#fff3a0')
+        self.transcript_text.tag_configure(CURRENT_TAG, background='#dcecff')
+        
+        # Transcrição ao vivo: só os trechos novos são inseridos no widget
+        self.live_transcript = IncrementalTranscriptView(
+            self.root, self.transcript_text, on_update=self._on_live_transcript_update
+        )
+        
+        # Transcrição final: só a página atual de segmentos fica no widget
+        self.transcript_pages = TranscriptPager(self.transcript_text, on_page=self._on_transcript_page)
+        
+        pager_bar = ttk.Frame(transcript_frame)
+        pager_bar.grid(row=1, column=0, sticky=(tk.W, tk.E), padx=3, pady=(0, 3))
+        pager_bar.columnconfigure(2, weight=1)
+        ttk.Button(pager_bar, text="◀", width=3, command=lambda: self._change_transcript_page(-1)).grid(row=0, column=0)
+        ttk.Button(pager_bar, text="▶", width=3, command=lambda: self._change_transcript_page(1)).grid(row=0, column=1, padx=(2, 8))
+        self.page_label = ttk.Label(pager_bar, text="", foreground='#555555')
+        self.page_label.grid(row=0, column=2, sticky=tk.W)
+        
+        self.jump_var = tk.StringVar()
+        jump_entry = ttk.Entry(pager_bar, textvariable=self.jump_var, width=9)
+        jump_entry.grid(row=0, column=3)
+        jump_entry.bind("<Return>", lambda event: self.jump_to_time())
+        ttk.Button(pager_bar, text="Ir para", command=self.jump_to_time).grid(row=0, column=4, padx=(2, 8))
+        
+        self.find_var = tk.StringVar()
+        find_entry = ttk.Entry(pager_bar, textvariable=self.find_var, width=18)
+        find_entry.grid(row=0, column=5)
+        find_entry.bind("<Return>", lambda event: self.find_in_transcript())
+        ttk.Button(pager_bar, text="Localizar", command=self.find_in_transcript).grid(row=0, column=6, padx=(2, 0))
         
         # Aba do resumo
         summary_frame = ttk.Frame(self.notebook)
@@ -154,7 +214,12 @@ class MainWindow:
         )
         config_button.pack(side=tk.RIGHT)
         
-        # Monitoramento de nível de áudio removido
+        search_button = ttk.Button(
+            right_buttons,
+            text="🔍 Buscar Reuniões",
+            command=self.open_search
+        )
+        search_button.pack(side=tk.RIGHT, padx=(0, 8))
     
     def load_templates(self):
         """Carregar templates disponíveis"""
@@ -185,6 +250,7 @@ class MainWindow:
             self.record_button.configure(text="⏹ Parar Gravação")
             self.status_label.configure(text="Gravando...")
             self.clear_results()
+            self._refresh_level_meter()
         else:
             messagebox.showerror("Erro", "Não foi possível iniciar a gravação")
     
@@ -193,27 +259,66 @@ class MainWindow:
         self.recording = False
         self.record_button.configure(text="▶ Iniciar Gravação")
         self.status_label.configure(text="Processando...")
-        
-        # Parar gravação em thread separada
-        threading.Thread(target=self.app.stop_recording, daemon=True).start()
+        if self._meter_after is not None:
+            self.root.after_cancel(self._meter_after)
+            self._meter_after = None
+        self.level_meter.clear()
+        
+        # Parar gravação em thread separada (o template é lido aqui, na thread do Tk)
+        template = self.get_selected_template()
+        threading.Thread(target=self.app.stop_recording, args=(template,), daemon=True).start()
+    
+    def _refresh_level_meter(self):
+        """Ler os níveis publicados pelos callbacks e reagendar enquanto gravar"""
+        self._meter_after = None
+        if not self.recording:
+            return
+        try:
+            self.level_meter.update(*self.app.audio_recorder.get_stream_levels())
+        except Exception as e:
+            print(f"Erro ao atualizar medidor de nível: {e}")
+            return
+        self._meter_after = self.root.after(LEVEL_METER_REFRESH_MS, self._refresh_level_meter)
     
-    # Método update_audio_level removido (barra de progresso removida)
+    def toggle_telemetry_overlay(self, event=None):
+        """Mostrar/ocultar as métricas de captura (xruns, duração dos callbacks, fila)"""
+        self.telemetry_visible = not self.telemetry_visible
+        if self.telemetry_visible:
+            self.telemetry_label.grid(row=1, column=0, columnspan=2, sticky=tk.W, pady=(6, 0))
+            self._refresh_telemetry_overlay()
+        else:
+            if self._telemetry_after is not None:
+                self.root.after_cancel(self._telemetry_after)
+                self._telemetry_after = None
+            self.telemetry_label.grid_remove()
+    
+    def _refresh_telemetry_overlay(self):
+        """Ler os contadores (sem trava) e reagendar enquanto o overlay estiver visível"""
+        self._telemetry_after = None
+        if not self.telemetry_visible:
+            return
+        try:
+            text = self.app.audio_recorder.telemetry.format_overlay()
+        except Exception as e:
+            text = f"Telemetria indisponível: {e}"
+        self.telemetry_label.configure(text=text)
+        self._telemetry_after = self.root.after(TELEMETRY_REFRESH_MS, self._refresh_telemetry_overlay)
     
     def get_selected_template(self):
         """Obter template selecionado"""
         template_name = self.template_var.get()
         return self.template_mapping.get(template_name, "conversa")
     
-    def display_results(self, transcript, summary):
+    def _load_transcript(self, transcript, segments=None):
+        """Trocar a transcrição exibida (só a primeira página vai para o widget)"""
+        self.live_transcript.reset()
+        self.transcript_pages.load(SegmentStore(segments, transcript))
+    
+    def display_results(self, transcript, summary, segments=None):
         """Exibir resultados da transcrição e resumo"""
-        # Limpar textos anteriores
-        self.transcript_text.delete('1.0', tk.END)
+        self._load_transcript(transcript, segments)
         self.summary_text.delete('1.0', tk.END)
         
-        # Inserir novos textos
-        if transcript:
-            self.transcript_text.insert('1.0', transcript)
-        
         if summary:
             self.summary_text.insert('1.0', summary)
         
@@ -223,14 +328,12 @@ class MainWindow:
         # Focar na aba do resumo
         self.notebook.select(1)
     
-    def display_transcript_only(self, transcript):
+    def display_transcript_only(self, transcript, segments=None):
         """Exibir apenas a transcrição (sistema simplificado)"""
         try:
             # Limpar e exibir transcrição
-            self.transcript_text.delete('1.0', tk.END)
-            if transcript:
-                self.transcript_text.insert('1.0', transcript)
-                
+            self._load_transcript(transcript, segments)
+            
             # Focar na aba da transcrição
             self.notebook.select(0)
             
@@ -241,13 +344,11 @@ class MainWindow:
         except Exception as e:
             print(f"Erro ao exibir transcrição: {e}")
 
-    def display_final_results(self, transcript, summary):
+    def display_final_results(self, transcript, summary, segments=None):
         """Exibir resultados finais (transcrição + resumo)"""
         # Atualizar transcrição
-        self.transcript_text.delete('1.0', tk.END)
-        if transcript:
-            self.transcript_text.insert('1.0', transcript)
-            
+        self._load_transcript(transcript, segments)
+        
         # Atualizar resumo
         self.summary_text.delete('1.0', tk.END)
         if summary:
@@ -260,40 +361,35 @@ class MainWindow:
         self.notebook.select(1)
     
     def update_status(self, status):
-        """Atualizar status na interface"""
+        """Atualizar status na interface (thread do Tk; de outras threads use post_status)"""
         self.status_label.configure(text=status)
-        self.root.update_idletasks()
+    
+    def post_status(self, status):
+        """Atualizar o status a partir de qualquer thread (rajadas viram uma única atualização)"""
+        self.dispatcher.post(STATUS, status)
+    
+    def post_error(self, message):
+        """Exibir um erro a partir de qualquer thread"""
+        self.dispatcher.post(ERROR, message)
         
     def show_error(self, message):
         """Exibir mensagem de erro"""
         messagebox.showerror("Erro", message)
     
-    def update_realtime_transcript(self, transcript):
-        """Atualizar transcrição em tempo real durante a gravação - OTIMIZADO"""
+    def add_realtime_segment(self, chunk_number, text):
+        """Acrescentar/corrigir o trecho de um chunk (pode ser chamado de qualquer thread)"""
+        self.live_transcript.submit(chunk_number, text)
+    
+    def _on_live_transcript_update(self, model):
+        """Após inserir os trechos novos: rolar, focar a aba e atualizar o status"""
         try:
-            # Atualização incremental mais eficiente
-            self.transcript_text.config(state=tk.NORMAL)
-            
-            # Limpar e inserir novo conteúdo de forma otimizada
-            self.transcript_text.delete('1.0', tk.END)
-            self.transcript_text.insert('1.0', transcript)
-            
-            # Scroll suave para o final
             self.transcript_text.see(tk.END)
             
             # Mudar para aba de resultados se não estiver já
-            if self.recording:
-                current_tab = self.notebook.index(self.notebook.select())
-                if current_tab != 0:  # Se não está na aba de transcrição
-                    self.notebook.select(0)
-                
-            # Atualizar status de forma eficiente
-            word_count = len(transcript.split()) if transcript else 0
-            self.update_status(f"🎙️ Gravando... ({word_count} palavras • Chunk de 8s)")
-            
-            # Forçar atualização da interface
-            self.root.update_idletasks()
+            if self.recording and self.notebook.index(self.notebook.select()) != 0:
+                self.notebook.select(0)
             
+            self.status_label.configure(text=f"🎙️ Gravando... ({model.word_count} palavras • Chunk de 8s)")
         except Exception as e:
             print(f"Erro ao atualizar transcrição em tempo real: {e}")
     
@@ -313,12 +409,17 @@ class MainWindow:
                     f.write(f"**Template:** {self.template_var.get()}\n\n")
                     
                     f.write("## Transcrição\n\n")
-                    f.write(self.transcript_text.get('1.0', tk.END))
+                    # Direto dos segmentos: o widget só tem a página visível
+                    if len(self.transcript_pages.store):
+                        self.transcript_pages.store.write_to(f)
+                    else:
+                        f.write(self.live_transcript.model.text)
                     f.write("\n\n")
                     
                     f.write("## Resumo\n\n")
                     f.write(self.summary_text.get('1.0', tk.END))
                 
+                self.app.record_export(filename)
                 messagebox.showinfo("Sucesso", f"Resultados salvos em: {filename}")
         
         except Exception as e:
@@ -326,7 +427,8 @@ class MainWindow:
     
     def clear_results(self):
         """Limpar resultados"""
-        self.transcript_text.delete('1.0', tk.END)
+        self.live_transcript.reset()
+        self.transcript_pages.clear()
         self.summary_text.delete('1.0', tk.END)
         self.save_button.configure(state='disabled')
         self.notebook.select(0)  # Voltar para aba de transcrição
@@ -334,6 +436,51 @@ class MainWindow:
     def open_settings(self):
         """Abrir janela de configurações"""
         SettingsWindow(self.root, self.app)
+    
+    def open_search(self):
+        """Abrir janela de busca nas reuniões"""
+        from src.gui.search_window import SearchWindow
+        SearchWindow(self.root, self.app)
+    
+    def show_transcript_at(self, start_ms):
+        """Abrir a página do segmento em start_ms e destacá-lo"""
+        self.transcript_pages.jump_to_time(start_ms)
+        self.notebook.select(0)
+    
+    def jump_to_time(self):
+        """Ir para o horário digitado (HH:MM:SS)"""
+        if not self.transcript_pages.store.timed:
+            self.update_status("Esta transcrição não tem horários por segmento")
+            return
+        try:
+            self.show_transcript_at(parse_timestamp(self.jump_var.get()))
+        except ValueError as e:
+            self.update_status(str(e))
+    
+    def find_in_transcript(self):
+        """Destacar o termo na página e ir para a próxima ocorrência (Enter repete)"""
+        query = self.find_var.get()
+        if not query.strip():
+            return
+        if self.transcript_pages.search_next(query) is None:
+            self.update_status(f"'{query.strip()}' não encontrado na transcrição")
+        self.notebook.select(0)
+    
+    def _change_transcript_page(self, step):
+        pages = self.transcript_pages
+        if len(pages.store):
+            pages.show_page(pages.page + step)
+    
+    def _on_transcript_page(self, pages):
+        """Atualizar o rótulo com a faixa de segmentos (e horários) da página"""
+        first, last = pages.page_range
+        if first == last:
+            self.page_label.configure(text="")
+            return
+        text = f"Página {pages.page + 1}/{pages.page_count} • trechos {first + 1}–{last} de {len(pages.store)}"
+        if pages.store.timed:
+            text += f" • {format_timestamp(pages.store.start_ms(first))}–{format_timestamp(pages.store.start_ms(last - 1))}"
+        self.page_label.configure(text=text)
 
 class SettingsWindow:
     def __init__(self, parent, app):
@@ -344,8 +491,17 @@ class SettingsWindow:
         self.window.transient(parent)
         self.window.grab_set()
         
+        # PortAudio (enumeração, testes) roda aqui, um por vez, fora da thread do Tk
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="meetai-settings")
+        self._pending_tasks = 0
+        self._closed = False
+        self._devices_loaded = False
+        self._saved_input_device = None
+        self._unsubscribe_devices = None
+        
         self.setup_ui()
         self.load_current_settings()
+        self._run_task("Procurando dispositivos...", self._load_devices, self._on_devices_loaded)
     
     def setup_ui(self):
         """Configurar interface de configurações"""
@@ -432,49 +588,15 @@ class SettingsWindow:
         self.device_combo = ttk.Combobox(
             device_frame,
             textvariable=self.device_var,
-            state="readonly",
+            state="disabled",
             width=60
         )
         self.device_combo.pack(fill=tk.X, pady=(0, 10))
         
-        # Carregar dispositivos únicos
+        # Dispositivos chegam da tarefa em segundo plano (_on_devices_loaded)
         self.device_mapping = {}  # Mapear texto para índice
-        try:
-            devices = self.app.audio_recorder.get_audio_devices()
-            unique_devices = self._filter_unique_devices(devices)
-            
-            device_options = ["🔄 Automático (Dispositivo Padrão do Sistema)"]
-            self.device_mapping["🔄 Automático (Dispositivo Padrão do Sistema)"] = None
-            
-            for device in unique_devices:
-                device_text = f"🎤 {device['clean_name']} ({device['channels']} {'canal' if device['channels'] == 1 else 'canais'})"
-                device_options.append(device_text)
-                self.device_mapping[device_text] = device['index']
-            
-            self.device_combo['values'] = device_options
-            if device_options:
-                self.device_combo.set(device_options[0])  # Selecionar automático por padrão
-            
-        except Exception as e:
-            print(f"Erro detalhado ao carregar dispositivos: {e}")
-            # Fallback: carregar dispositivos simples sem filtro
-            try:
-                devices = self.app.audio_recorder.get_audio_devices()
-                device_options = ["🔄 Automático (Dispositivo Padrão do Sistema)"]
-                self.device_mapping["🔄 Automático (Dispositivo Padrão do Sistema)"] = None
-                
-                for device in devices:
-                    device_text = f"🎤 {device['name']} ({device['channels']} canais)"
-                    device_options.append(device_text)
-                    self.device_mapping[device_text] = device['index']
-                
-                self.device_combo['values'] = device_options
-                if device_options:
-                    self.device_combo.set(device_options[0])
-                    
-            except Exception as e2:
-                error_label = ttk.Label(device_frame, text=f"❌ Erro ao carregar dispositivos: {e2}")
-                error_label.pack(anchor=tk.W, pady=5)
+        self.device_var.set("⏳ Carregando dispositivos...")
+        self.window.bind("<Destroy>", self._on_destroy, add="+")
         
         # Botão para testar dispositivo
         test_button = ttk.Button(
@@ -484,6 +606,13 @@ class SettingsWindow:
         )
         test_button.pack(pady=(10, 0))
         
+        refresh_button = ttk.Button(
+            device_frame,
+            text="🔄 Atualizar Lista",
+            command=self.refresh_devices
+        )
+        refresh_button.pack(pady=(5, 0))
+        
         # Configurações de qualidade
         quality_frame = ttk.LabelFrame(audio_frame, text="Qualidade de Gravação", padding="10")
         quality_frame.pack(fill=tk.X, padx=10, pady=(5, 10))
@@ -523,9 +652,118 @@ class SettingsWindow:
         button_frame = ttk.Frame(self.window)
         button_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
         
+        # Andamento das tarefas em segundo plano
+        self.progress = ttk.Progressbar(button_frame, mode='indeterminate', length=100)
+        self.task_label = ttk.Label(button_frame, text="", foreground='#555555')
+        
         ttk.Button(button_frame, text="Salvar", command=self.save_settings).pack(side=tk.RIGHT, padx=(10, 0))
         ttk.Button(button_frame, text="Cancelar", command=self.window.destroy).pack(side=tk.RIGHT)
     
+    def _populate_device_combo(self, devices):
+        """Preencher o combobox de microfones preservando a seleção atual
+
+        A seleção é mantida pelo texto (nome do dispositivo): uma nova varredura
+        do PortAudio pode renumerar os índices.
+        """
+        selected_text = self.device_var.get()
+        self.device_mapping = {}
+        auto_option = "🔄 Automático (Dispositivo Padrão do Sistema)"
+        device_options = [auto_option]
+        self.device_mapping[auto_option] = None
+        
+        try:
+            unique_devices = self._filter_unique_devices(devices)
+            for device in unique_devices:
+                device_text = f"🎤 {device['clean_name']} ({device['channels']} {'canal' if device['channels'] == 1 else 'canais'})"
+                device_options.append(device_text)
+                self.device_mapping[device_text] = device['index']
+        except Exception as e:
+            print(f"Erro detalhado ao carregar dispositivos: {e}")
+            # Fallback: carregar dispositivos simples sem filtro
+            for device in devices:
+                device_text = f"🎤 {device['name']} ({device['channels']} canais)"
+                device_options.append(device_text)
+                self.device_mapping[device_text] = device['index']
+        
+        self.device_combo['values'] = device_options
+        if selected_text not in self.device_mapping:
+            selected_text = auto_option
+        self.device_combo.set(selected_text)
+    
+    def _run_task(self, label, func, on_done, *args):
+        """Executar func(*args) em segundo plano; on_done(resultado) roda na thread do Tk"""
+        self._pending_tasks += 1
+        self.task_label.configure(text=label)
+        if self._pending_tasks == 1:
+            self.task_label.pack(side=tk.LEFT, padx=(6, 0))
+            self.progress.pack(side=tk.LEFT)
+            self.progress.start(15)
+        future = self._executor.submit(func, *args)
+        dispatcher = self.app.main_window.dispatcher
+        future.add_done_callback(lambda f: dispatcher.call(self._finish_task, f, label, on_done))
+    
+    def _finish_task(self, future, label, on_done):
+        """Entregar o resultado de uma tarefa (thread do Tk)"""
+        if self._closed:
+            return
+        self._pending_tasks -= 1
+        if self._pending_tasks == 0:
+            self.progress.stop()
+            self.progress.pack_forget()
+            self.task_label.pack_forget()
+        try:
+            result = future.result()
+        except Exception as e:
+            messagebox.showerror("Erro", f"{label.rstrip('.')}: {str(e)}", parent=self.window)
+            return
+        on_done(result)
+    
+    def _load_devices(self):
+        """Segundo plano: construir o gravador (se preciso) e enumerar os microfones"""
+        return self.app.audio_recorder.get_audio_devices()
+    
+    def _on_devices_loaded(self, devices):
+        """Preencher a lista, restaurar o dispositivo salvo e acompanhar atualizações"""
+        if self._closed:
+            return
+        first_load = not self._devices_loaded
+        self._devices_loaded = True
+        self.device_combo.configure(state="readonly")
+        self._populate_device_combo(devices)
+        if first_load:
+            for option_text, device_index in self.device_mapping.items():
+                if device_index == self._saved_input_device:
+                    self.device_var.set(option_text)
+                    break
+            # Atualizar a lista quando outra parte do app refizer a enumeração
+            self._unsubscribe_devices = self.app.audio_recorder.devices.subscribe(self._on_devices_changed)
+    
+    def _selected_device_index(self):
+        """Índice escolhido (o salvo, enquanto a lista ainda não carregou)"""
+        if not self._devices_loaded:
+            return self._saved_input_device
+        return self.device_mapping.get(self.device_var.get())
+    
+    def refresh_devices(self):
+        """Refazer a enumeração de dispositivos (ex.: headset recém-conectado)"""
+        self._run_task("Atualizando dispositivos...", self.app.audio_recorder.refresh_devices, self._on_devices_loaded)
+    
+    def _on_devices_changed(self, snapshot):
+        """Chamado quando a lista de dispositivos muda (fora da thread do Tk)"""
+        try:
+            self.app.main_window.dispatcher.call(self._on_devices_loaded, snapshot.inputs)
+        except Exception:
+            pass
+    
+    def _on_destroy(self, event):
+        """Cancelar a inscrição e descartar tarefas ao fechar a janela"""
+        if event.widget is not self.window:
+            return
+        self._closed = True
+        self._executor.shutdown(wait=False)
+        if self._unsubscribe_devices is not None:
+            self._unsubscribe_devices()
+    
     def on_provider_change(self):
         """Callback quando o provedor de IA é alterado"""
         provider = self.ai_provider_var.get()
@@ -535,65 +773,35 @@ class SettingsWindow:
         # Por exemplo, mostrar/ocultar campos específicos
     
     def load_current_settings(self):
-        """Carregar configurações atuais"""
+        """Carregar configurações atuais (do ConfigManager, sem ler arquivos)"""
         try:
-            import json
-            from pathlib import Path
+            config_manager = self.app.config_manager
             
             # Carregar API Keys
-            config_file = Path("config/api_keys.json")
-            if config_file.exists():
-                with open(config_file, 'r') as f:
-                    config = json.load(f)
-                    
-                    # OpenAI API Key
-                    openai_key = config.get('openai_api_key', '')
-                    if openai_key:
-                        self.openai_key_var.set('*' * len(openai_key))
-                    
-                    # Gemini API Key
-                    gemini_key = config.get('gemini_api_key', '')
-                    if gemini_key:
-                        self.gemini_key_var.set('*' * len(gemini_key))
-                    
-                    # Provedor preferido
-                    provider = config.get('ai_provider', 'openai')
-                    self.ai_provider_var.set(provider)
+            api_keys = config_manager.get_api_keys()
+            
+            # OpenAI API Key
+            if api_keys.openai_api_key:
+                self.openai_key_var.set('*' * len(api_keys.openai_api_key))
+            
+            # Gemini API Key
+            if api_keys.gemini_api_key:
+                self.gemini_key_var.set('*' * len(api_keys.gemini_api_key))
+            
+            # Provedor preferido
+            self.ai_provider_var.set(api_keys.ai_provider)
             
             # Carregar configurações de áudio
-            settings_file = Path("config/settings.json")
-            if settings_file.exists():
-                with open(settings_file, 'r') as f:
-                    settings = json.load(f)
-                    
-                    # Dispositivo de áudio
-                    audio_device = settings.get('audio', {}).get('input_device')
-                    if audio_device is None:
-                        # Procurar pela opção "Automático"
-                        for option in self.device_combo['values']:
-                            if "Automático" in option:
-                                self.device_var.set(option)
-                                break
-                    else:
-                        # Procurar pelo dispositivo salvo
-                        for option_text, device_index in self.device_mapping.items():
-                            if device_index == audio_device:
-                                self.device_var.set(option_text)
-                                break
-                    
-                    # Sample rate
-                    sample_rate = settings.get('audio', {}).get('sample_rate', 44100)
-                    self.sample_rate_var.set(str(sample_rate))
-                    
-                    # Áudio do sistema
-                    system_audio = settings.get('audio', {}).get('record_system_audio', True)
-                    self.system_audio_var.set(system_audio)
-            else:
-                # Valores padrão
-                if self.device_combo['values']:
-                    self.device_var.set(self.device_combo['values'][0])
-                self.sample_rate_var.set("44100")
-                self.system_audio_var.set(True)
+            audio = config_manager.audio
+            
+            # Dispositivo de áudio: selecionado quando a lista chegar
+            self._saved_input_device = audio.input_device
+            
+            # Sample rate
+            self.sample_rate_var.set(str(audio.sample_rate))
+            
+            # Áudio do sistema
+            self.system_audio_var.set(audio.record_system_audio)
                 
         except Exception as e:
             print(f"Erro ao carregar configurações: {e}")
@@ -718,111 +926,59 @@ class SettingsWindow:
             return 5   # Prioridade padrão
     
     def test_audio_device(self):
-        """Testar dispositivo de áudio selecionado"""
-        try:
-            selected_text = self.device_var.get()
-            device_index = self.device_mapping.get(selected_text)
-            
-            if device_index is None:
-                device_info = self.app.audio_recorder.get_default_device()
-                if device_info:
-                    message = f"✅ Dispositivo Padrão\n\nNome: {device_info['name']}\nCanais: {device_info['channels']}"
-                else:
-                    message = "❌ Nenhum dispositivo padrão encontrado"
-            else:
-                devices = self.app.audio_recorder.get_audio_devices()
-                device_info = next((d for d in devices if d['index'] == device_index), None)
-                if device_info:
-                    message = f"✅ Dispositivo Selecionado\n\nNome: {device_info['name']}\nÍndice: {device_info['index']}\nCanais: {device_info['channels']}\nTaxa Padrão: {device_info.get('default_sample_rate', 'N/A')} Hz"
-                else:
-                    message = "❌ Dispositivo não encontrado"
-            
-            messagebox.showinfo("Teste de Dispositivo", message)
-            
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro ao testar dispositivo: {str(e)}")
+        """Gravar um trecho curto do dispositivo selecionado (em segundo plano) e medir o nível"""
+        device_index = self._selected_device_index()
+        self._run_task(
+            "Testando dispositivo...",
+            lambda: self.app.audio_recorder.test_input_device(device_index, DEVICE_TEST_SECONDS),
+            self._show_device_test,
+        )
+    
+    def _show_device_test(self, result):
+        title = "Dispositivo Padrão" if self._selected_device_index() is None else "Dispositivo Selecionado"
+        if result['peak_db'] < -60.0:
+            verdict = "⚠️ Nenhum sinal captado (verifique mudo/volume)"
+        elif result['peak_db'] > -1.0:
+            verdict = "⚠️ Sinal saturando (reduza o ganho)"
+        else:
+            verdict = "✅ Sinal captado"
+        message = (
+            f"{verdict}\n\n{title}\nNome: {result['name']}\nÍndice: {result['index']}\nCanais: {result['channels']}\n"
+            f"Taxa Padrão: {result.get('default_sample_rate') or 'N/A'} Hz\n\n"
+            f"Nível RMS: {result['rms_db']:.1f} dBFS • Pico: {result['peak_db']:.1f} dBFS\n"
+            f"Blocos recebidos: {result['callbacks']} • xruns: {result['xruns']}"
+        )
+        messagebox.showinfo("Teste de Dispositivo", message, parent=self.window)
     
     def save_settings(self):
         """Salvar configurações"""
         try:
-            import json
-            from pathlib import Path
+            config_manager = self.app.config_manager
             
-            # Criar diretório se não existir
-            config_dir = Path("config")
-            config_dir.mkdir(exist_ok=True)
+            # Chaves API (somente se fornecidas) e provedor preferido
+            api_updates = {"ai_provider": self.ai_provider_var.get()}
             
-            # Carregar configurações existentes de API
-            api_config_file = config_dir / "api_keys.json"
-            if api_config_file.exists():
-                with open(api_config_file, 'r') as f:
-                    api_config = json.load(f)
-            else:
-                api_config = {}
-            
-            # Salvar chaves API se fornecidas
             openai_key = self.openai_key_var.get()
             if openai_key and not openai_key.startswith('*'):
-                api_config["openai_api_key"] = openai_key
+                api_updates["openai_api_key"] = openai_key
             
             gemini_key = self.gemini_key_var.get()
             if gemini_key and not gemini_key.startswith('*'):
-                api_config["gemini_api_key"] = gemini_key
-            
-            # Salvar provedor preferido
-            api_config["ai_provider"] = self.ai_provider_var.get()
-            
-            # Salvar arquivo de API
-            with open(api_config_file, 'w') as f:
-                json.dump(api_config, f, indent=2)
+                api_updates["gemini_api_key"] = gemini_key
             
-            # Recarregar configurações nos módulos
-            self.app.transcriber.load_config()
-            self.app.summarizer.load_config()
-            
-            # Salvar configurações de áudio
-            settings_file = config_dir / "settings.json"
-            
-            # Carregar configurações existentes ou usar padrão
-            if settings_file.exists():
-                with open(settings_file, 'r') as f:
-                    settings = json.load(f)
-            else:
-                settings = {
-                    "audio": {
-                        "sample_rate": 44100,
-                        "channels": 2,
-                        "chunk_size": 1024,
-                        "input_device": None
-                    },
-                    "ai": {
-                        "model": "gpt-3.5-turbo",
-                        "max_tokens": 1500,
-                        "temperature": 0.3,
-                        "language": "pt"
-                    },
-                    "ui": {
-                        "theme": "clam",
-                        "window_size": "900x700",
-                        "auto_save": False
-                    },
-                    "output": {
-                        "format": "txt",
-                        "directory": "outputs",
-                        "include_timestamp": True
-                    }
-                }
+            # Transcriber e Summarizer são notificados pelo ConfigManager
+            config_manager.update_api_keys(**api_updates)
             
             # Atualizar configurações de áudio
-            selected_text = self.device_var.get()
-            device_index = self.device_mapping.get(selected_text)
-            settings["audio"]["input_device"] = device_index
-            settings["audio"]["sample_rate"] = int(self.sample_rate_var.get())
-            settings["audio"]["record_system_audio"] = self.system_audio_var.get()
+            config_manager.update_section(
+                "audio",
+                input_device=self._selected_device_index(),
+                sample_rate=int(self.sample_rate_var.get()),
+                record_system_audio=self.system_audio_var.get()
+            )
             
-            # Salvar configurações
-            with open(settings_file, 'w') as f:
-                json.dump(settings, f, indent=2)
+            # Gravar agora: o usuário espera que "Salvar" persista imediatamente
+            config_manager.flush()
             
             # Aplicar configurações no gravador
             self.apply_audio_settings()
@@ -836,9 +992,7 @@ class SettingsWindow:
     def apply_audio_settings(self):
         """Aplicar configurações de áudio ao gravador"""
         try:
-            selected_text = self.device_var.get()
-            device_index = self.device_mapping.get(selected_text)
-            self.app.audio_recorder.set_input_device(device_index)
+            self.app.audio_recorder.set_input_device(self._selected_device_index())
             
             # Aplicar sample rate
             sample_rate = int(self.sample_rate_var.get())
@@ -857,22 +1011,30 @@ class SettingsWindow:
         print(f"Provedor de IA alterado para: {provider}")
     
     def check_system_audio(self):
-        """Verificar capacidade de gravação de áudio do sistema"""
+        """Verificar (em segundo plano) a capacidade de gravação de áudio do sistema"""
+        self._run_task("Verificando áudio do sistema...", self._probe_system_audio, self._show_system_audio_check)
+    
+    def _probe_system_audio(self):
+        """Segundo plano: procurar dispositivos de loopback"""
+        recorder = self.app.audio_recorder
+        can_record, message = recorder.check_system_audio_capability()
+        return can_record, message, recorder.get_system_audio_setup_instructions()
+    
+    def _show_system_audio_check(self, result):
+        """Exibir o resultado da verificação (thread do Tk)"""
+        can_record, message, instructions = result
         try:
-            can_record, message = self.app.audio_recorder.check_system_audio_capability()
-            
             if can_record:
                 messagebox.showinfo("✅ Áudio do Sistema", f"Captura de áudio do sistema disponível!\n\n{message}")
             else:
                 # Mostrar instruções para habilitar
-                instructions = self.app.audio_recorder.get_system_audio_setup_instructions()
-                result = messagebox.askyesno(
+                show_instructions = messagebox.askyesno(
                     "⚠️  Áudio do Sistema", 
                     f"Captura de áudio do sistema não disponível.\n\n{message}\n\nDeseja ver as instruções para habilitar?",
                     icon='warning'
                 )
                 
-                if result:
+                if show_instructions:
                     # Criar janela com instruções
                     instruction_window = tk.Toplevel(self.window)
                     instruction_window.title("Instruções - Áudio do Sistema")
@@ -898,24 +1060,17 @@ class SettingsWindow:
     def load_api_settings(self):
         """Carregar configurações de API das chaves já salvas"""
         try:
-            import json
-            from pathlib import Path
+            api_keys = self.app.config_manager.get_api_keys()
             
-            config_file = Path("config/api_keys.json")
-            if config_file.exists():
-                with open(config_file, 'r') as f:
-                    config = json.load(f)
-                    
-                    # Carregar chaves API (mostrar apenas asteriscos se existir)
-                    if config.get('openai_api_key'):
-                        self.openai_key_var.set('*' * 20)
-                    
-                    if config.get('gemini_api_key'):
-                        self.gemini_key_var.set('*' * 20)
-                    
-                    # Carregar provedor preferido
-                    provider = config.get('ai_provider', 'openai')
-                    self.ai_provider_var.set(provider)
+            # Carregar chaves API (mostrar apenas asteriscos se existir)
+            if api_keys.openai_api_key:
+                self.openai_key_var.set('*' * 20)
+            
+            if api_keys.gemini_api_key:
+                self.gemini_key_var.set('*' * 20)
+            
+            # Carregar provedor preferido
+            self.ai_provider_var.set(api_keys.ai_provider)
                     
         except Exception as e:
             print(f"Erro ao carregar configurações de API: {e}")
\ No newline at end of file
@@ -0,0 +1,138 @@
+"""
+Janela de busca em texto livre nas transcrições e resumos do catálogo
+"""
+
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+from datetime import datetime
+
+KIND_LABELS = {"segment": "Transcrição", "transcript": "Transcrição", "summary": "Resumo"}
+
+# Espera (ms) após a última tecla antes de buscar
+SEARCH_DEBOUNCE_MS = 300
+
+
+def format_ms(value):
+    """Formatar milissegundos como m:ss ou h:mm:ss"""
+    if value is None:
+        return ""
+    seconds = int(value) // 1000
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+
+class SearchWindow:
+    def __init__(self, parent, app, limit=200):
+        self.app = app
+        self.limit = limit
+        self.hits = {}
+        self._pending_search = None
+
+        self.window = tk.Toplevel(parent)
+        self.window.title("Buscar nas Reuniões")
+        self.window.geometry("850x500")
+        self.window.transient(parent)
+
+        self.setup_ui()
+        self.query_entry.focus_set()
+
+    def setup_ui(self):
+        """Configurar interface da busca"""
+        main_frame = ttk.Frame(self.window, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        main_frame.columnconfigure(0, weight=1)
+        main_frame.rowconfigure(1, weight=1)
+
+        # Campo de busca
+        query_frame = ttk.Frame(main_frame)
+        query_frame.grid(row=0, column=0, sticky=(tk.W, tk.E), pady=(0, 8))
+        query_frame.columnconfigure(0, weight=1)
+
+        self.query_var = tk.StringVar()
+        self.query_entry = ttk.Entry(query_frame, textvariable=self.query_var)
+        self.query_entry.grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 8))
+        self.query_entry.bind("<Return>", lambda event: self.run_search())
+        self.query_entry.bind("<KeyRelease>", self._on_key_release)
+
+        ttk.Button(query_frame, text="🔍 Buscar", command=self.run_search).grid(row=0, column=1)
+
+        # Resultados
+        columns = ("date", "time", "kind", "snippet")
+        self.results_tree = ttk.Treeview(main_frame, columns=columns, show="headings", selectmode="browse")
+        self.results_tree.heading("date", text="Data")
+        self.results_tree.heading("time", text="Tempo")
+        self.results_tree.heading("kind", text="Tipo")
+        self.results_tree.heading("snippet", text="Trecho")
+        self.results_tree.column("date", width=120, stretch=False)
+        self.results_tree.column("time", width=70, stretch=False, anchor=tk.E)
+        self.results_tree.column("kind", width=90, stretch=False)
+        self.results_tree.column("snippet", width=520)
+        self.results_tree.grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.results_tree.bind("<Double-1>", self._on_open)
+        self.results_tree.bind("<Return>", self._on_open)
+
+        scrollbar = ttk.Scrollbar(main_frame, orient=tk.VERTICAL, command=self.results_tree.yview)
+        scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        self.results_tree.configure(yscrollcommand=scrollbar.set)
+
+        self.status_label = ttk.Label(main_frame, text="Digite termos para buscar (use aspas para frases exatas)")
+        self.status_label.grid(row=2, column=0, sticky=tk.W, pady=(8, 0))
+
+    def _on_key_release(self, event):
+        """Buscar enquanto digita, após uma pausa"""
+        if event.keysym == "Return":
+            return
+        if self._pending_search is not None:
+            self.window.after_cancel(self._pending_search)
+        self._pending_search = self.window.after(SEARCH_DEBOUNCE_MS, self.run_search)
+
+    def run_search(self):
+        """Executar a busca e preencher a lista de resultados"""
+        if self._pending_search is not None:
+            self.window.after_cancel(self._pending_search)
+            self._pending_search = None
+
+        query = self.query_var.get().strip()
+        self.results_tree.delete(*self.results_tree.get_children())
+        self.hits = {}
+        if not query:
+            self.status_label.configure(text="Digite termos para buscar (use aspas para frases exatas)")
+            return
+
+        try:
+            started = time.perf_counter()
+            hits = self.app.pipeline.catalog.search(query, limit=self.limit)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        except Exception as e:
+            self.status_label.configure(text=f"Erro na busca: {e}")
+            return
+
+        for hit in hits:
+            created = datetime.fromtimestamp(hit["created_at"]).strftime("%d/%m/%Y %H:%M")
+            item = self.results_tree.insert("", tk.END, values=(
+                created,
+                format_ms(hit["start_ms"]) if hit["kind"] == "segment" else "",
+                KIND_LABELS.get(hit["kind"], hit["kind"]),
+                " ".join(hit["snippet"].split()),
+            ))
+            self.hits[item] = hit
+
+        suffix = "+" if len(hits) >= self.limit else ""
+        self.status_label.configure(text=f"{len(hits)}{suffix} resultado(s) em {elapsed_ms:.0f} ms")
+
+    def _on_open(self, event):
+        """Abrir a reunião do resultado selecionado na janela principal"""
+        selection = self.results_tree.selection()
+        if not selection:
+            return
+        hit = self.hits.get(selection[0])
+        if hit is None:
+            return
+        try:
+            self.app.open_recording(hit["recording_id"], hit["start_ms"] if hit["kind"] == "segment" else None)
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro ao abrir reunião: {e}", parent=self.window)
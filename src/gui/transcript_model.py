@@ -0,0 +1,130 @@
+"""
+Transcrição ao vivo incremental (modelo + ligação com o widget de texto)
+
+O ``TranscriptModel`` guarda os trechos por chave (número do chunk) em ordem e
+devolve, a cada alteração, só o que mudou. O ``IncrementalTranscriptView``
+aplica essas mudanças num ``tk.Text``: cada trecho começa numa marca
+``seg-<chave>``, então um trecho novo é inserido antes da marca do seguinte e
+um trecho corrigido é trocado entre a sua marca e a do próximo. O custo de
+cada atualização é proporcional ao texto novo, não ao tamanho da reunião.
+
+``submit`` pode ser chamado de qualquer thread; as chamadas feitas antes da
+interface atender são agrupadas num único ``root.after``. Este módulo não
+importa tkinter.
+"""
+
+import threading
+from bisect import bisect_left
+from collections import namedtuple
+
+# Alteração de um trecho: next_key é a chave do trecho seguinte (None = fim)
+SegmentChange = namedtuple("SegmentChange", "key next_key old_text new_text")
+
+MARK_PREFIX = "seg-"
+
+
+class TranscriptModel:
+    """Trechos da transcrição ordenados por chave, com contagem de palavras incremental"""
+
+    def __init__(self):
+        self._keys = []
+        self._texts = {}
+        self.word_count = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._texts
+
+    def set(self, key, text):
+        """Definir o texto do trecho ``key``; retorna a SegmentChange ou None se nada mudou"""
+        text = (text or "").strip()
+        old = self._texts.get(key)
+        if not text or text == old:
+            return None
+
+        position = bisect_left(self._keys, key)
+        if old is None:
+            self._keys.insert(position, key)
+        next_key = self._keys[position + 1] if position + 1 < len(self._keys) else None
+        self._texts[key] = text
+        self.word_count += len(text.split()) - (len(old.split()) if old else 0)
+        return SegmentChange(key, next_key, old, text)
+
+    def segments(self):
+        return [(key, self._texts[key]) for key in self._keys]
+
+    @property
+    def text(self):
+        """Texto completo (O(tamanho); use só para salvar/exportar)"""
+        return " ".join(self._texts[key] for key in self._keys)
+
+    def clear(self):
+        self._keys = []
+        self._texts = {}
+        self.word_count = 0
+
+
+class IncrementalTranscriptView:
+    """Liga um TranscriptModel a um widget ``tk.Text`` com inserções pontuais"""
+
+    def __init__(self, root, widget, on_update=None):
+        self.root = root
+        self.widget = widget
+        self.model = TranscriptModel()
+        # Chamado na thread da interface após cada lote aplicado: on_update(model)
+        self.on_update = on_update
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._scheduled = False
+
+    def submit(self, key, text):
+        """Enfileirar o trecho ``key`` (qualquer thread); aplicado no próximo ciclo da interface"""
+        with self._lock:
+            self._pending[key] = text
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.root.after(0, self.flush)
+
+    def flush(self):
+        """Aplicar os trechos pendentes (thread da interface). Retorna quantos mudaram"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._scheduled = False
+
+        applied = 0
+        for key in sorted(pending):
+            change = self.model.set(key, pending[key])
+            if change is not None:
+                self._apply(change)
+                applied += 1
+        if applied and self.on_update:
+            self.on_update(self.model)
+        return applied
+
+    def _apply(self, change):
+        widget = self.widget
+        mark = f"{MARK_PREFIX}{change.key}"
+        if change.next_key is not None:
+            end = widget.index(f"{MARK_PREFIX}{change.next_key}")
+        else:
+            end = widget.index("end-1c")
+
+        if change.old_text is None:
+            start = end
+        else:
+            start = widget.index(mark)
+            widget.delete(start, end)
+        widget.insert(start, change.new_text + " ")
+        # A marca tem gravidade à direita: reposicionar no início do trecho
+        widget.mark_set(mark, start)
+
+    def reset(self):
+        """Esquecer os trechos (o conteúdo do widget é responsabilidade de quem chama)"""
+        with self._lock:
+            self._pending = {}
+        for key, _ in self.model.segments():
+            self.widget.mark_unset(f"{MARK_PREFIX}{key}")
+        self.model.clear()
@@ -0,0 +1,240 @@
+"""
+Visualização paginada da transcrição (reuniões de várias horas)
+
+O ``SegmentStore`` guarda os segmentos (``start_ms``/``end_ms``/``text``, os
+mesmos do catálogo) e responde às buscas e aos saltos por tempo sem montar o
+texto completo. O ``TranscriptPager`` materializa no ``tk.Text`` só a página
+atual (``PAGE_SEGMENTS`` segmentos, uma linha cada com o horário): o layout do
+Tk fica proporcional à página, não à reunião.
+
+Transcrições sem segmentos (reuniões antigas, Gemini) são divididas em blocos
+de ``FALLBACK_SEGMENT_WORDS`` palavras, sem horário. Este módulo não importa
+tkinter.
+"""
+
+import re
+from bisect import bisect_right
+
+# Segmentos materializados por página (~10 min de fala com segmentos do Whisper)
+PAGE_SEGMENTS = 150
+# Tamanho dos blocos quando a transcrição não tem segmentos com horário
+FALLBACK_SEGMENT_WORDS = 80
+
+HIT_TAG = "search_hit"
+CURRENT_TAG = "current_segment"
+
+
+def format_timestamp(ms):
+    """Milissegundos -> ``HH:MM:SS``"""
+    seconds = max(0, int(ms)) // 1000
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def parse_timestamp(text):
+    """``HH:MM:SS``, ``MM:SS`` ou segundos -> milissegundos (ValueError se inválido)"""
+    parts = text.strip().split(":")
+    if not 1 <= len(parts) <= 3 or not all(part.strip().isdigit() for part in parts):
+        raise ValueError(f"Horário inválido: {text!r} (use HH:MM:SS)")
+    seconds = 0
+    for part in parts:
+        seconds = seconds * 60 + int(part)
+    return seconds * 1000
+
+
+class SegmentStore:
+    """Segmentos da transcrição com índice por tempo e busca sem texto completo"""
+
+    def __init__(self, segments=None, text=""):
+        self.source_text = text or ""
+        segments = [s for s in (segments or []) if (s.get("text") or "").strip()]
+        if segments:
+            segments.sort(key=lambda s: s["start_ms"])
+            self.timed = True
+            self._starts = [int(s["start_ms"]) for s in segments]
+            self._ends = [int(s["end_ms"]) for s in segments]
+            self._texts = [s["text"].strip() for s in segments]
+        else:
+            self.timed = False
+            words = self.source_text.split()
+            self._texts = [
+                " ".join(words[i:i + FALLBACK_SEGMENT_WORDS]) for i in range(0, len(words), FALLBACK_SEGMENT_WORDS)
+            ]
+            self._starts = self._ends = None
+        self._folded = None
+
+    def __len__(self):
+        return len(self._texts)
+
+    def text_at(self, index):
+        return self._texts[index]
+
+    def start_ms(self, index):
+        return self._starts[index] if self.timed else None
+
+    @property
+    def duration_ms(self):
+        return self._ends[-1] if self.timed and self._ends else 0
+
+    def index_at(self, ms):
+        """Índice do segmento em andamento no instante ``ms``"""
+        if not self.timed or not self._texts:
+            return 0
+        return max(0, min(len(self._texts) - 1, bisect_right(self._starts, ms) - 1))
+
+    def _folded_texts(self):
+        # Minúsculas calculadas uma única vez, na primeira busca
+        if self._folded is None:
+            self._folded = [text.lower() for text in self._texts]
+        return self._folded
+
+    def search(self, query, index=0, offset=0):
+        """Próxima ocorrência de ``query`` a partir de (index, offset), com volta ao início
+
+        Retorna ``(índice, offset)`` ou None. A busca ignora maiúsculas e não
+        atravessa segmentos.
+        """
+        query = query.strip().lower()
+        texts = self._folded_texts()
+        if not query or not texts:
+            return None
+        count = len(texts)
+        index = min(max(index, 0), count - 1)
+        for step in range(count + 1):
+            current = (index + step) % count
+            start = offset if step == 0 else 0
+            position = texts[current].find(query, start)
+            if position >= 0:
+                return current, position
+        return None
+
+    def find_in_range(self, query, first, last):
+        """Todas as ocorrências de ``query`` nos segmentos [first, last)"""
+        query = query.strip().lower()
+        if not query:
+            return []
+        texts = self._folded_texts()
+        hits = []
+        for index in range(first, min(last, len(texts))):
+            for match in re.finditer(re.escape(query), texts[index]):
+                hits.append((index, match.start()))
+        return hits
+
+    def write_to(self, handle):
+        """Escrever a transcrição num arquivo aberto, sem montar uma string única"""
+        if self.source_text:
+            handle.write(self.source_text)
+            return
+        for index, text in enumerate(self._texts):
+            if index:
+                handle.write(" ")
+            handle.write(text)
+
+
+class TranscriptPager:
+    """Mostra uma página de segmentos por vez num widget ``tk.Text``"""
+
+    def __init__(self, widget, page_size=PAGE_SEGMENTS, on_page=None):
+        self.widget = widget
+        self.page_size = page_size
+        # Chamado após renderizar uma página: on_page(pager)
+        self.on_page = on_page
+        self.store = SegmentStore()
+        self.page = 0
+        self._offsets = []
+        self._query = ""
+        self._last_hit = None
+
+    @property
+    def page_count(self):
+        return max(1, -(-len(self.store) // self.page_size))
+
+    @property
+    def page_range(self):
+        """Índices [primeiro, último) dos segmentos da página atual"""
+        first = self.page * self.page_size
+        return first, min(first + self.page_size, len(self.store))
+
+    def load(self, store):
+        self.store = store
+        self._query = ""
+        self._last_hit = None
+        self.show_page(0)
+
+    def clear(self):
+        self.load(SegmentStore())
+
+    def _prefix(self, index):
+        return f"[{format_timestamp(self.store.start_ms(index))}] " if self.store.timed else ""
+
+    def show_page(self, page):
+        """Substituir o conteúdo do widget pelos segmentos da página ``page``"""
+        self.page = min(max(page, 0), self.page_count - 1)
+        first, last = self.page_range
+        separator = "\n" if self.store.timed else "\n\n"
+        parts = []
+        self._offsets = []
+        position = 0
+        for index in range(first, last):
+            prefix = self._prefix(index)
+            text = self.store.text_at(index)
+            self._offsets.append(position + len(prefix))
+            parts.append(prefix + text + separator)
+            position += len(prefix) + len(text) + len(separator)
+
+        widget = self.widget
+        widget.delete("1.0", "end")
+        if parts:
+            widget.insert("1.0", "".join(parts))
+        if self._query:
+            self._highlight_page()
+        if self.on_page:
+            self.on_page(self)
+
+    def _index(self, segment, offset=0):
+        """Índice do Tk para o caractere ``offset`` do segmento ``segment`` (da página atual)"""
+        return f"1.0+{self._offsets[segment - self.page_range[0]] + offset}c"
+
+    def _show_segment(self, segment):
+        page = segment // self.page_size
+        if page != self.page:
+            self.show_page(page)
+
+    def jump_to_time(self, ms):
+        """Ir até o segmento em andamento em ``ms`` e destacá-lo; retorna o índice"""
+        if not len(self.store):
+            return None
+        segment = self.store.index_at(ms)
+        self._show_segment(segment)
+        widget = self.widget
+        widget.tag_remove(CURRENT_TAG, "1.0", "end")
+        start = self._index(segment)
+        widget.tag_add(CURRENT_TAG, start, f"{start}+{len(self.store.text_at(segment))}c")
+        widget.see(start)
+        return segment
+
+    def search_next(self, query):
+        """Destacar as ocorrências de ``query`` e ir até a próxima; retorna (índice, offset) ou None"""
+        query = query.strip()
+        if query.lower() != self._query.lower():
+            self._query = query
+            self._last_hit = None
+            self._highlight_page()
+        if self._last_hit is None:
+            hit = self.store.search(query, self.page_range[0], 0)
+        else:
+            index, offset = self._last_hit
+            hit = self.store.search(query, index, offset + 1)
+        self._last_hit = hit
+        if hit is None:
+            return None
+        self._show_segment(hit[0])
+        self.widget.see(self._index(*hit))
+        return hit
+
+    def _highlight_page(self):
+        widget = self.widget
+        widget.tag_remove(HIT_TAG, "1.0", "end")
+        first, last = self.page_range
+        for index, offset in self.store.find_in_range(self._query, first, last):
+            start = self._index(index, offset)
+            widget.tag_add(HIT_TAG, start, f"{start}+{len(self._query)}c")
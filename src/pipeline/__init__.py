@@ -0,0 +1 @@
+# Módulo de pipeline de processamento - inicialização
\ No newline at end of file
@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""Fila persistente de processamento pós-gravação.
+
+Cada gravação vira um *job* salvo em SQLite (``data/jobs.db``) que avança
+pelas etapas ``recorded → encoded → transcribed → summarized → archived``. O
+estado é gravado a cada transição; se a aplicação fechar ou travar no meio da
+transcrição, o job é retomado da última etapa concluída na próxima
+inicialização. Cada etapa tem seu próprio pool de threads com concorrência
+limitada, e as etapas atendem os jobs na ordem de chegada.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from src.utils.tracing import get_tracer
+
+STAGES = ["recorded", "encoded", "transcribed", "summarized", "archived"]
+NEXT_STAGE = {current: following for current, following in zip(STAGES, STAGES[1:])}
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+DEFAULT_CONCURRENCY = {"encoded": 1, "transcribed": 2, "summarized": 2, "archived": 1}
+
+# Campos que um handler pode atualizar além de ``metadata``
+_UPDATABLE = {"audio_path", "template", "transcript", "summary"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    audio_path TEXT NOT NULL,
+    template TEXT,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    transcript TEXT,
+    summary TEXT,
+    error TEXT,
+    metadata TEXT NOT NULL DEFAULT '{}',
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+"""
+
+
+class Job:
+    """Fotografia de uma linha da tabela ``jobs``."""
+
+    def __init__(self, row: sqlite3.Row):
+        self.id: int = row["id"]
+        self.audio_path: str = row["audio_path"]
+        self.template: Optional[str] = row["template"]
+        self.stage: str = row["stage"]
+        self.status: str = row["status"]
+        self.attempts: int = row["attempts"]
+        self.transcript: Optional[str] = row["transcript"]
+        self.summary: Optional[str] = row["summary"]
+        self.error: Optional[str] = row["error"]
+        self.metadata: dict = json.loads(row["metadata"] or "{}")
+        self.created_at: float = row["created_at"]
+        self.updated_at: float = row["updated_at"]
+
+    @property
+    def next_stage(self) -> Optional[str]:
+        return NEXT_STAGE.get(self.stage)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (STATUS_DONE, STATUS_FAILED)
+
+    def __repr__(self) -> str:
+        return f"Job(id={self.id}, stage={self.stage}, status={self.status})"
+
+
+class JobStore:
+    """Persistência dos jobs em SQLite (seguro para várias threads)."""
+
+    def __init__(self, db_path: str | Path = "data/jobs.db"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def create(self, audio_path: str, template: Optional[str] = None, metadata: Optional[dict] = None) -> Job:
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (audio_path, template, stage, status, metadata, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (str(audio_path), template, STAGES[0], STATUS_PENDING, json.dumps(metadata or {}), now, now),
+            )
+            job_id = cursor.lastrowid
+        return self.get(job_id)
+
+    def get(self, job_id: int) -> Job:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Job {job_id} não encontrado")
+        return Job(row)
+
+    def list(self, statuses: Optional[List[str]] = None) -> List[Job]:
+        query = "SELECT * FROM jobs"
+        params: tuple = ()
+        if statuses:
+            query += f" WHERE status IN ({', '.join('?' for _ in statuses)})"
+            params = tuple(statuses)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY id", params).fetchall()
+        return [Job(row) for row in rows]
+
+    def unfinished(self) -> List[Job]:
+        return self.list([STATUS_PENDING, STATUS_RUNNING])
+
+    def mark_running(self, job_id: int) -> Job:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (STATUS_RUNNING, time.time(), job_id),
+            )
+        return self.get(job_id)
+
+    def advance(self, job_id: int, stage: str, updates: Optional[dict] = None) -> Job:
+        """Registrar a conclusão de ``stage`` com os campos produzidos pela etapa."""
+        updates = dict(updates or {})
+        metadata_updates = updates.pop("metadata", None)
+        unknown = set(updates) - _UPDATABLE
+        if unknown:
+            raise KeyError(f"Campos inválidos para o job: {', '.join(sorted(unknown))}")
+
+        status = STATUS_DONE if stage not in NEXT_STAGE else STATUS_PENDING
+        assignments = ["stage = ?", "status = ?", "attempts = 0", "error = NULL", "updated_at = ?"]
+        params: list = [stage, status, time.time()]
+        for column, value in updates.items():
+            assignments.append(f"{column} = ?")
+            params.append(value)
+
+        with self._lock:
+            if metadata_updates:
+                row = self._conn.execute("SELECT metadata FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                metadata = json.loads(row["metadata"] or "{}") if row else {}
+                metadata.update(metadata_updates)
+                assignments.append("metadata = ?")
+                params.append(json.dumps(metadata))
+            self._conn.execute(f"UPDATE jobs SET {', '.join(assignments)} WHERE id = ?", (*params, job_id))
+        return self.get(job_id)
+
+    def fail(self, job_id: int, error: str, final: bool) -> Job:
+        """Registrar erro; com ``final`` o job para, senão volta a ficar pendente."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                (STATUS_FAILED if final else STATUS_PENDING, error, time.time(), job_id),
+            )
+        return self.get(job_id)
+
+    def requeue_interrupted(self) -> int:
+        """Jobs que estavam ``running`` quando o processo morreu voltam para a fila."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+                (STATUS_PENDING, time.time(), STATUS_RUNNING),
+            )
+            return cursor.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+StageHandler = Callable[[Job], Optional[dict]]
+JobListener = Callable[[Job, str], None]
+
+
+class JobRunner:
+    """Pools de workers por etapa que levam cada job até a última etapa.
+
+    ``handlers`` mapeia a etapa *a produzir* (``encoded``, ``transcribed``,
+    ``summarized``, ``archived``) para uma função que recebe o job e retorna
+    os campos a gravar (``transcript``, ``summary``, ``metadata``...). Exceções contam
+    como tentativa; após ``max_attempts`` o job é marcado como ``failed``.
+
+    Os ouvintes recebem ``(job, evento)`` com evento ``started``,
+    ``completed``, ``retrying`` ou ``failed``; são chamados nas threads dos
+    workers.
+
+    Cada execução de etapa é um span ``stage.<etapa>`` no trace ``job-<id>``
+    (``src/utils/tracing.py``); a tabela com o tempo de cada etapa é impressa
+    quando o job termina ou falha de vez.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        handlers: Dict[str, StageHandler],
+        concurrency: Optional[Dict[str, int]] = None,
+        max_attempts: int = 3,
+        retry_delay: float = 2.0,
+        tracer=None,
+    ):
+        self.store = store
+        self.tracer = tracer or get_tracer()
+        self.handlers = dict(handlers)
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        limits = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+        self._executors = {
+            stage: ThreadPoolExecutor(max_workers=max(1, limits.get(stage, 1)), thread_name_prefix=f"meetai-{stage}")
+            for stage in STAGES[1:]
+        }
+        self._listeners: List[JobListener] = []
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._closed = False
+
+    def add_listener(self, listener: JobListener) -> None:
+        self._listeners.append(listener)
+
+    def submit(self, audio_path: str, template: Optional[str] = None, metadata: Optional[dict] = None) -> Job:
+        """Criar o job (persistido imediatamente) e enfileirar a primeira etapa."""
+        job = self.store.create(audio_path, template, metadata)
+        self._schedule(job)
+        return job
+
+    def resume(self) -> List[Job]:
+        """Retomar jobs não concluídos (chamar na inicialização)."""
+        interrupted = self.store.requeue_interrupted()
+        jobs = self.store.unfinished()
+        if jobs:
+            print(f"[FILA] Retomando {len(jobs)} job(s) pendente(s) ({interrupted} interrompido(s)).")
+        for job in jobs:
+            self._schedule(job)
+        return jobs
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Bloquear até não haver etapas em execução ou agendadas."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return True
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Parar de aceitar trabalho; jobs interrompidos são retomados no próximo início."""
+        with self._lock:
+            self._closed = True
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    # ------------------------------------------------------------------
+    # Execução
+    # ------------------------------------------------------------------
+    def _schedule(self, job: Job, delay: float = 0.0) -> None:
+        stage = job.next_stage
+        if stage is None:
+            return
+        with self._lock:
+            if self._closed:
+                return
+            self._in_flight += 1
+        if delay > 0:
+            timer = threading.Timer(delay, self._submit_to_executor, args=(stage, job.id))
+            timer.daemon = True
+            timer.start()
+        else:
+            self._submit_to_executor(stage, job.id)
+
+    def _submit_to_executor(self, stage: str, job_id: int) -> None:
+        try:
+            self._executors[stage].submit(self._run_stage, stage, job_id)
+        except RuntimeError:
+            # Executor encerrado (aplicação fechando): o job fica pendente no banco
+            self._release()
+
+    def _release(self) -> None:
+        with self._idle:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._idle.notify_all()
+
+    def _run_stage(self, stage: str, job_id: int) -> None:
+        try:
+            job = self.store.mark_running(job_id)
+            self._emit(job, "started")
+            handler = self.handlers.get(stage)
+            trace_id = f"job-{job_id}"
+            try:
+                with self.tracer.trace(trace_id), self.tracer.span(f"stage.{stage}", job_id=job_id, attempt=job.attempts):
+                    updates = handler(job) if handler else None
+            except Exception as exc:
+                final = job.attempts >= self.max_attempts
+                job = self.store.fail(job_id, f"{stage}: {exc}", final=final)
+                print(f"[FILA] Job {job_id} falhou em '{stage}' (tentativa {job.attempts}): {exc}")
+                if final:
+                    self.tracer.end_trace(trace_id, title=f"Job {job_id} (falhou)")
+                    self._emit(job, "failed")
+                else:
+                    self._emit(job, "retrying")
+                    self._schedule(job, delay=self.retry_delay * job.attempts)
+                return
+
+            job = self.store.advance(job_id, stage, updates)
+            if job.finished:
+                self.tracer.end_trace(trace_id, title=f"Job {job_id}: {Path(job.audio_path).name}")
+            self._emit(job, "completed")
+            self._schedule(job)
+        except Exception as exc:
+            print(f"[FILA] Erro interno ao processar job {job_id}: {exc}")
+        finally:
+            self._release()
+
+    def _emit(self, job: Job, event: str) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(job, event)
+            except Exception as exc:
+                print(f"[AVISO] Ouvinte da fila gerou exceção: {exc}")
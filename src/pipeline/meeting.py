@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""Etapas do processamento de uma gravação sobre a fila persistente."""
+
+from __future__ import annotations
+
+import wave
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.pipeline.jobs import Job, JobListener, JobRunner, JobStore
+
+
+class MeetingPipeline:
+    """Liga Transcriber e Summarizer às etapas da fila de jobs.
+
+    - ``encoded``: valida o WAV gravado e registra duração, formato e níveis;
+    - ``transcribed``: transcrição completa do arquivo (com segmentos quando
+      o transcritor oferece ``transcribe_detailed``);
+    - ``summarized``: resumo com o template escolhido quando a gravação parou
+      (gravações sem fala seguem com transcrição e resumo vazios);
+    - ``archived``: compactação do áudio (``ArchiveStore``), quando configurada.
+
+    Com ``catalog`` (``RecordingCatalog``), cada etapa concluída é indexada.
+    Com ``archive``, as etapas leem o áudio do arquivo se o WAV original já
+    tiver sido removido.
+    """
+
+    def __init__(
+        self,
+        transcriber,
+        summarizer,
+        db_path: str | Path = "data/jobs.db",
+        concurrency: Optional[Dict[str, int]] = None,
+        max_attempts: int = 3,
+        retry_delay: float = 2.0,
+        catalog=None,
+        archive=None,
+    ):
+        self.transcriber = transcriber
+        self.summarizer = summarizer
+        self.catalog = catalog
+        self.archive = archive
+        self.store = JobStore(db_path)
+        self.runner = JobRunner(
+            self.store,
+            {
+                "encoded": self.encode,
+                "transcribed": self.transcribe,
+                "summarized": self.summarize,
+                "archived": self.archive_audio,
+            },
+            concurrency=concurrency,
+            max_attempts=max_attempts,
+            retry_delay=retry_delay,
+        )
+        if catalog is not None:
+            self.runner.add_listener(self._index_job)
+
+    def add_listener(self, listener: JobListener) -> None:
+        self.runner.add_listener(listener)
+
+    def submit(self, audio_path: str, template: Optional[str] = None) -> Job:
+        return self.runner.submit(str(audio_path), template or "auto")
+
+    def resume(self):
+        return self.runner.resume()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        return self.runner.wait_idle(timeout)
+
+    def shutdown(self, wait: bool = False) -> None:
+        self.runner.shutdown(wait=wait)
+
+    # ------------------------------------------------------------------
+    # Etapas
+    # ------------------------------------------------------------------
+    def _audio_file(self, job: Job):
+        """WAV legível da gravação (original ou decodificado do arquivo)."""
+        if self.archive is not None:
+            return self.archive.open_wav(job.audio_path)
+        if not Path(job.audio_path).exists():
+            raise FileNotFoundError(f"Arquivo de áudio não encontrado: {job.audio_path}")
+        return nullcontext(Path(job.audio_path))
+
+    def encode(self, job: Job) -> dict:
+        with self._audio_file(job) as audio_path:
+            return self._describe(audio_path)
+
+    def _describe(self, audio_path: Path) -> dict:
+        with wave.open(str(audio_path), "rb") as wf:
+            frames = wf.getnframes()
+            rate = wf.getframerate()
+            metadata = {
+                "sample_rate": rate,
+                "channels": wf.getnchannels(),
+                "duration": frames / float(rate) if rate else 0.0,
+            }
+        from src.audio.recorder import AudioProcessor
+
+        try:
+            peak_db, rms_db = AudioProcessor.analyze_file_levels(audio_path)
+            metadata.update(peak_db=_json_float(peak_db), rms_db=_json_float(rms_db))
+        except Exception as exc:
+            print(f"[AVISO] Não foi possível medir os níveis de {audio_path.name}: {exc}")
+        return {"metadata": metadata}
+
+    def transcribe(self, job: Job) -> dict:
+        with self._audio_file(job) as audio_path:
+            if hasattr(self.transcriber, "transcribe_detailed"):
+                result = self.transcriber.transcribe_detailed(str(audio_path))
+                if result and result.get("no_speech"):
+                    print(f"[FILA] Nenhuma fala em {Path(job.audio_path).name}; transcrição vazia registrada")
+                    return {"transcript": "", "metadata": {"segments": [], "no_speech": True}}
+                if not result:
+                    raise RuntimeError("transcrição vazia ou falhou")
+                return {"transcript": result["text"], "metadata": {"segments": result["segments"]}}
+
+            transcript = self.transcriber.transcribe(str(audio_path))
+        if not transcript:
+            raise RuntimeError("transcrição vazia ou falhou")
+        return {"transcript": transcript}
+
+    def summarize(self, job: Job) -> Optional[dict]:
+        if job.metadata.get("no_speech"):
+            return None
+        summary = self.summarizer.generate_summary(job.transcript or "", job.template or "auto")
+        if not summary:
+            raise RuntimeError("geração do resumo falhou")
+        return {"summary": summary}
+
+    def archive_audio(self, job: Job) -> Optional[dict]:
+        if self.archive is None:
+            return None
+        archive_path = self.archive.archive(job.audio_path)
+        if archive_path is None:
+            return None
+        return {"metadata": {"archive_path": str(archive_path)}}
+
+    # ------------------------------------------------------------------
+    # Catálogo
+    # ------------------------------------------------------------------
+    def _index_job(self, job: Job, event: str) -> None:
+        """Indexar no catálogo o resultado de cada etapa concluída."""
+        if event != "completed":
+            return
+        if job.stage == "encoded":
+            metadata = job.metadata
+            self.catalog.upsert_recording(
+                job.audio_path,
+                duration=metadata.get("duration"),
+                sample_rate=metadata.get("sample_rate"),
+                channels=metadata.get("channels"),
+                peak_db=metadata.get("peak_db"),
+                rms_db=metadata.get("rms_db"),
+                template=job.template,
+            )
+        elif job.stage == "transcribed":
+            self.catalog.set_transcript(job.audio_path, job.transcript or "", job.metadata.get("segments"))
+        elif job.stage == "summarized" and job.summary:
+            provider = getattr(self.summarizer, "ai_provider", None)
+            self.catalog.add_summary(job.audio_path, job.template or "auto", job.summary or "", provider)
+
+
+def _json_float(value: float) -> Optional[float]:
+    """-inf (silêncio total) não é JSON válido; vira None."""
+    value = float(value)
+    return None if value in (float("inf"), float("-inf")) or value != value else value
@@ -0,0 +1 @@
+# Módulo de armazenamento - inicialização
\ No newline at end of file
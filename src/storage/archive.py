@@ -0,0 +1,391 @@
+# -*- coding: utf-8 -*-
+"""Arquivamento compactado das gravações concluídas.
+
+Depois da transcrição, o WAV de ``data/`` (44,1 kHz estéreo, ~635 MB/h) é
+recodificado em ``data/archive/AAAA/MM/``:
+
+- ``flac``: sem perdas, ~2–3× menor (requer o pacote opcional ``soundfile``);
+- ``speech``: mono 16 kHz (a taxa usada pelo Whisper), ~5,5× menor em WAV e
+  ~10× em FLAC quando ``soundfile`` está disponível.
+
+A cópia é decodificada por inteiro antes de ser registrada; o WAV original só
+é apagado com ``delete_original`` ativado. ``open_wav`` /
+``read_audio`` leem do arquivo de forma transparente para retranscrição e
+diagnóstico. A retenção (``retention_days``) apaga apenas o áudio; a
+transcrição e os resumos continuam no catálogo.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+import wave
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+from src.storage.catalog import recording_timestamp
+from src.utils.tempspace import TempWorkspace
+
+ARCHIVE_FORMATS = ("flac", "speech")
+SPEECH_RATE = 16000
+BLOCK_FRAMES = 1 << 16
+
+
+def import_soundfile():
+    """``soundfile`` (libsndfile) é opcional: sem ele não há FLAC."""
+    try:
+        import soundfile
+    except (ImportError, OSError):
+        return None
+    return soundfile
+
+
+class SpeechResampler:
+    """Conversão em blocos para mono ``SPEECH_RATE`` com filtro anti-aliasing.
+
+    Filtro FIR (sinc janelado, corte em 45% da nova taxa) seguido de
+    interpolação linear; o atraso do filtro é compensado, então os tempos da
+    saída coincidem com os do original.
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int = SPEECH_RATE, num_taps: int = 127):
+        self.src_rate = src_rate
+        self.dst_rate = dst_rate
+        self.step = src_rate / float(dst_rate)
+        self.passthrough = dst_rate >= src_rate
+
+        cutoff = 0.45 * dst_rate / float(src_rate)
+        n = np.arange(num_taps) - (num_taps - 1) / 2.0
+        taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(num_taps)
+        self.taps = (taps / taps.sum()).astype(np.float32)
+        self._delay = (num_taps - 1) // 2
+        self._history = np.zeros(num_taps - 1, dtype=np.float32)
+        self._to_skip = self._delay
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._buffer_start = 0
+        self._next_pos = 0.0
+        self._consumed = 0
+        self._produced = 0
+
+    def process(self, mono: np.ndarray) -> np.ndarray:
+        mono = np.asarray(mono, dtype=np.float32)
+        self._consumed += mono.size
+        if self.passthrough:
+            self._produced += mono.size
+            return mono
+        return self._resample(self._filter(mono))
+
+    def flush(self) -> np.ndarray:
+        """Esvaziar o filtro no fim do arquivo."""
+        if self.passthrough:
+            return np.zeros(0, dtype=np.float32)
+        tail = self._resample(self._filter(np.zeros(self._delay + 2, dtype=np.float32)))
+        expected = int(round(self._consumed / self.step))
+        keep = max(0, expected - (self._produced - tail.size))
+        self._produced = self._produced - tail.size + min(keep, tail.size)
+        return tail[:keep]
+
+    def _filter(self, block: np.ndarray) -> np.ndarray:
+        padded = np.concatenate([self._history, block])
+        filtered = np.convolve(padded, self.taps, mode="valid")
+        self._history = padded[-self._history.size:] if self._history.size else self._history
+        if self._to_skip:
+            skip = min(self._to_skip, filtered.size)
+            filtered = filtered[skip:]
+            self._to_skip -= skip
+        return filtered
+
+    def _resample(self, filtered: np.ndarray) -> np.ndarray:
+        buffer = np.concatenate([self._buffer, filtered])
+        last = self._buffer_start + buffer.size - 2  # precisa de i e i + 1
+        if last < self._next_pos:
+            self._buffer = buffer
+            return np.zeros(0, dtype=np.float32)
+
+        count = int((last - self._next_pos) // self.step) + 1
+        positions = self._next_pos + self.step * np.arange(count)
+        index = np.floor(positions).astype(np.int64)
+        frac = (positions - index).astype(np.float32)
+        local = index - self._buffer_start
+        out = buffer[local] * (1.0 - frac) + buffer[local + 1] * frac
+
+        self._next_pos += count * self.step
+        drop = int(self._next_pos) - self._buffer_start
+        self._buffer = buffer[drop:]
+        self._buffer_start += drop
+        self._produced += out.size
+        return out
+
+
+def _to_int16(samples: np.ndarray) -> np.ndarray:
+    return np.clip(np.rint(samples), -32768, 32767).astype(np.int16)
+
+
+def _read_wav_blocks(path: Path) -> Iterator[np.ndarray]:
+    with wave.open(str(path), "rb") as wf:
+        channels = wf.getnchannels()
+        while True:
+            data = wf.readframes(BLOCK_FRAMES)
+            if not data:
+                break
+            yield np.frombuffer(data, dtype=np.int16).reshape(-1, channels)
+
+
+def _wav_info(path: Path) -> Tuple[int, int, int]:
+    with wave.open(str(path), "rb") as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError("Apenas WAV PCM de 16 bits é suportado")
+        return wf.getframerate(), wf.getnchannels(), wf.getnframes()
+
+
+class ArchiveStore:
+    """Compacta, localiza e lê gravações arquivadas registradas no catálogo."""
+
+    def __init__(self, catalog, settings=None, temp_dir: str | Path = "temp"):
+        if settings is None:
+            from src.utils.config_manager import StorageSettings
+
+            settings = StorageSettings()
+        self.catalog = catalog
+        self.settings = settings
+        self.archive_dir = Path(settings.archive_dir)
+        self.temp_dir = Path(temp_dir)
+        self._soundfile = import_soundfile()
+        self._warned = False
+        # Um arquivamento por gravação: a retomada da fila e o ``sweep`` podem
+        # chegar ao mesmo WAV ao mesmo tempo
+        self._locks: dict = {}
+        self._locks_guard = threading.Lock()
+
+    def update_settings(self, settings) -> None:
+        """Aplicar novas ``StorageSettings`` (ouvinte da seção "storage")."""
+        self.settings = settings
+        self.archive_dir = Path(settings.archive_dir)
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.archive_format in ARCHIVE_FORMATS
+
+    # ------------------------------------------------------------------
+    # Arquivamento
+    # ------------------------------------------------------------------
+    def archive(self, recording_path: str | Path) -> Optional[Path]:
+        """Compactar a gravação; retorna o caminho do arquivo ou None se desativado."""
+        if not self.enabled:
+            return None
+        fmt = self.settings.archive_format
+        if fmt == "flac" and self._soundfile is None:
+            if not self._warned:
+                print("[AVISO] Arquivamento FLAC requer 'pip install soundfile'; gravações mantidas em WAV.")
+                self._warned = True
+            return None
+
+        source = Path(recording_path)
+        with self._recording_lock(source):
+            return self._archive_locked(source, fmt)
+
+    @contextmanager
+    def _recording_lock(self, source: Path):
+        key = str(source.resolve())
+        with self._locks_guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            yield
+
+    def _archive_locked(self, source: Path, fmt: str) -> Path:
+        entry = self.catalog.get(source)
+        if entry and entry.get("archive_path") and Path(entry["archive_path"]).exists():
+            if self.settings.delete_original:
+                source.unlink(missing_ok=True)
+            return Path(entry["archive_path"])
+        try:
+            original_bytes = source.stat().st_size
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Arquivo de áudio não encontrado: {source}") from None
+
+        destination = self._destination_for(source, entry, fmt)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{destination.name}.", suffix=".tmp", dir=str(destination.parent))
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+        try:
+            if fmt == "flac":
+                expected_frames = self._encode_flac(source, tmp_path)
+            else:
+                expected_frames = self._encode_speech(source, tmp_path, destination.suffix)
+            if self._decoded_frames(tmp_path, destination.suffix) != expected_frames:
+                raise RuntimeError("verificação do arquivo compactado falhou")
+            os.replace(tmp_path, destination)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        archive_bytes = destination.stat().st_size
+        self.catalog.set_archive(source, destination, fmt, archive_bytes, original_bytes)
+        if self.settings.delete_original:
+            source.unlink(missing_ok=True)
+        ratio = original_bytes / archive_bytes if archive_bytes else 0.0
+        print(
+            f"[ARQUIVO] {source.name}: {original_bytes / 1e6:.1f} MB → "
+            f"{archive_bytes / 1e6:.1f} MB ({ratio:.1f}×, {fmt})"
+        )
+        return destination
+
+    def _destination_for(self, source: Path, entry: Optional[dict], fmt: str) -> Path:
+        created = (entry or {}).get("created_at") or recording_timestamp(source) or source.stat().st_mtime
+        month_dir = self.archive_dir / datetime.fromtimestamp(created).strftime("%Y/%m")
+        if fmt == "flac":
+            return month_dir / f"{source.stem}.flac"
+        suffix = ".flac" if self._soundfile is not None else ".wav"
+        return month_dir / f"{source.stem}.speech{suffix}"
+
+    def _encode_flac(self, source: Path, destination: Path) -> int:
+        rate, channels, frames = _wav_info(source)
+        with self._soundfile.SoundFile(
+            str(destination), "w", samplerate=rate, channels=channels, subtype="PCM_16", format="FLAC"
+        ) as out:
+            for block in _read_wav_blocks(source):
+                out.write(block)
+        return frames
+
+    def _encode_speech(self, source: Path, destination: Path, suffix: str) -> int:
+        rate, _, _ = _wav_info(source)
+        resampler = SpeechResampler(rate)
+        out_rate = resampler.dst_rate if not resampler.passthrough else rate
+        written = 0
+        with self._speech_writer(destination, suffix, out_rate) as write:
+            for block in _read_wav_blocks(source):
+                mono = block.astype(np.float32).mean(axis=1)
+                written += write(_to_int16(resampler.process(mono)))
+            written += write(_to_int16(resampler.flush()))
+        return written
+
+    @contextmanager
+    def _speech_writer(self, destination: Path, suffix: str, rate: int):
+        if suffix == ".flac":
+            with self._soundfile.SoundFile(
+                str(destination), "w", samplerate=rate, channels=1, subtype="PCM_16", format="FLAC"
+            ) as out:
+                def write(samples):
+                    out.write(samples)
+                    return samples.size
+
+                yield write
+        else:
+            with wave.open(str(destination), "wb") as out:
+                out.setnchannels(1)
+                out.setsampwidth(2)
+                out.setframerate(rate)
+
+                def write(samples):
+                    out.writeframes(samples.tobytes())
+                    return samples.size
+
+                yield write
+
+    def _decoded_frames(self, path: Path, suffix: str) -> int:
+        """Decodificar o arquivo inteiro; um FLAC corrompido falha aqui, não na leitura futura."""
+        if suffix == ".wav":
+            return sum(block.shape[0] for block in _read_wav_blocks(path))
+        with self._require_soundfile().SoundFile(str(path)) as archived:
+            return sum(
+                block.shape[0] for block in archived.blocks(blocksize=BLOCK_FRAMES, dtype="int16", always_2d=True)
+            )
+
+    def _require_soundfile(self):
+        if self._soundfile is None:
+            raise RuntimeError("Leitura de FLAC requer 'pip install soundfile'")
+        return self._soundfile
+
+    # ------------------------------------------------------------------
+    # Leitura transparente
+    # ------------------------------------------------------------------
+    def locate(self, recording_path: str | Path) -> Optional[Path]:
+        """Original em ``data/`` se ainda existir, senão a cópia arquivada."""
+        source = Path(recording_path)
+        if source.exists():
+            return source
+        entry = self.catalog.get(source)
+        if entry and entry.get("archive_path") and Path(entry["archive_path"]).exists():
+            return Path(entry["archive_path"])
+        return None
+
+    def read_audio(self, recording_path: str | Path) -> Tuple[np.ndarray, int]:
+        """Amostras int16 com forma (quadros, canais) e a taxa de amostragem."""
+        path = self.locate(recording_path)
+        if path is None:
+            raise FileNotFoundError(f"Áudio não disponível: {recording_path}")
+        if path.suffix.lower() == ".wav":
+            rate = _wav_info(path)[0]
+            blocks = list(_read_wav_blocks(path))
+            audio = np.concatenate(blocks) if blocks else np.zeros((0, 1), dtype=np.int16)
+            return audio, rate
+        audio, rate = self._require_soundfile().read(str(path), dtype="int16", always_2d=True)
+        return audio, rate
+
+    @contextmanager
+    def open_wav(self, recording_path: str | Path) -> Iterator[Path]:
+        """Caminho de um WAV legível (original ou decodificado em ``temp/``)."""
+        path = self.locate(recording_path)
+        if path is None:
+            raise FileNotFoundError(f"Áudio não disponível: {recording_path}")
+        if path.suffix.lower() == ".wav":
+            yield path
+            return
+
+        with TempWorkspace("archive", root=self.temp_dir) as workspace:
+            tmp_path = workspace.file(f"{Path(recording_path).stem}.wav")
+            soundfile = self._require_soundfile()
+            with soundfile.SoundFile(str(path)) as source, wave.open(str(tmp_path), "wb") as out:
+                out.setnchannels(source.channels)
+                out.setsampwidth(2)
+                out.setframerate(source.samplerate)
+                for block in source.blocks(blocksize=BLOCK_FRAMES, dtype="int16", always_2d=True):
+                    out.writeframes(block.tobytes())
+            yield tmp_path
+
+    # ------------------------------------------------------------------
+    # Manutenção
+    # ------------------------------------------------------------------
+    def apply_retention(self, now: Optional[float] = None) -> int:
+        """Apagar o áudio (cópia arquivada e WAV original) mais antigo que ``retention_days``.
+
+        A retenção vale para todo o áudio da gravação, independentemente de
+        ``delete_original``: o catálogo passa a registrá-lo como removido.
+        """
+        days = int(self.settings.retention_days or 0)
+        if days <= 0:
+            return 0
+        cutoff = (now or time.time()) - days * 86400
+        removed = 0
+        for entry in self.catalog.archived_before(cutoff):
+            original = Path(entry["path"])
+            with self._recording_lock(original):
+                Path(entry["archive_path"]).unlink(missing_ok=True)
+                original.unlink(missing_ok=True)
+                self.catalog.mark_audio_deleted(original)
+            removed += 1
+        if removed:
+            print(f"[ARQUIVO] Retenção de {days} dia(s): áudio de {removed} gravação(ões) removido.")
+        return removed
+
+    def sweep(self, limit: int = 100) -> int:
+        """Arquivar gravações transcritas que ficaram para trás e aplicar a retenção."""
+        archived = 0
+        if self.enabled:
+            for entry in self.catalog.pending_archive(limit):
+                if not Path(entry["path"]).exists():
+                    continue
+                try:
+                    if self.archive(entry["path"]) is not None:
+                        archived += 1
+                except Exception as exc:
+                    print(f"[AVISO] Falha ao arquivar {Path(entry['path']).name}: {exc}")
+        self.apply_retention()
+        return archived
@@ -0,0 +1,512 @@
+# -*- coding: utf-8 -*-
+"""Catálogo das gravações em SQLite (``data/catalog.db``).
+
+Liga cada ``data/recording_<timestamp>.wav`` à sua duração, níveis
+(``AudioProcessor.analyze_levels``), transcrição com segmentos, resumos e
+arquivos exportados, com índices para buscas por data, duração e template.
+É preenchido pela fila de processamento à medida que cada etapa conclui.
+
+Segmentos e resumos também entram, de forma incremental, em um índice FTS5
+(``search_index``) consultado por ``search`` — ver ``src.storage.search``.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import time
+import wave
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence
+
+from src.storage.search import FTS_TOKENIZE, build_match_query
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS recordings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL UNIQUE,
+    created_at REAL NOT NULL,
+    duration REAL,
+    sample_rate INTEGER,
+    channels INTEGER,
+    peak_db REAL,
+    rms_db REAL,
+    template TEXT,
+    transcript TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_recordings_created ON recordings(created_at);
+CREATE INDEX IF NOT EXISTS idx_recordings_duration ON recordings(duration);
+CREATE INDEX IF NOT EXISTS idx_recordings_template ON recordings(template);
+
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recording_id INTEGER NOT NULL REFERENCES recordings(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    start_ms INTEGER NOT NULL,
+    end_ms INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_segments_recording ON segments(recording_id, start_ms);
+
+CREATE TABLE IF NOT EXISTS summaries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recording_id INTEGER NOT NULL REFERENCES recordings(id) ON DELETE CASCADE,
+    template TEXT NOT NULL,
+    provider TEXT,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_summaries_recording ON summaries(recording_id);
+CREATE INDEX IF NOT EXISTS idx_summaries_template ON summaries(template);
+
+CREATE TABLE IF NOT EXISTS exports (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recording_id INTEGER NOT NULL REFERENCES recordings(id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_exports_recording ON exports(recording_id);
+
+CREATE TABLE IF NOT EXISTS search_docs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recording_id INTEGER NOT NULL REFERENCES recordings(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    start_ms INTEGER,
+    end_ms INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_search_docs_recording ON search_docs(recording_id, kind);
+"""
+
+# rowid do search_index == search_docs.id; o texto fica só no índice
+_FTS_SCHEMA = f"""
+CREATE VIRTUAL TABLE search_index USING fts5(
+    text,
+    tokenize = '{FTS_TOKENIZE}',
+    prefix = '2 3'
+)
+"""
+
+# Colunas acrescentadas depois da primeira versão do catálogo (migração via ALTER TABLE)
+_MIGRATED_COLUMNS = {
+    "archive_path": "TEXT",
+    "archive_format": "TEXT",
+    "archive_bytes": "INTEGER",
+    "original_bytes": "INTEGER",
+    "archived_at": "REAL",
+    "audio_deleted_at": "REAL",
+}
+
+_RECORDING_NAME = re.compile(r"recording_(\d{8}_\d{6})")
+
+# Colunas da tabela recordings que podem ser atualizadas por upsert_recording
+_RECORDING_FIELDS = ("created_at", "duration", "sample_rate", "channels", "peak_db", "rms_db", "template")
+
+
+def recording_timestamp(path: str | Path) -> Optional[float]:
+    """Data da gravação a partir do nome ``recording_YYYYmmdd_HHMMSS.wav``."""
+    match = _RECORDING_NAME.search(Path(path).stem)
+    if not match:
+        return None
+    try:
+        return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").timestamp()
+    except ValueError:
+        return None
+
+
+def _finite(value):
+    """SQLite não guarda -inf de forma portável; silêncio total vira NULL."""
+    if value is None:
+        return None
+    value = float(value)
+    return value if value == value and abs(value) != float("inf") else None
+
+
+class RecordingCatalog:
+    """Índice persistente das gravações (seguro para várias threads)."""
+
+    def __init__(self, db_path: str | Path = "data/catalog.db"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(_SCHEMA)
+            self._migrate()
+            self.fts_enabled, created = self._ensure_search_index()
+        if created:
+            # Catálogo anterior ao índice: indexar o que já existe
+            self.rebuild_search_index()
+
+    def _migrate(self):
+        existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(recordings)")}
+        for column, column_type in _MIGRATED_COLUMNS.items():
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE recordings ADD COLUMN {column} {column_type}")
+
+    def _ensure_search_index(self):
+        """Criar a tabela FTS5; retorna (disponível, criada_agora)."""
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'"
+        ).fetchone()
+        if exists:
+            return True, False
+        try:
+            self._conn.execute(_FTS_SCHEMA)
+        except sqlite3.OperationalError as exc:
+            print(f"[AVISO] SQLite sem suporte a FTS5 ({exc}); busca em texto desativada.")
+            return False, False
+        return True, True
+
+    @staticmethod
+    def _key(path: str | Path) -> str:
+        return str(Path(path).resolve())
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+    def upsert_recording(self, path: str | Path, **fields) -> int:
+        """Criar ou atualizar a gravação; campos ``None`` não sobrescrevem valores."""
+        unknown = set(fields) - set(_RECORDING_FIELDS)
+        if unknown:
+            raise KeyError(f"Campos inválidos para a gravação: {', '.join(sorted(unknown))}")
+        for name in ("peak_db", "rms_db"):
+            if name in fields:
+                fields[name] = _finite(fields[name])
+        values = {name: value for name, value in fields.items() if value is not None}
+
+        key = self._key(path)
+        now = time.time()
+        created_at = values.pop("created_at", None) or recording_timestamp(path) or now
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO recordings (path, created_at, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(path) DO NOTHING",
+                (key, created_at, now),
+            )
+            if values:
+                assignments = ", ".join(f"{name} = ?" for name in values)
+                self._conn.execute(
+                    f"UPDATE recordings SET {assignments}, updated_at = ? WHERE path = ?",
+                    (*values.values(), now, key),
+                )
+            row = self._conn.execute("SELECT id FROM recordings WHERE path = ?", (key,)).fetchone()
+        return row["id"]
+
+    def set_transcript(self, path: str | Path, transcript: str, segments: Optional[Iterable[dict]] = None) -> int:
+        """Gravar a transcrição e substituir os segmentos (``start_ms``/``end_ms``/``text``)."""
+        recording_id = self.upsert_recording(path)
+        rows = [
+            (recording_id, position, int(segment["start_ms"]), int(segment["end_ms"]), segment["text"].strip())
+            for position, segment in enumerate(segments or [])
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "UPDATE recordings SET transcript = ?, updated_at = ? WHERE id = ?",
+                    (transcript, time.time(), recording_id),
+                )
+                self._conn.execute("DELETE FROM segments WHERE recording_id = ?", (recording_id,))
+                self._conn.executemany(
+                    "INSERT INTO segments (recording_id, position, start_ms, end_ms, text) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._index_transcript_locked(recording_id, transcript, rows)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return recording_id
+
+    def add_summary(self, path: str | Path, template: str, content: str, provider: Optional[str] = None) -> int:
+        recording_id = self.upsert_recording(path, template=template)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                cursor = self._conn.execute(
+                    "INSERT INTO summaries (recording_id, template, provider, content, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (recording_id, template, provider, content, time.time()),
+                )
+                self._index_doc_locked(recording_id, "summary", content)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return cursor.lastrowid
+
+    def add_export(self, path: str | Path, export_path: str | Path) -> int:
+        """Registrar um arquivo salvo pelo usuário a partir desta gravação."""
+        recording_id = self.upsert_recording(path)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO exports (recording_id, path, created_at) VALUES (?, ?, ?)",
+                (recording_id, str(Path(export_path).resolve()), time.time()),
+            )
+            return cursor.lastrowid
+
+    # ------------------------------------------------------------------
+    # Arquivamento
+    # ------------------------------------------------------------------
+    def set_archive(self, path, archive_path, archive_format, archive_bytes, original_bytes) -> None:
+        """Registrar a cópia compactada da gravação (ver ``src.storage.archive``)."""
+        recording_id = self.upsert_recording(path)
+        with self._lock:
+            self._conn.execute(
+                "UPDATE recordings SET archive_path = ?, archive_format = ?, archive_bytes = ?, "
+                "original_bytes = ?, archived_at = ?, updated_at = ? WHERE id = ?",
+                (str(archive_path), archive_format, archive_bytes, original_bytes, time.time(), time.time(), recording_id),
+            )
+
+    def mark_audio_deleted(self, path) -> None:
+        """O áudio foi removido pela retenção; transcrição e resumos continuam."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE recordings SET archive_path = NULL, audio_deleted_at = ?, updated_at = ? WHERE path = ?",
+                (time.time(), time.time(), self._key(path)),
+            )
+
+    def pending_archive(self, limit: int = 100) -> List[dict]:
+        """Gravações já transcritas que ainda não foram arquivadas."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM recordings WHERE transcript IS NOT NULL AND archive_path IS NULL "
+                "AND audio_deleted_at IS NULL ORDER BY created_at LIMIT ?",
+                (int(limit),),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def archived_before(self, timestamp: float) -> List[dict]:
+        """Gravações arquivadas criadas antes de ``timestamp`` (para a retenção)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM recordings WHERE archive_path IS NOT NULL AND created_at < ? ORDER BY created_at",
+                (timestamp,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def storage_usage(self) -> dict:
+        """Totais de bytes originais e arquivados (para diagnóstico)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS recordings, COALESCE(SUM(original_bytes), 0) AS original_bytes, "
+                "COALESCE(SUM(archive_bytes), 0) AS archive_bytes FROM recordings WHERE archive_path IS NOT NULL"
+            ).fetchone()
+        return dict(row)
+
+    # ------------------------------------------------------------------
+    # Índice de texto
+    # ------------------------------------------------------------------
+    def _index_doc_locked(self, recording_id, kind, text, start_ms=None, end_ms=None) -> None:
+        if not self.fts_enabled or not text:
+            return
+        cursor = self._conn.execute(
+            "INSERT INTO search_docs (recording_id, kind, start_ms, end_ms) VALUES (?, ?, ?, ?)",
+            (recording_id, kind, start_ms, end_ms),
+        )
+        self._conn.execute("INSERT INTO search_index (rowid, text) VALUES (?, ?)", (cursor.lastrowid, text))
+
+    def _unindex_locked(self, recording_id, kinds: Sequence[str]) -> None:
+        if not self.fts_enabled:
+            return
+        placeholders = ", ".join("?" for _ in kinds)
+        selection = f"SELECT id FROM search_docs WHERE recording_id = ? AND kind IN ({placeholders})"
+        self._conn.execute(f"DELETE FROM search_index WHERE rowid IN ({selection})", (recording_id, *kinds))
+        self._conn.execute(
+            f"DELETE FROM search_docs WHERE recording_id = ? AND kind IN ({placeholders})", (recording_id, *kinds)
+        )
+
+    def _index_transcript_locked(self, recording_id, transcript, segment_rows) -> None:
+        """Substituir a transcrição indexada: um documento por segmento (ou o texto todo)."""
+        self._unindex_locked(recording_id, ("segment", "transcript"))
+        if segment_rows:
+            for _, _, start_ms, end_ms, text in segment_rows:
+                self._index_doc_locked(recording_id, "segment", text, start_ms, end_ms)
+        else:
+            self._index_doc_locked(recording_id, "transcript", transcript, 0, None)
+
+    def rebuild_search_index(self) -> None:
+        """Reconstruir o índice a partir das tabelas do catálogo."""
+        if not self.fts_enabled:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM search_index")
+                self._conn.execute("DELETE FROM search_docs")
+                recordings = self._conn.execute("SELECT id, transcript FROM recordings").fetchall()
+                for recording in recordings:
+                    rows = self._conn.execute(
+                        "SELECT recording_id, position, start_ms, end_ms, text FROM segments "
+                        "WHERE recording_id = ? ORDER BY position",
+                        (recording["id"],),
+                    ).fetchall()
+                    self._index_transcript_locked(recording["id"], recording["transcript"], [tuple(r) for r in rows])
+                    for summary in self._conn.execute(
+                        "SELECT content FROM summaries WHERE recording_id = ? ORDER BY id", (recording["id"],)
+                    ).fetchall():
+                        self._index_doc_locked(recording["id"], "summary", summary["content"])
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        kinds: Optional[Sequence[str]] = None,
+        since: Optional[datetime | float] = None,
+        until: Optional[datetime | float] = None,
+    ) -> List[dict]:
+        """Buscar em transcrições e resumos, do resultado mais relevante ao menos.
+
+        Cada resultado traz ``recording_id``, ``path``, ``created_at``,
+        ``kind`` (``segment``, ``transcript`` ou ``summary``), ``start_ms`` e
+        ``end_ms`` do segmento, um ``snippet`` com os termos entre colchetes e
+        ``score`` (maior = mais relevante).
+        """
+        if not self.fts_enabled:
+            raise RuntimeError("Busca em texto indisponível: SQLite sem FTS5")
+        match = build_match_query(query)
+        if not match:
+            return []
+
+        clauses, params = ["search_index MATCH ?"], [match]
+        if kinds:
+            clauses.append(f"d.kind IN ({', '.join('?' for _ in kinds)})")
+            params.extend(kinds)
+        if since is not None:
+            clauses.append("r.created_at >= ?")
+            params.append(since.timestamp() if isinstance(since, datetime) else since)
+        if until is not None:
+            clauses.append("r.created_at < ?")
+            params.append(until.timestamp() if isinstance(until, datetime) else until)
+        params.extend([int(limit), int(offset)])
+
+        sql = (
+            "SELECT d.recording_id, r.path, r.created_at, d.kind, d.start_ms, d.end_ms, "
+            "snippet(search_index, 0, '[', ']', '…', 12) AS snippet, bm25(search_index) AS rank "
+            "FROM search_index "
+            "JOIN search_docs d ON d.id = search_index.rowid "
+            "JOIN recordings r ON r.id = d.recording_id "
+            f"WHERE {' AND '.join(clauses)} "
+            "ORDER BY rank LIMIT ? OFFSET ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        hits = []
+        for row in rows:
+            hit = dict(row)
+            hit["score"] = -hit.pop("rank")
+            hits.append(hit)
+        return hits
+
+    def backfill(self, data_dir: str | Path = "data") -> int:
+        """Indexar gravações já existentes em disco (apenas cabeçalho do WAV)."""
+        added = 0
+        for wav_path in sorted(Path(data_dir).glob("recording_*.wav")):
+            if self.get(wav_path) is not None:
+                continue
+            fields = {}
+            try:
+                with wave.open(str(wav_path), "rb") as wf:
+                    rate = wf.getframerate()
+                    fields = {
+                        "sample_rate": rate,
+                        "channels": wf.getnchannels(),
+                        "duration": wf.getnframes() / float(rate) if rate else None,
+                    }
+            except Exception as exc:
+                print(f"[AVISO] Não foi possível ler {wav_path.name}: {exc}")
+            self.upsert_recording(wav_path, **fields)
+            added += 1
+        return added
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    def get(self, path: str | Path) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM recordings WHERE path = ?", (self._key(path),)).fetchone()
+        return dict(row) if row else None
+
+    def get_by_id(self, recording_id: int) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM recordings WHERE id = ?", (recording_id,)).fetchone()
+        return dict(row) if row else None
+
+    def segments(self, recording_id: int) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT start_ms, end_ms, text FROM segments WHERE recording_id = ? ORDER BY start_ms, position",
+                (recording_id,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def summaries(self, recording_id: int) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT template, provider, content, created_at FROM summaries WHERE recording_id = ? ORDER BY id",
+                (recording_id,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def exports(self, recording_id: int) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path FROM exports WHERE recording_id = ? ORDER BY id", (recording_id,)
+            ).fetchall()
+        return [row["path"] for row in rows]
+
+    def find(
+        self,
+        since: Optional[datetime | float] = None,
+        until: Optional[datetime | float] = None,
+        min_duration: Optional[float] = None,
+        max_duration: Optional[float] = None,
+        template: Optional[str] = None,
+        limit: int = 50,
+    ) -> List[dict]:
+        """Listar gravações (mais recentes primeiro) filtrando por data, duração e template.
+
+        O filtro de template considera tanto o template atual da gravação quanto
+        qualquer resumo já gerado com ele.
+        """
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since.timestamp() if isinstance(since, datetime) else since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until.timestamp() if isinstance(until, datetime) else until)
+        if min_duration is not None:
+            clauses.append("duration >= ?")
+            params.append(min_duration)
+        if max_duration is not None:
+            clauses.append("duration <= ?")
+            params.append(max_duration)
+        if template is not None:
+            clauses.append("(template = ? OR id IN (SELECT recording_id FROM summaries WHERE template = ?))")
+            params.extend([template, template])
+
+        query = "SELECT * FROM recordings"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""Consulta em texto livre sobre o índice FTS5 do catálogo.
+
+O índice usa o tokenizador ``unicode61 remove_diacritics 2``: maiúsculas e
+acentos são ignorados ("reunião" = "REUNIAO"). Como o FTS5 não traz
+stemmer para português, cada termo da busca é reduzido a um radical
+aproximado e pesquisado como prefixo ("reunião" → ``reuni*``, que também
+encontra "reuniões"). Trechos entre aspas são buscados como frase exata.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import List
+
+FTS_TOKENIZE = "unicode61 remove_diacritics 2"
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_PHRASE = re.compile(r'"([^"]+)"')
+
+# Palavras frequentes que não ajudam a ranquear resultados
+STOPWORDS = frozenset(
+    "a as o os e de da das do dos em no na nos nas um uma uns umas que para por com "
+    "se ao aos à às é foi ser ou mas como quem".split()
+)
+
+
+def fold(text: str) -> str:
+    """Minúsculas sem acentos (mesma normalização do tokenizador)."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def stem(token: str) -> str:
+    """Radical aproximado para busca por prefixo em português."""
+    token = fold(token)
+    if len(token) > 5:
+        return token[:-2]
+    if len(token) > 3:
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    return [fold(token) for token in _TOKEN.findall(text)]
+
+
+def build_match_query(query: str) -> str:
+    """Converter o texto digitado em uma expressão MATCH segura do FTS5.
+
+    Todos os termos precisam aparecer (AND implícito). Operadores do FTS5
+    digitados pelo usuário são tratados como texto comum.
+    """
+    parts = []
+    for phrase in _PHRASE.findall(query):
+        tokens = tokenize(phrase)
+        if tokens:
+            parts.append('"' + " ".join(tokens) + '"')
+
+    remainder = _PHRASE.sub(" ", query)
+    tokens = tokenize(remainder)
+    meaningful = [token for token in tokens if token not in STOPWORDS] or tokens
+    for token in meaningful:
+        parts.append(f'"{stem(token)}"*')
+    return " ".join(parts)
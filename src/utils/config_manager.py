@@ -1,48 +1,122 @@
 """
 Gerenciador de configurações do MeetAI
+
+O ConfigManager é a fonte única, em memória, das configurações da aplicação
+(``config/settings.json``) e das chaves de API (``config/api_keys.json``).
+Os arquivos são lidos uma vez; alterações notificam os inscritos da seção e
+são gravadas de forma atômica e agrupada (debounce).
 """
 
+import copy
 import json
-import os
+import threading
+from dataclasses import dataclass, fields
 from pathlib import Path
+from typing import Optional
+
+from src.utils.persistence import DebouncedJsonWriter, atomic_write_json
+
+
+@dataclass(frozen=True)
+class AudioSettings:
+    sample_rate: int = 44100
+    channels: int = 2
+    chunk_size: int = 1024
+    input_device: Optional[int] = None
+    record_system_audio: bool = True
+
+
+@dataclass(frozen=True)
+class AISettings:
+    model: str = "gpt-3.5-turbo"
+    max_tokens: int = 1500
+    temperature: float = 0.3
+    language: str = "pt"
+    # Endpoints alternativos (ex.: servidor falso de src/devtools); None = API oficial
+    openai_base_url: Optional[str] = None
+    gemini_base_url: Optional[str] = None
+    # Detecção de voz antes do upload (src/audio/vad.py): só trechos com fala vão ao Whisper
+    vad_enabled: bool = True
+    # Quanto (dB) acima do piso de ruído da gravação um quadro precisa estar para contar como fala
+    vad_margin_db: float = 10.0
+
+
+@dataclass(frozen=True)
+class UISettings:
+    theme: str = "clam"
+    window_size: str = "900x700"
+    auto_save: bool = False
+
+
+@dataclass(frozen=True)
+class OutputSettings:
+    format: str = "txt"
+    directory: str = "outputs"
+    include_timestamp: bool = True
+
+
+@dataclass(frozen=True)
+class StorageSettings:
+    # "flac" (sem perdas, requer soundfile), "speech" (mono 16 kHz) ou "none".
+    # Desligado por padrão: só economiza espaço junto com ``delete_original``
+    archive_format: str = "none"
+    archive_dir: str = "data/archive"
+    # Apagar o WAV original depois que o arquivo compactado foi decodificado e verificado (opt-in)
+    delete_original: bool = False
+    # Dias até apagar o áudio (0 = manter para sempre); texto e resumos ficam no catálogo
+    retention_days: int = 0
+
+
+@dataclass(frozen=True)
+class ApiKeys:
+    openai_api_key: Optional[str] = None
+    gemini_api_key: Optional[str] = None
+    ai_provider: str = "openai"
+
+
+SECTION_TYPES = {
+    "audio": AudioSettings,
+    "ai": AISettings,
+    "ui": UISettings,
+    "output": OutputSettings,
+    "storage": StorageSettings,
+}
+
+API_KEYS_SECTION = "api_keys"
+
+
+def _section_defaults(section_type):
+    return {field.name: field.default for field in fields(section_type)}
+
+
+def _build_section(section_type, values):
+    known = {field.name for field in fields(section_type)}
+    return section_type(**{key: value for key, value in (values or {}).items() if key in known})
+
 
 class ConfigManager:
-    def __init__(self):
-        self.config_dir = Path("config")
+    def __init__(self, config_dir="config", save_delay=0.5):
+        self.config_dir = Path(config_dir)
         self.config_file = self.config_dir / "settings.json"
         self.api_keys_file = self.config_dir / "api_keys.json"
-        
+
         # Criar diretório se não existir
         self.config_dir.mkdir(exist_ok=True)
-        
+
         # Configurações padrão
         self.default_config = {
-            "audio": {
-                "sample_rate": 44100,
-                "channels": 2,
-                "chunk_size": 1024,
-                "input_device": None
-            },
-            "ai": {
-                "model": "gpt-3.5-turbo",
-                "max_tokens": 1500,
-                "temperature": 0.3,
-                "language": "pt"
-            },
-            "ui": {
-                "theme": "clam",
-                "window_size": "900x700",
-                "auto_save": False
-            },
-            "output": {
-                "format": "txt",
-                "directory": "outputs",
-                "include_timestamp": True
-            }
+            name: _section_defaults(section_type)
+            for name, section_type in SECTION_TYPES.items()
         }
-        
+
+        self._lock = threading.RLock()
+        self._subscribers = {}
+        self._config_writer = DebouncedJsonWriter(self.config_file, delay=save_delay)
+        self._api_keys_writer = DebouncedJsonWriter(self.api_keys_file, delay=save_delay, ensure_ascii=True)
+
         self.config = self.load_config()
-    
+        self.api_keys = self.load_api_keys()
+
     def load_config(self):
         """Carregar configurações do arquivo"""
         try:
@@ -54,53 +128,162 @@ class ConfigManager:
             else:
                 # Criar arquivo com configurações padrão
                 self.save_config(self.default_config)
-                return self.default_config.copy()
+                return copy.deepcopy(self.default_config)
         except Exception as e:
             print(f"Erro ao carregar configurações: {e}")
-            return self.default_config.copy()
-    
+            return copy.deepcopy(self.default_config)
+
     def save_config(self, config=None):
-        """Salvar configurações no arquivo"""
+        """Salvar configurações no arquivo (imediatamente, com substituição atômica)"""
         try:
-            config_to_save = config or self.config
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config_to_save, f, indent=2, ensure_ascii=False)
+            with self._lock:
+                config_to_save = copy.deepcopy(config or self.config)
+            self._config_writer.cancel()
+            atomic_write_json(self.config_file, config_to_save)
             return True
         except Exception as e:
             print(f"Erro ao salvar configurações: {e}")
             return False
-    
+
+    def schedule_save(self):
+        """Agendar gravação de settings.json (agrupa alterações próximas)"""
+        self._config_writer.schedule(self._config_snapshot)
+
+    def flush(self):
+        """Gravar imediatamente qualquer alteração pendente (chamar ao encerrar)"""
+        try:
+            self._config_writer.flush()
+            self._api_keys_writer.flush()
+            return True
+        except Exception as e:
+            print(f"Erro ao salvar configurações: {e}")
+            return False
+
+    def _config_snapshot(self):
+        with self._lock:
+            return copy.deepcopy(self.config)
+
+    def _api_keys_snapshot(self):
+        with self._lock:
+            return dict(self.api_keys)
+
     def get(self, key_path, default=None):
         """Obter valor de configuração usando notação de ponto"""
         keys = key_path.split('.')
-        value = self.config
-        
-        try:
-            for key in keys:
-                value = value[key]
-            return value
-        except (KeyError, TypeError):
-            return default
-    
+
+        with self._lock:
+            value = self.config
+            try:
+                for key in keys:
+                    value = value[key]
+                return copy.deepcopy(value)
+            except (KeyError, TypeError):
+                return default
+
     def set(self, key_path, value):
         """Definir valor de configuração usando notação de ponto"""
         keys = key_path.split('.')
-        config = self.config
-        
-        # Navegar até o último nível
-        for key in keys[:-1]:
-            if key not in config:
-                config[key] = {}
-            config = config[key]
-        
-        # Definir o valor
-        config[keys[-1]] = value
-        
-        # Salvar configurações
-        return self.save_config()
-    
+
+        with self._lock:
+            config = self.config
+
+            # Navegar até o último nível
+            for key in keys[:-1]:
+                if key not in config:
+                    config[key] = {}
+                config = config[key]
+
+            # Definir o valor
+            config[keys[-1]] = value
+
+        # Salvar configurações (agrupado) e avisar os inscritos da seção
+        self.schedule_save()
+        self._notify(keys[0])
+        return True
+
+    # ------------------------------------------------------------------
+    # Seções tipadas
+    # ------------------------------------------------------------------
+    def get_section(self, name):
+        """Retornar a seção como dataclass imutável (ex.: AudioSettings)"""
+        if name == API_KEYS_SECTION:
+            return self.get_api_keys()
+        section_type = SECTION_TYPES[name]
+        with self._lock:
+            return _build_section(section_type, self.config.get(name))
+
+    @property
+    def audio(self):
+        return self.get_section("audio")
+
+    @property
+    def ai(self):
+        return self.get_section("ai")
+
+    @property
+    def ui(self):
+        return self.get_section("ui")
+
+    @property
+    def output(self):
+        return self.get_section("output")
+
+    @property
+    def storage(self):
+        return self.get_section("storage")
+
+    def update_section(self, name, **values):
+        """Atualizar vários campos de uma seção com uma única gravação e notificação"""
+        if name == API_KEYS_SECTION:
+            return self.update_api_keys(**values)
+        known = {field.name for field in fields(SECTION_TYPES[name])}
+        unknown = set(values) - known
+        if unknown:
+            raise KeyError(f"Campos desconhecidos na seção '{name}': {', '.join(sorted(unknown))}")
+
+        with self._lock:
+            section = self.config.setdefault(name, {})
+            changed = {key: value for key, value in values.items() if section.get(key) != value}
+            section.update(changed)
+
+        if changed:
+            self.schedule_save()
+            self._notify(name)
+        return True
+
+    # ------------------------------------------------------------------
+    # Inscrições
+    # ------------------------------------------------------------------
+    def subscribe(self, section, callback):
+        """Registrar callback(seção) para alterações; retorna função para cancelar"""
+        with self._lock:
+            self._subscribers.setdefault(section, []).append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                callbacks = self._subscribers.get(section, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+
+        return unsubscribe
+
+    def _notify(self, section):
+        with self._lock:
+            callbacks = list(self._subscribers.get(section, []))
+        if not callbacks:
+            return
+        value = self.get_section(section) if (section in SECTION_TYPES or section == API_KEYS_SECTION) else self.get(section)
+        for callback in callbacks:
+            try:
+                callback(value)
+            except Exception as e:
+                print(f"Erro em callback de configuração '{section}': {e}")
+
+    # ------------------------------------------------------------------
+    # Chaves de API
+    # ------------------------------------------------------------------
     def load_api_keys(self):
-        """Carregar chaves de API"""
+        """Carregar chaves de API do disco"""
         try:
             if self.api_keys_file.exists():
                 with open(self.api_keys_file, 'r', encoding='utf-8') as f:
@@ -109,64 +292,101 @@ class ConfigManager:
         except Exception as e:
             print(f"Erro ao carregar chaves API: {e}")
             return {}
-    
+
+    def get_api_keys(self):
+        """Retornar as chaves de API em memória (ApiKeys)"""
+        with self._lock:
+            return _build_section(ApiKeys, self.api_keys)
+
     def save_api_keys(self, api_keys):
-        """Salvar chaves de API"""
+        """Substituir e salvar chaves de API"""
         try:
-            with open(self.api_keys_file, 'w', encoding='utf-8') as f:
-                json.dump(api_keys, f, indent=2)
+            with self._lock:
+                self.api_keys = dict(api_keys)
+            self._api_keys_writer.cancel()
+            atomic_write_json(self.api_keys_file, self._api_keys_snapshot(), ensure_ascii=True)
+            self._notify(API_KEYS_SECTION)
             return True
         except Exception as e:
             print(f"Erro ao salvar chaves API: {e}")
             return False
-    
+
+    def update_api_keys(self, **values):
+        """Atualizar chaves/provedor em memória, agendar gravação e notificar"""
+        with self._lock:
+            changed = {key: value for key, value in values.items() if self.api_keys.get(key) != value}
+            self.api_keys.update(changed)
+
+        if changed:
+            self._api_keys_writer.schedule(self._api_keys_snapshot)
+            self._notify(API_KEYS_SECTION)
+        return True
+
     def get_api_key(self, service):
         """Obter chave de API específica"""
-        api_keys = self.load_api_keys()
-        return api_keys.get(f"{service}_api_key")
-    
+        with self._lock:
+            return self.api_keys.get(f"{service}_api_key")
+
     def set_api_key(self, service, key):
         """Definir chave de API específica"""
-        api_keys = self.load_api_keys()
-        api_keys[f"{service}_api_key"] = key
-        return self.save_api_keys(api_keys)
-    
+        return self.update_api_keys(**{f"{service}_api_key": key})
+
     def _merge_config(self, default, user):
         """Mesclar configuração do usuário com padrão"""
-        merged = default.copy()
-        
+        merged = copy.deepcopy(default)
+
         for key, value in user.items():
             if key in merged and isinstance(merged[key], dict) and isinstance(value, dict):
                 merged[key] = self._merge_config(merged[key], value)
             else:
                 merged[key] = value
-        
+
         return merged
-    
+
     def reset_to_defaults(self):
         """Restaurar configurações padrão"""
-        self.config = self.default_config.copy()
-        return self.save_config()
-    
+        with self._lock:
+            self.config = copy.deepcopy(self.default_config)
+        saved = self.save_config()
+        for section in SECTION_TYPES:
+            self._notify(section)
+        return saved
+
     def export_config(self, file_path):
         """Exportar configurações para arquivo"""
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
+            atomic_write_json(file_path, self._config_snapshot())
             return True
         except Exception as e:
             print(f"Erro ao exportar configurações: {e}")
             return False
-    
+
     def import_config(self, file_path):
         """Importar configurações de arquivo"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 imported_config = json.load(f)
-            
+
             # Validar e mesclar configurações
-            self.config = self._merge_config(self.default_config, imported_config)
-            return self.save_config()
+            with self._lock:
+                self.config = self._merge_config(self.default_config, imported_config)
+            saved = self.save_config()
+            for section in SECTION_TYPES:
+                self._notify(section)
+            return saved
         except Exception as e:
             print(f"Erro ao importar configurações: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+_shared_manager = None
+_shared_lock = threading.Lock()
+
+
+def get_config_manager():
+    """Instância compartilhada usada por toda a aplicação"""
+    global _shared_manager
+    with _shared_lock:
+        if _shared_manager is None:
+            _shared_manager = ConfigManager()
+        return _shared_manager
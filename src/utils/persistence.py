@@ -0,0 +1,112 @@
+"""
+Gravação atômica e adiada (debounce) de arquivos JSON
+"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+
+def atomic_write_text(path, text):
+    """Gravar texto em arquivo temporário e substituir o destino atomicamente.
+
+    Quem lê o arquivo vê sempre a versão antiga ou a nova completa, nunca um
+    arquivo pela metade (queda de energia, crash no meio da escrita).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.remove(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path, data, indent=2, ensure_ascii=False):
+    """Gravar JSON de forma atômica (ver atomic_write_text)"""
+    atomic_write_text(path, json.dumps(data, indent=indent, ensure_ascii=ensure_ascii))
+
+
+class DebouncedJsonWriter:
+    """Agrupa várias alterações em uma única gravação após um período de silêncio.
+
+    ``schedule`` pode ser chamado muitas vezes seguidas (ex.: vários setters
+    disparados por um clique); só a última versão é gravada, ``delay`` segundos
+    depois da última chamada. ``flush`` grava imediatamente o que estiver
+    pendente e deve ser chamado no encerramento da aplicação.
+    """
+
+    def __init__(self, path, delay=0.5, indent=2, ensure_ascii=False, on_saved=None):
+        self.path = Path(path)
+        self.delay = delay
+        self.indent = indent
+        self.ensure_ascii = ensure_ascii
+        self.on_saved = on_saved
+        self._lock = threading.Lock()
+        self._timer = None
+        self._provider = None
+        self.writes = 0
+
+    @property
+    def pending(self):
+        return self._provider is not None
+
+    def schedule(self, provider):
+        """Agendar gravação; ``provider`` é chamado na hora de gravar e retorna os dados."""
+        with self._lock:
+            self._provider = provider
+            if self._timer is not None:
+                self._timer.cancel()
+            if self.delay <= 0:
+                self._timer = None
+            else:
+                self._timer = threading.Timer(self.delay, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+        if self.delay <= 0:
+            self.flush()
+
+    def flush(self):
+        """Gravar agora a alteração pendente, se houver. Retorna True se gravou.
+
+        Erros de gravação são propagados e a alteração continua pendente.
+        """
+        with self._lock:
+            provider = self._provider
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if provider is None:
+                return False
+            # Gravação dentro do lock: duas threads nunca escrevem o mesmo arquivo ao mesmo tempo
+            atomic_write_json(self.path, provider(), indent=self.indent, ensure_ascii=self.ensure_ascii)
+            # Só depois de gravar: se a escrita falhar, o próximo flush tenta de novo
+            self._provider = None
+            self.writes += 1
+        if self.on_saved:
+            self.on_saved(self.path)
+        return True
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"[ERRO] Falha ao salvar {self.path}: {e}")
+
+    def cancel(self):
+        """Descartar a gravação pendente."""
+        with self._lock:
+            self._provider = None
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
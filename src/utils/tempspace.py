@@ -0,0 +1,135 @@
+"""
+Pastas temporárias exclusivas por job, com limpeza por contagem de referências
+
+Cada job (gravação em tempo real, divisão de arquivo grande, decodificação
+de áudio arquivado) recebe ``temp/<prefixo>-<pid>-<id>/``. Nomes de arquivos
+dentro dela nunca colidem com os de outro job, e a pasta inteira é apagada
+quando a última referência é liberada. Pastas de processos que já não
+existem (crash, encerramento forçado) são removidas na inicialização.
+"""
+
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+TEMP_ROOT = Path("temp")
+
+# Pastas de um PID ainda vivo também são removidas após este período (reuso de PID)
+STALE_AFTER_SECONDS = 7 * 24 * 3600
+
+_WORKSPACE_NAME = re.compile(r"^[a-z]+-(\d+)-[0-9a-f]{8}$")
+# Arquivos soltos deixados por versões antigas (temp/chunk_001.wav, temp/chunk_1.wav)
+_LEGACY_FILE = re.compile(r"^chunk_\d+\.wav$")
+
+
+class TempWorkspace:
+    """Pasta temporária exclusiva, apagada quando a última referência é liberada.
+
+    O construtor já conta como uma referência. Quem precisar manter os
+    arquivos além do escopo atual chama ``acquire()`` e, depois,
+    ``release()``. Também pode ser usada com ``with``.
+    """
+
+    def __init__(self, prefix="job", root=None):
+        self.root = Path(root) if root is not None else TEMP_ROOT
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.path = self.root / f"{prefix}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.path.mkdir()
+        self._lock = threading.Lock()
+        self._refs = 1
+
+    @property
+    def closed(self):
+        return self._refs == 0
+
+    def file(self, name):
+        """Caminho para ``name`` dentro da pasta do job"""
+        if self.closed:
+            raise RuntimeError(f"Pasta temporária já liberada: {self.path}")
+        return self.path / name
+
+    def acquire(self):
+        with self._lock:
+            if self._refs == 0:
+                raise RuntimeError(f"Pasta temporária já liberada: {self.path}")
+            self._refs += 1
+        return self
+
+    def release(self):
+        with self._lock:
+            if self._refs == 0:
+                return
+            self._refs -= 1
+            if self._refs:
+                return
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    def __repr__(self):
+        return f"TempWorkspace({self.path}, refs={self._refs})"
+
+
+def _pid_alive(pid):
+    """Verificar se o processo existe (sem sinalizá-lo no Windows)"""
+    if pid <= 0:
+        return False
+    if sys.platform == "win32":
+        import ctypes
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+            return exit_code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def cleanup_stale_workspaces(root=None, now=None):
+    """Remover sobras de execuções anteriores; retorna quantos itens foram apagados"""
+    root = Path(root) if root is not None else TEMP_ROOT
+    if not root.is_dir():
+        return 0
+    now = now or time.time()
+    removed = 0
+    for entry in root.iterdir():
+        try:
+            if entry.is_dir():
+                match = _WORKSPACE_NAME.match(entry.name)
+                if not match:
+                    continue
+                pid = int(match.group(1))
+                if pid == os.getpid():
+                    continue
+                too_old = now - entry.stat().st_mtime > STALE_AFTER_SECONDS
+                if too_old or not _pid_alive(pid):
+                    shutil.rmtree(entry, ignore_errors=True)
+                    removed += 1
+            elif _LEGACY_FILE.match(entry.name):
+                entry.unlink()
+                removed += 1
+        except OSError as e:
+            print(f"⚠️ Erro ao limpar {entry}: {e}")
+    if removed:
+        print(f"🧹 {removed} item(ns) temporário(s) de execuções anteriores removido(s)")
+    return removed
@@ -0,0 +1,306 @@
+"""
+Rastreamento (spans) com tempo de cada etapa do processamento
+
+Cada etapa instrumentada (emissão de chunk, etapas de DSP, renderização,
+cada upload de transcrição, resumo, etapas da fila) abre um ``span``. Os
+spans de um mesmo job compartilham o ``trace_id`` e formam uma árvore
+(``parent_span_id``), inclusive entre threads quando a função é embrulhada
+com ``propagate``. Os registros são gravados em ``data/traces.jsonl`` (uma
+linha JSON por span, com os nomes de campo do modelo de dados do
+OpenTelemetry) em lotes, fora do caminho crítico.
+
+Os callbacks de áudio, executados muitas vezes por segundo, não abrem spans:
+usam as métricas sem trava de ``src/audio/telemetry.py``.
+
+``stage_stats`` devolve p50/p95 por etapa entre todos os jobs da sessão e
+``load_stage_stats`` faz o mesmo a partir do arquivo; ``end_trace`` devolve a
+tabela-resumo de um job.
+"""
+
+import atexit
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+# Durações guardadas por etapa para os percentis (as mais recentes)
+STATS_WINDOW = 2000
+# Spans acumulados antes de gravar no arquivo
+FLUSH_EVERY = 200
+# Tamanho a partir do qual traces.jsonl vira traces.jsonl.1
+MAX_FILE_BYTES = 20 * 1024 * 1024
+
+_current_trace = contextvars.ContextVar("meetai_trace_id", default=None)
+_current_span = contextvars.ContextVar("meetai_span_id", default=None)
+_span_ids = itertools.count(1)
+_span_prefix = f"{os.getpid() & 0xFFFF:04x}{int(time.time()) & 0xFFFF:04x}"
+
+
+def percentile(values, fraction):
+    """Percentil por vizinho mais próximo (None para lista vazia)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def propagate(func):
+    """Embrulhar ``func`` para rodar em outra thread com o trace/span atual como pai.
+
+    Use ao submeter trabalho a um ``ThreadPoolExecutor``; cada chamada roda numa
+    cópia do contexto capturado aqui.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(func, *args, **kwargs)
+
+    return run
+
+
+class Span:
+    """Span aberto; ``set`` acrescenta atributos antes do fim."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attributes", "start_ns", "start", "error")
+
+    def __init__(self, name, trace_id, parent_id, attributes):
+        self.name = name
+        self.trace_id = trace_id
+        self.parent_id = parent_id
+        self.span_id = f"{_span_prefix}{next(_span_ids):08x}"
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.start = time.perf_counter()
+        self.error = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+
+class _NullSpan:
+    def set(self, **attributes):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Coletor de spans com gravação em lote em JSON Lines."""
+
+    def __init__(self, path="data/traces.jsonl", enabled=True, flush_every=FLUSH_EVERY):
+        self.path = Path(path) if path else None
+        self.enabled = enabled
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending = []
+        self._durations = {}
+        self._traces = {}
+
+    # ------------------------------------------------------------------
+    # Contexto
+    # ------------------------------------------------------------------
+    @contextmanager
+    def trace(self, trace_id):
+        """Associar os spans abertos neste bloco ao trace ``trace_id`` (ex.: ``job-12``)"""
+        trace_token = _current_trace.set(str(trace_id))
+        span_token = _current_span.set(None)
+        try:
+            yield
+        finally:
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """Medir o bloco como etapa ``name``; exceções marcam o span com erro"""
+        if not self.enabled:
+            yield _NULL_SPAN
+            return
+
+        span = Span(name, _current_trace.get(), _current_span.get(), attributes)
+        token = _current_span.set(span.span_id)
+        try:
+            yield span
+        except BaseException as exc:
+            span.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            _current_span.reset(token)
+            self._finish(span, time.perf_counter() - span.start)
+
+    # ------------------------------------------------------------------
+    # Registro
+    # ------------------------------------------------------------------
+    def _window(self, name):
+        window = self._durations.get(name)
+        if window is None:
+            window = self._durations[name] = deque(maxlen=STATS_WINDOW)
+        return window
+
+    def _aggregate(self, trace_id, name, duration_ms, error):
+        stages = self._traces.setdefault(trace_id, {})
+        entry = stages.get(name)
+        if entry is None:
+            entry = stages[name] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "errors": 0}
+        entry["count"] += 1
+        entry["total_ms"] += duration_ms
+        entry["max_ms"] = max(entry["max_ms"], duration_ms)
+        entry["errors"] += int(error)
+
+    def _finish(self, span, elapsed):
+        duration_ms = elapsed * 1000.0
+        record = {
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            "parent_span_id": span.parent_id,
+            "name": span.name,
+            "start_time_unix_nano": span.start_ns,
+            "end_time_unix_nano": span.start_ns + int(elapsed * 1e9),
+            "duration_ms": round(duration_ms, 3),
+            "status": "error" if span.error else "ok",
+            "attributes": span.attributes,
+            "thread": threading.current_thread().name,
+        }
+        if span.error:
+            record["error"] = span.error
+
+        with self._lock:
+            self._window(span.name).append(duration_ms)
+            if span.trace_id is not None:
+                self._aggregate(span.trace_id, span.name, duration_ms, span.error is not None)
+            self._pending.append(record)
+            should_flush = len(self._pending) >= self.flush_every
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """Gravar os spans pendentes em ``path``"""
+        with self._lock:
+            records, self._pending = self._pending, []
+        if not records or self.path is None:
+            return
+        with self._write_lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                if self.path.exists() and self.path.stat().st_size > MAX_FILE_BYTES:
+                    os.replace(self.path, self.path.with_name(self.path.name + ".1"))
+                with open(self.path, "a", encoding="utf-8") as f:
+                    for record in records:
+                        f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            except Exception as e:
+                print(f"[AVISO] Não foi possível gravar os traces: {e}")
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def stage_stats(self, names=None):
+        """{etapa: {count, p50_ms, p95_ms, max_ms}} das durações recentes de todos os jobs"""
+        with self._lock:
+            windows = {name: list(values) for name, values in self._durations.items() if names is None or name in names}
+        return {name: _summarize(values) for name, values in sorted(windows.items())}
+
+    def trace_summary(self, trace_id):
+        """Totais por etapa do trace, na ordem em que as etapas terminaram pela primeira vez"""
+        with self._lock:
+            return {name: dict(entry) for name, entry in self._traces.get(str(trace_id), {}).items()}
+
+    def end_trace(self, trace_id, title=None, print_table=True):
+        """Encerrar o trace: gravar o que falta e devolver (e imprimir) a tabela-resumo"""
+        summary = self.trace_summary(trace_id)
+        with self._lock:
+            self._traces.pop(str(trace_id), None)
+        self.flush()
+        table = format_summary(summary, title or f"Trace {trace_id}")
+        if print_table and summary:
+            print(table)
+        return table
+
+
+def _summarize(values):
+    return {
+        "count": len(values),
+        "p50_ms": percentile(values, 0.50),
+        "p95_ms": percentile(values, 0.95),
+        "max_ms": max(values) if values else None,
+    }
+
+
+def format_summary(summary, title="Trace"):
+    """Tabela de texto com contagem, total e máximo por etapa"""
+    lines = [f"=== {title} ==="]
+    if not summary:
+        lines.append("(sem etapas registradas)")
+        return "\n".join(lines)
+    width = max(len(name) for name in summary)
+    lines.append(f"{'etapa':<{width}}  {'n':>5}  {'total':>10}  {'máx':>10}  erros")
+    for name, entry in summary.items():
+        lines.append(
+            f"{name:<{width}}  {entry['count']:>5}  {entry['total_ms']:>8.1f}ms  "
+            f"{entry['max_ms']:>8.1f}ms  {entry['errors']:>5}"
+        )
+    return "\n".join(lines)
+
+
+def format_stage_stats(stats, title="Latência por etapa"):
+    """Tabela de texto com p50/p95/máximo de ``stage_stats``/``load_stage_stats``"""
+    lines = [f"=== {title} ==="]
+    if not stats:
+        lines.append("(sem etapas registradas)")
+        return "\n".join(lines)
+    width = max(len(name) for name in stats)
+    lines.append(f"{'etapa':<{width}}  {'n':>6}  {'p50':>10}  {'p95':>10}  {'máx':>10}")
+    for name, entry in stats.items():
+        lines.append(
+            f"{name:<{width}}  {entry['count']:>6}  {entry['p50_ms']:>8.1f}ms  "
+            f"{entry['p95_ms']:>8.1f}ms  {entry['max_ms']:>8.1f}ms"
+        )
+    return "\n".join(lines)
+
+
+def load_stage_stats(path="data/traces.jsonl", names=None):
+    """p50/p95 por etapa a partir do arquivo de traces (inclui sessões anteriores)"""
+    path = Path(path)
+    durations = {}
+    for candidate in (path.with_name(path.name + ".1"), path):
+        if not candidate.exists():
+            continue
+        with open(candidate, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # linha truncada por um encerramento abrupto
+                name = record.get("name")
+                if names is None or name in names:
+                    durations.setdefault(name, []).append(float(record.get("duration_ms", 0.0)))
+    return {name: _summarize(values) for name, values in sorted(durations.items())}
+
+
+_shared_tracer = None
+_shared_lock = threading.Lock()
+
+
+def get_tracer():
+    """Instância compartilhada (``data/traces.jsonl``), gravada também ao sair"""
+    global _shared_tracer
+    with _shared_lock:
+        if _shared_tracer is None:
+            _shared_tracer = Tracer()
+            atexit.register(_shared_tracer.flush)
+        return _shared_tracer
+
+
+def set_tracer(tracer):
+    """Substituir a instância compartilhada (testes, benchmarks); retorna a anterior"""
+    global _shared_tracer
+    with _shared_lock:
+        previous, _shared_tracer = _shared_tracer, tracer
+        return previous
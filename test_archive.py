@@ -0,0 +1,213 @@
+"""
+Teste do arquivamento compactado das gravações (src/storage/archive.py)
+"""
+
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.pipeline.meeting import MeetingPipeline
+from src.storage.archive import ArchiveStore, SpeechResampler, import_soundfile
+from src.storage.catalog import RecordingCatalog
+from src.utils.config_manager import StorageSettings
+
+
+class FakeTranscriber:
+    def __init__(self):
+        self.seen = []
+
+    def transcribe(self, audio_file):
+        with wave.open(audio_file, "rb") as wf:
+            self.seen.append((wf.getframerate(), wf.getnchannels()))
+        return "transcrição"
+
+
+class FakeSummarizer:
+    def generate_summary(self, transcript, template_id="auto"):
+        return "resumo"
+
+
+def _write_tone(path, seconds=2.0, rate=44100, freq=1000.0):
+    t = np.arange(int(rate * seconds)) / rate
+    tone = (np.sin(2 * np.pi * freq * t) * 8000).astype(np.int16)
+    stereo = np.column_stack([tone, tone])
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(2)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(stereo.tobytes())
+    return path
+
+
+def test_speech_resampler_keeps_duration_and_pitch():
+    rate = 44100
+    t = np.arange(rate * 3) / rate
+    tone = np.sin(2 * np.pi * 440.0 * t) * 10000
+    resampler = SpeechResampler(rate)
+    # Blocos de tamanhos irregulares, como na leitura em streaming
+    parts = [resampler.process(block) for block in np.array_split(tone, 7)]
+    out = np.concatenate(parts + [resampler.flush()])
+
+    assert out.size == 48000
+    spectrum = np.abs(np.fft.rfft(out[4000:-4000] * np.hanning(out.size - 8000)))
+    peak_hz = np.argmax(spectrum) * 16000 / (out.size - 8000)
+    assert abs(peak_hz - 440.0) < 2.0
+    # Sem deslocamento no tempo: compara com a senoide ideal na nova taxa
+    ideal = np.sin(2 * np.pi * 440.0 * np.arange(out.size) / 16000) * 10000
+    assert np.max(np.abs(out[1000:-1000] - ideal[1000:-1000])) < 200
+
+
+def test_speech_archive_replaces_original_and_reads_back(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    original = _write_tone(data_dir / "recording_20240510_140000.wav")
+    original_size = original.stat().st_size
+
+    catalog = RecordingCatalog(tmp_path / "catalog.db")
+    settings = StorageSettings(archive_format="speech", archive_dir=str(tmp_path / "archive"), delete_original=True)
+    store = ArchiveStore(catalog, settings, temp_dir=tmp_path / "temp")
+    archived = store.archive(original)
+
+    assert not original.exists()
+    assert archived.parent == tmp_path / "archive" / "2024" / "05"
+    assert original_size / archived.stat().st_size > 5
+    entry = catalog.get(original)
+    assert entry["archive_format"] == "speech" and entry["original_bytes"] == original_size
+
+    assert store.locate(original) == archived
+    audio, rate = store.read_audio(original)
+    assert rate == 16000 and audio.shape == (32000, 1)
+    with store.open_wav(original) as wav_path:
+        with wave.open(str(wav_path), "rb") as wf:
+            assert wf.getnframes() == 32000
+    assert store.archive(original) == archived
+
+
+def test_pipeline_archives_after_summary_and_retention(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    original = _write_tone(data_dir / "recording_20200101_090000.wav", seconds=1.0)
+
+    catalog = RecordingCatalog(tmp_path / "catalog.db")
+    settings = StorageSettings(
+        archive_format="speech", archive_dir=str(tmp_path / "archive"), delete_original=True, retention_days=30
+    )
+    store = ArchiveStore(catalog, settings, temp_dir=tmp_path / "temp")
+    transcriber = FakeTranscriber()
+    pipeline = MeetingPipeline(
+        transcriber, FakeSummarizer(), db_path=tmp_path / "jobs.db", catalog=catalog, archive=store
+    )
+    job = pipeline.submit(original)
+    assert pipeline.wait_idle(timeout=30)
+    pipeline.shutdown(wait=True)
+
+    done = pipeline.store.get(job.id)
+    assert done.stage == "archived" and Path(done.metadata["archive_path"]).exists()
+    assert transcriber.seen == [(44100, 2)] and not original.exists()
+
+    # Retranscrição a partir do arquivo compactado
+    retry = MeetingPipeline(transcriber, FakeSummarizer(), db_path=tmp_path / "jobs2.db", archive=store)
+    assert retry.transcribe(done)["transcript"] == "transcrição"
+    assert transcriber.seen[-1] == (16000, 1)
+    retry.shutdown(wait=True)
+
+    # Gravação de 2020 está fora da retenção de 30 dias: áudio removido, texto mantido
+    assert store.apply_retention(now=time.time()) == 1
+    entry = catalog.get(original)
+    assert entry["archive_path"] is None and entry["audio_deleted_at"] is not None
+    assert entry["transcript"] == "transcrição"
+    assert store.locate(original) is None
+
+
+def test_concurrent_archive_keeps_original_by_default(tmp_path):
+    import threading
+
+    original = _write_tone(tmp_path / "recording_20240301_100000.wav", seconds=1.0)
+    catalog = RecordingCatalog(tmp_path / "catalog.db")
+    settings = StorageSettings(archive_format="speech", archive_dir=str(tmp_path / "archive"))
+    store = ArchiveStore(catalog, settings, temp_dir=tmp_path / "temp")
+
+    # Retomada da fila e sweep chegando à mesma gravação
+    results, errors = [], []
+
+    def run():
+        try:
+            results.append(store.archive(original))
+        except Exception as exc:  # pragma: no cover - falha do teste
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors and len(set(results)) == 1
+    assert original.exists() and results[0].exists()
+    assert sorted(p.name for p in results[0].parent.iterdir()) == [results[0].name]
+
+    # Com delete_original ativado depois, a gravação já arquivada só perde o WAV
+    store.update_settings(
+        StorageSettings(archive_format="speech", archive_dir=str(tmp_path / "archive"), delete_original=True)
+    )
+    assert store.archive(original) == results[0] and not original.exists()
+    assert store.archive(original) == results[0]
+
+
+def test_retention_removes_kept_original_with_default_settings(tmp_path):
+    original = _write_tone(tmp_path / "recording_20200301_100000.wav", seconds=0.5)
+    catalog = RecordingCatalog(tmp_path / "catalog.db")
+    settings = StorageSettings(archive_format="speech", archive_dir=str(tmp_path / "archive"), retention_days=30)
+    store = ArchiveStore(catalog, settings, temp_dir=tmp_path / "temp")
+    archived = store.archive(original)
+    assert original.exists()
+
+    # O WAV mantido (delete_original desligado) também sai: o catálogo não mente
+    assert store.apply_retention(now=time.time()) == 1
+    assert not original.exists() and not archived.exists()
+    assert catalog.get(original)["audio_deleted_at"] is not None and store.locate(original) is None
+
+
+def test_archiving_is_off_by_default(tmp_path):
+    original = _write_tone(tmp_path / "recording_20240401_100000.wav", seconds=0.2)
+    store = ArchiveStore(RecordingCatalog(tmp_path / "catalog.db"), StorageSettings(), temp_dir=tmp_path / "temp")
+    assert not store.enabled and store.archive(original) is None and original.exists()
+
+
+def test_flac_archive_is_lossless(tmp_path):
+    import pytest
+
+    if import_soundfile() is None:
+        pytest.skip("soundfile não instalado")
+    original = _write_tone(tmp_path / "recording_20240101_000000.wav")
+    with wave.open(str(original), "rb") as wf:
+        expected = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16).reshape(-1, 2)
+
+    catalog = RecordingCatalog(tmp_path / "catalog.db")
+    settings = StorageSettings(archive_format="flac", archive_dir=str(tmp_path / "archive"))
+    store = ArchiveStore(catalog, settings, temp_dir=tmp_path / "temp")
+    archived = store.archive(original)
+    assert archived.suffix == ".flac"
+    audio, rate = store.read_audio(original)
+    assert rate == 44100 and np.array_equal(audio, expected)
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    test_speech_resampler_keeps_duration_and_pitch()
+    for test in (
+        test_speech_archive_replaces_original_and_reads_back,
+        test_pipeline_archives_after_summary_and_retention,
+        test_concurrent_archive_keeps_original_by_default,
+        test_retention_removes_kept_original_with_default_settings,
+        test_archiving_is_off_by_default,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Arquivamento OK")
@@ -0,0 +1,141 @@
+"""
+Teste do modo em lote (python main.py batch <pasta>)
+"""
+
+import json
+import subprocess
+import sys
+import threading
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.cli.batch import MANIFEST_NAME, BatchProcessor
+
+
+class FakeTranscriber:
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio_file):
+        with self._lock:
+            self.calls.append(Path(audio_file).name)
+        if self.fail_on and Path(audio_file).name == self.fail_on:
+            return None
+        return f"transcrição de {Path(audio_file).stem}"
+
+
+class FakeSummarizer:
+    def generate_summary(self, transcript, template_id="auto"):
+        return f"# Resumo ({template_id})\n{transcript}"
+
+
+def _write_wav(path):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(b"\x00\x00" * 1600)
+
+
+def test_batch_writes_outputs_and_skips_processed(tmp_path):
+    for name in ("a.wav", "b.wav", "c.wav"):
+        _write_wav(tmp_path / name)
+
+    transcriber = FakeTranscriber()
+    report = BatchProcessor(transcriber, FakeSummarizer(), template="standup", workers=3).run(tmp_path)
+
+    assert len(report.processed) == 3 and report.exit_code == 0
+    assert (tmp_path / "a.transcript.txt").read_text(encoding="utf-8") == "transcrição de a"
+    assert "(standup)" in (tmp_path / "b.summary.md").read_text(encoding="utf-8")
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert manifest["files"]["c.wav"]["status"] == "done"
+
+    # Segunda execução: nada a fazer
+    second = FakeTranscriber()
+    report = BatchProcessor(second, FakeSummarizer(), template="standup").run(tmp_path)
+    assert second.calls == [] and len(report.skipped) == 3
+
+    # Outro template exige novo resumo
+    third = FakeTranscriber()
+    report = BatchProcessor(third, FakeSummarizer(), template="vendas").run(tmp_path)
+    assert sorted(third.calls) == ["a.wav", "b.wav", "c.wav"]
+
+
+def test_failures_are_recorded_and_retried(tmp_path):
+    _write_wav(tmp_path / "ok.wav")
+    _write_wav(tmp_path / "bad.wav")
+
+    report = BatchProcessor(FakeTranscriber(fail_on="bad.wav"), None).run(tmp_path)
+    assert [p.name for p in report.failed] == ["bad.wav"]
+    assert report.exit_code == 1
+
+    retry = FakeTranscriber()
+    BatchProcessor(retry, None).run(tmp_path)
+    assert retry.calls == ["bad.wav"]
+
+
+def test_silent_recording_is_done_without_summary(tmp_path):
+    import numpy as np
+
+    from src.ai.transcriber import Transcriber
+
+    class Summaries(FakeSummarizer):
+        calls = 0
+
+        def generate_summary(self, transcript, template_id="auto"):
+            Summaries.calls += 1
+            return super().generate_summary(transcript, template_id)
+
+    # Transcritor real com VAD ligado; sem fala, a API nem é chamada
+    transcriber = Transcriber.__new__(Transcriber)
+    transcriber._api_key = "teste"
+    transcriber._client = object()
+    transcriber._vad_enabled = True
+    with wave.open(str(tmp_path / "silencio.wav"), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(np.zeros(16000 * 2, dtype=np.int16).tobytes())
+
+    report = BatchProcessor(transcriber, Summaries()).run(tmp_path)
+    assert report.exit_code == 0 and [p.name for p in report.processed] == ["silencio.wav"]
+    assert (tmp_path / "silencio.transcript.txt").read_text(encoding="utf-8") == ""
+    entry = json.loads((tmp_path / MANIFEST_NAME).read_text(encoding="utf-8"))["files"]["silencio.wav"]
+    assert entry["status"] == "done" and entry["no_speech"] and Summaries.calls == 0
+
+    # Nova execução não reprocessa o arquivo silencioso
+    report = BatchProcessor(transcriber, Summaries()).run(tmp_path)
+    assert [p.name for p in report.skipped] == ["silencio.wav"]
+
+
+def test_batch_entry_point_does_not_import_tkinter():
+    code = (
+        "import sys, main, src.cli.batch; "
+        "print('tkinter' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().endswith("False")
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    for test in (
+        test_batch_writes_outputs_and_skips_processed,
+        test_failures_are_recorded_and_retried,
+        test_silent_recording_is_done_without_summary,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    test_batch_entry_point_does_not_import_tkinter()
+    print("✅ Modo em lote OK")
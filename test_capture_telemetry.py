@@ -0,0 +1,98 @@
+"""
+Teste da telemetria dos callbacks de captura (src/audio/telemetry.py)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.audio.backends import GeneratedSource, SimulatedBackend, SimulatedStatus
+from src.audio.recorder import AudioRecorder
+from src.audio.telemetry import CaptureTelemetry, StreamMetrics, level_to_db
+
+
+def test_stream_metrics_track_deadline_histogram_and_flags():
+    metrics = StreamMetrics("mic", block_frames=1024, sample_rate=44100)
+    period = 1024 / 44100
+    # 98 callbacks rápidos, um lento (quase perdeu o prazo) e um que estourou
+    start = 0.0
+    for _ in range(98):
+        metrics.record(start, start + 0.00008, 1024, None, queue_depth=1)
+        start += period
+    metrics.record(start, start + 0.015, 1024, SimulatedStatus(input_overflow=True), queue_depth=3)
+    start += period * 3  # stream travou por dois blocos
+    metrics.record(start, start + 0.030, 1024, None, queue_depth=2)
+
+    snap = metrics.snapshot()
+    assert snap["callbacks"] == 100 and snap["frames"] == 100 * 1024
+    assert snap["input_overflows"] == 1 and snap["input_underflows"] == 0
+    assert snap["near_misses"] == 1 and snap["overruns"] == 1
+    assert snap["late_callbacks"] == 1 and abs(snap["max_interval_ms"] - period * 3000) < 1e-6
+    assert snap["callback_p50_us"] == 100.0
+    assert snap["callback_p99_us"] == 25000.0
+    assert abs(snap["callback_max_us"] - 30000.0) < 1e-6 and snap["worst_headroom"] < 0
+    assert snap["queue_depth"] == 2 and snap["max_queue_depth"] == 3
+    assert sum(snap["histogram"].values()) == 100
+
+    telemetry = CaptureTelemetry()
+    telemetry.streams["mic"] = metrics
+    assert telemetry.new_xruns() == {"mic": 1}
+    assert telemetry.new_xruns() == {}
+    assert "xrun 1/0" in telemetry.format_overlay()
+
+
+def test_block_levels_from_integer_sum_of_squares():
+    metrics = StreamMetrics("mic", block_frames=4, sample_rate=44100)
+    metrics.record_level(peak=16384, sum_squares=4 * 8192 ** 2, samples=4)
+    rms, peak, hold = metrics.levels
+    assert rms == 0.25 and peak == 0.5 and hold == 0.5
+    metrics.record_level(peak=0, sum_squares=0, samples=4)
+    rms, peak, hold = metrics.levels
+    assert rms == 0.0 and peak == 0.0 and 0.0 < hold < 0.5  # pico retido decai
+    assert abs(level_to_db(0.5) - (-6.0206)) < 1e-3 and level_to_db(0.0) == -90.0
+
+
+def test_recorder_counts_simulated_overflows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    backend = SimulatedBackend(
+        GeneratedSource("tone", seconds=2.0, level_db=-20.0),
+        GeneratedSource("noise", seconds=2.0, level_db=-40.0),
+        speed=0,
+        xrun_rate=0.1,
+        seed=5,
+    )
+    recorder = AudioRecorder(backend=backend)
+    recorder.config["enable_noise_gate"] = False
+
+    assert recorder.start_recording()
+    assert backend.wait_finished(timeout=10)
+    recorder.stop_recording()
+
+    metrics = recorder.get_capture_metrics()
+    for name, stream in (("mic", backend.streams[0]), ("system", backend.streams[1])):
+        assert metrics[name]["callbacks"] == stream.blocks
+        # Blocos perdidos em sequência geram uma única flag no bloco seguinte
+        assert 0 < metrics[name]["input_overflows"] <= stream.xruns
+        assert metrics[name]["max_queue_depth"] >= 1
+
+    # O nível do último bloco vem pronto do callback (tom com pico em -20 dBFS)
+    assert -21.0 < metrics["mic"]["level_peak_db"] < -19.0
+    assert metrics["mic"]["level_rms_db"] > metrics["system"]["level_rms_db"]
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    class _Patch:
+        def chdir(self, path):
+            os.chdir(path)
+
+    test_stream_metrics_track_deadline_histogram_and_flags()
+    test_block_levels_from_integer_sum_of_squares()
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_recorder_counts_simulated_overflows(Path(tmp), _Patch())
+        os.chdir(cwd)
+    print("✅ Telemetria da captura OK")
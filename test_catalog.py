@@ -0,0 +1,168 @@
+"""
+Teste do catálogo de gravações (src/storage/catalog.py)
+"""
+
+import sys
+import wave
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.audio.recorder import AudioProcessor
+from src.pipeline.meeting import MeetingPipeline
+from src.storage.catalog import RecordingCatalog, recording_timestamp
+from src.storage.search import build_match_query
+
+
+class DetailedTranscriber:
+    def transcribe_detailed(self, audio_file):
+        return {
+            "text": "bom dia pessoal",
+            "segments": [
+                {"start_ms": 0, "end_ms": 900, "text": "bom dia"},
+                {"start_ms": 900, "end_ms": 1500, "text": "pessoal"},
+            ],
+        }
+
+
+class FakeSummarizer:
+    ai_provider = "gemini"
+
+    def generate_summary(self, transcript, template_id="auto"):
+        return f"resumo {template_id}"
+
+
+def _write_wav(path, samples):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(np.asarray(samples, dtype=np.int16).tobytes())
+    return path
+
+
+def test_pipeline_populates_catalog(tmp_path):
+    rng = np.random.default_rng(0)
+    samples = (rng.standard_normal(32000) * 3000).astype(np.int16)
+    audio = _write_wav(tmp_path / "recording_20240105_093000.wav", samples)
+
+    catalog = RecordingCatalog(tmp_path / "catalog.db")
+    pipeline = MeetingPipeline(DetailedTranscriber(), FakeSummarizer(), db_path=tmp_path / "jobs.db", catalog=catalog)
+    pipeline.submit(audio, "standup")
+    assert pipeline.wait_idle(timeout=10)
+    pipeline.shutdown(wait=True)
+
+    recording = catalog.get(audio)
+    assert recording["duration"] == 2.0
+    assert recording["created_at"] == datetime(2024, 1, 5, 9, 30).timestamp()
+    peak_db, rms_db = AudioProcessor.analyze_levels(samples)
+    assert abs(recording["peak_db"] - peak_db) < 1e-9 and abs(recording["rms_db"] - rms_db) < 1e-9
+    assert recording["transcript"] == "bom dia pessoal"
+    assert [s["text"] for s in catalog.segments(recording["id"])] == ["bom dia", "pessoal"]
+    summaries = catalog.summaries(recording["id"])
+    assert summaries[0]["template"] == "standup" and summaries[0]["provider"] == "gemini"
+
+
+def test_find_filters_by_date_duration_and_template(tmp_path):
+    catalog = RecordingCatalog(tmp_path / "catalog.db")
+    catalog.upsert_recording(tmp_path / "recording_20240110_100000.wav", duration=600.0)
+    catalog.upsert_recording(tmp_path / "recording_20240215_100000.wav", duration=3600.0)
+    catalog.upsert_recording(tmp_path / "recording_20240220_100000.wav", duration=120.0)
+    catalog.add_summary(tmp_path / "recording_20240110_100000.wav", "vendas", "…")
+
+    february = catalog.find(since=datetime(2024, 2, 1), until=datetime(2024, 3, 1))
+    assert [Path(r["path"]).name for r in february] == [
+        "recording_20240220_100000.wav",
+        "recording_20240215_100000.wav",
+    ]
+    assert len(catalog.find(min_duration=300)) == 2
+    assert [Path(r["path"]).name for r in catalog.find(template="vendas")] == ["recording_20240110_100000.wav"]
+
+
+def test_backfill_export_and_silence(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_wav(data_dir / "recording_20240301_120000.wav", np.zeros(8000))
+
+    catalog = RecordingCatalog(tmp_path / "catalog.db")
+    assert catalog.backfill(data_dir) == 1
+    assert catalog.backfill(data_dir) == 0
+
+    wav = data_dir / "recording_20240301_120000.wav"
+    # Silêncio total (-inf dB) é guardado como NULL
+    catalog.upsert_recording(wav, peak_db=float("-inf"))
+    recording = catalog.get(wav)
+    assert recording["duration"] == 0.5 and recording["peak_db"] is None
+
+    catalog.add_export(wav, tmp_path / "ata.md")
+    assert catalog.exports(recording["id"]) == [str((tmp_path / "ata.md").resolve())]
+    assert recording_timestamp("outro_nome.wav") is None
+
+
+def test_search_folds_accents_and_returns_segment_times(tmp_path):
+    catalog = RecordingCatalog(tmp_path / "catalog.db")
+    march = tmp_path / "recording_20240312_150000.wav"
+    april = tmp_path / "recording_20240402_150000.wav"
+    catalog.set_transcript(march, "…", [
+        {"start_ms": 0, "end_ms": 4000, "text": "Bom dia, vamos começar a reunião."},
+        {"start_ms": 754000, "end_ms": 761500, "text": "A Joana concordou em lançar a API em março."},
+    ])
+    catalog.set_transcript(april, "Retrospectiva das reuniões de abril sem segmentos.")
+    catalog.add_summary(april, "equipe", "Decisão: lançar a API pública em maio.")
+
+    hits = catalog.search("lancar api marco")
+    assert hits[0]["path"] == str(march.resolve())
+    assert hits[0]["kind"] == "segment" and hits[0]["start_ms"] == 754000
+    assert "[março]" in hits[0]["snippet"]
+
+    # Radical aproximado: "reunião" encontra "reuniões"; sem segmentos indexa o texto todo
+    kinds = {(Path(h["path"]).name, h["kind"]) for h in catalog.search("REUNIÃO")}
+    assert kinds == {(march.name, "segment"), (april.name, "transcript")}
+
+    assert [h["kind"] for h in catalog.search("API", kinds=["summary"])] == ["summary"]
+    assert catalog.search('"API em maio"') == []
+    assert catalog.search("") == [] and catalog.search(" ?! ") == []
+
+    # Transcrição refeita substitui os documentos antigos do índice
+    catalog.set_transcript(march, "…", [{"start_ms": 0, "end_ms": 1000, "text": "outro assunto"}])
+    assert all(Path(h["path"]).name != march.name for h in catalog.search("março"))
+
+
+def test_match_query_neutralizes_fts_syntax():
+    # Operadores e curingas digitados viram termos comuns entre aspas
+    assert build_match_query('NEAR(a b) OR "x*"') == '"x" "nea"* "b"* "or"*'
+    assert build_match_query("reuniões") == '"reunio"*'
+
+
+def test_search_index_rebuilt_for_existing_catalog(tmp_path):
+    db_path = tmp_path / "catalog.db"
+    catalog = RecordingCatalog(db_path)
+    catalog.set_transcript(tmp_path / "recording_20240101_080000.wav", "…", [
+        {"start_ms": 1500, "end_ms": 3000, "text": "orçamento aprovado"},
+    ])
+    # Simular um catálogo criado antes do índice de texto
+    with catalog._lock:
+        catalog._conn.execute("DROP TABLE search_index")
+    catalog.close()
+
+    reopened = RecordingCatalog(db_path)
+    assert [h["start_ms"] for h in reopened.search("orcamento")] == [1500]
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    for test in (
+        test_pipeline_populates_catalog,
+        test_find_filters_by_date_duration_and_template,
+        test_backfill_export_and_silence,
+        test_search_folds_accents_and_returns_segment_times,
+        test_search_index_rebuilt_for_existing_catalog,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    test_match_query_neutralizes_fts_syntax()
+    print("✅ Catálogo de gravações OK")
@@ -0,0 +1,107 @@
+"""
+Teste do ConfigManager como fonte única de configurações
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.utils.config_manager import AudioSettings, ConfigManager
+from src.utils.persistence import DebouncedJsonWriter
+
+
+def test_typed_sections_merge_with_defaults(tmp_path):
+    (tmp_path / "settings.json").write_text(json.dumps({"audio": {"sample_rate": 48000, "mic_gain": 1.0}}))
+    manager = ConfigManager(config_dir=tmp_path)
+
+    audio = manager.audio
+    assert isinstance(audio, AudioSettings)
+    assert audio.sample_rate == 48000
+    assert audio.channels == 2
+    # Campos desconhecidos continuam preservados no dicionário
+    assert manager.get("audio.mic_gain") == 1.0
+
+
+def test_updates_notify_and_are_saved_once(tmp_path):
+    manager = ConfigManager(config_dir=tmp_path, save_delay=0.05)
+    events = []
+    manager.subscribe("audio", events.append)
+
+    manager.update_section("audio", sample_rate=22050)
+    manager.update_section("audio", record_system_audio=False)
+    manager.set("audio.input_device", 3)
+
+    assert [event.sample_rate for event in events] == [22050, 22050, 22050]
+    assert events[-1].input_device == 3
+
+    manager.flush()
+    saved = json.loads((tmp_path / "settings.json").read_text())
+    assert saved["audio"]["sample_rate"] == 22050
+    assert saved["audio"]["record_system_audio"] is False
+    assert saved["audio"]["input_device"] == 3
+    # Nenhum arquivo temporário esquecido
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_api_keys_are_served_from_memory(tmp_path):
+    (tmp_path / "api_keys.json").write_text(json.dumps({"openai_api_key": "sk-1", "ai_provider": "gemini"}))
+    manager = ConfigManager(config_dir=tmp_path, save_delay=0.05)
+
+    (tmp_path / "api_keys.json").unlink()
+    assert manager.get_api_key("openai") == "sk-1"
+    assert manager.get_api_keys().ai_provider == "gemini"
+
+    received = []
+    manager.subscribe("api_keys", received.append)
+    manager.set_api_key("gemini", "g-2")
+    assert received[-1].gemini_api_key == "g-2"
+
+    manager.flush()
+    saved = json.loads((tmp_path / "api_keys.json").read_text())
+    assert saved == {"openai_api_key": "sk-1", "ai_provider": "gemini", "gemini_api_key": "g-2"}
+
+
+def test_debounced_writer_coalesces(tmp_path):
+    target = tmp_path / "out.json"
+    writer = DebouncedJsonWriter(target, delay=0.05)
+    for value in range(10):
+        writer.schedule(lambda value=value: {"value": value})
+
+    time.sleep(0.3)
+    assert writer.writes == 1
+    assert json.loads(target.read_text()) == {"value": 9}
+
+
+def test_debounced_writer_keeps_pending_data_after_failed_write(tmp_path):
+    target = tmp_path / "out.json"
+    writer = DebouncedJsonWriter(target, delay=60)
+    writer.schedule(lambda: {"value": 1})
+    target.mkdir()  # um diretório no lugar do arquivo faz a gravação falhar
+
+    with pytest.raises(OSError):
+        writer.flush()
+    assert writer.pending and writer.writes == 0
+
+    target.rmdir()
+    assert writer.flush() and not writer.pending
+    assert json.loads(target.read_text()) == {"value": 1}
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    for test in (
+        test_typed_sections_merge_with_defaults,
+        test_updates_notify_and_are_saved_once,
+        test_api_keys_are_served_from_memory,
+        test_debounced_writer_coalesces,
+        test_debounced_writer_keeps_pending_data_after_failed_write,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ ConfigManager OK")
@@ -0,0 +1,114 @@
+"""
+Teste do registro de dispositivos (cache da enumeração do PortAudio)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.audio.devices import DeviceRegistry
+
+
+class FakePortAudio:
+    """Simula sd.query_devices() contando quantas vezes foi consultado"""
+
+    def __init__(self):
+        self.queries = 0
+        self.rescans = 0
+        self.devices = [
+            {"name": "Microfone (Realtek Audio)", "max_input_channels": 2, "default_samplerate": 44100.0},
+            {"name": "Alto-falantes", "max_input_channels": 0, "default_samplerate": 48000.0},
+            {"name": "Stereo Mix (Realtek Audio)", "max_input_channels": 2, "default_samplerate": 44100.0},
+        ]
+
+    def query(self):
+        self.queries += 1
+        return list(self.devices), 0
+
+    def rescan(self):
+        self.rescans += 1
+
+
+def test_enumeration_is_cached_and_classified():
+    fake = FakePortAudio()
+    registry = DeviceRegistry(query=fake.query, rescan=fake.rescan)
+
+    assert [d["index"] for d in registry.inputs()] == [0, 2]
+    assert [d["name"] for d in registry.microphones()] == ["Microfone (Realtek Audio)"]
+    assert [d["index"] for d in registry.loopbacks()] == [2]
+    assert registry.default_input()["index"] == 0
+    assert registry.find(2)["channels"] == 2
+    assert fake.queries == 1
+
+
+def test_refresh_notifies_only_on_change():
+    fake = FakePortAudio()
+    registry = DeviceRegistry(query=fake.query, rescan=fake.rescan)
+    registry.snapshot()
+
+    changes = []
+    unsubscribe = registry.subscribe(changes.append)
+
+    registry.refresh()
+    assert changes == []
+
+    fake.devices.append({"name": "Headset USB", "max_input_channels": 1, "default_samplerate": 16000.0})
+    registry.refresh()
+    assert len(changes) == 1
+    assert changes[0].find(3)["name"] == "Headset USB"
+    assert fake.rescans == 2
+
+    unsubscribe()
+    fake.devices.pop()
+    registry.refresh()
+    assert len(changes) == 1
+
+
+def test_no_rescan_while_streams_are_open():
+    fake = FakePortAudio()
+    registry = DeviceRegistry(query=fake.query, rescan=fake.rescan)
+
+    with registry.hold():
+        registry.refresh()
+    assert fake.rescans == 0
+
+    registry.refresh()
+    assert fake.rescans == 1
+
+
+def test_invalidate_forces_new_query():
+    fake = FakePortAudio()
+    registry = DeviceRegistry(query=fake.query, rescan=fake.rescan)
+    registry.inputs()
+    registry.invalidate()
+    registry.inputs()
+    assert fake.queries == 2
+
+
+def test_refresh_keeps_indices_following_names():
+    fake = FakePortAudio()
+    registry = DeviceRegistry(query=fake.query, rescan=fake.rescan)
+    registry.snapshot()
+    changes = []
+    registry.subscribe(changes.append)
+
+    # Sem pedido explícito, nada reinicializa o PortAudio
+    registry.inputs()
+    assert fake.rescans == 0 and fake.queries == 1
+
+    # Após a reinicialização, um headset novo entra antes e renumera os demais
+    fake.devices.insert(0, {"name": "Headset USB", "max_input_channels": 1, "default_samplerate": 16000.0})
+    registry.refresh()
+    assert fake.rescans == 1
+    assert changes[0].renumbered == {0: 1, 2: 3}
+    assert changes[0].find(3)["name"] == "Stereo Mix (Realtek Audio)"
+
+
+if __name__ == "__main__":
+    test_enumeration_is_cached_and_classified()
+    test_refresh_notifies_only_on_change()
+    test_no_rescan_while_streams_are_open()
+    test_invalidate_forces_new_query()
+    test_refresh_keeps_indices_following_names()
+    print("✅ Registro de dispositivos OK")
@@ -0,0 +1,117 @@
+"""
+Teste do kernel de DSP em blocos (src/audio/dsp_kernel.py) contra a cadeia etapa por etapa
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.audio.dsp_kernel import FusedDspKernel
+from src.audio.recorder import AudioProcessor, AudioRecorder
+
+RATE = 44100
+
+
+def _pair(seconds=1.5, seed=7):
+    """Fala sintética com pausas no microfone; o sistema tem outra voz e vazamento do microfone."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(RATE * seconds)) / RATE
+    phrases = (np.sin(2 * np.pi * 0.8 * t) > -0.2).astype(float)
+    mic = np.sin(2 * np.pi * 180 * t) * np.clip(np.sin(2 * np.pi * 4 * t), 0, None) * phrases * 12000
+    mic += rng.standard_normal(t.size) * 15
+    system = np.sin(2 * np.pi * 240 * t + 1.0) * 6000 + 0.25 * mic + rng.standard_normal(t.size) * 15
+    # Estéreo intercalado, como no gravador
+    stereo = lambda mono: np.column_stack((mono, mono * 0.9)).reshape(-1)
+    return stereo(mic).astype(np.int16), stereo(system).astype(np.int16)
+
+
+def _recorder(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return AudioRecorder()
+
+
+def test_fused_kernel_matches_stage_chain(tmp_path, monkeypatch):
+    recorder = _recorder(tmp_path, monkeypatch)
+    mic, system = _pair()
+    reference = recorder._process_pair_stages(mic, system)
+    # Blocos menores que a janela do gate e maiores que o chunk
+    for block in (300, 8192, mic.size + 10):
+        fused = FusedDspKernel(block).process(mic, system, RATE, recorder.config)
+        assert fused.dtype == np.int16 and fused.size == reference.size
+        assert np.abs(fused.astype(np.int32) - reference).max() <= 1
+
+    assert recorder.config["fused_dsp"]
+    assert np.abs(recorder._process_pair(mic, system).astype(np.int32) - reference).max() <= 1
+
+
+def test_fused_kernel_covers_config_and_single_tracks(tmp_path, monkeypatch):
+    recorder = _recorder(tmp_path, monkeypatch)
+    mic, system = _pair(seconds=0.5, seed=3)
+    empty = np.array([], dtype=np.int16)
+    recorder.config.update(mic_gain_db=0.0, enable_compressor=False, enable_echo_reduction=False)
+    kernel = recorder.dsp_kernel
+    for pair in ((mic, system), (mic, empty), (empty, system), (mic[:20], system[:9]), (empty, empty)):
+        reference = recorder._process_pair_stages(*pair)
+        fused = kernel.process(*pair, RATE, recorder.config)
+        assert fused.size == reference.size
+        if fused.size:
+            assert np.abs(fused.astype(np.int32) - reference).max() <= 1
+
+    # Os buffers float32 são reaproveitados entre chamadas do mesmo tamanho
+    buffer = kernel._mic
+    kernel.process(mic, system, RATE, recorder.config)
+    assert kernel._mic is buffer and buffer.dtype == np.float32
+
+    # Áudio maior que retain_samples (arquivo final) não deixa as faixas residentes
+    small = FusedDspKernel(retain_samples=mic.size - 1)
+    released = small.process(mic, system, RATE, recorder.config)
+    assert np.array_equal(released, kernel.process(mic, system, RATE, recorder.config))
+    assert small._mic.size == 0 and small._system.size == 0 and kernel._mic is buffer
+
+
+def test_float32_precision_stays_within_documented_bounds(tmp_path, monkeypatch):
+    recorder = _recorder(tmp_path, monkeypatch)
+    mic, system = _pair(seconds=1.0, seed=11)
+    reference = recorder._process_pair_stages(mic, system, np.float64)
+    for output in (
+        recorder._process_pair_stages(mic, system, np.float32),
+        recorder._process_pair(mic, system, recorder.config["realtime_precision"]),
+    ):
+        error = output.astype(np.int64) - reference
+        # Limites do DOCS.md: até 16 LSB por amostra e erro RMS abaixo de -80 dBFS
+        assert np.abs(error).max() <= 16
+        assert 20 * np.log10(np.sqrt(np.mean(error.astype(np.float64) ** 2)) / 32767 + 1e-12) < -80
+
+    assert recorder.config["realtime_precision"] == "float32" and recorder.config["final_precision"] == "float64"
+    with pytest.raises(ValueError):
+        AudioProcessor.precision_dtype("float16")
+
+
+def test_noise_gate_keeps_float64_envelope_in_float32_mode():
+    mic, _ = _pair(seconds=0.5, seed=5)
+    # O envelope do gate não acumula erro de float32 (o passa-altas nem recebe dtype)
+    gate = lambda dtype: AudioProcessor.apply_noise_gate(mic, RATE, threshold_db=-55.0, floor=0.12, dtype=dtype)
+    # Só o produto amostra × envelope é em float32: até 1 LSB
+    assert np.abs(gate(np.float32).astype(np.int64) - gate(np.float64)).max() <= 1
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    class _Patch:
+        def chdir(self, path):
+            os.chdir(path)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_fused_kernel_matches_stage_chain(Path(tmp), _Patch())
+        test_fused_kernel_covers_config_and_single_tracks(Path(tmp), _Patch())
+        test_float32_precision_stays_within_documented_bounds(Path(tmp), _Patch())
+        test_noise_gate_keeps_float64_envelope_in_float32_mode()
+        os.chdir(cwd)
+    print("✅ Kernel de DSP em blocos OK")
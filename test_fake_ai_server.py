@@ -0,0 +1,125 @@
+"""
+Teste do servidor falso OpenAI/Gemini (src/devtools/fake_ai_server.py)
+"""
+
+import json
+import sys
+import urllib.error
+import urllib.request
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.audio.buffers import PcmBuffer
+from src.devtools.fake_ai_server import FakeAIConfig, FakeAIServer
+from src.utils.config_manager import ConfigManager
+
+
+def _post(url, body, content_type, headers=None):
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": content_type, **(headers or {})})
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return response.status, response.read()
+
+
+def _transcription_request(server, audio, response_format="verbose_json", headers=None):
+    boundary = uuid.uuid4().hex
+    parts = [
+        f'--{boundary}\r\nContent-Disposition: form-data; name="model"\r\n\r\nwhisper-1\r\n'.encode(),
+        f'--{boundary}\r\nContent-Disposition: form-data; name="response_format"\r\n\r\n{response_format}\r\n'.encode(),
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="chunk.wav"\r\n'
+        f"Content-Type: audio/wav\r\n\r\n".encode() + audio + b"\r\n",
+        f"--{boundary}--\r\n".encode(),
+    ]
+    return _post(
+        f"{server.openai_base_url}/audio/transcriptions",
+        b"".join(parts),
+        f"multipart/form-data; boundary={boundary}",
+        headers,
+    )
+
+
+def _wav_bytes(seconds, seed=0):
+    samples = (np.random.default_rng(seed).standard_normal(int(seconds * 8000)) * 1000).astype(np.int16)
+    return PcmBuffer(samples, 8000).to_wav().getvalue()
+
+
+def test_endpoints_are_deterministic():
+    with FakeAIServer() as server:
+        audio = _wav_bytes(12.0)
+        status, body = _transcription_request(server, audio)
+        result = json.loads(body)
+        assert status == 200
+        assert result["duration"] == 12.0
+        # Um segmento a cada 5 s, o último truncado na duração do áudio
+        assert [(s["start"], s["end"]) for s in result["segments"]] == [(0.0, 5.0), (5.0, 10.0), (10.0, 12.0)]
+        assert json.loads(_transcription_request(server, audio)[1]) == result
+        assert _transcription_request(server, audio, "text")[1].decode("utf-8") == result["text"]
+
+        chat = {"model": "gpt-3.5-turbo", "messages": [{"role": "user", "content": result["text"]}]}
+        _, first = _post(f"{server.openai_base_url}/chat/completions", json.dumps(chat).encode(), "application/json")
+        _, second = _post(f"{server.openai_base_url}/chat/completions", json.dumps(chat).encode(), "application/json")
+        summary = json.loads(first)["choices"][0]["message"]["content"]
+        assert summary.startswith("## Resumo") and summary == json.loads(second)["choices"][0]["message"]["content"]
+
+        gemini = {"contents": [{"role": "user", "parts": [{"text": result["text"]}]}]}
+        _, body = _post(
+            f"{server.gemini_base_url}/v1beta/models/gemini-2.5-flash:generateContent",
+            json.dumps(gemini).encode(),
+            "application/json",
+        )
+        assert json.loads(body)["candidates"][0]["content"]["parts"][0]["text"] == summary
+        assert server.stats()["calls"] == {"transcriptions": 3, "chat": 2, "gemini": 1}
+
+
+def test_errors_and_api_key():
+    with FakeAIServer(FakeAIConfig(error_rate=1.0, seed=1)) as server:
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            _transcription_request(server, _wav_bytes(1.0))
+        assert excinfo.value.code in (429, 500, 503)
+        assert "error" in json.loads(excinfo.value.read())
+
+    with FakeAIServer(FakeAIConfig(api_key="sk-teste")) as server:
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            _transcription_request(server, _wav_bytes(1.0), headers={"Authorization": "Bearer outra"})
+        assert excinfo.value.code == 401
+        status, _ = _transcription_request(server, _wav_bytes(1.0), headers={"Authorization": "Bearer sk-teste"})
+        assert status == 200
+        assert server.stats()["errors"] == {"transcriptions": 1}
+
+
+def test_clients_follow_base_url_setting(tmp_path):
+    pytest.importorskip("openai")
+    from src.ai.summarizer import Summarizer
+    from src.ai.transcriber import Transcriber
+
+    with FakeAIServer() as server:
+        config = ConfigManager(config_dir=tmp_path)
+        config.update_api_keys(openai_api_key="sk-fake", ai_provider="openai")
+        transcriber = Transcriber(config)
+        summarizer = Summarizer(config)
+        # A troca do endpoint recria os clientes sem reiniciar
+        config.update_section("ai", openai_base_url=server.openai_base_url)
+
+        wav = PcmBuffer((np.random.default_rng(2).standard_normal(8000 * 6) * 1000).astype(np.int16), 8000)
+        result = transcriber.transcribe_detailed(wav)
+        assert result["text"] and len(result["segments"]) == 2
+        assert summarizer.generate_summary(result["text"]).startswith("## Resumo")
+        assert server.stats()["calls"]["transcriptions"] >= 1
+        config.flush()
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    test_endpoints_are_deterministic()
+    test_errors_and_api_key()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            test_clients_follow_base_url_setting(Path(tmp))
+    except BaseException as exc:  # pytest.skip sem o SDK instalado
+        print(f"[AVISO] Teste com os SDKs ignorado: {exc}")
+    print("✅ Servidor falso de IA OK")
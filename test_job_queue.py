@@ -0,0 +1,168 @@
+"""
+Teste da fila persistente de processamento (src/pipeline)
+"""
+
+import sys
+import threading
+import time
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.pipeline.jobs import STATUS_DONE, STATUS_FAILED, JobRunner, JobStore
+from src.pipeline.meeting import MeetingPipeline
+
+
+class SlowTranscriber:
+    """Transcritor falso que mede quantas chamadas rodam ao mesmo tempo"""
+
+    def __init__(self, delay=0.05, fail_times=0):
+        self.delay = delay
+        self.fail_times = fail_times
+        self.active = 0
+        self.max_active = 0
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio_file):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.calls.append(Path(audio_file).name)
+            should_fail = self.fail_times > 0
+            if should_fail:
+                self.fail_times -= 1
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return None if should_fail else f"transcrição de {Path(audio_file).stem}"
+
+
+class FakeSummarizer:
+    def generate_summary(self, transcript, template_id="auto"):
+        return f"[{template_id}] {transcript}"
+
+
+def _write_wav(path, seconds=0.1):
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(16000)
+        wf.writeframes(b"\x00\x00" * int(16000 * seconds))
+    return path
+
+
+def test_jobs_run_through_all_stages_with_bounded_concurrency(tmp_path):
+    transcriber = SlowTranscriber()
+    pipeline = MeetingPipeline(
+        transcriber,
+        FakeSummarizer(),
+        db_path=tmp_path / "jobs.db",
+        concurrency={"transcribed": 1},
+    )
+    jobs = [pipeline.submit(_write_wav(tmp_path / f"rec{i}.wav"), "standup") for i in range(3)]
+    assert pipeline.wait_idle(timeout=10)
+    pipeline.shutdown(wait=True)
+
+    assert transcriber.max_active == 1
+    # Uma etapa com um worker atende os jobs na ordem de chegada
+    assert transcriber.calls == ["rec0.wav", "rec1.wav", "rec2.wav"]
+    for job in jobs:
+        stored = pipeline.store.get(job.id)
+        assert stored.status == STATUS_DONE and stored.stage == "archived"
+        assert stored.summary.startswith("[standup] transcrição de rec")
+        assert stored.metadata["duration"] == 0.1
+
+
+def test_unfinished_jobs_resume_from_last_completed_stage(tmp_path):
+    db_path = tmp_path / "jobs.db"
+    audio = _write_wav(tmp_path / "interrompida.wav")
+
+    # Simular um processo que morreu durante a geração do resumo
+    store = JobStore(db_path)
+    job = store.create(str(audio), "auto")
+    store.mark_running(job.id)
+    store.advance(job.id, "encoded")
+    store.advance(job.id, "transcribed", {"transcript": "texto já transcrito"})
+    store.mark_running(job.id)
+    store.close()
+
+    transcriber = SlowTranscriber()
+    pipeline = MeetingPipeline(transcriber, FakeSummarizer(), db_path=db_path)
+    resumed = pipeline.resume()
+    assert [j.id for j in resumed] == [job.id]
+    assert pipeline.wait_idle(timeout=10)
+
+    final = pipeline.store.get(job.id)
+    assert final.status == STATUS_DONE
+    assert final.summary == "[auto] texto já transcrito"
+    # A transcrição concluída antes da interrupção não é refeita
+    assert transcriber.calls == []
+    pipeline.shutdown(wait=True)
+
+
+def test_failed_stage_is_retried_then_marked_failed(tmp_path):
+    audio = _write_wav(tmp_path / "a.wav")
+    flaky = SlowTranscriber(delay=0, fail_times=1)
+    pipeline = MeetingPipeline(flaky, FakeSummarizer(), db_path=tmp_path / "ok.db", retry_delay=0.01)
+    job = pipeline.submit(audio)
+    assert pipeline.wait_idle(timeout=10)
+    assert pipeline.store.get(job.id).status == STATUS_DONE
+    assert flaky.calls == ["a.wav", "a.wav"]
+    pipeline.shutdown(wait=True)
+
+    events = []
+    broken = SlowTranscriber(delay=0, fail_times=10)
+    pipeline = MeetingPipeline(broken, FakeSummarizer(), db_path=tmp_path / "fail.db", max_attempts=2, retry_delay=0.01)
+    pipeline.add_listener(lambda job, event: events.append(event))
+    job = pipeline.submit(audio)
+    assert pipeline.wait_idle(timeout=10)
+    failed = pipeline.store.get(job.id)
+    assert failed.status == STATUS_FAILED and failed.stage == "encoded"
+    assert "transcribed" in failed.error
+    assert events.count("retrying") == 1 and events[-1] == "failed"
+    pipeline.shutdown(wait=True)
+
+
+def test_recording_without_speech_completes_with_empty_transcript(tmp_path):
+    class SilentTranscriber:
+        def transcribe_detailed(self, audio_file):
+            return {"text": "", "segments": [], "no_speech": True}
+
+    class StrictSummarizer:
+        def generate_summary(self, transcript, template_id="auto"):
+            raise AssertionError("não deveria resumir uma gravação sem fala")
+
+    pipeline = MeetingPipeline(SilentTranscriber(), StrictSummarizer(), db_path=tmp_path / "jobs.db", retry_delay=0.01)
+    job = pipeline.submit(_write_wav(tmp_path / "silencio.wav"))
+    assert pipeline.wait_idle(timeout=10)
+    pipeline.shutdown(wait=True)
+
+    stored = pipeline.store.get(job.id)
+    assert stored.status == STATUS_DONE and stored.stage == "archived" and stored.attempts == 0
+    assert stored.transcript == "" and stored.summary is None and stored.metadata["no_speech"]
+
+
+def test_shutdown_leaves_pending_jobs_in_store(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    runner = JobRunner(store, {})
+    runner.shutdown()
+    job = runner.submit("nao_existe.wav")
+    assert store.get(job.id).status == "pending"
+    assert [j.id for j in store.unfinished()] == [job.id]
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    for test in (
+        test_jobs_run_through_all_stages_with_bounded_concurrency,
+        test_unfinished_jobs_resume_from_last_completed_stage,
+        test_failed_stage_is_retried_then_marked_failed,
+        test_recording_without_speech_completes_with_empty_transcript,
+        test_shutdown_leaves_pending_jobs_in_store,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Fila de processamento OK")
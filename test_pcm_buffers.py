@@ -0,0 +1,130 @@
+"""
+Teste da transcrição a partir de buffers em memória (src/audio/buffers.py)
+"""
+
+import sys
+import threading
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.ai.transcriber import Transcriber
+from src.audio.buffers import PcmBuffer
+from src.audio.recorder import AudioRecorder
+
+
+class FakeTranscriptions:
+    """Registra o que seria enviado à API (nome, quadros e primeira amostra)"""
+
+    def __init__(self):
+        self.uploads = []
+        self._lock = threading.Lock()
+
+    def create(self, model, file, language, **kwargs):
+        name, stream = file if isinstance(file, tuple) else (getattr(file, "name", ""), file)
+        with wave.open(stream, "rb") as wf:
+            frames = wf.getnframes()
+            first = np.frombuffer(wf.readframes(1), dtype=np.int16)[0]
+        with self._lock:
+            self.uploads.append((Path(name).name, frames, int(first)))
+        text = f"t{first}"
+        segments = [{"start": 0.5, "end": 1.0, "text": text}]
+        return type("Response", (), {"text": text, "segments": segments})()
+
+
+def _transcriber():
+    transcriber = Transcriber.__new__(Transcriber)
+    transcriber._api_key = "teste"
+    transcriber._client = type("Client", (), {})()
+    transcriber._client.audio = type("Audio", (), {})()
+    transcriber._client.audio.transcriptions = FakeTranscriptions()
+    return transcriber, transcriber._client.audio.transcriptions
+
+
+def test_buffer_slices_are_views_and_round_trip_as_wav():
+    samples = np.arange(20, dtype=np.int16).reshape(-1, 2)
+    buffer = PcmBuffer(samples, 16000)
+    assert buffer.channels == 2 and buffer.frames == 10
+
+    part = buffer.slice(2, 5)
+    assert np.shares_memory(part.samples, buffer.samples)
+    assert part.samples.tolist() == [4, 5, 6, 7, 8, 9]
+
+    stream = buffer.to_wav()
+    assert stream.name == "audio.wav" and len(stream.getvalue()) == buffer.wav_nbytes
+    decoded = PcmBuffer.from_wav(stream, start_frame=3, frame_count=2)
+    assert decoded.sample_rate == 16000 and decoded.samples.tolist() == [6, 7, 8, 9]
+
+    pieces = buffer.split(44 + 4 * 3)
+    assert [p.frames for p in pieces] == [3, 3, 3, 1]
+    assert np.concatenate([p.samples for p in pieces]).tolist() == buffer.samples.tolist()
+
+
+def test_transcribe_buffer_and_stream_without_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    transcriber, api = _transcriber()
+    buffer = PcmBuffer(np.full(16000, 7, dtype=np.int16), 16000)
+    assert transcriber.transcribe(buffer) == "t7"
+
+    stream = PcmBuffer(np.full(1600, 3, dtype=np.int16), 16000).to_wav("gravacao.wav")
+    assert transcriber.transcribe(stream) == "t3"
+    assert stream.tell() == 0  # posição restaurada para uma nova tentativa
+    assert api.uploads == [("chunk.wav", 16000, 7), ("gravacao.wav", 1600, 3)]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_large_inputs_are_split_in_memory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # ~20 MB (dois pedaços de até 12 MB); valores diferentes ao longo do áudio conferem a ordem
+    frames = 5_300_000
+    samples = np.repeat(np.array([1, 2, 3], dtype=np.int16), -(-frames // 3))[:frames]
+    buffer = PcmBuffer(np.column_stack([samples, samples]), 44100)
+    path = buffer.save_wav(tmp_path / "longa.wav")
+
+    transcriber, api = _transcriber()
+    assert transcriber.transcribe(buffer) == "t1 t2"
+    assert sum(frames for _, frames, _ in api.uploads) == buffer.frames
+
+    detailed = transcriber.transcribe_detailed(str(path))
+    assert detailed["text"] == "t1 t2"
+    starts = [s["start_ms"] for s in detailed["segments"]]
+    assert starts[0] == 500 and starts == sorted(starts)
+    assert starts[1] == 500 + round(api.uploads[0][1] * 1000 / 44100)
+    # Nenhum WAV intermediário além da gravação original
+    assert sorted(p.name for p in tmp_path.rglob("*") if p.is_file()) == ["longa.wav"]
+
+
+def test_realtime_chunks_reach_callback_in_memory():
+    recorder = AudioRecorder()
+    received = []
+    recorder.realtime_callback = lambda chunk, index: received.append((chunk, index))
+    # Tom puro não é fala: a triagem de chunks silenciosos o descartaria
+    recorder.config["skip_silent_chunks"] = False
+    tone = (np.sin(np.arange(8820) / 10.0) * 3000).astype(np.int16)
+    recorder._emit_chunk(tone, np.zeros(0, dtype=np.int16))
+
+    chunk, index = received[0]
+    assert isinstance(chunk, PcmBuffer) and index == 1
+    assert chunk.sample_rate == recorder.sample_rate and chunk.channels == recorder.channels
+    assert chunk.frames == tone.size // recorder.channels
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    class _Patch:
+        def chdir(self, path):
+            os.chdir(path)
+
+    test_buffer_slices_are_views_and_round_trip_as_wav()
+    cwd = os.getcwd()
+    for test in (test_transcribe_buffer_and_stream_without_files, test_large_inputs_are_split_in_memory):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp), _Patch())
+            os.chdir(cwd)
+    test_realtime_chunks_reach_callback_in_memory()
+    print("✅ Buffers em memória OK")
@@ -0,0 +1,134 @@
+"""
+Teste do backend de captura simulado (src/audio/backends.py)
+"""
+
+import sys
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.audio.backends import (
+    ArraySource,
+    GeneratedSource,
+    SimulatedBackend,
+    SimulatedInputStream,
+    WavSource,
+)
+from src.audio.buffers import PcmBuffer
+from src.audio.recorder import AudioRecorder
+
+
+def test_recorder_runs_end_to_end_without_sound_card(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    backend = SimulatedBackend(
+        GeneratedSource("tone", seconds=3.0, level_db=-20.0),
+        GeneratedSource("noise", seconds=3.0, level_db=-40.0),
+        speed=0,
+    )
+    recorder = AudioRecorder(backend=backend)
+    recorder.chunk_duration = 1
+    recorder.chunk_overlap = 0
+    recorder.config["enable_noise_gate"] = False
+    # Tom puro não é fala: a triagem de chunks silenciosos o descartaria
+    recorder.config["skip_silent_chunks"] = False
+    chunks = []
+    recorder.set_realtime_transcription_callback(lambda chunk, index: chunks.append((index, chunk.frames)))
+
+    assert recorder.start_recording()
+    assert recorder.mic_device == 0 and recorder.system_device == 1
+    assert backend.wait_finished(timeout=10)
+    output = recorder.stop_recording()
+
+    mic = backend.streams[0]
+    # 3 s em blocos de 1024 quadros: o último bloco é completado com silêncio
+    assert mic.blocks == 130 and mic.frames_delivered == 130 * 1024
+    with wave.open(output, "rb") as wf:
+        assert wf.getnframes() == 130 * 1024 and wf.getnchannels() == 2
+    assert [index for index, _ in chunks] == [1, 2, 3, 4]
+    assert all(frames == 44100 for _, frames in chunks[:3])
+
+
+def test_xruns_drop_blocks_and_flag_the_next_one():
+    ramp = np.arange(64 * 100, dtype=np.int16)
+    delivered = []
+    flags = []
+
+    def callback(indata, frames, time_info, status):
+        assert indata.shape == (64, 2) and np.array_equal(indata[:, 0], indata[:, 1])
+        delivered.append(indata[:, 0].copy())
+        flags.append(bool(status))
+
+    stream = SimulatedInputStream(
+        ArraySource(ramp, sample_rate=8000),
+        samplerate=8000,
+        channels=2,
+        blocksize=64,
+        callback=callback,
+        speed=0,
+        xrun_rate=0.2,
+        seed=3,
+    )
+    stream.start()
+    assert stream.finished.wait(5)
+
+    assert stream.xruns > 0
+    assert stream.frames_delivered + stream.frames_lost == ramp.size
+    received = np.concatenate(delivered)
+    # Cada bloco que chega após uma perda está marcado e começa depois do buraco
+    starts = [int(block[0]) for block in delivered]
+    for start, flagged, previous in zip(starts[1:], flags[1:], starts):
+        assert flagged == (start - previous > 64)
+    assert received.size == stream.frames_delivered
+    assert stream.delivery_time(1) is not None
+
+
+def test_drift_and_speed_set_the_block_clock(tmp_path):
+    source = GeneratedSource("silence", seconds=0.1)
+    base = SimulatedInputStream(source, 48000, 2, 480, lambda *args: None, speed=1.0)
+    fast = SimulatedInputStream(source, 48000, 2, 480, lambda *args: None, speed=10.0, drift_ppm=1000)
+    assert abs(base.block_period - 0.01) < 1e-12
+    assert abs(fast.block_period - 0.001 / 1.001) < 1e-12
+
+    path = PcmBuffer(np.arange(10, dtype=np.int16), 16000).save_wav(tmp_path / "curto.wav")
+    looped = WavSource(path, loop=True)
+    assert looped.read(25)[:, 0].tolist() == list(range(10)) * 2 + list(range(5))
+
+
+def test_device_test_measures_level_of_selected_input(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    backend = SimulatedBackend(
+        GeneratedSource("tone", level_db=-20.0),
+        GeneratedSource("silence"),
+        speed=0,
+    )
+    recorder = AudioRecorder(backend=backend)
+    mic = recorder.test_input_device(None, seconds=0.05)
+    assert mic["name"] == "Microfone simulado" and mic["callbacks"] > 0
+    assert abs(mic["peak_db"] - -20.0) < 0.1
+    system = recorder.test_input_device(1, seconds=0.05)
+    assert system["peak_db"] == -90.0
+    assert not recorder.recording
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    class _Patch:
+        def chdir(self, path):
+            os.chdir(path)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_recorder_runs_end_to_end_without_sound_card(Path(tmp), _Patch())
+        os.chdir(cwd)
+    test_xruns_drop_blocks_and_flag_the_next_one()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_drift_and_speed_set_the_block_clock(Path(tmp))
+    with tempfile.TemporaryDirectory() as tmp:
+        test_device_test_measures_level_of_selected_input(Path(tmp), _Patch())
+        os.chdir(cwd)
+    print("✅ Backend simulado OK")
@@ -0,0 +1,99 @@
+"""
+Teste das pastas temporárias por job (src/utils/tempspace.py)
+"""
+
+import os
+import subprocess
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.ai.transcriber import Transcriber
+from src.utils import tempspace
+from src.utils.tempspace import TempWorkspace, cleanup_stale_workspaces
+
+
+def test_workspaces_are_unique_and_refcounted(tmp_path):
+    first = TempWorkspace("split", root=tmp_path)
+    second = TempWorkspace("split", root=tmp_path)
+    assert first.path != second.path
+    first.file("chunk_1.wav").write_bytes(b"a")
+    second.file("chunk_1.wav").write_bytes(b"b")
+    assert first.file("chunk_1.wav").read_bytes() == b"a"
+
+    # Outra etapa ainda usa os arquivos: a pasta sobrevive à primeira liberação
+    first.acquire()
+    first.release()
+    assert first.path.exists()
+    first.release()
+    assert not first.path.exists() and first.closed
+    first.release()  # liberar de novo não é erro
+
+    with second:
+        pass
+    assert not second.path.exists()
+
+
+def test_cleanup_removes_dead_process_and_legacy_leftovers(tmp_path):
+    # PID de um processo que já terminou
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    dead = tmp_path / f"rec-{proc.pid}-0123abcd"
+    dead.mkdir()
+    (dead / "chunk_001.wav").write_bytes(b"x")
+    (tmp_path / "chunk_003.wav").write_bytes(b"x")
+    (tmp_path / "notas.txt").write_text("manter")
+
+    alive = TempWorkspace("split", root=tmp_path)
+    old = tmp_path / f"split-{os.getppid()}-fedc4321"
+    old.mkdir()
+    stale_time = time.time() - tempspace.STALE_AFTER_SECONDS - 60
+    os.utime(old, (stale_time, stale_time))
+
+    assert cleanup_stale_workspaces(tmp_path) == 3
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([alive.path.name, "notas.txt"])
+    alive.release()
+
+
+def test_split_keeps_frame_alignment(tmp_path):
+    source = tmp_path / "longa.wav"
+    with wave.open(str(source), "wb") as wf:
+        wf.setnchannels(2)
+        wf.setsampwidth(2)
+        wf.setframerate(44100)
+        # Número de quadros que não divide igualmente em 3 pedaços
+        expected = (np.arange(2 * 300001) % 30000).astype(np.int16)
+        wf.writeframes(expected.tobytes())
+
+    transcriber = Transcriber.__new__(Transcriber)
+    with TempWorkspace("split", root=tmp_path) as workspace:
+        chunks = transcriber.split_audio_file(str(source), max_size_mb=0.5, workspace=workspace)
+        assert len(chunks) == 3
+        assert all(Path(c).parent == workspace.path for c in chunks)
+        samples = []
+        for chunk in chunks:
+            with wave.open(chunk, "rb") as wf:
+                samples.append(np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16))
+        joined = np.concatenate(samples)
+        assert np.array_equal(joined, expected)
+        # Cada pedaço começa no canal esquerdo (amostra de índice par)
+        assert all(s[0] % 2 == 0 for s in samples)
+    assert not workspace.path.exists()
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    for test in (
+        test_workspaces_are_unique_and_refcounted,
+        test_cleanup_removes_dead_process_and_legacy_leftovers,
+        test_split_keeps_frame_alignment,
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            test(Path(tmp))
+    print("✅ Pastas temporárias OK")
@@ -0,0 +1,98 @@
+"""
+Teste do rastreamento de etapas (src/utils/tracing.py)
+"""
+
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.pipeline.jobs import STATUS_DONE, JobRunner, JobStore
+from src.utils.tracing import Tracer, format_stage_stats, load_stage_stats, propagate
+
+
+def test_spans_nest_across_threads_and_are_written_as_jsonl(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    tracer = Tracer(path)
+
+    def upload(index):
+        with tracer.span("transcribe.upload", chunk=index):
+            time.sleep(0.01)
+            if index == 2:
+                raise RuntimeError("429")
+
+    with tracer.trace("job-1"), tracer.span("transcribe") as root:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(propagate(upload), index) for index in range(3)]
+        errors = [future.exception() for future in futures]
+        root.set(chunks=3)
+
+    table = tracer.end_trace("job-1", print_table=False)
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    by_name = {}
+    for record in records:
+        by_name.setdefault(record["name"], []).append(record)
+
+    assert [type(error).__name__ if error else None for error in errors] == [None, None, "RuntimeError"]
+    parent = by_name["transcribe"][0]
+    assert parent["trace_id"] == "job-1" and parent["attributes"] == {"chunks": 3}
+    uploads = by_name["transcribe.upload"]
+    assert len(uploads) == 3
+    assert all(u["trace_id"] == "job-1" and u["parent_span_id"] == parent["span_id"] for u in uploads)
+    assert sorted(u["status"] for u in uploads) == ["error", "ok", "ok"]
+    assert all(u["end_time_unix_nano"] - u["start_time_unix_nano"] >= 10_000_000 for u in uploads)
+    assert "transcribe.upload" in table
+
+    stats = tracer.stage_stats()
+    assert stats["transcribe.upload"]["count"] == 3 and stats["transcribe.upload"]["p50_ms"] >= 10
+    assert load_stage_stats(path)["transcribe.upload"]["count"] == 3
+    assert "p95" in format_stage_stats(stats)
+
+
+def test_job_runner_traces_each_stage(tmp_path, capsys):
+    tracer = Tracer(tmp_path / "traces.jsonl")
+    attempts = {"transcribed": 0}
+
+    def transcribe(job):
+        attempts["transcribed"] += 1
+        if attempts["transcribed"] == 1:
+            raise RuntimeError("timeout")
+        with tracer.span("transcribe.upload"):
+            pass
+        return {"transcript": "ok"}
+
+    store = JobStore(tmp_path / "jobs.db")
+    runner = JobRunner(
+        store,
+        {"encoded": lambda job: None, "transcribed": transcribe, "summarized": lambda job: None, "archived": lambda job: None},
+        retry_delay=0.01,
+        tracer=tracer,
+    )
+    job = runner.submit(str(tmp_path / "reuniao.wav"))
+    assert runner.wait_idle(timeout=5)
+    runner.shutdown(wait=True)
+    assert store.get(job.id).status == STATUS_DONE
+    store.close()
+
+    output = capsys.readouterr().out
+    assert f"=== Job {job.id}: reuniao.wav ===" in output
+    stages = load_stage_stats(tmp_path / "traces.jsonl")
+    assert stages["stage.transcribed"]["count"] == 2
+    assert stages["transcribe.upload"]["count"] == 1
+    records = [json.loads(line) for line in (tmp_path / "traces.jsonl").read_text(encoding="utf-8").splitlines()]
+    failed = [r for r in records if r["name"] == "stage.transcribed" and r["status"] == "error"]
+    assert len(failed) == 1 and failed[0]["error"] == "RuntimeError: timeout"
+    assert {r["trace_id"] for r in records} == {f"job-{job.id}"}
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        test_spans_nest_across_threads_and_are_written_as_jsonl(Path(tmp))
+    sys.exit(pytest.main([__file__, "-q", "-k", "job_runner"]))
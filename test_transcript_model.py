@@ -0,0 +1,125 @@
+"""
+Teste da transcrição ao vivo incremental (src/gui/transcript_model.py)
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.gui.transcript_model import IncrementalTranscriptView, TranscriptModel
+
+
+class FakeText:
+    """Subconjunto de tk.Text: índices são offsets e as marcas têm gravidade à direita"""
+
+    def __init__(self):
+        self.content = ""
+        self.marks = {}
+        self.inserted = []
+
+    def index(self, index):
+        if index == "end-1c":
+            return len(self.content)
+        return self.marks[index]
+
+    def insert(self, index, text):
+        self.content = self.content[:index] + text + self.content[index:]
+        self.marks = {name: pos + len(text) if pos >= index else pos for name, pos in self.marks.items()}
+        self.inserted.append(text)
+
+    def delete(self, start, end):
+        self.content = self.content[:start] + self.content[end:]
+        self.marks = {
+            name: start if start <= pos <= end else pos - (end - start) if pos > end else pos
+            for name, pos in self.marks.items()
+        }
+
+    def mark_set(self, name, index):
+        self.marks[name] = index
+
+    def mark_unset(self, name):
+        self.marks.pop(name, None)
+
+
+class FakeRoot:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append(callback)
+
+    def run(self):
+        callbacks, self.scheduled = self.scheduled, []
+        for callback in callbacks:
+            callback()
+
+
+def test_model_reports_only_changed_segments():
+    model = TranscriptModel()
+    assert model.set(2, "segundo trecho").next_key is None
+    change = model.set(1, " primeiro ")
+    assert change.key == 1 and change.next_key == 2 and change.old_text is None
+    assert model.set(1, "primeiro") is None
+    change = model.set(2, "segundo trecho corrigido")
+    assert change.old_text == "segundo trecho"
+    assert model.text == "primeiro segundo trecho corrigido"
+    assert model.word_count == 4
+
+
+def test_view_inserts_out_of_order_chunks_and_coalesces_updates():
+    root, widget = FakeRoot(), FakeText()
+    updates = []
+    view = IncrementalTranscriptView(root, widget, on_update=lambda model: updates.append(model.word_count))
+
+    threads = [threading.Thread(target=view.submit, args=(key, f"trecho {key}")) for key in (1, 3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(root.scheduled) == 1  # um único after para as duas chamadas
+    root.run()
+    assert widget.content == "trecho 1 trecho 3 "
+
+    view.submit(2, "trecho 2")
+    view.submit(4, "trecho 4")
+    root.run()
+    assert widget.content == "trecho 1 trecho 2 trecho 3 trecho 4 "
+    # Cada lote insere só os trechos novos, nunca o texto inteiro
+    assert widget.inserted == ["trecho 1 ", "trecho 3 ", "trecho 2 ", "trecho 4 "]
+
+    view.submit(3, "trecho três revisado")
+    root.run()
+    assert widget.content == "trecho 1 trecho 2 trecho três revisado trecho 4 "
+    assert updates == [4, 8, 9]
+
+    view.reset()
+    assert widget.marks == {} and len(view.model) == 0
+
+
+def test_view_with_real_text_widget():
+    tk = pytest.importorskip("tkinter")
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("sem display")
+    try:
+        text = tk.Text(root)
+        view = IncrementalTranscriptView(root, text)
+        for key in (2, 1, 3):
+            view.submit(key, f"parte {key}")
+        view.flush()
+        view.submit(1, "parte um")
+        view.flush()
+        assert text.get("1.0", "end-1c") == "parte um parte 2 parte 3 "
+    finally:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    test_model_reports_only_changed_segments()
+    test_view_inserts_out_of_order_chunks_and_coalesces_updates()
+    print("✅ Transcrição incremental OK")
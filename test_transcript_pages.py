@@ -0,0 +1,124 @@
+"""
+Teste da transcrição paginada (src/gui/transcript_pages.py)
+"""
+
+import io
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.gui.transcript_pages import (
+    CURRENT_TAG,
+    HIT_TAG,
+    SegmentStore,
+    TranscriptPager,
+    format_timestamp,
+    parse_timestamp,
+)
+
+
+class FakeText:
+    """Subconjunto de tk.Text com índices "1.0", "end" e "1.0+Nc" """
+
+    def __init__(self):
+        self.content = ""
+        self.tags = {}
+        self.seen = None
+        self.inserts = 0
+
+    def _offset(self, index):
+        if index == "1.0":
+            return 0
+        if index == "end":
+            return len(self.content)
+        return sum(int(n) for n in re.findall(r"\+(\d+)c", index))
+
+    def insert(self, index, text):
+        offset = self._offset(index)
+        self.content = self.content[:offset] + text + self.content[offset:]
+        self.inserts += 1
+
+    def delete(self, start, end):
+        self.content = self.content[:self._offset(start)] + self.content[self._offset(end):]
+
+    def tag_add(self, tag, start, end):
+        self.tags.setdefault(tag, []).append(self.content[self._offset(start):self._offset(end)])
+
+    def tag_remove(self, tag, start, end):
+        self.tags.pop(tag, None)
+
+    def see(self, index):
+        self.seen = self._offset(index)
+
+
+def make_segments(count, step_ms=5000):
+    return [
+        {"start_ms": i * step_ms, "end_ms": (i + 1) * step_ms, "text": f"segmento {i} sobre orçamento" if i % 100 == 7 else f"segmento {i}"}
+        for i in range(count)
+    ]
+
+
+def test_timestamps_round_trip():
+    assert format_timestamp(3723000) == "01:02:03"
+    assert parse_timestamp("1:02:03") == 3723000
+    assert parse_timestamp("62:03") == 3723000
+    assert parse_timestamp("45") == 45000
+    with pytest.raises(ValueError):
+        parse_timestamp("1:xx")
+
+
+def test_pager_materializes_one_page_and_jumps_by_time():
+    widget = FakeText()
+    pages = []
+    pager = TranscriptPager(widget, page_size=100, on_page=lambda p: pages.append(p.page))
+    # ~4 horas de segmentos de 5 s
+    pager.load(SegmentStore(make_segments(3000)))
+    assert pager.page_count == 30
+    assert widget.content.count("\n") == 100
+    assert widget.content.startswith("[00:00:00] segmento 0\n")
+
+    segment = pager.jump_to_time(parse_timestamp("02:30:02"))
+    assert segment == 1800 and pager.page == 18
+    assert widget.tags[CURRENT_TAG] == ["segmento 1800"]
+    assert widget.content.count("\n") == 100 and "[02:30:00] segmento 1800" in widget.content
+    assert pages == [0, 18]
+
+
+def test_search_highlights_page_and_wraps_around():
+    widget = FakeText()
+    pager = TranscriptPager(widget, page_size=100)
+    pager.load(SegmentStore(make_segments(300)))
+
+    assert pager.search_next("ORÇAMENTO") == (7, 17)
+    assert widget.tags[HIT_TAG] == ["orçamento"]
+    assert pager.search_next("orçamento") == (107, 19)
+    assert pager.page == 1 and widget.tags[HIT_TAG] == ["orçamento"]
+    assert pager.search_next("orçamento") == (207, 19)
+    assert pager.search_next("orçamento") == (7, 17) and pager.page == 0
+    assert pager.search_next("inexistente") is None
+
+
+def test_store_without_segments_and_save():
+    text = " ".join(f"palavra{i}" for i in range(200))
+    store = SegmentStore(None, text)
+    assert not store.timed and len(store) == 3
+    handle = io.StringIO()
+    store.write_to(handle)
+    assert handle.getvalue() == text
+
+    timed = SegmentStore(make_segments(3))
+    handle = io.StringIO()
+    timed.write_to(handle)
+    assert handle.getvalue() == "segmento 0 segmento 1 segmento 2"
+
+
+if __name__ == "__main__":
+    test_timestamps_round_trip()
+    test_pager_materializes_one_page_and_jumps_by_time()
+    test_search_highlights_page_and_wraps_around()
+    test_store_without_segments_and_save()
+    print("✅ Transcrição paginada OK")
@@ -0,0 +1,82 @@
+"""
+Teste do despachante de eventos da interface (src/gui/dispatcher.py)
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.gui.dispatcher import ERROR, JOB, STATUS, UIDispatcher
+
+
+class FakeRoot:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append(callback)
+        return len(self.scheduled)
+
+    def after_cancel(self, after_id):
+        pass
+
+    def run(self):
+        callbacks, self.scheduled = self.scheduled, []
+        for callback in callbacks:
+            callback()
+
+
+def test_status_is_coalesced_and_order_is_kept():
+    root = FakeRoot()
+    dispatcher = UIDispatcher(root)
+    delivered = []
+    dispatcher.register(STATUS, lambda text: delivered.append(("status", text)), coalesce=True)
+    dispatcher.register(JOB, lambda job, event: delivered.append((job, event)))
+    dispatcher.register(ERROR, lambda message: 1 / 0)
+
+    def worker(job):
+        for step in range(50):
+            dispatcher.post(STATUS, f"{job} passo {step}")
+        dispatcher.post(JOB, job, "completed")
+
+    threads = [threading.Thread(target=worker, args=(job,)) for job in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    dispatcher.post(ERROR, "handler com defeito não derruba o lote")
+    dispatcher.call(delivered.append, ("call", 1))
+
+    dispatcher.start()
+    root.run()
+    statuses = [item for item in delivered if item[0] == "status"]
+    assert len(statuses) == 1 and statuses[0][1].endswith("passo 49")
+    assert sorted(item for item in delivered if item[1] == "completed") == [("a", "completed"), ("b", "completed")]
+    assert delivered[-1] == ("call", 1)
+    assert dispatcher.posted == 104 and dispatcher.delivered + dispatcher.coalesced == 104
+    # A drenagem se reagenda enquanto o despachante estiver ativo
+    assert len(root.scheduled) == 1
+    dispatcher.stop()
+    root.run()
+    assert root.scheduled == []
+
+
+def test_batches_are_bounded():
+    dispatcher = UIDispatcher(FakeRoot(), max_batch=10)
+    seen = []
+    dispatcher.register(JOB, seen.append)
+    for index in range(25):
+        dispatcher.post(JOB, index)
+    assert dispatcher.drain() == 10
+    assert dispatcher.drain() == 10
+    assert dispatcher.drain() == 5
+    assert dispatcher.drain() == 0
+    assert seen == list(range(25))
+
+
+if __name__ == "__main__":
+    test_status_is_coalesced_and_order_is_kept()
+    test_batches_are_bounded()
+    print("✅ Despachante da interface OK")
@@ -0,0 +1,201 @@
+"""
+Teste da detecção de voz antes do upload (src/audio/vad.py)
+"""
+
+import io
+import sys
+import threading
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.ai.transcriber import Transcriber
+from src.audio.backends import GeneratedSource, SimulatedBackend
+from src.audio.buffers import PcmBuffer
+from src.audio.recorder import AudioRecorder
+from src.audio.vad import TimeMap, VoiceActivityDetector, extract_speech
+from src.utils.tempspace import TEMP_ROOT
+
+RATE = 16000
+
+
+def _amplitude(db):
+    return 32767 * 10 ** (db / 20)
+
+
+def _meeting(seed=0):
+    """1 s silêncio | 2 s fala | 3 s música de espera (tom) | 2 s silêncio | 1 s fala | 1 s silêncio"""
+    rng = np.random.default_rng(seed)
+
+    def silence(seconds):
+        return rng.standard_normal(int(RATE * seconds)) * _amplitude(-70)
+
+    def speech(seconds):
+        t = np.arange(int(RATE * seconds)) / RATE
+        syllables = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 2
+        return rng.standard_normal(t.size) * _amplitude(-20) * syllables + silence(seconds)
+
+    def hold_music(seconds):
+        t = np.arange(int(RATE * seconds)) / RATE
+        return np.sin(2 * np.pi * 440 * t) * _amplitude(-25) + silence(seconds)
+
+    parts = [silence(1), speech(2), hold_music(3), silence(2), speech(1), silence(1)]
+    return PcmBuffer(np.concatenate(parts).astype(np.int16), RATE)
+
+
+def test_detector_keeps_speech_and_drops_silence_and_hold_music(tmp_path):
+    buffer = _meeting()
+    regions = VoiceActivityDetector().detect(buffer)
+    seconds = [(start / RATE, end / RATE) for start, end in regions]
+    assert len(seconds) == 2
+    (a, b), (c, d) = seconds
+    # Pré-roll antes e hangover depois de cada trecho, sem engolir a música
+    assert 0.7 <= a <= 1.0 and 3.0 <= b <= 3.5
+    assert 7.7 <= c <= 8.0 and 9.0 <= d <= 9.5
+
+    # A análise em blocos do arquivo dá o mesmo resultado
+    path = buffer.save_wav(tmp_path / "reuniao.wav")
+    assert VoiceActivityDetector().detect_file(path)[0] == regions
+
+
+def test_time_map_restores_original_timestamps(tmp_path):
+    samples = np.arange(10 * RATE, dtype=np.int16)
+    buffer = PcmBuffer(samples, RATE)
+    regions = [(1 * RATE, 3 * RATE), (8 * RATE, 9 * RATE)]
+    speech, time_map = extract_speech(buffer, regions, gap_ms=200)
+    # 2 s + pausa de 0,2 s + 1 s
+    assert speech.frames == int(3.2 * RATE)
+    assert speech.samples[0] == samples[RATE] and speech.samples[-1] == samples[9 * RATE - 1]
+    assert time_map.speech_ms == 3000 and time_map.original_ms == 10000
+    assert time_map.to_original(500) == 1500
+    assert time_map.to_original(2100) == 3000  # dentro da pausa: cola no fim do trecho anterior
+    assert time_map.to_original(2700) == 8500
+    assert time_map.map_segments([{"start_ms": 2300, "end_ms": 3100, "text": "oi"}]) == [
+        {"start_ms": 8100, "end_ms": 8900, "text": "oi"}
+    ]
+
+    path = buffer.save_wav(tmp_path / "original.wav")
+    from_file, file_map = extract_speech(path, regions, gap_ms=200)
+    assert np.array_equal(from_file.samples, speech.samples) and file_map.pieces == time_map.pieces
+    # Com destino, a fala é gravada em blocos num WAV em vez de ficar na memória
+    written, written_map = extract_speech(path, regions, gap_ms=200, destination=tmp_path / "fala.wav")
+    assert written == tmp_path / "fala.wav" and written_map.pieces == time_map.pieces
+    assert np.array_equal(PcmBuffer.from_wav(written).samples, speech.samples)
+    assert TimeMap([], RATE, 0).to_original(1234) == 1234
+
+
+class FakeTranscriptions:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.uploaded_ms = []
+
+    def create(self, model, file, language, **kwargs):
+        with wave.open(file, "rb") as wf:
+            duration_ms = wf.getnframes() * 1000 // wf.getframerate()
+        with self._lock:
+            self.uploaded_ms.append(duration_ms)
+        # Um segmento no início do áudio recebido e outro no fim
+        segments = [
+            {"start": 0.3, "end": 1.0, "text": "primeiro"},
+            {"start": duration_ms / 1000 - 0.6, "end": duration_ms / 1000 - 0.1, "text": "segundo"},
+        ]
+        return type("Response", (), {"text": "primeiro segundo", "segments": segments})()
+
+
+def test_transcriber_uploads_only_speech_with_original_timestamps(tmp_path):
+    transcriber = Transcriber.__new__(Transcriber)
+    transcriber._api_key = "teste"
+    transcriber._client = type("Client", (), {})()
+    transcriber._client.audio = type("Audio", (), {})()
+    transcriber._client.audio.transcriptions = api = FakeTranscriptions()
+    transcriber._vad_enabled = True
+
+    path = _meeting().save_wav(tmp_path / "reuniao.wav")
+    before = set(TEMP_ROOT.glob("vad-*"))
+    result = transcriber.transcribe_detailed(str(path))
+    assert api.uploaded_ms[0] < 4500  # ~4 s de fala em vez de 10 s
+    # A fala extraída do arquivo passou por um WAV temporário, já apagado
+    assert set(TEMP_ROOT.glob("vad-*")) == before
+    first, second = result["segments"]
+    assert 1000 <= first["start_ms"] <= 1300
+    assert 8700 <= second["end_ms"] <= 9500
+
+    silent = PcmBuffer(np.zeros(RATE * 2, dtype=np.int16), RATE)
+    assert transcriber.transcribe(silent) is None
+    assert transcriber.transcribe_detailed(silent) == {"text": "", "segments": [], "no_speech": True}
+    assert len(api.uploaded_ms) == 1
+
+    # Stream que não é WAV (MP3 com ID3): VAD ignorado, posição preservada
+    stream = io.BytesIO(b"xxID3\x04\x00" + bytes(64))
+    stream.seek(2)
+    assert transcriber._speech_only(stream) == (stream, None) and stream.tell() == 2
+
+
+def test_recorder_skips_silent_chunks_before_dsp(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    backend = SimulatedBackend(GeneratedSource("noise", seconds=1.0), speed=0)
+    recorder = AudioRecorder(backend=backend)
+    recorder.sample_rate, recorder.channels, recorder.chunk_duration = RATE, 1, 2
+    chunks, processed, systems = [], [], []
+    recorder.set_realtime_transcription_callback(lambda chunk, index: chunks.append((index, chunk.frames)))
+    process_pair = recorder._process_pair
+
+    def record_pair(mic, system, *args):
+        processed.append(mic.size)
+        systems.append(system.size)
+        return process_pair(mic, system, *args)
+
+    recorder._process_pair = record_pair
+
+    audio = _meeting().samples
+    silent = audio[:RATE]
+    empty = np.array([], dtype=np.int16)
+
+    # "merge": o trecho não repetido do chunk silencioso vai no início do próximo chunk com fala
+    recorder._emit_chunk(np.concatenate((silent, silent)), empty, step_samples=RATE)
+    assert recorder.skipped_chunks == 1 and processed == [] and chunks == []
+    recorder._emit_chunk(audio[RATE:3 * RATE], empty, step_samples=RATE)
+    assert processed == [3 * RATE] and chunks == [(1, 3 * RATE)]
+
+    # "drop": descartado sem deixar nada para o próximo chunk
+    recorder.config["silent_chunk_policy"] = "drop"
+    recorder._emit_chunk(np.concatenate((silent, silent)), empty, step_samples=RATE)
+    recorder._emit_chunk(audio[RATE:3 * RATE], empty, step_samples=RATE)
+    assert recorder.skipped_chunks == 2 and chunks[-1] == (2, 2 * RATE)
+
+    # Chunk final silencioso: nada é enviado, mas o laço de chunks é liberado
+    recorder._emit_chunk(silent, empty, final_chunk=True)
+    assert recorder.skipped_chunks == 3 and len(chunks) == 2 and recorder._chunk_event.is_set()
+    # Chunks mais curtos que a janela do fluxo (sobra no fim da gravação)
+    assert recorder._chunk_is_silent(silent[:RATE // 10], empty)
+
+    # O sistema guardado é anexado mesmo quando o chunk com fala não tem sistema,
+    # e um chunk guardado sem sistema vira silêncio no sistema (trilhas alinhadas)
+    recorder.config["silent_chunk_policy"] = "merge"
+    recorder._emit_chunk(silent, silent, step_samples=RATE)
+    recorder._emit_chunk(silent, empty, step_samples=RATE)
+    assert recorder._held_mic.size == recorder._held_system.size == 2 * RATE
+    assert np.array_equal(recorder._held_system[:RATE], silent) and not recorder._held_system[RATE:].any()
+    recorder._emit_chunk(audio[RATE:3 * RATE], empty, step_samples=RATE)
+    assert processed[-1] == 4 * RATE and systems[-1] == 4 * RATE and chunks[-1] == (3, 4 * RATE)
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    class _Patch:
+        def chdir(self, path):
+            os.chdir(path)
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        test_detector_keeps_speech_and_drops_silence_and_hold_music(Path(tmp))
+        test_time_map_restores_original_timestamps(Path(tmp))
+        test_transcriber_uploads_only_speech_with_original_timestamps(Path(tmp))
+        test_recorder_skips_silent_chunks_before_dsp(Path(tmp), _Patch())
+        os.chdir(cwd)
+    print("✅ Detecção de voz OK")